@@ -0,0 +1,382 @@
+"""
+Fleet report aggregation into SQLite.
+
+``azure-functions doctor --format json`` reports collected from many builds are
+stream-parsed (plain or gzipped) into normalized tables:
+
+- ``apps``: one row per application name
+- ``rules``: one row per rule id (or label, for reports predating rule ids)
+- ``runs``: one row per report, with its source file and timestamp
+- ``results``: status and detail per run and rule
+- ``durations``: rule execution time per run and rule, when the report has it
+
+Reports are never loaded whole: sections are decoded one at a time from a
+bounded read buffer and rows are written with batched ``executemany`` calls
+inside a single transaction. Re-ingesting a report that is already in the
+database is a no-op, so a collection job can simply pass every file it has.
+"""
+
+import gzip
+import io
+import json
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional
+
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_CHUNK_SIZE = 1 << 16
+_BATCH_SIZE = 5000
+_WHITESPACE = " \t\r\n"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS apps (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    rule_key TEXT NOT NULL UNIQUE,
+    label TEXT,
+    category TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    app_id INTEGER NOT NULL REFERENCES apps(id),
+    source TEXT NOT NULL,
+    report_index INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    UNIQUE (source, report_index)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    rule_id INTEGER NOT NULL REFERENCES rules(id),
+    status TEXT NOT NULL,
+    detail TEXT,
+    PRIMARY KEY (run_id, rule_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS durations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    rule_id INTEGER NOT NULL REFERENCES rules(id),
+    duration_ms REAL NOT NULL,
+    PRIMARY KEY (run_id, rule_id)
+) WITHOUT ROWID;
+"""
+
+# Created after loading so a first bulk import does not maintain them row by row
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS results_rule_status ON results (rule_id, status);
+CREATE INDEX IF NOT EXISTS durations_rule ON durations (rule_id, duration_ms);
+CREATE INDEX IF NOT EXISTS runs_app_started ON runs (app_id, started_at);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);
+"""
+
+
+class IngestStats:
+    """Counters describing one aggregation pass."""
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.runs = 0
+        self.skipped_runs = 0
+        self.results = 0
+
+
+def open_report(path: Path) -> IO[str]:
+    """Open a report for reading, transparently decompressing gzip by magic number."""
+    raw = path.open("rb")
+    if raw.peek(2)[:2] == b"\x1f\x8b":
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=raw), encoding="utf-8")
+    return io.TextIOWrapper(raw, encoding="utf-8")
+
+
+def iter_report_sections(stream: IO[str], chunk_size: int = _CHUNK_SIZE) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Yield ``(report_index, section)`` pairs from a stream of JSON reports.
+
+    A stream holds one report (a JSON array of sections) or several of them,
+    concatenated or one per line. Only the section being decoded is buffered.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    report_index = -1
+    in_array = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        # Skip whitespace and, inside an array, element separators
+        while True:
+            while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (in_array and buffer[pos] == ",")):
+                pos += 1
+            if pos < len(buffer) or not fill():
+                break
+        if pos >= len(buffer):
+            if in_array:
+                raise ValueError("Unexpected end of report: unterminated array")
+            return
+
+        char = buffer[pos]
+        if not in_array:
+            if char != "[":
+                raise ValueError(f"Expected a JSON array of sections, found {char!r}")
+            in_array = True
+            report_index += 1
+            pos += 1
+            continue
+        if char == "]":
+            in_array = False
+            pos += 1
+            continue
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                break
+            except json.JSONDecodeError as exc:
+                if not fill():
+                    raise ValueError(f"Malformed report section: {exc.msg}") from exc
+        pos = end
+        if isinstance(value, dict):
+            yield report_index, value
+        else:
+            logger.debug(f"Skipping non-object section in report {report_index}")
+
+
+def _app_name(path: Path, pattern: Optional[re.Pattern[str]]) -> str:
+    if pattern is not None:
+        match = pattern.search(path.as_posix())
+        if match is not None:
+            groups = match.groupdict()
+            return groups.get("app") or match.group(0)
+    name = path.name
+    for suffix in (".gz", ".json"):
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    return name
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open (and if needed create) a fleet database."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+class _Ingester:
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.apps: dict[str, int] = dict(conn.execute("SELECT name, id FROM apps").fetchall())
+        self.rules: dict[str, int] = dict(conn.execute("SELECT rule_key, id FROM rules").fetchall())
+        self.results: list[tuple[int, int, str, Optional[str]]] = []
+        self.durations: list[tuple[int, int, float]] = []
+        self.stats = IngestStats()
+
+    def app_id(self, name: str) -> int:
+        app_id = self.apps.get(name)
+        if app_id is None:
+            cursor = self.conn.execute("INSERT INTO apps (name) VALUES (?)", (name,))
+            app_id = self.apps[name] = int(cursor.lastrowid or 0)
+        return app_id
+
+    def rule_id(self, key: str, label: Optional[str], category: Optional[str]) -> int:
+        rule_id = self.rules.get(key)
+        if rule_id is None:
+            cursor = self.conn.execute(
+                "INSERT INTO rules (rule_key, label, category) VALUES (?, ?, ?)", (key, label, category)
+            )
+            rule_id = self.rules[key] = int(cursor.lastrowid or 0)
+        return rule_id
+
+    def start_run(self, app_id: int, source: str, report_index: int, started_at: str) -> Optional[int]:
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO runs (app_id, source, report_index, started_at) VALUES (?, ?, ?, ?)",
+            (app_id, source, report_index, started_at),
+        )
+        if cursor.rowcount == 0:
+            self.stats.skipped_runs += 1
+            return None
+        self.stats.runs += 1
+        return int(cursor.lastrowid or 0)
+
+    def add_section(self, run_id: int, section: dict[str, Any]) -> None:
+        category = section.get("category")
+        seen: set[int] = set()
+        for item in section.get("items") or []:
+            if not isinstance(item, dict):
+                continue
+            key = item.get("id") or item.get("label")
+            if not key:
+                continue
+            rule_id = self.rule_id(str(key), item.get("label"), category)
+            if rule_id in seen:
+                continue
+            seen.add(rule_id)
+            self.results.append((run_id, rule_id, str(item.get("status", "fail")), item.get("value")))
+            duration = item.get("duration_ms")
+            if isinstance(duration, (int, float)):
+                self.durations.append((run_id, rule_id, float(duration)))
+        if len(self.results) >= _BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.results:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO results (run_id, rule_id, status, detail) VALUES (?, ?, ?, ?)", self.results
+            )
+            self.stats.results += len(self.results)
+            self.results = []
+        if self.durations:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO durations (run_id, rule_id, duration_ms) VALUES (?, ?, ?)", self.durations
+            )
+            self.durations = []
+
+
+def ingest_reports(
+    db_path: Path,
+    reports: Iterable[Path],
+    app_pattern: Optional[str] = None,
+) -> IngestStats:
+    """
+    Load JSON reports into the fleet database at ``db_path``.
+
+    The application name is taken from the ``app`` group of ``app_pattern``
+    (a regex searched in the report path) or, by default, from the report file
+    name without ``.json``/``.gz``. The run timestamp is the file's mtime.
+    """
+    pattern = re.compile(app_pattern) if app_pattern else None
+    conn = connect(db_path)
+    ingester = _Ingester(conn)
+    try:
+        with conn:
+            for path in reports:
+                path = Path(path)
+                source = str(path.resolve())
+                started_at = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+                app_id = ingester.app_id(_app_name(path, pattern))
+                run_ids: dict[int, Optional[int]] = {}
+                with open_report(path) as stream:
+                    for report_index, section in iter_report_sections(stream):
+                        if report_index not in run_ids:
+                            run_ids[report_index] = ingester.start_run(app_id, source, report_index, started_at)
+                        run_id = run_ids[report_index]
+                        if run_id is not None:
+                            ingester.add_section(run_id, section)
+                ingester.stats.files += 1
+            ingester.flush()
+            conn.executescript(_INDEXES)
+    finally:
+        conn.close()
+    return ingester.stats
+
+
+# --- built-in queries ---
+
+
+def most_failed_rules(conn: sqlite3.Connection, limit: int = 20) -> list[dict[str, Any]]:
+    """Rules with the most failing results, with how many distinct apps they failed in."""
+    rows = conn.execute(
+        """
+        SELECT rules.rule_key, rules.label, COUNT(*) AS failures, COUNT(DISTINCT runs.app_id) AS apps
+        FROM results
+        JOIN rules ON rules.id = results.rule_id
+        JOIN runs ON runs.id = results.run_id
+        WHERE results.status = 'fail'
+        GROUP BY results.rule_id
+        ORDER BY failures DESC, rules.rule_key
+        LIMIT ?
+        """,
+        (limit,),
+    )
+    return [{"rule": r[0], "label": r[1], "failures": r[2], "apps": r[3]} for r in rows]
+
+
+def slowest_rules(conn: sqlite3.Connection, limit: int = 20) -> list[dict[str, Any]]:
+    """Rules ordered by mean execution time across all runs that recorded durations."""
+    rows = conn.execute(
+        """
+        SELECT rules.rule_key, rules.label, AVG(duration_ms), MAX(duration_ms), COUNT(*)
+        FROM durations
+        JOIN rules ON rules.id = durations.rule_id
+        GROUP BY durations.rule_id
+        ORDER BY AVG(duration_ms) DESC, rules.rule_key
+        LIMIT ?
+        """,
+        (limit,),
+    )
+    return [
+        {"rule": r[0], "label": r[1], "avg_ms": round(r[2], 3), "max_ms": round(r[3], 3), "runs": r[4]} for r in rows
+    ]
+
+
+def regressions_since(conn: sqlite3.Connection, since: str) -> list[dict[str, Any]]:
+    """
+    App/rule pairs that passed in their last run before ``since`` but not in their latest run after it.
+
+    ``since`` is an ISO date or date-time, compared in UTC.
+    """
+    # Only runs after ``since`` are ranked; the previous status of each candidate pair is then
+    # looked up through the (app_id, started_at) index instead of ranking the whole history.
+    rows = conn.execute(
+        """
+        WITH latest AS (
+            SELECT runs.app_id, results.rule_id, results.status, runs.started_at,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY runs.app_id, results.rule_id
+                       ORDER BY runs.started_at DESC, runs.id DESC
+                   ) AS rn
+            FROM runs JOIN results ON results.run_id = runs.id
+            WHERE runs.started_at >= :since
+        ),
+        candidates AS (
+            SELECT latest.*, (
+                SELECT previous_run.started_at || '|' || previous.status
+                FROM runs AS previous_run
+                JOIN results AS previous
+                  ON previous.run_id = previous_run.id AND previous.rule_id = latest.rule_id
+                WHERE previous_run.app_id = latest.app_id AND previous_run.started_at < :since
+                ORDER BY previous_run.started_at DESC, previous_run.id DESC
+                LIMIT 1
+            ) AS previous
+            FROM latest
+            WHERE latest.rn = 1 AND latest.status != 'pass'
+        )
+        SELECT apps.name, rules.rule_key, rules.label, candidates.status, candidates.started_at,
+               substr(candidates.previous, 1, instr(candidates.previous, '|') - 1)
+        FROM candidates
+        JOIN apps ON apps.id = candidates.app_id
+        JOIN rules ON rules.id = candidates.rule_id
+        WHERE candidates.previous LIKE '%|pass'
+        ORDER BY apps.name, rules.rule_key
+        """,
+        {"since": _normalize_timestamp(since)},
+    )
+    return [
+        {"app": r[0], "rule": r[1], "label": r[2], "status": r[3], "seen_at": r[4], "last_pass_at": r[5]} for r in rows
+    ]
+
+
+def _normalize_timestamp(value: str) -> str:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S")
@@ -1,16 +1,34 @@
-from typing import List
+from typing import List, Optional, Sequence
 
-from azure_functions_doctor.doctor import Doctor, SectionResult
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.results import SectionResult, to_dicts
 
 
-def run_diagnostics(path: str) -> List[SectionResult]:
+def run_diagnostics(
+    path: str,
+    only: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+) -> List[SectionResult]:
     """
     Run diagnostics on the Azure Functions application at the specified path.
 
     Args:
         path: The file system path to the Azure Functions application.
+        only: Optional selectors (rule id, section, category or handler type; globs allowed)
+            limiting the run to matching rules.
+        skip: Optional selectors for rules to leave out.
 
     Returns:
         A list of SectionResult containing the results of each diagnostic check.
+
+    Raises:
+        SystemExit: The project is a v1 app with nested function folders. This is only
+            checked when the selected rules depend on the programming model, so
+            selections shared by both models never walk the project tree.
     """
-    return Doctor(path).run_all_checks()
+    doctor = Doctor(path, allow_v1=True)
+    selected_only, selected_skip = only or (), skip or ()
+    doctor.load_rules(selected_only, selected_skip)
+    if doctor.model_detected:
+        doctor.reject_nested_v1()
+    return to_dicts(doctor.run_all_checks(only=selected_only, skip=selected_skip))
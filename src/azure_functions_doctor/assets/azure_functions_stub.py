@@ -0,0 +1,229 @@
+"""
+Minimal stand-in for ``azure.functions`` used by the worker-indexing simulation.
+
+Only the surface the Python worker touches while indexing a v2 app is modelled.
+``FunctionApp`` and ``Blueprint`` collect functions through ``route``,
+``schedule``, ``function_name`` and any ``*_trigger``/``*_input``/``*_output``
+decorator. ``get_functions`` applies the checks that fail indexing: exactly one
+trigger per function and unique function names. Binding arguments are recorded
+but not validated, and binding types are derived from the decorator name, so
+they can differ from the real package's. Any other public name resolves to a
+placeholder class so that annotations such as ``func.HttpRequest`` or
+``func.Out[str]`` still import.
+"""
+
+import json
+from enum import Enum
+from typing import Any, Callable, Optional, Union
+
+__version__ = "0+doctor.stub"
+
+
+class AuthLevel(str, Enum):
+    FUNCTION = "FUNCTION"
+    ANONYMOUS = "ANONYMOUS"
+    ADMIN = "ADMIN"
+
+
+class Binding:
+    def __init__(self, type: str, direction: str, name: str, settings: dict[str, Any]) -> None:
+        self.type = type
+        self.direction = direction
+        self.name = name
+        self.settings = settings
+
+    def get_dict_repr(self) -> dict[str, Any]:
+        return {"type": self.type, "direction": self.direction, "name": self.name, **self.settings}
+
+
+class Function:
+    def __init__(self, func: Callable[..., Any], script_file: str) -> None:
+        self._func = func
+        self._name = getattr(func, "__name__", "function")
+        self._script_file = script_file
+        self._trigger: Optional[Binding] = None
+        self._bindings: list[Binding] = []
+
+    def add_trigger(self, trigger: Binding) -> None:
+        if self._trigger is not None:
+            raise ValueError("A trigger was already registered to this function. A function can only have one trigger.")
+        self._trigger = trigger
+        self._bindings.append(trigger)
+
+    def add_binding(self, binding: Binding) -> None:
+        self._bindings.append(binding)
+
+    def set_function_name(self, name: str) -> None:
+        self._name = name
+
+    def get_function_name(self) -> str:
+        return self._name
+
+    def get_trigger(self) -> Optional[Binding]:
+        return self._trigger
+
+    def get_bindings(self) -> list[Binding]:
+        return self._bindings
+
+    def get_user_function(self) -> Callable[..., Any]:
+        return self._func
+
+    def get_function_json(self) -> str:
+        return json.dumps(
+            {"scriptFile": self._script_file, "bindings": [binding.get_dict_repr() for binding in self._bindings]}
+        )
+
+
+class FunctionBuilder:
+    def __init__(self, func: Callable[..., Any], script_file: str) -> None:
+        self._function = Function(func, script_file)
+
+    def build(self, auth_level: Optional[AuthLevel] = None) -> Function:
+        if self._function.get_trigger() is None:
+            raise ValueError(
+                f"Function {self._function.get_function_name()} does not have a trigger. "
+                "A valid function must have one and only one trigger registered."
+            )
+        return self._function
+
+
+def _camel(words: list[str]) -> str:
+    return words[0] + "".join(word.title() for word in words[1:])
+
+
+class DecoratorApi:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._function_builders: list[FunctionBuilder] = []
+        self._app_script_file = "function_app.py"
+
+    def _builder(self, target: Union[FunctionBuilder, Callable[..., Any]]) -> FunctionBuilder:
+        if isinstance(target, FunctionBuilder):
+            return target
+        if not callable(target):
+            raise ValueError(f"{target!r} is not a function")
+        builder = FunctionBuilder(target, self._app_script_file)
+        self._function_builders.append(builder)
+        return builder
+
+    def _decorator(
+        self, type: str, direction: str, name: str, settings: dict[str, Any]
+    ) -> Callable[[Any], FunctionBuilder]:
+        def wrap(target: Any) -> FunctionBuilder:
+            builder = self._builder(target)
+            binding = Binding(type, direction, name, settings)
+            if direction == "in" and type.endswith("Trigger"):
+                builder._function.add_trigger(binding)
+            else:
+                builder._function.add_binding(binding)
+            return builder
+
+        return wrap
+
+    def function_name(self, name: str, **kwargs: Any) -> Callable[[Any], FunctionBuilder]:
+        def wrap(target: Any) -> FunctionBuilder:
+            builder = self._builder(target)
+            builder._function.set_function_name(name)
+            return builder
+
+        return wrap
+
+    def route(self, route: Optional[str] = None, **kwargs: Any) -> Callable[[Any], FunctionBuilder]:
+        trigger = self._decorator("httpTrigger", "in", kwargs.pop("trigger_arg_name", "req"), {"route": route})
+        output = self._decorator("http", "out", kwargs.pop("binding_arg_name", "$return"), {})
+        return lambda target: output(trigger(target))
+
+    def schedule(self, schedule: str, arg_name: str = "timer", **kwargs: Any) -> Callable[[Any], FunctionBuilder]:
+        return self._decorator("timerTrigger", "in", arg_name, {"schedule": schedule, **kwargs})
+
+    def __getattr__(self, attr: str) -> Callable[..., Callable[[Any], FunctionBuilder]]:
+        words = attr.split("_")
+        if attr.startswith("_") or words[-1] not in ("trigger", "input", "output"):
+            raise AttributeError(attr)
+
+        def decorator(*args: Any, arg_name: str = "", **kwargs: Any) -> Callable[[Any], FunctionBuilder]:
+            if words[-1] == "trigger":
+                return self._decorator(_camel(words), "in", arg_name, kwargs)
+            return self._decorator(_camel(words[:-1]), "in" if words[-1] == "input" else "out", arg_name, kwargs)
+
+        return decorator
+
+
+class Blueprint(DecoratorApi):
+    pass
+
+
+class FunctionRegister(DecoratorApi):
+    def __init__(self, auth_level: Union[AuthLevel, str] = AuthLevel.FUNCTION, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.auth_level = AuthLevel(auth_level)
+
+    def register_functions(self, function_container: DecoratorApi) -> None:
+        if isinstance(function_container, FunctionRegister):
+            raise TypeError("functions can not be type of FunctionRegister!")
+        self._function_builders.extend(function_container._function_builders)
+
+    register_blueprint = register_functions
+
+    def get_functions(self) -> list[Function]:
+        functions = [builder.build(self.auth_level) for builder in self._function_builders]
+        seen: set[str] = set()
+        for function in functions:
+            name = function.get_function_name().lower()
+            if name in seen:
+                raise ValueError(
+                    f"Function {function.get_function_name()} does not have a unique function name. "
+                    "Change @app.function_name() or the function method name to be unique."
+                )
+            seen.add(name)
+        return functions
+
+
+class FunctionApp(FunctionRegister):
+    def __init__(self, http_auth_level: Union[AuthLevel, str] = AuthLevel.FUNCTION) -> None:
+        super().__init__(auth_level=http_auth_level)
+
+
+class AsyncFunctionApp(FunctionApp):
+    pass
+
+
+class _HostedApp(FunctionApp):
+    def __init__(self, app: Any, http_auth_level: Union[AuthLevel, str] = AuthLevel.FUNCTION) -> None:
+        super().__init__(http_auth_level=http_auth_level)
+
+        def http_app_func(req: Any, context: Any) -> Any:
+            return None
+
+        self.route("/{*route}")(http_app_func)
+
+
+class AsgiFunctionApp(_HostedApp):
+    pass
+
+
+class WsgiFunctionApp(_HostedApp):
+    pass
+
+
+class _PlaceholderMeta(type):
+    def __getattr__(cls, attr: str) -> str:
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return attr
+
+
+class _Placeholder(metaclass=_PlaceholderMeta):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+    def __class_getitem__(cls, item: Any) -> Any:
+        return cls
+
+
+def __getattr__(name: str) -> type:
+    if not name[:1].isupper():
+        raise AttributeError(name)
+    placeholder = _PlaceholderMeta(name, (_Placeholder,), {})
+    globals()[name] = placeholder
+    return placeholder
@@ -0,0 +1,100 @@
+"""
+Blocking calls reachable from ``async def`` function handlers.
+
+An async handler runs on the worker's event loop; a synchronous network call,
+``time.sleep`` or file read inside it stalls every invocation sharing that
+loop. From each async handler the project's call graph
+(:mod:`azure_functions_doctor.call_graph`) is followed, and calls matching the
+blocking API table (:data:`BLOCKING_CALLS`, extended per rule with
+``blocking_calls``) are reported with a ``file:line`` call chain.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Iterable, Optional, TypedDict
+
+from azure_functions_doctor.call_graph import CallGraph
+
+# Qualified call name pattern (fnmatch) -> what to use instead
+BLOCKING_CALLS: dict[str, str] = {
+    "time.sleep": "await asyncio.sleep()",
+    "requests.get": "an async HTTP client (aiohttp, httpx.AsyncClient)",
+    "requests.post": "an async HTTP client (aiohttp, httpx.AsyncClient)",
+    "requests.put": "an async HTTP client (aiohttp, httpx.AsyncClient)",
+    "requests.patch": "an async HTTP client (aiohttp, httpx.AsyncClient)",
+    "requests.delete": "an async HTTP client (aiohttp, httpx.AsyncClient)",
+    "requests.head": "an async HTTP client (aiohttp, httpx.AsyncClient)",
+    "requests.request": "an async HTTP client (aiohttp, httpx.AsyncClient)",
+    "httpx.get": "httpx.AsyncClient",
+    "httpx.post": "httpx.AsyncClient",
+    "httpx.put": "httpx.AsyncClient",
+    "httpx.patch": "httpx.AsyncClient",
+    "httpx.delete": "httpx.AsyncClient",
+    "httpx.request": "httpx.AsyncClient",
+    "httpx.Client": "httpx.AsyncClient",
+    "urllib.request.urlopen": "an async HTTP client (aiohttp, httpx.AsyncClient)",
+    "socket.create_connection": "asyncio.open_connection()",
+    "subprocess.run": "asyncio.create_subprocess_exec()",
+    "subprocess.call": "asyncio.create_subprocess_exec()",
+    "subprocess.check_call": "asyncio.create_subprocess_exec()",
+    "subprocess.check_output": "asyncio.create_subprocess_exec()",
+    "os.system": "asyncio.create_subprocess_shell()",
+    "open": "asyncio.to_thread() or aiofiles",
+    "io.open": "asyncio.to_thread() or aiofiles",
+    "sqlite3.connect": "asyncio.to_thread() or an async driver",
+    "psycopg2.connect": "an async driver (asyncpg, psycopg async)",
+    "pyodbc.connect": "asyncio.to_thread() or an async driver (aioodbc)",
+    "pymysql.connect": "an async driver (aiomysql)",
+    "smtplib.SMTP*": "an async SMTP client (aiosmtplib)",
+    # Synchronous Azure SDK clients; the asynchronous ones live in ``.aio`` modules
+    "azure.*Client": "the client from the package's .aio module",
+    "azure.*Client.from_connection_string": "the client from the package's .aio module",
+}
+# Checked before the table: asynchronous variants of blocking APIs
+_ASYNC_VARIANTS = ("*.aio.*", "aiohttp.*", "aiofiles.*", "asyncio.*")
+_MAX_FINDINGS = 5
+
+
+class BlockingCall(TypedDict):
+    handler: str
+    call: str
+    advice: str
+    chain: list[str]
+
+
+def blocking_advice(name: str, extra: Iterable[str] = ()) -> Optional[str]:
+    """What to use instead of the call ``name`` (qualified), or None when it is not known to block."""
+    if any(fnmatchcase(name, pattern) for pattern in _ASYNC_VARIANTS):
+        return None
+    for pattern, advice in BLOCKING_CALLS.items():
+        if fnmatchcase(name, pattern):
+            return advice
+    if any(fnmatchcase(name, pattern) for pattern in extra):
+        return "a non-blocking alternative or asyncio.to_thread()"
+    return None
+
+
+def find_blocking(graph: CallGraph, extra: Iterable[str] = ()) -> list[BlockingCall]:
+    """Blocking calls reachable from each async handler, with the call chain that reaches them."""
+    extra = tuple(extra)
+    findings: list[BlockingCall] = []
+    for module, handler in graph.handlers(async_only=True):
+        for external in graph.walk(module, handler):
+            advice = blocking_advice(external["call"], extra)
+            if advice is not None:
+                findings.append(
+                    {
+                        "handler": f"{module}.{handler}",
+                        "call": external["call"],
+                        "advice": advice,
+                        "chain": external["chain"],
+                    }
+                )
+    return findings
+
+
+def describe(findings: list[BlockingCall]) -> list[str]:
+    """Human-readable evidence (call chain and advice) for the first few findings."""
+    return [
+        f"{' -> '.join(finding['chain'])} blocks the event loop; use {finding['advice']}"
+        for finding in findings[:_MAX_FINDINGS]
+    ]
@@ -0,0 +1,118 @@
+"""
+Comparison of a run against a previous JSON report.
+
+Legacy apps often carry a known set of failing checks. Instead of diffing whole
+reports, the baseline is loaded into an index keyed by ``(category, rule id)``
+and the new results are compared in a single pass. Only new failures, fixed
+checks and changed details of non-passing checks are reported, and only new
+failures fail the run.
+
+Reports written before result items carried a rule ``id`` are matched by label.
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional, TypedDict, cast
+
+from azure_functions_doctor.aggregate import iter_report_sections, open_report
+from azure_functions_doctor.results import CheckResult, SectionResult
+
+
+class BaselineChange(TypedDict, total=False):
+    category: str
+    id: str
+    label: str
+    status: str
+    value: str
+    previous_status: str
+    previous_value: str
+
+
+class BaselineDiff:
+    """New failures, fixed checks and changed details relative to a baseline."""
+
+    def __init__(self) -> None:
+        self.new_failures: list[BaselineChange] = []
+        self.fixed: list[BaselineChange] = []
+        self.changed: list[BaselineChange] = []
+        self.unchanged = 0
+
+    @property
+    def exit_code(self) -> int:
+        """1 when the run introduced failures that are not in the baseline, else 0."""
+        return 1 if self.new_failures else 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "new_failures": self.new_failures,
+            "fixed": self.fixed,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+        }
+
+
+class BaselineIndex:
+    """Baseline results indexed by ``(category, rule id)`` with a label fallback."""
+
+    def __init__(self, sections: Iterable[SectionResult]) -> None:
+        self._by_id: dict[tuple[str, str], CheckResult] = {}
+        self._by_label: dict[tuple[str, str], CheckResult] = {}
+        for section in sections:
+            category = str(section.get("category", ""))
+            for item in section.get("items", []):
+                if item.get("id"):
+                    self._by_id[(category, item["id"])] = item
+                if item.get("label"):
+                    self._by_label.setdefault((category, item["label"]), item)
+
+    @classmethod
+    def load(cls, path: Path) -> "BaselineIndex":
+        """Load the first report in ``path`` (plain or gzipped JSON); raises ValueError if malformed."""
+        with open_report(path) as stream:
+            sections = [section for index, section in iter_report_sections(stream) if index == 0]
+        return cls(cast(list[SectionResult], sections))
+
+    def get(self, category: str, item: Mapping[str, Any]) -> Optional[CheckResult]:
+        found = self._by_id.get((category, item.get("id", "")))
+        if found is None:
+            found = self._by_label.get((category, item.get("label", "")))
+        return found
+
+    def diff(self, results: Iterable[Mapping[str, Any]]) -> BaselineDiff:
+        """Compare ``results`` against the baseline in one pass."""
+        diff = BaselineDiff()
+        for section in results:
+            category = section["category"]
+            for item in section["items"]:
+                previous = self.get(category, item)
+                status = item.get("status", "fail")
+                previous_status = previous.get("status", "") if previous is not None else ""
+                change: BaselineChange = {
+                    "category": category,
+                    "id": item.get("id", ""),
+                    "label": item.get("label", ""),
+                    "status": status,
+                    "value": item.get("value", ""),
+                }
+                if previous is not None:
+                    change["previous_status"] = previous_status
+                    change["previous_value"] = previous.get("value", "")
+
+                if status == "fail" and previous_status != "fail":
+                    diff.new_failures.append(change)
+                elif status == "pass" and previous_status in ("fail", "warn"):
+                    diff.fixed.append(change)
+                elif previous is None:
+                    # A check the baseline did not have; only worth reporting when it is not passing
+                    if status == "pass":
+                        diff.unchanged += 1
+                    else:
+                        diff.changed.append(change)
+                elif status != previous_status or (
+                    # Passing details are informational (and often embed workspace paths)
+                    status != "pass"
+                    and item.get("value", "") != previous.get("value", "")
+                ):
+                    diff.changed.append(change)
+                else:
+                    diff.unchanged += 1
+        return diff
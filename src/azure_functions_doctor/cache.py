@@ -0,0 +1,105 @@
+"""
+Small on-disk cache used to keep expensive results between runs.
+
+Each cache is a single JSON document under the configured cache directory
+(see ``Config.get_cache_dir``). Reads never fail: a missing, unreadable or
+corrupt cache file simply behaves like an empty cache. Writes are atomic so
+concurrent runs never observe a half-written file.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from azure_functions_doctor.config import get_config
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class JsonCache:
+    """A named JSON document in the cache directory, loaded lazily and saved explicitly."""
+
+    def __init__(self, name: str, cache_dir: Optional[Path] = None) -> None:
+        self.name = name
+        self._cache_dir = cache_dir
+        self._data: Optional[dict[str, Any]] = None
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        """Location of the cache file."""
+        base = self._cache_dir if self._cache_dir is not None else get_config().get_cache_dir()
+        return base / f"{self.name}.json"
+
+    @property
+    def enabled(self) -> bool:
+        """Whether reads and writes go to disk; a disabled cache stays in memory only."""
+        return get_config().is_cache_enabled()
+
+    def data(self) -> dict[str, Any]:
+        """Return the cached document, loading it from disk on first access."""
+        if self._data is None:
+            self._data = self._load()
+        return self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data().get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self.data()[key] = value
+        self._dirty = True
+
+    def pop(self, key: str) -> Any:
+        data = self.data()
+        if key in data:
+            self._dirty = True
+        return data.pop(key, None)
+
+    def save(self) -> None:
+        """Write pending changes to disk atomically; errors are logged and ignored."""
+        if not self._dirty or not self.enabled or self._data is None:
+            return
+        target = self.path
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{self.name}.", suffix=".tmp", dir=target.parent)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    # json.dumps uses the C encoder; json.dump streams through the pure-Python one
+                    f.write(json.dumps(self._data, separators=(",", ":")))
+                os.replace(tmp_name, target)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+            self._dirty = False
+        except OSError as exc:
+            logger.debug(f"Failed to write cache {target}: {exc}")
+
+    def _load(self) -> dict[str, Any]:
+        if not self.enabled:
+            return {}
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.debug(f"Ignoring unreadable cache {self.path}: {exc}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+def file_signature(path: Path) -> Optional[str]:
+    """Return a cheap identity for a file (resolved path, size, mtime) or None if it cannot be stat'ed."""
+    try:
+        resolved = path.resolve()
+        st = resolved.stat()
+    except OSError:
+        return None
+    return f"{resolved}:{st.st_size}:{st.st_mtime_ns}"
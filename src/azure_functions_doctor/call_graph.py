@@ -0,0 +1,353 @@
+"""
+Function-level call graph of the project's own source, shared by the source lints.
+
+Function handlers are the functions carrying a trigger decorator of the v2
+programming model (``@app.route``, ``@bp.queue_trigger``, ...) or named as a v1
+``entryPoint`` in ``function.json``. From a handler, :meth:`CallGraph.walk`
+follows calls through the project's functions and yields every call it cannot
+follow further (library calls), with the ``file:line`` chain that reaches it;
+the lints match those calls against their API tables.
+
+Each module is summarized in one AST pass into its imports, functions and the
+calls each function makes. Calls inside lambdas are not attributed to the
+enclosing function: they are typically handed to ``run_in_executor``. Modules
+are parsed lazily: only files that may define handlers and the project modules
+their handlers reach. Summaries are JSON and cached by content digest in the
+``call_graph`` cache, and memoized per file through ``ProjectContext.scan``.
+"""
+
+import ast
+import hashlib
+import re
+from fnmatch import fnmatchcase
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TypedDict, Union
+
+from azure_functions_doctor.cache import JsonCache
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.import_graph import VENDORED_DIRS
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Trigger and binding decorators of FunctionApp/Blueprint (``@app.route``, ``@bp.timer_trigger``, ...)
+_HANDLER_DECORATORS = ("route", "schedule", "function_name", "*_trigger")
+_HANDLER_TEXT = re.compile(r"@\s*[\w.]+\.(?:route|schedule|function_name|\w+_trigger)\b")
+# Decorators that make a function return the same object on every call
+_CACHING_DECORATORS = ("cache", "lru_cache", "cached", "cached_property", "cache_resource")
+# Bumped when the summary layout changes
+_SUMMARY_VERSION = 2
+# Summaries kept in the cache beyond those used in the current run
+_MAX_CACHE_ENTRIES = 20_000
+
+# Nodes that cannot contain calls, imports or definitions
+_LEAF_TYPES = frozenset({ast.Name, ast.Constant, ast.Load, ast.Store, ast.Del, ast.alias, ast.Pass})
+
+# A function summary: [line, is_async, is_handler, [[call, line], ...], is_cached]. ``is_cached`` marks
+# memoized factories: a caching decorator, or ``global`` state assigned on first use
+FunctionSummary = list[Any]
+
+
+class ModuleSummary(TypedDict):
+    imports: dict[str, str]
+    functions: dict[str, FunctionSummary]
+
+
+class ExternalCall(TypedDict):
+    call: str
+    chain: list[str]
+
+
+def _dotted(node: ast.expr) -> Optional[str]:
+    parts: list[str] = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _decorator_name(node: ast.expr) -> str:
+    target = node.func if isinstance(node, ast.Call) else node
+    if isinstance(target, ast.Attribute):
+        return target.attr
+    return target.id if isinstance(target, ast.Name) else ""
+
+
+def _is_handler_decorator(node: ast.expr) -> bool:
+    target = node.func if isinstance(node, ast.Call) else node
+    return isinstance(target, ast.Attribute) and any(fnmatchcase(target.attr, p) for p in _HANDLER_DECORATORS)
+
+
+def summarize_module(source: Union[str, bytes], module: str, is_package: bool = False) -> ModuleSummary:
+    """
+    Imports (local name -> qualified name) and functions (qualified name -> summary) of a module.
+
+    One explicit-stack walk over the tree; ``ast.NodeVisitor`` dispatch costs
+    more than the parse itself on large projects.
+    """
+    imports: dict[str, str] = {}
+    functions: dict[str, FunctionSummary] = {}
+    package = module if is_package else module.rpartition(".")[0]
+    # (node, enclosing scope names, summary of the innermost enclosing function or None)
+    stack: list[tuple[ast.AST, tuple[str, ...], Optional[FunctionSummary]]] = [(ast.parse(source), (), None)]
+    while stack:
+        node, scope, current = stack.pop()
+        kind = type(node)
+        if kind in _LEAF_TYPES:
+            continue
+        if isinstance(node, ast.Call):
+            name = _dotted(node.func) if current is not None else None
+            if current is not None and name is not None:
+                current[3].append([name, node.lineno])
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            decorators = [_decorator_name(d) for d in node.decorator_list]
+            summary: FunctionSummary = [
+                node.lineno,
+                kind is ast.AsyncFunctionDef,
+                any(_is_handler_decorator(d) for d in node.decorator_list),
+                [],
+                any(name in _CACHING_DECORATORS for name in decorators),
+            ]
+            functions[".".join((*scope, node.name))] = summary
+            inner = (*scope, node.name)
+            stack.extend((statement, inner, summary) for statement in reversed(node.body))
+            # Decorators run in the enclosing scope
+            stack.extend((decorator, scope, current) for decorator in node.decorator_list)
+            continue
+        elif isinstance(node, ast.ClassDef):
+            stack.extend((child, (*scope, node.name), current) for child in reversed(node.body))
+            stack.extend((decorator, scope, current) for decorator in node.decorator_list)
+            continue
+        elif kind is ast.Lambda:
+            # Usually handed to run_in_executor or a callback; not executed by the enclosing function
+            continue
+        elif isinstance(node, ast.Global):
+            if current is not None:
+                current[4] = True
+            continue
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                top = alias.name.partition(".")[0]
+                imports[alias.asname or top] = alias.name if alias.asname else top
+            continue
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = package
+                for _ in range(node.level - 1):
+                    parent = parent.rpartition(".")[0]
+                base = f"{parent}.{base}" if base and parent else (base or parent)
+            for alias in node.names:
+                if alias.name != "*":
+                    imports[alias.asname or alias.name] = f"{base}.{alias.name}" if base else alias.name
+            continue
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                stack.extend((item, scope, current) for item in reversed(value) if isinstance(item, ast.AST))
+            elif isinstance(value, ast.AST):
+                stack.append((value, scope, current))
+    for summary in functions.values():
+        summary[3].sort(key=lambda call: call[1])
+    return {"imports": imports, "functions": functions}
+
+
+def module_of(root: Path, path: Path) -> tuple[str, bool]:
+    """Dotted module name of the source file ``path`` below ``root`` and whether it is a package."""
+    parts = list(path.relative_to(root).with_suffix("").parts)
+    is_package = parts[-1] == "__init__"
+    if is_package:
+        parts.pop()
+    return ".".join(parts), is_package
+
+
+def v1_entry_points(root: Path, context: ProjectContext) -> list[tuple[str, str]]:
+    """``(module, function)`` named by each ``function.json`` (``scriptFile``, ``entryPoint`` default ``main``)."""
+    entries: list[tuple[str, str]] = []
+    for function_json in context.files.rglob("function.json"):
+        try:
+            data = context.read_json(function_json)
+        except Exception as exc:
+            logger.debug(f"Skipping {function_json}: {exc}")
+            continue
+        if not isinstance(data, dict):
+            continue
+        script = (function_json.parent / str(data.get("scriptFile", "__init__.py"))).resolve()
+        try:
+            module, _ = module_of(Path(root).resolve(), script)
+        except ValueError:
+            continue
+        entries.append((module, str(data.get("entryPoint", "main"))))
+    return entries
+
+
+def _handler_markers(context: ProjectContext, path: Path) -> list[bool]:
+    """Whether the file has trigger decorators and whether it has ``async def``, without parsing it."""
+    try:
+        text = context.read_text(path, errors="replace")
+    except OSError:
+        return [False, False]
+    return [_HANDLER_TEXT.search(text) is not None, "async def" in text]
+
+
+class CallGraph:
+    """Lazily summarized project modules and call-graph walks from function handlers."""
+
+    def __init__(self, root: Path, context: ProjectContext, cache: Optional[JsonCache] = None) -> None:
+        self.root = Path(root)
+        self.context = context
+        self._cache = cache if cache is not None else JsonCache("call_graph")
+        self.files: dict[str, tuple[Path, bool]] = {}
+        self.modules: dict[str, Optional[ModuleSummary]] = {}
+        self.paths: dict[str, str] = {}
+        self.parsed = 0
+        self._used: set[str] = set()
+        self.entry_points: set[tuple[str, str]] = set()
+
+    def _summary(self, path: Path, module: str, is_package: bool) -> Optional[ModuleSummary]:
+        try:
+            content = self.context.read_text(path, errors="replace").encode("utf-8")
+        except OSError as exc:
+            logger.debug(f"Cannot read {path}: {exc}")
+            return None
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        key = f"{digest}:{module}:{int(is_package)}:{_SUMMARY_VERSION}"
+        self._used.add(key)
+        cached = self._cache.get(key)
+        if isinstance(cached, dict):
+            return ModuleSummary(imports=cached["imports"], functions=cached["functions"])
+        try:
+            summary = summarize_module(content, module, is_package)
+        except (SyntaxError, ValueError) as exc:
+            logger.debug(f"Cannot parse {path}: {exc}")
+            return None
+        self.parsed += 1
+        self._cache.set(key, summary)
+        return summary
+
+    def load(self) -> None:
+        """Index the project's modules by name (dependencies in virtual environments are skipped)."""
+        for path in self.context.files.rglob("*.py"):
+            rel = path.relative_to(self.root)
+            if VENDORED_DIRS.intersection(rel.parts):
+                continue
+            module, is_package = module_of(self.root, path)
+            if module:
+                self.files[module] = (path, is_package)
+                self.paths[module] = rel.as_posix()
+
+    def module(self, name: str) -> Optional[ModuleSummary]:
+        """Summary of the project module ``name``; parsed on first use, None when unknown or unparsable."""
+        if name not in self.modules:
+            summary = None
+            if name in self.files:
+                path, is_package = self.files[name]
+                summary = self.context.scan(
+                    "call_graph", path, partial(self._summary, module=name, is_package=is_package)
+                )
+            self.modules[name] = summary
+        return self.modules[name]
+
+    def add_entry_points(self, entries: Iterable[tuple[str, str]]) -> None:
+        """Treat ``(module, function)`` pairs (v1 ``scriptFile``/``entryPoint``) as handlers."""
+        self.entry_points.update(entries)
+
+    def handlers(self, async_only: bool = False) -> list[tuple[str, str]]:
+        """``(module, function)`` of every handler; files without decorators or ``async def`` are not parsed."""
+        entry_modules = {module for module, _ in self.entry_points}
+        found: list[tuple[str, str]] = []
+        for module in sorted(self.files):
+            if module not in entry_modules:
+                decorated, has_async = self.context.scan(
+                    "call_graph_handlers", self.files[module][0], partial(_handler_markers, self.context)
+                )
+                if not decorated or (async_only and not has_async):
+                    continue
+            summary = self.module(module)
+            if summary is None:
+                continue
+            found.extend(
+                (module, name)
+                for name, (_, is_async, is_handler, _, _) in summary["functions"].items()
+                if (is_async or not async_only) and (is_handler or (module, name) in self.entry_points)
+            )
+        return found
+
+    def resolve(
+        self, module: str, summary: ModuleSummary, function: str, call: str
+    ) -> tuple[str, Optional[tuple[str, str]]]:
+        """The qualified name of ``call`` made in ``module.function`` and the project function it refers to."""
+        head, _, rest = call.partition(".")
+        scope = function.rsplit(".", 1)[0] if "." in function else ""
+        functions = summary["functions"]
+        if head in ("self", "cls") and rest and scope:
+            method = f"{scope}.{rest}"
+            return f"{module}.{method}", (module, method) if method in functions else None
+        for local in (f"{function}.{call}", f"{scope}.{call}" if scope else "", call):
+            for name in (local, f"{local}.__init__") if local else ():
+                if name in functions:
+                    return f"{module}.{local}", (module, name)
+        qualified = f"{summary['imports'][head]}.{rest}".rstrip(".") if head in summary["imports"] else call
+        # Longest project module prefix, the remainder is the function's (or class's) qualified name
+        parts = qualified.split(".")
+        for cut in range(len(parts) - 1, 0, -1):
+            target = ".".join(parts[:cut])
+            if target in self.files:
+                found = self.module(target)
+                local = ".".join(parts[cut:])
+                for name in (local, f"{local}.__init__"):
+                    if found is not None and name in found["functions"]:
+                        return qualified, (target, name)
+                break
+        return qualified, None
+
+    def walk(
+        self, module: str, handler: str, follow: Optional[Callable[[FunctionSummary], bool]] = None
+    ) -> Iterator[ExternalCall]:
+        """
+        Calls leaving the project that are reachable from ``module.handler``, each with its call chain.
+
+        Project functions are entered once; ``follow`` can keep the walk out of
+        some of them (it is not consulted for the handler itself).
+        """
+        seen = {(module, handler)}
+        stack: list[tuple[str, str, list[str]]] = [(module, handler, [])]
+        while stack:
+            current, function, chain = stack.pop()
+            summary = self.modules.get(current)
+            if summary is None:
+                continue
+            line, calls = summary["functions"][function][0], summary["functions"][function][3]
+            here = chain or [f"{self.paths[current]}:{line} {function}"]
+            for call, call_line in calls:
+                qualified, target = self.resolve(current, summary, function, call)
+                step = [*here, f"{self.paths[current]}:{call_line} {call}"]
+                if target is None:
+                    yield {"call": qualified, "chain": step}
+                elif target not in seen:
+                    seen.add(target)
+                    entered = self.modules[target[0]]
+                    if follow is None or (entered is not None and follow(entered["functions"][target[1]])):
+                        stack.append((target[0], target[1], step))
+
+    def save(self) -> None:
+        """Persist newly parsed summaries, dropping unused entries once the cache outgrows its cap."""
+        if not self.parsed:
+            return
+        data = self._cache.data()
+        if len(data) > _MAX_CACHE_ENTRIES:
+            for key in [key for key in data if key not in self._used]:
+                self._cache.pop(key)
+        self._cache.save()
+
+
+def load_call_graph(root: Path, context: ProjectContext) -> CallGraph:
+    """The project's call graph with v1 ``function.json`` entry points registered as handlers."""
+    graph = CallGraph(root, context)
+    graph.load()
+    graph.add_entry_points(v1_entry_points(root, context))
+    return graph
@@ -0,0 +1,220 @@
+"""
+Changed-files-only runs driven by local git state.
+
+A pre-commit hook usually touches a handful of files, yet a full run re-walks the
+tree for every rule that scans project sources. In changed-only mode the doctor
+asks local git which paths changed, re-runs the tree-scanning rules whose inputs
+(see :func:`azure_functions_doctor.handlers.rule_inputs`) match those paths and
+reports the last known result for the rest. Rules that do not scan the tree
+(environment, PATH, single-file checks) are cheap and always re-run, which also
+covers inputs git does not track such as ``local.settings.json``. Tree-scanning
+rules whose inputs git never reports (ignored paths, installed packages) always
+re-run as well.
+
+Affected source-scanning rules still enumerate the tree, but per-file scan
+verdicts are persisted too (see ``ProjectContext.scan``), so only files whose
+size or mtime changed are read again.
+
+Reused results are only trusted while nothing could have changed them unseen:
+each run records ``HEAD`` and a signature (size, mtime) of every dirty path, and
+the next run also re-checks paths committed since that ``HEAD`` and dirty paths
+whose signature differs. Without a usable record the run falls back to all rules.
+"""
+
+import hashlib
+import json
+import subprocess
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from azure_functions_doctor import __version__
+from azure_functions_doctor.cache import JsonCache, file_signature
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.files import matches_rglob
+from azure_functions_doctor.handlers import Rule, rule_inputs
+from azure_functions_doctor.logging_config import get_logger
+from azure_functions_doctor.results import CheckResult, Section
+
+logger = get_logger(__name__)
+
+# Handler types that enumerate the project tree; only these are worth skipping
+_TREE_SCANNING_TYPES = frozenset(
+    {
+        "source_code_contains",
+        "conditional_exists",
+        "callable_detection",
+        "file_glob_check",
+        "binding_validation",
+        "cron_validation",
+        "deploy_size",
+        "cold_start_import",
+        "cold_start_memory",
+        "async_blocking_io",
+        "client_per_invocation",
+        "host_json_audit",
+        "dist_footprint",
+    }
+)
+# Tree-scanning types whose inputs include paths git never reports, such as ignored build output or
+# virtual environments (``file_glob_check`` looks for ``.venv`` and ``__pycache__``; ``deploy_size``
+# measures everything ``.funcignore`` keeps, including gitignored ``.python_packages``), and measurements
+# that depend on the installed dependencies (``cold_start_import`` and ``cold_start_memory`` import the
+# app, ``dist_footprint`` reads site-packages). Their results cannot be vouched for by git state, so they
+# always re-run.
+_UNREPORTED_INPUT_TYPES = frozenset(
+    {"file_glob_check", "deploy_size", "cold_start_import", "cold_start_memory", "dist_footprint"}
+)
+# Git's well-known empty tree, used as the diff base before the first commit
+_EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+_GIT_TIMEOUT_SECONDS = 10
+
+
+class GitError(RuntimeError):
+    """Raised when git is unavailable or the project is not inside a work tree."""
+
+
+def _git(root: Path, *args: str, missing_ok: bool = False) -> list[str]:
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=root,
+            capture_output=True,
+            check=True,
+            timeout=_GIT_TIMEOUT_SECONDS,
+        )
+    except FileNotFoundError as exc:
+        raise GitError("git executable not found") from exc
+    except subprocess.CalledProcessError as exc:
+        if missing_ok and exc.returncode == 1 and not exc.stderr:
+            return []
+        raise GitError(exc.stderr.decode("utf-8", errors="replace").strip() or f"git {args[0]} failed") from exc
+    except subprocess.TimeoutExpired as exc:
+        raise GitError(f"git {args[0]} timed out") from exc
+    return [p for p in completed.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p]
+
+
+def git_head(root: Path) -> Optional[str]:
+    """Commit id of ``HEAD``, or None in a repository without commits."""
+    # Exit status 1 without output means "no such ref"; outside a repository git exits with 128
+    found = _git(root, "rev-parse", "--verify", "-q", "HEAD", missing_ok=True)
+    return found[0].strip() if found else None
+
+
+def diff_paths(root: Path, *revisions: str) -> set[str]:
+    """Paths under ``root`` (relative to it) that differ for ``git diff <revisions>``."""
+    return set(_git(root, "diff", "--name-only", "--relative", "--no-renames", "-z", *revisions))
+
+
+def dirty_paths(root: Path, head: Optional[str]) -> set[str]:
+    """Staged, unstaged and untracked (not ignored) paths relative to ``root``."""
+    untracked = _git(root, "ls-files", "-z", "--others", "--exclude-standard")
+    return diff_paths(root, head or _EMPTY_TREE) | set(untracked)
+
+
+def _rules_digest(rules: list[Rule]) -> str:
+    payload = json.dumps([__version__, rules], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _reusable(rule: Rule) -> bool:
+    check_type = rule.get("type")
+    return check_type in _TREE_SCANNING_TYPES and check_type not in _UNREPORTED_INPUT_TYPES
+
+
+def _affected(rule: Rule, changed: set[str]) -> bool:
+    return any(matches_rglob(pattern, rel) for rel in changed for pattern in rule_inputs(rule))
+
+
+class ChangedOnlyRun:
+    """Outcome of a changed-only run, with counters for reporting."""
+
+    def __init__(self, results: list[Section], changed: set[str], ran: int, reused: int, full: bool) -> None:
+        self.results = results
+        self.changed = changed
+        self.ran = ran
+        self.reused = reused
+        self.full = full
+
+
+def run_changed_only(
+    path: str,
+    base: Optional[str] = None,
+    staged: bool = False,
+    jobs: Optional[int] = None,
+    fail_fast: bool = False,
+    only: Sequence[str] = (),
+    skip: Sequence[str] = (),
+) -> ChangedOnlyRun:
+    """
+    Run only rules affected by git-reported changes, merging last known results for the rest.
+
+    ``staged`` selects paths staged in the index; ``base`` selects paths that
+    differ between the working tree and that ref; by default every uncommitted
+    change (including untracked files) is selected. ``jobs``, ``fail_fast``,
+    ``only`` and ``skip`` are passed to :meth:`Doctor.run_all_checks`. Raises :class:`GitError`
+    when the project is not in a git work tree.
+    """
+    root = Path(path).resolve()
+    head = git_head(root)
+    dirty = {rel: file_signature(root / rel) for rel in dirty_paths(root, head)}
+    if staged:
+        changed = diff_paths(root, "--cached", head or _EMPTY_TREE)
+    elif base:
+        changed = diff_paths(root, base)
+    else:
+        changed = set(dirty)
+
+    cache = JsonCache("results")
+    record: Any = cache.get(str(root))
+    reusable = isinstance(record, dict) and isinstance(record.get("results"), dict)
+    if reusable:
+        # Anything that may have changed since the recorded run must be re-checked too
+        recorded_dirty = record.get("dirty") if isinstance(record.get("dirty"), dict) else {}
+        changed |= {rel for rel in set(dirty) | set(recorded_dirty) if dirty.get(rel) != recorded_dirty.get(rel)}
+        if record.get("head") != head:
+            try:
+                changed |= diff_paths(root, record.get("head") or _EMPTY_TREE, head or _EMPTY_TREE)
+            except GitError as exc:
+                logger.debug(f"Cannot diff against recorded HEAD, running all rules: {exc}")
+                reusable = False
+
+    model: Optional[str] = None
+    if reusable and not any(matches_rglob("function.json", rel) for rel in changed):
+        model = record.get("model")
+    doctor = Doctor(str(root), allow_v1=True, programming_model=model)
+    rules = doctor.load_rules(only, skip)
+    digest = _rules_digest(rules)
+    if reusable and (record.get("model") != doctor.programming_model or record.get("rules") != digest):
+        reusable = False
+
+    memo = record.get("scans") if reusable else None
+    if isinstance(memo, dict):
+        doctor.context.scan_memo = memo
+
+    reuse: dict[str, CheckResult] = {}
+    if reusable:
+        previous = record["results"]
+        for rule in rules:
+            if _reusable(rule) and rule["id"] in previous and not _affected(rule, changed):
+                reuse[rule["id"]] = previous[rule["id"]]
+
+    results = doctor.run_all_checks(reuse=reuse, jobs=jobs, fail_fast=fail_fast, only=only, skip=skip)
+
+    scanned_ids = {rule["id"] for rule in rules if _reusable(rule)}
+    cache.set(
+        str(root),
+        {
+            "head": head,
+            "dirty": dirty,
+            "model": doctor.programming_model,
+            "rules": digest,
+            "scans": doctor.context.scan_memo,
+            "results": {
+                item.id: item.to_dict() for section in results for item in section.checks if item.id in scanned_ids
+            },
+        },
+    )
+    cache.save()
+    # Fail-fast runs may stop before every rule ran
+    ran = sum(len(section.checks) for section in results) - len(reuse)
+    return ChangedOnlyRun(results, changed, ran=ran, reused=len(reuse), full=not reusable)
@@ -1,8 +1,9 @@
 import json
 import os
+import sys
 import time
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import TYPE_CHECKING, Annotated, Any, Optional
 
 import typer
 from rich.console import Console
@@ -15,8 +16,13 @@ from azure_functions_doctor.logging_config import (
     log_diagnostic_start,
     setup_logging,
 )
+from azure_functions_doctor.results import to_dicts
+from azure_functions_doctor.rule_schema import RuleValidationError
 from azure_functions_doctor.utils import format_detail, format_status_icon
 
+if TYPE_CHECKING:
+    from azure_functions_doctor.baseline import BaselineIndex
+
 cli = typer.Typer()
 console = Console()
 logger = get_logger(__name__)
@@ -71,6 +77,37 @@ def doctor(
     debug: Annotated[bool, typer.Option(help="Enable debug logging")] = False,
     format: Annotated[str, typer.Option(help="Output format: 'table' or 'json'")] = "table",
     output: Annotated[Optional[Path], typer.Option(help="Optional path to save JSON result")] = None,
+    changed_only: Annotated[
+        bool, typer.Option("--changed-only", help="Only re-run rules whose inputs changed according to git")
+    ] = False,
+    base: Annotated[Optional[str], typer.Option(help="With --changed-only: compare the working tree to REF")] = None,
+    staged: Annotated[bool, typer.Option("--staged", help="With --changed-only: use staged changes only")] = False,
+    baseline: Annotated[
+        Optional[Path],
+        typer.Option(help="Previous JSON report; print only differences and fail only on new failures"),
+    ] = None,
+    jobs: Annotated[
+        Optional[int], typer.Option(min=1, help="Run rules on N threads, longest (by learned timings) first")
+    ] = None,
+    fail_fast: Annotated[
+        bool, typer.Option("--fail-fast", help="Run cheapest rules first and stop at the first required failure")
+    ] = False,
+    only: Annotated[
+        Optional[list[str]],
+        typer.Option(help="Run only rules matching an id, section, category or handler type (repeatable, globs)"),
+    ] = None,
+    skip: Annotated[Optional[list[str]], typer.Option(help="Skip rules matching a selector (repeatable)")] = None,
+    sections: Annotated[
+        Optional[list[str]], typer.Option("--section", help="Shorthand for --only SECTION (repeatable)")
+    ] = None,
+    shard: Annotated[
+        Optional[str],
+        typer.Option(help="Run only shard K of N (K/N) and emit a partial JSON report for 'merge'"),
+    ] = None,
+    tracked_only: Annotated[
+        bool,
+        typer.Option("--tracked-only", help="In a git work tree, list only files tracked in the git index"),
+    ] = False,
 ) -> None:
     """
     Run diagnostics on an Azure Functions application.
@@ -81,9 +118,44 @@ def doctor(
         debug: Enable debug logging to stderr.
         format: Output format: 'table' or 'json'.
         output: Optional file path to save JSON result.
+        changed_only: Re-run only rules affected by changed files and reuse the last results for the rest.
+        base: Git ref to diff the working tree against in changed-only mode.
+        staged: Use staged changes in changed-only mode.
+        baseline: Previous JSON report to diff against.
+        jobs: Number of rule worker threads.
+        fail_fast: Stop at the first required failure.
+        only: Rule selectors to run.
+        skip: Rule selectors to leave out.
+        sections: Sections to run.
+        shard: ``K/N`` shard of the rules to run; implies JSON output.
+        tracked_only: Skip untracked files when the file listing comes from the git index.
     """
     # Validate inputs before proceeding
     _validate_inputs(path, format, output)
+    if (base or staged) and not changed_only:
+        raise typer.BadParameter("--base and --staged require --changed-only")
+    if base and staged:
+        raise typer.BadParameter("--base and --staged are mutually exclusive")
+    shard_spec = None
+    if shard is not None:
+        from azure_functions_doctor.shard import ShardError, parse_shard
+
+        if changed_only or baseline is not None or fail_fast:
+            raise typer.BadParameter("--shard cannot be combined with --changed-only, --baseline or --fail-fast")
+        try:
+            shard_spec = parse_shard(shard)
+        except ShardError as e:
+            raise typer.BadParameter(str(e)) from e
+    only_selectors = _split_selectors((only or []) + (sections or []))
+    skip_selectors = _split_selectors(skip or [])
+    baseline_index = None
+    if baseline is not None:
+        from azure_functions_doctor.baseline import BaselineIndex
+
+        try:
+            baseline_index = BaselineIndex.load(baseline)
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(f"Cannot read baseline {baseline}: {e}") from e
 
     # Configure logging based on CLI flags
     if debug:
@@ -93,15 +165,57 @@ def doctor(
         setup_logging(level=None, format_style="simple")
 
     start_time = time.time()
-    # Allow v1 projects when invoked from CLI so we can show warning but continue
-    doctor = Doctor(path, allow_v1=True)
     resolved_path = Path(path).resolve()
+    changed_run = None
+    partial = None
+    try:
+        if changed_only:
+            from azure_functions_doctor.changes import GitError, run_changed_only
 
-    # Log diagnostic start
-    rules = doctor.load_rules()
-    log_diagnostic_start(str(resolved_path), len(rules))
-
-    results = doctor.run_all_checks()
+            try:
+                changed_run = run_changed_only(
+                    path,
+                    base=base,
+                    staged=staged,
+                    jobs=jobs,
+                    fail_fast=fail_fast,
+                    only=only_selectors,
+                    skip=skip_selectors,
+                )
+            except GitError as e:
+                logger.warning(f"--changed-only unavailable ({e}); running all rules")
+
+        if changed_run is not None:
+            log_diagnostic_start(str(resolved_path), changed_run.ran)
+            results = changed_run.results
+        else:
+            # Allow v1 projects when invoked from CLI so we can show warning but continue
+            doctor = Doctor(path, allow_v1=True, tracked_only=tracked_only)
+
+            # Log diagnostic start
+            rules = doctor.load_rules(only_selectors, skip_selectors)
+            if not rules:
+                raise typer.BadParameter("No rules match the --only/--skip/--section selection")
+            rule_ids = None
+            if shard_spec is not None:
+                from azure_functions_doctor.scheduler import RuleTimings
+                from azure_functions_doctor.shard import plan_rules
+
+                plan, strategy = plan_rules(rules, shard_spec[1], RuleTimings(doctor.project_path))
+                rule_ids = {rule["id"] for rule in plan if rule["shard"] == shard_spec[0]}
+            log_diagnostic_start(str(resolved_path), len(rules) if rule_ids is None else len(rule_ids))
+
+            results = doctor.run_all_checks(
+                jobs=jobs, fail_fast=fail_fast, only=only_selectors, skip=skip_selectors, rule_ids=rule_ids
+            )
+            if shard_spec is not None:
+                from azure_functions_doctor.shard import partial_report
+
+                partial = partial_report(shard_spec[0], shard_spec[1], strategy, plan, results)
+    except RuleValidationError as e:
+        console.print(f"[red]{format_status_icon('fail')} {e}[/red]")
+        logger.error(str(e))
+        raise typer.Exit(2) from e
 
     # Calculate execution metrics
     end_time = time.time()
@@ -135,8 +249,12 @@ def doctor(
             else:
                 warning_count += 1  # unknown treated as warning
 
-    if format == "json":
-        json_output = results
+    if baseline_index is not None:
+        _report_baseline_diff(baseline_index, results, format, output)
+        return
+
+    if format == "json" or partial is not None:
+        json_output: Any = to_dicts(results) if partial is None else partial
         if output:
             try:
                 output.write_text(json.dumps(json_output, indent=2), encoding="utf-8")
@@ -158,6 +276,12 @@ def doctor(
     # Table-format user-facing output (requested design)
     console.print("Azure Functions Doctor   ")
     console.print(f"Path: {resolved_path}")
+    if changed_run is not None:
+        scope = "no reusable results" if changed_run.full else f"{changed_run.reused} reused"
+        changed_count = len(changed_run.changed)
+        console.print(
+            f"[dim]Changed only: {changed_count} changed path(s), {changed_run.ran} rule(s) run, {scope}[/dim]"
+        )
 
     # Print each section with simple title and items
     for section in results:
@@ -205,6 +329,517 @@ def doctor(
         raise typer.Exit(exit_code)
 
 
+def _split_selectors(values: list[str]) -> list[str]:
+    """Flatten repeated and comma-separated selector options."""
+    return [part.strip() for value in values for part in value.split(",") if part.strip()]
+
+
+def _report_baseline_diff(
+    baseline_index: "BaselineIndex", results: list[Any], format: str, output: Optional[Path]
+) -> None:
+    """Print differences from the baseline and exit non-zero only on new failures."""
+    diff = baseline_index.diff(results)
+    if output:
+        # Save the full results so the report can serve as the next baseline
+        try:
+            output.write_text(json.dumps(to_dicts(results), indent=2), encoding="utf-8")
+        except OSError as e:
+            console.print(f"[red]{format_status_icon('fail')} Failed to write output file:[/red] {e}")
+            raise typer.Exit(1) from e
+
+    if format == "json":
+        print(json.dumps(diff.to_dict(), indent=2))
+        raise typer.Exit(diff.exit_code)
+
+    groups = (("New failures", diff.new_failures), ("Fixed", diff.fixed), ("Changed", diff.changed))
+    for title, changes in groups:
+        if not changes:
+            continue
+        console.print()
+        console.print(title)
+        for change in changes:
+            status = change.get("status", "fail")
+            line = Text.assemble((f"[{format_status_icon(status)}] ", "bold"), (change.get("label", ""), "dim"))
+            if change.get("value"):
+                line.append(": ")
+                line.append(format_detail(status, change.get("value", "")))
+            if "previous_status" in change and change["previous_status"] != status:
+                line.append(f" ({change['previous_status']} -> {status})", "italic dim")
+            console.print(line)
+    console.print()
+    console.print(
+        f"Baseline diff: {len(diff.new_failures)} new failures, {len(diff.fixed)} fixed, "
+        f"{len(diff.changed)} changed, {diff.unchanged} unchanged"
+    )
+    if diff.exit_code:
+        raise typer.Exit(diff.exit_code)
+
+
+@cli.command(name="merge")
+def merge(
+    partials: Annotated[list[Path], typer.Argument(help="Partial reports written by doctor --shard K/N", exists=True)],
+    output: Annotated[Optional[Path], typer.Option(help="Optional path to save the merged JSON result")] = None,
+) -> None:
+    """
+    Merge the partial reports of a sharded run into one JSON report.
+
+    Every shard of the same plan must be given exactly once. The result has the
+    same layout as `doctor --format json` on a single node. Exits with 1 when the
+    merged report contains failures.
+    """
+    from azure_functions_doctor.shard import merge_partials
+
+    try:
+        results = merge_partials([json.loads(path.read_text(encoding="utf-8")) for path in partials])
+    except (OSError, ValueError) as e:
+        # ShardError is a ValueError, as are JSON decoding errors
+        console.print(f"[red]{format_status_icon('fail')} Merge failed:[/red] {e}")
+        raise typer.Exit(2) from e
+    text = json.dumps(results, indent=2)
+    if output:
+        output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    raise typer.Exit(1 if any(item.get("status") == "fail" for s in results for item in s["items"]) else 0)
+
+
+@cli.command(name="serve")
+def serve(
+    socket_path: Annotated[
+        Optional[Path], typer.Option("--socket", help="Unix socket path (default: FUNC_DOCTOR_DAEMON_SOCKET)")
+    ] = None,
+    max_projects: Annotated[
+        Optional[int], typer.Option(help="Number of project roots kept warm before LRU eviction")
+    ] = None,
+    poll_interval: Annotated[Optional[float], typer.Option(help="Seconds between file change polls")] = None,
+    debug: Annotated[bool, typer.Option(help="Enable debug logging")] = False,
+) -> None:
+    """
+    Run a long-lived daemon that keeps rules and project state warm.
+
+    Query it with `fdoctor-client [PATH]`, which returns results over a Unix socket
+    without re-importing the CLI or re-walking unchanged projects.
+    """
+    from azure_functions_doctor.daemon import DoctorDaemon
+
+    setup_logging(level="DEBUG" if debug else "INFO", format_style="structured" if debug else "simple")
+    daemon = DoctorDaemon(socket_path=socket_path, max_projects=max_projects, poll_interval=poll_interval)
+    console.print(f"Serving diagnostics on {daemon.socket_path} (Ctrl+C to stop)")
+    try:
+        daemon.serve_forever()
+    except RuntimeError as e:
+        console.print(f"[red]{format_status_icon('fail')} {e}[/red]")
+        raise typer.Exit(1) from e
+    except KeyboardInterrupt:
+        daemon.shutdown()
+
+
+@cli.command(name="aggregate")
+def aggregate(
+    reports: Annotated[list[Path], typer.Argument(help="JSON reports (optionally gzipped) to load", exists=True)],
+    db: Annotated[Path, typer.Option(help="SQLite database to create or extend")] = Path("fleet.sqlite"),
+    app_pattern: Annotated[
+        Optional[str], typer.Option(help="Regex with an 'app' group matched against each report path")
+    ] = None,
+) -> None:
+    """
+    Load `doctor --format json` reports from many apps into a SQLite database.
+
+    Reports already present in the database are skipped. Query the result with
+    `azure-functions fleet-report`.
+    """
+    from azure_functions_doctor.aggregate import ingest_reports
+
+    try:
+        stats = ingest_reports(db, reports, app_pattern=app_pattern)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]{format_status_icon('fail')} Aggregation failed:[/red] {e}")
+        raise typer.Exit(1) from e
+    console.print(
+        f"Loaded {stats.runs} run(s) ({stats.results} results) from {stats.files} file(s) into {db}"
+        + (f"; {stats.skipped_runs} already present" if stats.skipped_runs else "")
+    )
+
+
+@cli.command(name="fleet-report")
+def fleet_report(
+    query: Annotated[str, typer.Argument(help="Built-in query: most-failed, slowest or regressions")],
+    db: Annotated[Path, typer.Option(help="SQLite database written by `aggregate`", exists=True)] = Path(
+        "fleet.sqlite"
+    ),
+    since: Annotated[Optional[str], typer.Option(help="ISO date for the regressions query")] = None,
+    limit: Annotated[int, typer.Option(help="Maximum rows for ranking queries")] = 20,
+    format: Annotated[str, typer.Option(help="Output format: 'table' or 'json'")] = "table",
+) -> None:
+    """Run a built-in query against an aggregated fleet database."""
+    from azure_functions_doctor.aggregate import connect, most_failed_rules, regressions_since, slowest_rules
+
+    if format not in ("table", "json"):
+        raise typer.BadParameter(f"Invalid format: {format}. Must be 'table' or 'json'")
+    conn = connect(db)
+    try:
+        if query == "most-failed":
+            rows = most_failed_rules(conn, limit)
+        elif query == "slowest":
+            rows = slowest_rules(conn, limit)
+        elif query == "regressions":
+            if not since:
+                raise typer.BadParameter("--since is required for the regressions query")
+            try:
+                rows = regressions_since(conn, since)
+            except ValueError as e:
+                raise typer.BadParameter(f"Invalid --since value: {since}") from e
+        else:
+            raise typer.BadParameter(f"Unknown query: {query}. Use most-failed, slowest or regressions")
+    finally:
+        conn.close()
+
+    if format == "json":
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        console.print("No rows")
+        return
+    columns = list(rows[0])
+    console.print("  ".join(columns), style="bold")
+    for row in rows:
+        console.print("  ".join(str(row[c]) for c in columns), markup=False)
+
+
+@cli.command(name="size")
+def size(
+    path: Annotated[str, typer.Option(help="Path to your Azure Functions project")] = ".",
+    format: Annotated[str, typer.Option(help="Output format: 'table' or 'json'")] = "table",
+    top: Annotated[int, typer.Option(help="Number of largest files and directories to list")] = 10,
+    max_bytes: Annotated[Optional[int], typer.Option(help="Fail when the package exceeds this many bytes")] = None,
+    max_files: Annotated[Optional[int], typer.Option(help="Fail when the package exceeds this many files")] = None,
+) -> None:
+    """
+    Report the size of the deployment package, honoring .funcignore.
+
+    Lists totals, the largest files and directories and a breakdown by file
+    extension. Exits with 1 when a --max-bytes or --max-files budget is exceeded.
+    """
+    from azure_functions_doctor.deploy_size import format_bytes, measure_deployment, over_budget
+
+    if format not in ("table", "json"):
+        raise typer.BadParameter(f"Invalid format: {format}. Must be 'table' or 'json'")
+    if not Path(path).is_dir():
+        raise typer.BadParameter(f"Path is not a directory: {path}")
+
+    report = measure_deployment(Path(path), top=top)
+    problems = over_budget(report, max_bytes, max_files)
+    if format == "json":
+        print(json.dumps({**report, "over_budget": problems}, indent=2))
+    else:
+        console.print(f"[bold]Deployment package:[/bold] {report['root']}")
+        console.print(f"  {format_bytes(report['total_bytes'])} in {report['file_count']} files")
+        listings = (("Largest directories", report["largest_directories"]), ("Largest files", report["largest_files"]))
+        for title, entries in listings:
+            if entries:
+                console.print(f"\n[bold]{title}[/bold]")
+                for entry in entries:
+                    console.print(f"  {format_bytes(entry['bytes']):>10}  {entry['path']}", markup=False)
+        if report["extensions"]:
+            console.print("\n[bold]By extension[/bold]")
+            for ext in report["extensions"][:top]:
+                console.print(
+                    f"  {format_bytes(ext['bytes']):>10}  {ext['files']:>7} files  {ext['extension']}", markup=False
+                )
+        for problem in problems:
+            console.print(f"\n[red]{format_status_icon('fail')} Over budget:[/red] {problem}")
+    if problems:
+        raise typer.Exit(1)
+
+
+@cli.command(name="footprint")
+def footprint(
+    path: Annotated[str, typer.Option(help="Path to your Azure Functions project")] = ".",
+    site_packages: Annotated[
+        Optional[str],
+        typer.Option(help="site-packages directory to read (default: .python_packages or the project's venv)"),
+    ] = None,
+    format: Annotated[str, typer.Option(help="Output format: 'table' or 'json'")] = "table",
+    top: Annotated[int, typer.Option(help="Number of largest distributions to list")] = 20,
+    max_bytes: Annotated[
+        Optional[int], typer.Option(help="Fail when a top-level requirement installs more than this many bytes")
+    ] = None,
+) -> None:
+    """
+    Report the installed size of every distribution, by top-level requirement.
+
+    Reads each distribution's RECORD in .python_packages or the project's
+    virtual environment and attributes it to the requirements.txt entries that
+    pull it in. Exits with 1 when a requirement exceeds --max-bytes.
+    """
+    from azure_functions_doctor.deploy_size import format_bytes
+    from azure_functions_doctor.dist_footprint import heavy_requirements, measure_footprint
+
+    if format not in ("table", "json"):
+        raise typer.BadParameter(f"Invalid format: {format}. Must be 'table' or 'json'")
+    if not Path(path).is_dir():
+        raise typer.BadParameter(f"Path is not a directory: {path}")
+
+    report = measure_footprint(Path(path), site=Path(site_packages) if site_packages else None, top=top)
+    if report is None:
+        console.print("No installed packages found; create .python_packages or a virtual environment first")
+        raise typer.Exit(1)
+    problems = heavy_requirements(report, max_bytes) if max_bytes is not None else []
+    if format == "json":
+        print(json.dumps({**report, "over_budget": problems}, indent=2))
+    else:
+        console.print(f"[bold]Installed packages:[/bold] {report['site_packages']}")
+        console.print(
+            f"  {format_bytes(report['total_bytes'])} in {report['file_count']} files, "
+            f"{format_bytes(report['native_bytes'])} native extensions"
+        )
+        if report["requirements"]:
+            console.print("\n[bold]By top-level requirement[/bold]")
+            for requirement in report["requirements"]:
+                heaviest = ", ".join(requirement["distributions"][:3])
+                console.print(
+                    f"  {format_bytes(requirement['bytes']):>10}  {requirement['requirement']}  ({heaviest})",
+                    markup=False,
+                )
+        if report["distributions"]:
+            console.print("\n[bold]Largest distributions[/bold]")
+            for dist in report["distributions"]:
+                via = f"  via {', '.join(dist['required_by'])}" if dist["required_by"] else ""
+                console.print(
+                    f"  {format_bytes(dist['bytes']):>10}  {format_bytes(dist['native_bytes']):>10} native  "
+                    f"{dist['name']} {dist['version']}{via}",
+                    markup=False,
+                )
+        unattributed = report["unattributed"]
+        if unattributed:
+            more = f", ... ({len(unattributed)} in total)" if len(unattributed) > 10 else ""
+            console.print(f"\nNot required by requirements.txt: {', '.join(unattributed[:10])}{more}", markup=False)
+        for problem in problems:
+            console.print(f"\n[red]{format_status_icon('fail')} Over budget:[/red] {problem}")
+    if problems:
+        raise typer.Exit(1)
+
+
+@cli.command(name="coldstart")
+def coldstart(
+    path: Annotated[str, typer.Option(help="Path to your Azure Functions project")] = ".",
+    runs: Annotated[int, typer.Option(min=1, help="Number of fresh interpreter runs")] = 5,
+    python: Annotated[
+        Optional[str], typer.Option(help="Interpreter to profile with (default: the project's virtual environment)")
+    ] = None,
+    static: Annotated[
+        bool, typer.Option("--static", help="Estimate from the import graph without executing the app")
+    ] = False,
+    top: Annotated[int, typer.Option(help="Number of heaviest imports to list")] = 10,
+    max_ms: Annotated[Optional[float], typer.Option(help="Fail when import time exceeds this many ms")] = None,
+    format: Annotated[str, typer.Option(help="Output format: 'table' or 'json'")] = "table",
+) -> None:
+    """
+    Profile the app's import time, the local part of cold start.
+
+    Imports function_app.py (or every v1 scriptFile) in fresh interpreters with
+    `-X importtime` and reports p50/p95 and the heaviest top-level imports. This
+    executes the app's module-level code; with --static the import graph is
+    parsed and weighed instead, ranking the import lines by the code they pull in.
+    Exits with 1 when --max-ms (p95, or the estimate) is exceeded or the app fails to import.
+    """
+    from azure_functions_doctor.coldstart import ColdStartError, profile_imports
+    from azure_functions_doctor.import_graph import analyze_imports
+
+    if format not in ("table", "json"):
+        raise typer.BadParameter(f"Invalid format: {format}. Must be 'table' or 'json'")
+    if not Path(path).is_dir():
+        raise typer.BadParameter(f"Path is not a directory: {path}")
+
+    try:
+        if static:
+            estimate = analyze_imports(Path(path), top=top)
+            measured = estimate["estimated_ms"]
+            data: dict[str, Any] = dict(estimate)
+        else:
+            report = profile_imports(Path(path), runs=runs, python=python, top=top)
+            measured = report["p95_ms"]
+            data = dict(report)
+    except ColdStartError as e:
+        console.print(f"[red]{format_status_icon('fail')} {e}[/red]")
+        raise typer.Exit(1) from e
+    over = max_ms is not None and measured > max_ms
+    if format == "json":
+        print(json.dumps({**data, "over_budget": over}, indent=2))
+    elif static:
+        console.print(f"[bold]Estimated import cost:[/bold] {', '.join(estimate['entry_modules'])}")
+        console.print(
+            f"  ~{estimate['estimated_ms']:.1f} ms for {estimate['modules']} modules"
+            f" ({estimate['native']} native), {estimate['bytes'] / 1024:.0f} KiB on disk"
+        )
+        if estimate["lines"]:
+            console.print("\n[bold]Heaviest import lines[/bold]")
+            for line in estimate["lines"]:
+                console.print(
+                    f"  {line['estimated_ms']:>8.1f} ms {line['modules']:>5} modules  "
+                    f"{line['file']}:{line['line']}  {line['statement']}",
+                    markup=False,
+                )
+        if estimate["unresolved"]:
+            console.print(f"\n[yellow]Unresolved imports:[/yellow] {', '.join(estimate['unresolved'])}")
+    else:
+        console.print(f"[bold]Import time:[/bold] {', '.join(report['entry_modules'])} ({report['python']})")
+        console.print(f"  p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms over {report['runs']} runs")
+        if report["heaviest"]:
+            console.print("\n[bold]Heaviest top-level imports[/bold]")
+            for cost in report["heaviest"]:
+                console.print(f"  {cost['ms']:>9.1f} ms  {cost['module']}", markup=False)
+    if over and format != "json":
+        console.print(f"\n[red]{format_status_icon('fail')} Over budget:[/red] {measured:.1f} ms exceeds {max_ms:g} ms")
+    if over:
+        raise typer.Exit(1)
+
+
+@cli.command(name="memory")
+def memory(
+    path: Annotated[str, typer.Option(help="Path to your Azure Functions project")] = ".",
+    runs: Annotated[int, typer.Option(min=1, help="Number of fresh interpreter runs")] = 5,
+    python: Annotated[
+        Optional[str], typer.Option(help="Interpreter to profile with (default: the project's virtual environment)")
+    ] = None,
+    top: Annotated[int, typer.Option(help="Number of heaviest top-level modules to list")] = 10,
+    max_bytes: Annotated[
+        Optional[int], typer.Option(help="Fail when p95 peak RSS (or the Python heap without RSS) exceeds this")
+    ] = None,
+    format: Annotated[str, typer.Option(help="Output format: 'table' or 'json'")] = "table",
+) -> None:
+    """
+    Profile peak memory of importing the app.
+
+    Imports function_app.py (or every v1 scriptFile) in fresh interpreters and
+    reports p50/p95 peak RSS, the Python heap peak under tracemalloc, and the
+    top-level modules holding the most memory once imported. This executes the
+    app's module-level code. Exits with 1 when --max-bytes is exceeded or the app fails to import.
+    """
+    from azure_functions_doctor.coldstart import ColdStartError, profile_memory
+    from azure_functions_doctor.deploy_size import format_bytes
+
+    if format not in ("table", "json"):
+        raise typer.BadParameter(f"Invalid format: {format}. Must be 'table' or 'json'")
+    if not Path(path).is_dir():
+        raise typer.BadParameter(f"Path is not a directory: {path}")
+
+    try:
+        report = profile_memory(Path(path), runs=runs, python=python, top=top)
+    except ColdStartError as e:
+        console.print(f"[red]{format_status_icon('fail')} {e}[/red]")
+        raise typer.Exit(1) from e
+    measured = report["p95_rss_bytes"] if report["p95_rss_bytes"] is not None else report["p95_heap_bytes"]
+    over = max_bytes is not None and measured > max_bytes
+    if format == "json":
+        print(json.dumps({**report, "over_budget": over}, indent=2))
+    else:
+        console.print(f"[bold]Import memory:[/bold] {', '.join(report['entry_modules'])} ({report['python']})")
+        if report["p50_rss_bytes"] is not None and report["p95_rss_bytes"] is not None:
+            baseline = report["baseline_rss_bytes"]
+            console.print(
+                f"  Peak RSS  p50 {format_bytes(report['p50_rss_bytes'])}, p95 {format_bytes(report['p95_rss_bytes'])}"
+                + (f" (bare interpreter {format_bytes(baseline)})" if baseline is not None else "")
+            )
+        console.print(
+            f"  Peak heap p50 {format_bytes(report['p50_heap_bytes'])}, p95 {format_bytes(report['p95_heap_bytes'])}"
+            f" over {report['runs']} runs"
+        )
+        if report["heaviest"]:
+            console.print("\n[bold]Heaviest top-level modules[/bold]")
+            for entry in report["heaviest"]:
+                console.print(f"  {format_bytes(entry['bytes']):>10}  {entry['module']}", markup=False)
+    if over and format != "json":
+        console.print(
+            f"\n[red]{format_status_icon('fail')} Over budget:[/red] "
+            f"{format_bytes(measured)} exceeds {format_bytes(max_bytes or 0)}"
+        )
+    if over:
+        raise typer.Exit(1)
+
+
+@cli.command(name="index")
+def index(
+    path: Annotated[str, typer.Option(help="Path to your Azure Functions project")] = ".",
+    runs: Annotated[int, typer.Option(min=1, help="Number of fresh interpreter runs")] = 3,
+    python: Annotated[
+        Optional[str], typer.Option(help="Interpreter to index with (default: the project's virtual environment)")
+    ] = None,
+    stub: Annotated[
+        bool, typer.Option("--stub", help="Use the bundled azure.functions stub even if the package is installed")
+    ] = False,
+    max_ms: Annotated[
+        Optional[float], typer.Option(help="Fail when p95 import plus indexing time exceeds this many ms")
+    ] = None,
+    format: Annotated[str, typer.Option(help="Output format: 'table' or 'json'")] = "table",
+) -> None:
+    """
+    Simulate the Python worker indexing a v2 app.
+
+    Imports function_app.py (or PYTHON_SCRIPT_FILE_NAME) in fresh interpreters,
+    finds the top-level FunctionApp and builds its functions the way the worker
+    does at startup. Reports import and indexing time, functions per blueprint,
+    and registration errors. This executes the app's module-level code.
+    Exits with 1 on an import or indexing error, or when --max-ms is exceeded.
+    """
+    from azure_functions_doctor.coldstart import ColdStartError
+    from azure_functions_doctor.worker_index import simulate_indexing
+
+    if format not in ("table", "json"):
+        raise typer.BadParameter(f"Invalid format: {format}. Must be 'table' or 'json'")
+    if not Path(path).is_dir():
+        raise typer.BadParameter(f"Path is not a directory: {path}")
+
+    try:
+        report = simulate_indexing(Path(path), runs=runs, python=python, stub=stub)
+    except ColdStartError as e:
+        console.print(f"[red]{format_status_icon('fail')} {e}[/red]")
+        raise typer.Exit(1) from e
+    over = max_ms is not None and report["p95_ms"] > max_ms
+    if format == "json":
+        print(json.dumps({**report, "over_budget": over}, indent=2))
+    else:
+        console.print(f"[bold]Worker indexing:[/bold] {report['script']} with {report['library']} ({report['python']})")
+        console.print(
+            f"  import {report['import_ms']:.1f} ms + indexing {report['index_ms']:.1f} ms;"
+            f" p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms over {report['runs']} runs"
+        )
+        console.print(f"  {report['function_count']} functions")
+        if report["blueprints"]:
+            console.print("\n[bold]Functions per app or blueprint[/bold]")
+            for entry in report["blueprints"]:
+                console.print(f"  {entry['functions']:>6}  {entry['blueprint']}", markup=False)
+        for error in report["errors"]:
+            where = f" ({error['location']})" if error["location"] else ""
+            console.print(
+                f"\n[red]{format_status_icon('fail')} {error['stage'].capitalize()} error{where}:[/red] "
+                f"{error['type']}: {error['message']}"
+            )
+    if over and format != "json":
+        console.print(
+            f"\n[red]{format_status_icon('fail')} Over budget:[/red] {report['p95_ms']:.1f} ms exceeds {max_ms:g} ms"
+        )
+    if over or report["errors"]:
+        raise typer.Exit(1)
+
+
+@cli.command(name="lsp")
+def lsp(
+    debug: Annotated[bool, typer.Option(help="Enable debug logging (to stderr)")] = False,
+) -> None:
+    """
+    Run a Language Server Protocol server on stdio.
+
+    Editors receive doctor findings as diagnostics on host.json, function.json,
+    requirements.txt and function_app.py, updated from unsaved buffers as you type.
+    """
+    from azure_functions_doctor.lsp import LanguageServer
+
+    setup_logging(level="DEBUG" if debug else "WARNING", format_style="structured" if debug else "simple")
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer)
+    raise typer.Exit(server.serve())
+
+
 # Explicit command registration (test-friendly)
 cli.command()(doctor)
 
@@ -0,0 +1,88 @@
+"""
+Thin client for the diagnostics daemon.
+
+This module deliberately imports only the standard library and the lightweight
+configuration module, so a query costs an interpreter start plus one socket
+round trip instead of importing typer/rich and re-running every check.
+
+Usage::
+
+    fdoctor-client [PATH] [--format table|json] [--socket SOCKET]
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+from azure_functions_doctor.config import get_config
+
+_ICONS = {"pass": "✓", "warn": "!", "fail": "✗"}
+
+
+class DaemonUnavailableError(RuntimeError):
+    """Raised when no daemon is listening on the socket."""
+
+
+def request(payload: dict[str, Any], socket_path: Optional[Path] = None, timeout: float = 60.0) -> dict[str, Any]:
+    """Send one request to the daemon and return the decoded response."""
+    path = socket_path if socket_path is not None else get_config().get_daemon_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(str(path))
+        except OSError as exc:
+            raise DaemonUnavailableError(f"No daemon listening on {path}: {exc}") from exc
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        buffer = b""
+        while not buffer.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+    finally:
+        sock.close()
+    response = json.loads(buffer)
+    if not isinstance(response, dict):
+        raise ValueError("Daemon returned a non-object response")
+    return response
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Query the daemon for a project and print its results; returns the process exit code."""
+    parser = argparse.ArgumentParser(prog="fdoctor-client", description="Query a running func-doctor daemon.")
+    parser.add_argument("path", nargs="?", default=".", help="Path to the Azure Functions app")
+    parser.add_argument("--format", choices=["table", "json"], default="table")
+    parser.add_argument("--socket", type=Path, default=None, help="Daemon socket path")
+    args = parser.parse_args(argv)
+
+    payload = {"command": "run", "path": str(Path(args.path).resolve()), "env": dict(os.environ)}
+    try:
+        response = request(payload, args.socket)
+    except DaemonUnavailableError as exc:
+        print(f"{exc}. Start one with: azure-functions serve", file=sys.stderr)
+        return 2
+    if not response.get("ok"):
+        print(f"Daemon error: {response.get('error')}", file=sys.stderr)
+        return 2
+
+    results = response.get("results", [])
+    if args.format == "json":
+        print(json.dumps(results, indent=2))
+    else:
+        for section in results:
+            print(section.get("title", ""))
+            for item in section.get("items", []):
+                status = item.get("status", "pass")
+                suffix = f" ({status})" if status != "pass" else ""
+                print(f"  [{_ICONS.get(status, '?')}] {item.get('label', '')}: {item.get('value', '')}{suffix}")
+    failed = any(item.get("status") == "fail" for section in results for item in section.get("items", []))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+SDK clients and HTTP sessions constructed on every invocation.
+
+A client built inside a handler is thrown away with its connection pool when
+the invocation returns, so every invocation opens new connections; under load
+this exhausts the instance's outbound (SNAT) ports. Clients belong at module
+scope or behind a cached factory (``functools.lru_cache``/``cache``, or a
+function initializing ``global`` state).
+
+From each function handler the project's call graph
+(:mod:`azure_functions_doctor.call_graph`) is followed, skipping cached
+factories, and calls matching the client table (:data:`CLIENT_TYPES`,
+extended per rule with ``client_types``) are reported with a ``file:line``
+call chain. Module-scope construction is never reported: module code runs
+once per worker.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Iterable, Optional, TypedDict
+
+from azure_functions_doctor.call_graph import CallGraph, FunctionSummary
+
+# Qualified constructor pattern (fnmatch) -> kind of client
+CLIENT_TYPES: dict[str, str] = {
+    # Azure SDK clients (sync and .aio), including the from_connection_string/from_*_url factories
+    "azure.*Client": "Azure SDK client",
+    "azure.*Client.from_*": "Azure SDK client",
+    "requests.Session": "requests.Session",
+    "requests.session": "requests.Session",
+    "httpx.Client": "httpx client",
+    "httpx.AsyncClient": "httpx client",
+    "aiohttp.ClientSession": "aiohttp.ClientSession",
+    "urllib3.PoolManager": "urllib3 pool",
+    "pymongo.MongoClient": "MongoDB client",
+    "motor.motor_asyncio.AsyncIOMotorClient": "MongoDB client",
+    "redis.Redis": "Redis client",
+    "redis.StrictRedis": "Redis client",
+    "redis.from_url": "Redis client",
+    "redis.asyncio.Redis": "Redis client",
+    "openai.OpenAI": "OpenAI client",
+    "openai.AsyncOpenAI": "OpenAI client",
+    "openai.AzureOpenAI": "OpenAI client",
+    "openai.AsyncAzureOpenAI": "OpenAI client",
+    "boto3.client": "boto3 client",
+    "boto3.resource": "boto3 client",
+}
+_MAX_FINDINGS = 5
+
+
+class ClientConstruction(TypedDict):
+    handler: str
+    call: str
+    kind: str
+    chain: list[str]
+
+
+def client_kind(name: str, extra: Iterable[str] = ()) -> Optional[str]:
+    """The kind of client constructed by the call ``name`` (qualified), or None when it is not a client."""
+    for pattern, kind in CLIENT_TYPES.items():
+        if fnmatchcase(name, pattern):
+            return kind
+    if any(fnmatchcase(name, pattern) for pattern in extra):
+        return "client"
+    return None
+
+
+def _not_cached(function: FunctionSummary) -> bool:
+    return not function[4]
+
+
+def find_per_invocation_clients(graph: CallGraph, extra: Iterable[str] = ()) -> list[ClientConstruction]:
+    """Client constructors reachable from each handler outside cached factories, with their call chain."""
+    extra = tuple(extra)
+    findings: list[ClientConstruction] = []
+    for module, handler in graph.handlers():
+        for external in graph.walk(module, handler, follow=_not_cached):
+            kind = client_kind(external["call"], extra)
+            if kind is not None:
+                findings.append(
+                    {
+                        "handler": f"{module}.{handler}",
+                        "call": external["call"],
+                        "kind": kind,
+                        "chain": external["chain"],
+                    }
+                )
+    return findings
+
+
+def describe(findings: list[ClientConstruction]) -> list[str]:
+    """Human-readable evidence (call chain and client kind) for the first few findings."""
+    return [
+        f"{' -> '.join(finding['chain'])} ({finding['kind']}) runs on every invocation; hoist it to module scope"
+        for finding in findings[:_MAX_FINDINGS]
+    ]
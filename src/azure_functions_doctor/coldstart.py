@@ -0,0 +1,394 @@
+"""
+Import-time profile of the function app, the main local contributor to cold start.
+
+The app's entry modules (``function_app.py`` for the v2 model, every
+``scriptFile`` of a v1 project) are imported in a fresh interpreter started
+with ``-X importtime``, the way the worker loads them on a cold host. The run is
+repeated and CPython's per-module timings are parsed into an import tree; the
+report gives p50/p95 of the total and the heaviest modules the app imports at
+top level. Modules imported during interpreter startup are not counted.
+
+Runs execute one after another: overlapping them would measure contention
+rather than import cost. Importing the app executes its module-level code, so
+nothing here runs unless asked for (the ``coldstart`` command or a rule of type
+``cold_start_import``).
+"""
+
+import json
+import math
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence, TypedDict
+
+from azure_functions_doctor.config import get_config
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.deploy_size import format_bytes
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_IS_WINDOWS = sys.platform.startswith("win")
+VENV_DIRS = (".venv", "venv")
+_IMPORT_TIME_PREFIX = "import time:"
+# Run with ``-c``: argv[1] is the project root, the rest are the modules to import. Only the
+# C import path is timed by -X importtime, so this uses __import__ rather than importlib
+_IMPORTER = "import sys\nsys.path.insert(0, sys.argv[1])\nfor name in sys.argv[2:]:\n    __import__(name)\n"
+# Run with ``-c``: argv[1] is the project root, argv[2] "rss" for a plain run or "trace:<bytes>" to record
+# the Python heap with tracemalloc (its bookkeeping inflates RSS, so RSS comes from untraced runs), the rest
+# are the modules to import. Linux's ru_maxrss survives exec and so would report the parent's peak; VmHWM is
+# reset for the new image. Traced runs charge each allocation to the innermost frame outside the import
+# machinery, so what importlib allocates on a module's behalf lands on the code that imported it. A profile
+# hook checks the heap as Python functions return (checking it allocates, and every allocation records a
+# deep traceback) and takes the breakdown once, when it first reaches <bytes> (the peak of an earlier run), or
+# it is taken at the end if the heap never does; the snapshot's own allocations are kept out of the peak.
+# The hook stays installed for the whole run, which on CPython 3.11 also makes deep tracebacks much cheaper.
+# The result follows a marker on stdout, which the app's own prints may share
+_MEMORY_MARKER = "__azure_functions_doctor_memory__"
+_TRACE_FRAMES = 25
+# Heap peaks vary a little between runs, so the breakdown is taken this close to the sizing run's peak
+_PEAK_FRACTION = 0.95
+_MEMORY_PROBE = f"""\
+import json, sys
+trace = sys.argv[2].startswith("trace:")
+modules = {{}}
+if trace:
+    import importlib, os, tracemalloc
+    machinery = ("<frozen importlib.", "<frozen zipimport>", os.path.dirname(importlib.__file__) + os.sep)
+    pending = [int(sys.argv[2][len("trace:") :])]
+    peaks = []
+
+    def attribute():
+        pending.clear()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        owners = {{}}
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if path:
+                owners[path] = name.partition(".")[0]
+        for stat in tracemalloc.take_snapshot().statistics("traceback"):
+            owner = "<import system>"
+            for frame in reversed(stat.traceback):
+                if not frame.filename.startswith(machinery):
+                    frozen = frame.filename.startswith("<frozen ")
+                    owner = frame.filename[8:-1].partition(".")[0] if frozen else owners.get(frame.filename, "<other>")
+                    break
+            modules[owner] = modules.get(owner, 0) + stat.size
+        tracemalloc.reset_peak()
+
+    def watch(frame, event, arg):
+        if event == "return" and pending and pending[0] and tracemalloc.get_traced_memory()[0] >= pending[0]:
+            attribute()
+
+    tracemalloc.start({_TRACE_FRAMES})
+    sys.setprofile(watch)
+sys.path.insert(0, sys.argv[1])
+for name in sys.argv[3:]:
+    __import__(name)
+if trace:
+    sys.setprofile(None)
+    if pending:
+        attribute()
+    peaks.append(tracemalloc.get_traced_memory()[1])
+result = {{"rss": None, "heap": max(peaks) if trace else None, "modules": modules}}
+try:
+    with open("/proc/self/status") as status:
+        result["rss"] = next(int(line.split()[1]) * 1024 for line in status if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["rss"] = rss if sys.platform == "darwin" else rss * 1024
+    except ImportError:
+        pass
+print("{_MEMORY_MARKER}" + json.dumps(result))
+"""
+
+
+class ColdStartError(RuntimeError):
+    """Raised when the entry modules cannot be found or fail to import."""
+
+
+class ImportNode(TypedDict):
+    module: str
+    self_us: int
+    cumulative_us: int
+    children: list["ImportNode"]
+
+
+class ImportCost(TypedDict):
+    module: str
+    ms: float
+
+
+class ColdStartReport(TypedDict):
+    python: str
+    entry_modules: list[str]
+    runs: int
+    samples_ms: list[float]
+    p50_ms: float
+    p95_ms: float
+    heaviest: list[ImportCost]
+
+
+class ModuleMemory(TypedDict):
+    module: str
+    bytes: int
+
+
+class MemoryReport(TypedDict):
+    python: str
+    entry_modules: list[str]
+    runs: int
+    baseline_rss_bytes: Optional[int]
+    rss_samples: list[int]
+    p50_rss_bytes: Optional[int]
+    p95_rss_bytes: Optional[int]
+    heap_samples: list[int]
+    p50_heap_bytes: int
+    p95_heap_bytes: int
+    heaviest: list[ModuleMemory]
+
+
+def app_entry_points(root: Path, context: Optional[ProjectContext] = None) -> list[Path]:
+    """The files the worker imports: each v1 ``scriptFile`` (default ``__init__.py``) or ``function_app.py``."""
+    context = context if context is not None else ProjectContext(root)
+    scripts: list[Path] = []
+    for function_json in sorted(context.files.rglob("function.json")):
+        try:
+            data = context.read_json(function_json)
+        except Exception as exc:
+            logger.debug(f"Skipping {function_json}: {exc}")
+            continue
+        script = data.get("scriptFile", "__init__.py") if isinstance(data, dict) else "__init__.py"
+        candidate = (function_json.parent / str(script)).resolve()
+        if candidate.suffix == ".py" and candidate.is_file():
+            scripts.append(candidate)
+    if scripts:
+        return list(dict.fromkeys(scripts))
+    main = root / "function_app.py"
+    return [main] if main.is_file() else []
+
+
+def module_name(root: Path, script: Path) -> str:
+    """Dotted module name of ``script`` relative to ``root`` (``pkg/__init__.py`` -> ``pkg``)."""
+    parts = list(script.resolve().relative_to(root.resolve()).with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    if not parts:
+        raise ColdStartError(f"{script} is not importable as a module")
+    return ".".join(parts)
+
+
+def project_python(root: Path, environ: Optional[Mapping[str, str]] = None) -> str:
+    """The project's interpreter: a virtual environment in the project, ``$VIRTUAL_ENV``, else the current one."""
+    environ = os.environ if environ is None else environ
+    relative = Path("Scripts", "python.exe") if _IS_WINDOWS else Path("bin", "python")
+    candidates = [root / name for name in VENV_DIRS]
+    if environ.get("VIRTUAL_ENV"):
+        candidates.append(Path(environ["VIRTUAL_ENV"]))
+    for venv in candidates:
+        python = venv / relative
+        if python.is_file():
+            return str(python)
+    return sys.executable
+
+
+def parse_importtime(stderr: str) -> list[ImportNode]:
+    """
+    Build the import tree from ``-X importtime`` output; returns the top-level imports in import order.
+
+    CPython prints a module after everything it imported, indented two spaces
+    per nesting level, so each line adopts the pending lines one level deeper.
+    """
+    pending: dict[int, list[ImportNode]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith(_IMPORT_TIME_PREFIX):
+            continue
+        fields = line[len(_IMPORT_TIME_PREFIX) :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Header line ("self [us] | cumulative | imported package")
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        node: ImportNode = {
+            "module": name.strip(),
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+            "children": pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def run_python(
+    python: str, args: list[str], root: Path, modules: list[str], timeout: float, environ: Mapping[str, str]
+) -> subprocess.CompletedProcess[str]:
+    """Run ``python *args`` importing ``modules`` from ``root``; a failed import raises :class:`ColdStartError`."""
+    try:
+        proc = subprocess.run(
+            [python, *args],
+            cwd=root,
+            env=dict(environ),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise ColdStartError(f"Importing {', '.join(modules)} took longer than {timeout:g}s") from exc
+    except OSError as exc:
+        raise ColdStartError(f"Cannot run {python}: {exc}") from exc
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.splitlines() if not line.startswith(_IMPORT_TIME_PREFIX)]
+        reason = lines[-1] if lines else f"exit code {proc.returncode}"
+        raise ColdStartError(f"Importing {', '.join(modules)} failed: {reason}")
+    return proc
+
+
+def _import_once(
+    python: str, root: Path, modules: list[str], timeout: float, environ: Mapping[str, str]
+) -> list[ImportNode]:
+    proc = run_python(
+        python, ["-X", "importtime", "-c", _IMPORTER, str(root), *modules], root, modules, timeout, environ
+    )
+    # Importing ``pkg.mod`` imports ``pkg`` first, as a separate top-level entry
+    wanted = {".".join(name.split(".")[: i + 1]) for name in modules for i in range(name.count(".") + 1)}
+    return [node for node in parse_importtime(proc.stderr) if node["module"] in wanted]
+
+
+def profile_imports(
+    root: Path,
+    runs: int = 5,
+    python: Optional[str] = None,
+    top: int = 10,
+    context: Optional[ProjectContext] = None,
+) -> ColdStartReport:
+    """Import the app's entry modules ``runs`` times in fresh interpreters and summarize the timings."""
+    root = Path(root).resolve()
+    context = context if context is not None else ProjectContext(root)
+    scripts = app_entry_points(root, context)
+    if not scripts:
+        raise ColdStartError("No entry point found (function_app.py or function.json scriptFile)")
+    modules = [module_name(root, script) for script in scripts]
+    python = python or project_python(root, context.environ)
+    timeout = get_config().get_coldstart_timeout_seconds()
+
+    samples: list[float] = []
+    per_import: dict[str, list[float]] = {}
+    for _ in range(max(1, runs)):
+        entries = _import_once(python, root, modules, timeout, context.environ)
+        samples.append(round(sum(node["cumulative_us"] for node in entries) / 1000, 3))
+        totals: dict[str, int] = {}
+        for entry in entries:
+            for child in entry["children"]:
+                totals[child["module"]] = totals.get(child["module"], 0) + child["cumulative_us"]
+        for name, us in totals.items():
+            per_import.setdefault(name, []).append(us / 1000)
+
+    heaviest: list[ImportCost] = sorted(
+        ({"module": name, "ms": round(percentile(values, 50), 3)} for name, values in per_import.items()),
+        key=lambda cost: cost["ms"],
+        reverse=True,
+    )
+    return {
+        "python": python,
+        "entry_modules": modules,
+        "runs": len(samples),
+        "samples_ms": samples,
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "heaviest": heaviest[:top],
+    }
+
+
+def describe_heaviest(report: ColdStartReport, count: int = 3) -> str:
+    """Short ``module (ms)`` list of the heaviest top-level imports."""
+    return ", ".join(f"{cost['module']} ({cost['ms']:.0f} ms)" for cost in report["heaviest"][:count])
+
+
+def _memory_once(
+    python: str,
+    root: Path,
+    modules: list[str],
+    threshold: Optional[int],
+    timeout: float,
+    environ: Mapping[str, str],
+) -> dict[str, Any]:
+    """One probe run: plain when ``threshold`` is None, else traced with the breakdown taken at ``threshold``."""
+    args = ["-c", _MEMORY_PROBE, str(root), "rss" if threshold is None else f"trace:{threshold}", *modules]
+    proc = run_python(python, args, root, modules, timeout, environ)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(_MEMORY_MARKER):
+            result: dict[str, Any] = json.loads(line[len(_MEMORY_MARKER) :])
+            return result
+    raise ColdStartError(f"Importing {', '.join(modules) or 'nothing'} reported no memory figures")
+
+
+def profile_memory(
+    root: Path,
+    runs: int = 5,
+    python: Optional[str] = None,
+    top: int = 10,
+    context: Optional[ProjectContext] = None,
+) -> MemoryReport:
+    """
+    Peak memory of importing the app's entry modules in fresh interpreters, ``runs`` times each way.
+
+    Peak RSS (unavailable on Windows) is taken from plain runs; the Python heap
+    peak and the bytes held per top-level module at that peak come from runs
+    under ``tracemalloc``, after one traced run to find roughly where the peak
+    lies. The bare interpreter's RSS is measured once as the baseline.
+    """
+    root = Path(root).resolve()
+    context = context if context is not None else ProjectContext(root)
+    scripts = app_entry_points(root, context)
+    if not scripts:
+        raise ColdStartError("No entry point found (function_app.py or function.json scriptFile)")
+    modules = [module_name(root, script) for script in scripts]
+    python = python or project_python(root, context.environ)
+    timeout = get_config().get_coldstart_timeout_seconds()
+    runs = max(1, runs)
+
+    baseline = _memory_once(python, root, [], None, timeout, context.environ)["rss"]
+    rss = [_memory_once(python, root, modules, None, timeout, context.environ)["rss"] for _ in range(runs)]
+    rss_samples = [int(value) for value in rss if value is not None]
+    heap_samples: list[int] = []
+    per_module: dict[str, list[float]] = {}
+    sizing = _memory_once(python, root, modules, 0, timeout, context.environ)
+    threshold = int(sizing["heap"] * _PEAK_FRACTION)
+    for _ in range(runs):
+        traced = _memory_once(python, root, modules, threshold, timeout, context.environ)
+        heap_samples.append(int(traced["heap"]))
+        for name, size in traced["modules"].items():
+            per_module.setdefault(name, []).append(size)
+
+    heaviest: list[ModuleMemory] = sorted(
+        ({"module": name, "bytes": int(percentile(sizes, 50))} for name, sizes in per_module.items()),
+        key=lambda entry: entry["bytes"],
+        reverse=True,
+    )
+    return {
+        "python": python,
+        "entry_modules": modules,
+        "runs": runs,
+        "baseline_rss_bytes": None if baseline is None else int(baseline),
+        "rss_samples": rss_samples,
+        "p50_rss_bytes": int(percentile(rss_samples, 50)) if rss_samples else None,
+        "p95_rss_bytes": int(percentile(rss_samples, 95)) if rss_samples else None,
+        "heap_samples": heap_samples,
+        "p50_heap_bytes": int(percentile(heap_samples, 50)),
+        "p95_heap_bytes": int(percentile(heap_samples, 95)),
+        "heaviest": heaviest[:top],
+    }
+
+
+def describe_memory_heaviest(report: MemoryReport, count: int = 3) -> str:
+    """Short ``module (size)`` list of the top-level modules holding the most memory at the import peak."""
+    return ", ".join(f"{entry['module']} ({format_bytes(entry['bytes'])})" for entry in report["heaviest"][:count])
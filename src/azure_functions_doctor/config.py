@@ -22,6 +22,13 @@ class Config:
         "output_width": 120,
         "enable_colors": True,
         "parallel_execution": False,
+        "cache_enabled": True,
+        "probe_timeout_seconds": 10,
+        "probe_cache_ttl_seconds": 86400,
+        "daemon_max_projects": 16,
+        "daemon_poll_interval_seconds": 1.0,
+        "lsp_debounce_ms": 30,
+        "coldstart_timeout_seconds": 60,
     }
 
     def __init__(self) -> None:
@@ -103,6 +110,54 @@ class Config:
         """Check if parallel execution is enabled."""
         return bool(self._config["parallel_execution"])
 
+    def is_cache_enabled(self) -> bool:
+        """Check if the on-disk cache is enabled."""
+        return bool(self._config["cache_enabled"])
+
+    def get_probe_timeout_seconds(self) -> float:
+        """Get timeout for a single external tool probe in seconds."""
+        return float(self._config["probe_timeout_seconds"])
+
+    def get_probe_cache_ttl_seconds(self) -> int:
+        """Get how long a cached tool probe result stays valid in seconds."""
+        return int(self._config["probe_cache_ttl_seconds"])
+
+    def get_cache_dir(self) -> Path:
+        """Get the on-disk cache directory.
+
+        Resolution order: ``FUNC_DOCTOR_CACHE_DIR``, ``$XDG_CACHE_HOME/azure-functions-doctor``,
+        then ``~/.cache/azure-functions-doctor``.
+        """
+        custom_dir = os.getenv("FUNC_DOCTOR_CACHE_DIR")
+        if custom_dir:
+            return Path(custom_dir)
+        xdg_cache = os.getenv("XDG_CACHE_HOME")
+        base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+        return base / "azure-functions-doctor"
+
+    def get_daemon_max_projects(self) -> int:
+        """Get how many project roots the daemon keeps warm before evicting the least recently used."""
+        return int(self._config["daemon_max_projects"])
+
+    def get_daemon_poll_interval_seconds(self) -> float:
+        """Get how often the daemon checks warm projects for file changes."""
+        return float(self._config["daemon_poll_interval_seconds"])
+
+    def get_lsp_debounce_seconds(self) -> float:
+        """Get how long the language server waits after the last edit before re-evaluating rules."""
+        return max(0, int(self._config["lsp_debounce_ms"])) / 1000
+
+    def get_coldstart_timeout_seconds(self) -> float:
+        """Get how long one import-time profiling run of the app may take in seconds."""
+        return float(self._config["coldstart_timeout_seconds"])
+
+    def get_daemon_socket_path(self) -> Path:
+        """Get the daemon's Unix socket path (``FUNC_DOCTOR_DAEMON_SOCKET`` or the cache directory)."""
+        custom_socket = os.getenv("FUNC_DOCTOR_DAEMON_SOCKET")
+        if custom_socket:
+            return Path(custom_socket)
+        return self.get_cache_dir() / "daemon.sock"
+
     def get_custom_rules_path(self) -> Optional[Path]:
         """Get custom rules file path from environment."""
         custom_path = os.getenv("FUNC_DOCTOR_CUSTOM_RULES")
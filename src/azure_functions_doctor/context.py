@@ -0,0 +1,185 @@
+"""Per-run project context shared by all rule handlers."""
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Optional
+
+from azure_functions_doctor.executables import ExecutableIndex
+from azure_functions_doctor.files import FileIndex
+from azure_functions_doctor.target_resolver import resolve_target_values
+
+if TYPE_CHECKING:
+    from azure_functions_doctor.requirements import RequirementsIndex
+
+
+class ProjectContext:
+    """
+    Lazily computed project inputs shared across the rules of a single run.
+
+    The doctor creates one context per run and hands it to every handler, so
+    inputs that several rules depend on (the file listing, file contents, the
+    parsed requirements include graph, the PATH index and tool probes) are
+    computed at most once, and only when a rule asks for them.
+
+    ``environ`` defaults to the current process environment; long-lived callers
+    such as the daemon pass the requesting client's environment instead.
+    ``overlays`` maps absolute paths to unsaved editor buffers that take
+    precedence over the file contents on disk. ``untracked`` controls whether
+    a listing read from the git index includes untracked, non-ignored files.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        environ: Optional[Mapping[str, str]] = None,
+        overlays: Optional[dict[Path, str]] = None,
+        untracked: bool = True,
+    ) -> None:
+        self.project_path: Path = Path(path)
+        self.untracked = untracked
+        self.environ: Mapping[str, str] = os.environ if environ is None else environ
+        self.overlays: dict[Path, str] = overlays if overlays is not None else {}
+        self._requirements: dict[Path, "RequirementsIndex"] = {}
+        self._executables: Optional[ExecutableIndex] = None
+        self._target_values: dict[str, str] = {}
+        self._files: Optional[FileIndex] = None
+        self._texts: dict[tuple[Path, str], str] = {}
+        self._json: dict[Path, Any] = {}
+        # Per-file verdicts of content scans: key -> str(path) -> [stat signature, verdict]
+        self.scan_memo: dict[str, dict[str, list[Any]]] = {}
+        self._signatures: dict[str, Optional[str]] = {}
+
+    def with_environ(self, environ: Mapping[str, str]) -> "ProjectContext":
+        """Return a context for another environment that shares this context's file-derived inputs."""
+        other = ProjectContext(self.project_path, environ=environ, overlays=self.overlays, untracked=self.untracked)
+        other._files = self._files
+        other._texts = self._texts
+        other._json = self._json
+        other._requirements = self._requirements
+        other.scan_memo = self.scan_memo
+        other._signatures = self._signatures
+        return other
+
+    @property
+    def files(self) -> FileIndex:
+        """Listing of the project tree, walked once on first use."""
+        if self._files is None:
+            self._files = FileIndex(self.project_path, untracked=self.untracked)
+        return self._files
+
+    @property
+    def executables(self) -> ExecutableIndex:
+        """PATH executable index, built on first use and shared by all tool checks."""
+        if self._executables is None:
+            self._executables = ExecutableIndex(path_env=self.environ.get("PATH", os.defpath))
+        return self._executables
+
+    def getenv(self, name: str) -> Optional[str]:
+        """Look up an environment variable in the run's environment."""
+        return self.environ.get(name)
+
+    def read_text(self, path: Path, errors: str = "strict") -> str:
+        """Read a UTF-8 file once per run (or its unsaved overlay); read errors propagate to the caller."""
+        path = path if isinstance(path, Path) else Path(path)
+        overlay = self.overlays.get(path) if self.overlays else None
+        if overlay is not None:
+            return overlay
+        key = (path, errors)
+        text = self._texts.get(key)
+        if text is None:
+            text = Path(path).read_text(encoding="utf-8", errors=errors)
+            self._texts[key] = text
+        return text
+
+    def invalidate(self, paths: Iterable[Path], structural: bool = False) -> None:
+        """
+        Forget cached inputs derived from ``paths`` after they changed.
+
+        Set ``structural`` when files were created, deleted or renamed so the
+        file listing is rebuilt as well.
+        """
+        changed = {Path(p) for p in paths}
+        # Mutate in place: contexts derived through with_environ share these caches
+        for key in [k for k in self._texts if k[0] in changed]:
+            del self._texts[key]
+        for path in changed:
+            self._json.pop(path, None)
+            self._signatures.pop(str(path), None)
+            for memo in self.scan_memo.values():
+                memo.pop(str(path), None)
+        for req_path, index in list(self._requirements.items()):
+            if changed.intersection(index.files) or changed.intersection(index.missing):
+                del self._requirements[req_path]
+        if structural:
+            self._files = None
+
+    def scan(self, key: str, path: Path, compute: Callable[[Path], Any]) -> Any:
+        """
+        Return ``compute(path)``, memoized per file for the content scan identified by ``key``.
+
+        Verdicts are keyed by the file's size and mtime so a memo carried over
+        from an earlier run (see ``scan_memo``) stays valid only for unchanged
+        files. Files the git index shows unchanged are keyed by their object id
+        instead, so an mtime-only change such as a fresh checkout keeps the
+        verdict. Unsaved overlays are always re-scanned. Verdicts must be JSON
+        serializable.
+        """
+        name = str(path)
+        if self.overlays and path in self.overlays:
+            return compute(path)
+        if name in self._signatures:
+            signature = self._signatures[name]
+        else:
+            try:
+                st = os.stat(name)
+                signature = self.files.content_signature(path, st) or f"{st.st_size}:{st.st_mtime_ns}"
+            except OSError:
+                signature = None
+            self._signatures[name] = signature
+        if signature is None:
+            return compute(path)
+        memo = self.scan_memo.setdefault(key, {})
+        entry = memo.get(name)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        verdict = compute(path)
+        memo[name] = [signature, verdict]
+        return verdict
+
+    def read_json(self, path: Path) -> Any:
+        """Parse a JSON file once per run; read and decode errors propagate to the caller."""
+        key = Path(path)
+        if key not in self._json:
+            self._json[key] = json.loads(self.read_text(key))
+        return self._json[key]
+
+    def host_json(self) -> Optional[Any]:
+        """Parsed ``host.json`` or None when the project has none."""
+        host_path = self.project_path / "host.json"
+        if not host_path.exists():
+            return None
+        return self.read_json(host_path)
+
+    def requirements(self, filename: str = "requirements.txt") -> "RequirementsIndex":
+        """Return the parsed requirements index for ``filename`` relative to the project root."""
+        from azure_functions_doctor.requirements import RequirementsIndex
+
+        req_path = self.project_path / filename
+        index = self._requirements.get(req_path)
+        if index is None:
+            index = RequirementsIndex.from_file(req_path, self.overlays)
+            self._requirements[req_path] = index
+        return index
+
+    def target_values(self, targets: Iterable[str]) -> dict[str, str]:
+        """Resolve version targets, probing all not-yet-known external tools concurrently."""
+        wanted = list(dict.fromkeys(targets))
+        missing = [t for t in wanted if t not in self._target_values]
+        if missing:
+            self._target_values.update(resolve_target_values(missing, self.executables))
+        return {t: self._target_values[t] for t in wanted}
+
+    def target_value(self, target: str) -> str:
+        """Resolve a single version target such as "python" or "func_core_tools"."""
+        return self.target_values([target])[target]
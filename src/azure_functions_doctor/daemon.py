@@ -0,0 +1,336 @@
+"""
+Long-lived diagnostics daemon serving JSON requests over a Unix domain socket.
+
+Starting a fresh interpreter for every editor save or git hook pays for imports,
+rule loading and a full tree walk each time. The daemon keeps that state warm per
+project root: the loaded rules, the project context (file index, parsed files,
+requirements, PATH index, tool probes) and the last results per client
+environment. A background watcher polls the project tree and the environments'
+site-packages directories, and drops cached state as soon as either changes.
+Requests never walk the tree themselves.
+
+Protocol: one JSON object per line in each direction. Requests carry a
+``command`` field:
+
+- ``{"command": "run", "path": "...", "env": {...}}`` -> ``{"ok": true, "results": [...], "cached": bool}``
+- ``{"command": "invalidate", "path": "..."}`` drops the project's warm state
+- ``{"command": "stats"}`` lists warm projects
+- ``{"command": "ping"}`` / ``{"command": "shutdown"}``
+
+Checks that inspect the interpreter itself (Python version, ``sys.executable``)
+report the daemon's interpreter; environment-variable and PATH checks use the
+``env`` sent by the client.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from azure_functions_doctor import __version__
+from azure_functions_doctor.config import get_config
+from azure_functions_doctor.dist_footprint import site_packages
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.handlers import environment_inputs
+from azure_functions_doctor.logging_config import get_logger
+from azure_functions_doctor.results import Section, to_dicts
+
+logger = get_logger(__name__)
+
+# Directories whose contents are not stat'ed individually by the watcher; additions and
+# removals directly inside them still show up through the parent directory's mtime.
+# Installed packages are watched through their site-packages directory instead (see ProjectState.sites).
+_WATCH_EXCLUDED_DIRS = frozenset({".git", ".venv", "venv", "node_modules", "__pycache__", ".python_packages"})
+# Client environments whose results are kept per project
+_MAX_ENVIRONMENTS = 8
+
+
+def tree_signature(root: Path) -> str:
+    """Return a digest of the mtimes and sizes of the project's files and directories."""
+    digest = hashlib.blake2b(digest_size=16)
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            digest.update(f"!{directory}".encode())
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            digest.update(f"{entry.path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+            if entry.is_dir(follow_symlinks=False) and entry.name not in _WATCH_EXCLUDED_DIRS:
+                stack.append(entry.path)
+    return digest.hexdigest()
+
+
+def _environ_key(environ: dict[str, str], names: Optional[frozenset[str]]) -> str:
+    relevant = environ if names is None else {k: v for k, v in environ.items() if k in names}
+    payload = json.dumps(sorted(relevant.items()), separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ProjectState:
+    """
+    Warm per-project state: a Doctor with its context and results per client environment.
+
+    The state is only rebuilt once the watcher marks it stale. Results are kept
+    for the most recently used environments and keyed on the variables the
+    rules read (see :func:`environment_inputs`), so per-shell values such as
+    ``PWD`` do not defeat the cache.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.doctor = Doctor(str(path), allow_v1=True)
+        self.signature = tree_signature(path)
+        self.results: "OrderedDict[str, list[Section]]" = OrderedDict()
+        # site-packages directories of the environments served so far -> mtime when first seen;
+        # installing, upgrading or removing a distribution changes the directory's mtime
+        self.sites: dict[Path, Optional[int]] = {}
+        self.stale = False
+        self.runs = 0
+
+    def invalidate(self) -> None:
+        """Mark the state stale; it is rebuilt on the next request."""
+        self.stale = True
+
+    def sites_changed(self) -> bool:
+        """Whether a watched site-packages directory changed since it was first seen."""
+        return any(_mtime_ns(site) != mtime for site, mtime in list(self.sites.items()))
+
+    def run(self, environ: dict[str, str]) -> tuple[list[Section], bool]:
+        """Return results for ``environ``, re-running checks only if something changed."""
+        with self.lock:
+            if self.stale:
+                self.doctor.refresh()
+                self.results.clear()
+                self.sites.clear()
+                self.stale = False
+
+            site = site_packages(self.path, environ)
+            if site is not None and site not in self.sites:
+                self.sites[site] = _mtime_ns(site)
+
+            key = _environ_key(environ, environment_inputs(self.doctor.load_rules()))
+            cached = self.results.get(key)
+            if cached is not None:
+                self.results.move_to_end(key)
+                return cached, True
+
+            # Keep the warm context (file index, parsed files) but evaluate env-dependent checks
+            # against the client's environment.
+            if dict(self.doctor.context.environ) != environ:
+                self.doctor.context = self.doctor.context.with_environ(environ)
+            results = self.doctor.run_all_checks()
+            self.runs += 1
+            self.results[key] = results
+            while len(self.results) > _MAX_ENVIRONMENTS:
+                self.results.popitem(last=False)
+            return results, False
+
+
+class DoctorDaemon:
+    """Holds warm project states (bounded LRU) and answers protocol requests."""
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        max_projects: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ) -> None:
+        config = get_config()
+        self.socket_path = socket_path if socket_path is not None else config.get_daemon_socket_path()
+        self.max_projects = max_projects if max_projects is not None else config.get_daemon_max_projects()
+        self.poll_interval = poll_interval if poll_interval is not None else config.get_daemon_poll_interval_seconds()
+        self._projects: "OrderedDict[Path, ProjectState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server: Optional[socketserver.BaseServer] = None
+
+    # --- request handling ---
+
+    def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Process a single decoded request and return the response object."""
+        command = request.get("command", "run")
+        try:
+            if command == "ping":
+                return {"ok": True, "version": __version__, "pid": os.getpid()}
+            if command == "stats":
+                with self._lock:
+                    projects = [{"path": str(p), "runs": s.runs, "stale": s.stale} for p, s in self._projects.items()]
+                return {"ok": True, "projects": projects, "max_projects": self.max_projects}
+            if command == "invalidate":
+                path = self._resolve_path(request)
+                with self._lock:
+                    state = self._projects.get(path)
+                if state is not None:
+                    state.invalidate()
+                return {"ok": True}
+            if command == "shutdown":
+                self.shutdown()
+                return {"ok": True}
+            if command == "run":
+                path = self._resolve_path(request)
+                env = request.get("env")
+                environ = {str(k): str(v) for k, v in env.items()} if isinstance(env, dict) else dict(os.environ)
+                start = time.perf_counter()
+                results, cached = self._state_for(path).run(environ)
+                return {
+                    "ok": True,
+                    "path": str(path),
+                    "results": to_dicts(results),
+                    "cached": cached,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                }
+            return {"ok": False, "error": f"Unknown command: {command}"}
+        except SystemExit as exc:
+            return {"ok": False, "error": str(exc)}
+        except Exception as exc:
+            logger.error(f"Daemon request failed: {exc}", exc_info=True)
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    def _resolve_path(self, request: dict[str, Any]) -> Path:
+        raw = request.get("path")
+        if not isinstance(raw, str) or not raw:
+            raise ValueError("Request is missing 'path'")
+        path = Path(raw).resolve()
+        if not path.is_dir():
+            raise ValueError(f"Path must be a directory: {raw}")
+        return path
+
+    def _state_for(self, path: Path) -> ProjectState:
+        with self._lock:
+            state = self._projects.get(path)
+            if state is not None:
+                self._projects.move_to_end(path)
+                return state
+        # Build outside the daemon lock; a concurrent duplicate build is harmless
+        state = ProjectState(path)
+        with self._lock:
+            existing = self._projects.get(path)
+            if existing is not None:
+                self._projects.move_to_end(path)
+                return existing
+            self._projects[path] = state
+            while len(self._projects) > self.max_projects:
+                evicted, _ = self._projects.popitem(last=False)
+                logger.debug(f"Evicted warm state for {evicted}")
+        return state
+
+    @property
+    def projects(self) -> list[Path]:
+        """Warm project roots, least recently used first."""
+        with self._lock:
+            return list(self._projects)
+
+    # --- file watching ---
+
+    def poll_once(self) -> list[Path]:
+        """Check every warm project for file changes and mark changed ones stale."""
+        changed: list[Path] = []
+        with self._lock:
+            states = list(self._projects.values())
+        for state in states:
+            if state.stale:
+                continue
+            signature = tree_signature(state.path)
+            if signature != state.signature or state.sites_changed():
+                state.signature = signature
+                state.invalidate()
+                changed.append(state.path)
+        return changed
+
+    def _watch_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                for path in self.poll_once():
+                    logger.debug(f"Change detected in {path}; cached state invalidated")
+            except Exception as exc:
+                logger.warning(f"File watcher error: {exc}")
+
+    # --- socket server ---
+
+    def serve_forever(self) -> None:
+        """Bind the Unix socket and serve requests until shutdown is requested."""
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Unix domain sockets are not supported on this platform")
+        self._prepare_socket_path()
+
+        daemon = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError("Request must be a JSON object")
+                        response = daemon.handle_request(request)
+                    except ValueError as exc:
+                        response = {"ok": False, "error": f"Invalid request: {exc}"}
+                    self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        old_umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), _Handler)
+        finally:
+            os.umask(old_umask)
+        server.daemon_threads = True
+        self._server = server
+
+        watcher = threading.Thread(target=self._watch_loop, name="func-doctor-watcher", daemon=True)
+        watcher.start()
+        logger.info(f"Daemon listening on {self.socket_path}")
+        try:
+            server.serve_forever(poll_interval=0.2)
+        finally:
+            self._stop.set()
+            server.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+    def shutdown(self) -> None:
+        """Stop serving; safe to call from a request handler thread."""
+        self._stop.set()
+        server = self._server
+        if server is not None:
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+    def _prepare_socket_path(self) -> None:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            # Stale socket left behind by a daemon that did not shut down cleanly
+            self.socket_path.unlink()
+        else:
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
@@ -0,0 +1,247 @@
+"""
+Size of the deployment package that ``func azure functionapp publish`` would build.
+
+Package size drives cold start and deployment time on the Consumption plan.
+The analyzer walks the project with ``.funcignore`` semantics (the gitignore
+syntax Core Tools uses), pruning ignored directories without descending into
+them, and stats the remaining files on a small thread pool: ``stat`` releases
+the GIL, so directory scans overlap on large trees.
+
+Without a ``.funcignore`` every file is counted except the ``.git`` directory.
+"""
+
+import heapq
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Pattern, TypedDict
+
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+FUNCIGNORE = ".funcignore"
+_ALWAYS_EXCLUDED = (".git",)
+_MAX_WORKERS = 8
+
+
+class SizeEntry(TypedDict):
+    path: str
+    bytes: int
+
+
+class ExtensionSize(TypedDict):
+    extension: str
+    files: int
+    bytes: int
+
+
+class SizeReport(TypedDict):
+    root: str
+    total_bytes: int
+    file_count: int
+    largest_files: list[SizeEntry]
+    largest_directories: list[SizeEntry]
+    extensions: list[ExtensionSize]
+
+
+def _translate(pattern: str) -> str:
+    """Translate the body of a gitignore pattern (no negation or trailing slash) into a regex."""
+    parts: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) else i + 1)
+            if end == -1:
+                parts.append(re.escape("["))
+                i += 1
+                continue
+            body = pattern[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+class FuncIgnore:
+    """
+    ``.funcignore`` rules with gitignore semantics.
+
+    The last matching pattern wins, ``!`` re-includes, a trailing ``/`` only
+    matches directories and patterns without an inner ``/`` match at any depth.
+    As in git, a file inside an ignored directory cannot be re-included.
+    """
+
+    def __init__(self, lines: list[str]) -> None:
+        rules: list[tuple[str, bool, bool]] = []
+        for raw in lines:
+            line = raw.rstrip("\n")
+            # Trailing spaces are ignored unless escaped
+            if not line.endswith("\\ "):
+                line = line.rstrip(" ")
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            elif line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            body = _translate(line.lstrip("/"))
+            rules.append((body if anchored else f"(?:.*/)?{body}", negated, dir_only))
+        # Checked last-rule-first; consecutive rules with the same effect collapse into one regex,
+        # so a typical .funcignore without negations costs a single match per path
+        self._file_runs = self._runs([rule for rule in reversed(rules) if not rule[2]])
+        self._dir_runs = self._runs(list(reversed(rules)))
+
+    @staticmethod
+    def _runs(rules: list[tuple[str, bool, bool]]) -> list[tuple[Pattern[str], bool]]:
+        runs: list[tuple[list[str], bool]] = []
+        for body, negated, _ in rules:
+            if runs and runs[-1][1] == negated:
+                runs[-1][0].append(body)
+            else:
+                runs.append(([body], negated))
+        return [(re.compile("|".join(f"(?:{body})" for body in bodies)), negated) for bodies, negated in runs]
+
+    @classmethod
+    def load(cls, root: Path) -> "FuncIgnore":
+        """Rules from ``root/.funcignore``; no rules when the file is missing or unreadable."""
+        try:
+            text = (root / FUNCIGNORE).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return cls([])
+        return cls(text.splitlines())
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Whether the last matching pattern excludes ``rel_path``, or None when no pattern matches."""
+        for regex, negated in self._dir_runs if is_dir else self._file_runs:
+            if regex.fullmatch(rel_path):
+                return not negated
+        return None
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Whether the POSIX-style ``rel_path`` (relative to the project root) is excluded."""
+        return self.match(rel_path, is_dir) is True
+
+
+def _scan(root: str, rel: str, rules: FuncIgnore) -> tuple[list[tuple[str, int]], list[str]]:
+    """Sizes of the deployable files directly in ``rel`` and its deployable subdirectories."""
+    files: list[tuple[str, int]] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(os.path.join(root, rel) if rel else root) as it:
+            for entry in it:
+                child = f"{rel}/{entry.name}" if rel else entry.name
+                try:
+                    # Symlinked directories are not descended into, as in FileIndex
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if rules.ignored(child, is_dir) or (not rel and entry.name in _ALWAYS_EXCLUDED):
+                        continue
+                    if is_dir:
+                        subdirs.append(child)
+                    else:
+                        files.append((child, entry.stat().st_size))
+                except OSError as exc:
+                    logger.debug(f"Skipping {child}: {exc}")
+    except OSError as exc:
+        logger.debug(f"Cannot scan {rel or root}: {exc}")
+    return files, subdirs
+
+
+def walk_deployment(root: Path, workers: int = _MAX_WORKERS) -> list[tuple[str, int]]:
+    """``(relative path, size)`` of every file that would be deployed from ``root``."""
+    rules = FuncIgnore.load(root)
+    base = str(root)
+    found: list[tuple[str, int]] = []
+    level = [""]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deploy-size") as executor:
+        # Breadth-first, one batch of directory scans per tree level
+        while level:
+            next_level: list[str] = []
+            for files, subdirs in executor.map(lambda rel: _scan(base, rel, rules), level):
+                found.extend(files)
+                next_level.extend(subdirs)
+            level = next_level
+    return found
+
+
+def measure_deployment(root: Path, top: int = 10) -> SizeReport:
+    """Summarize the would-be deployment package: totals, largest files and directories, and extensions."""
+    root = Path(root).resolve()
+    files = walk_deployment(root)
+    # Sum per containing directory first, then roll up once per directory rather than once per file
+    direct: dict[str, int] = {}
+    extensions: dict[str, list[int]] = {}
+    total = 0
+    for rel, size in files:
+        total += size
+        parent, _, name = rel.rpartition("/")
+        direct[parent] = direct.get(parent, 0) + size
+        _, dot, ext = name[1:].rpartition(".")
+        bucket = extensions.setdefault(f".{ext.lower()}" if dot else "(none)", [0, 0])
+        bucket[0] += 1
+        bucket[1] += size
+    directories: dict[str, int] = {}
+    for directory, size in direct.items():
+        while directory:
+            directories[directory] = directories.get(directory, 0) + size
+            directory = directory.rpartition("/")[0]
+
+    largest_files = heapq.nlargest(top, files, key=lambda item: item[1])
+    largest_dirs = heapq.nlargest(top, directories.items(), key=lambda item: item[1])
+    by_ext = sorted(extensions.items(), key=lambda item: item[1][1], reverse=True)
+    return {
+        "root": str(root),
+        "total_bytes": total,
+        "file_count": len(files),
+        "largest_files": [{"path": path, "bytes": size} for path, size in largest_files],
+        "largest_directories": [{"path": path, "bytes": size} for path, size in largest_dirs],
+        "extensions": [{"extension": ext, "files": count, "bytes": size} for ext, (count, size) in by_ext],
+    }
+
+
+def format_bytes(size: float) -> str:
+    """Human-readable size such as ``12.3 MB``."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def over_budget(report: SizeReport, max_bytes: Optional[int] = None, max_files: Optional[int] = None) -> list[str]:
+    """Budget violations of ``report``, as human-readable messages (empty when within budget)."""
+    problems: list[str] = []
+    if max_bytes is not None and report["total_bytes"] > max_bytes:
+        problems.append(f"{format_bytes(report['total_bytes'])} exceeds {format_bytes(max_bytes)}")
+    if max_files is not None and report["file_count"] > max_files:
+        problems.append(f"{report['file_count']} files exceed {max_files}")
+    return problems
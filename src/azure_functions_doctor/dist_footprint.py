@@ -0,0 +1,354 @@
+"""
+Installed footprint of every distribution in the project's environment.
+
+The environment is ``.python_packages`` (what Core Tools and remote builds
+deploy) or the project's virtual environment. For each ``*.dist-info``
+directory the ``RECORD`` file lists every installed file with its size, so no
+file needs to be stat'ed except the few RECORD leaves without one (the RECORD
+itself, bytecode compiled after installation). Distributions without a
+``RECORD`` (``*.egg-info``, some vendored installs) are measured by walking
+their top-level packages.
+
+Each distribution is attributed to the top-level requirements of
+``requirements.txt`` that pull it in through ``Requires-Dist`` (environment
+markers are evaluated for the doctor's interpreter, with the requested extras).
+Distributions are read on a thread pool and cached in the ``dist_footprint``
+cache by dist-info path and RECORD mtime, so only changed distributions are
+read again.
+"""
+
+import csv
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Mapping, Optional, TypedDict
+
+from packaging.markers import InvalidMarker
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+
+from azure_functions_doctor.cache import JsonCache
+from azure_functions_doctor.coldstart import VENV_DIRS
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.deploy_size import format_bytes
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_MAX_WORKERS = 8
+_NATIVE_SUFFIXES = (".so", ".pyd", ".dylib", ".dll")
+# Footprints kept in the cache beyond those used in the current run
+_MAX_CACHE_ENTRIES = 20_000
+_MAX_LISTED = 5
+
+
+class Distribution(TypedDict):
+    name: str
+    version: str
+    bytes: int
+    files: int
+    native_bytes: int
+    required_by: list[str]
+
+
+class RequirementFootprint(TypedDict):
+    requirement: str
+    bytes: int
+    native_bytes: int
+    distributions: list[str]
+
+
+class FootprintReport(TypedDict):
+    site_packages: str
+    total_bytes: int
+    file_count: int
+    native_bytes: int
+    distributions: list[Distribution]
+    requirements: list[RequirementFootprint]
+    unattributed: list[str]
+
+
+def site_packages(root: Path, environ: Optional[Mapping[str, str]] = None) -> Optional[Path]:
+    """Installed packages of ``.python_packages``, else of a virtual environment in the project or ``$VIRTUAL_ENV``."""
+    environ = os.environ if environ is None else environ
+    root = Path(root)
+    environments = [root / ".python_packages"] + [root / name for name in VENV_DIRS]
+    if environ.get("VIRTUAL_ENV"):
+        environments.append(Path(environ["VIRTUAL_ENV"]))
+    for env in environments:
+        candidates = [env / "lib" / "site-packages", env / "Lib" / "site-packages"]
+        candidates.extend(sorted((env / "lib").glob("python3*/site-packages")))
+        for candidate in candidates:
+            if candidate.is_dir():
+                return candidate
+    return None
+
+
+def _is_native(name: str) -> bool:
+    return name.endswith(_NATIVE_SUFFIXES) or ".so." in name
+
+
+def _read_metadata(dist_info: Path) -> tuple[str, str, list[str]]:
+    """Name, version and ``Requires-Dist`` entries from the metadata headers."""
+    name, version, requires = dist_info.name.split("-")[0], "", []
+    metadata = dist_info / ("PKG-INFO" if dist_info.suffix == ".egg-info" else "METADATA")
+    try:
+        with metadata.open(encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    # Headers end at the first blank line; the description follows
+                    break
+                key, _, value = line.partition(":")
+                if key == "Name":
+                    name = value.strip()
+                elif key == "Version":
+                    version = value.strip()
+                elif key == "Requires-Dist":
+                    requires.append(value.strip())
+    except OSError as exc:
+        logger.debug(f"Cannot read {metadata}: {exc}")
+    if dist_info.suffix == ".egg-info":
+        requires.extend(_egg_requires(dist_info))
+    return name, version, requires
+
+
+def _egg_requires(egg_info: Path) -> list[str]:
+    """``requires.txt`` of an egg-info directory; ``[extra]`` sections become ``extra`` markers."""
+    requires: list[str] = []
+    section = ""
+    try:
+        lines = (egg_info / "requires.txt").read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return requires
+    for line in (line.strip() for line in lines):
+        if line.startswith("["):
+            section = line.strip("[]")
+        elif line:
+            extra, _, marker = section.partition(":")
+            markers = [m for m in (f'extra == "{extra}"' if extra else "", marker) if m]
+            requires.append(f"{line}; {' and '.join(markers)}" if markers else line)
+    return requires
+
+
+def _measure_record(site: Path, record: Path) -> tuple[int, int, int]:
+    total = files = native = 0
+    with record.open(encoding="utf-8", errors="replace", newline="") as f:
+        for row in csv.reader(f):
+            if not row or not row[0]:
+                continue
+            if len(row) > 2 and row[2].isdigit():
+                size = int(row[2])
+            else:
+                try:
+                    size = os.stat(os.path.join(site, row[0])).st_size
+                except OSError:
+                    continue
+            total += size
+            files += 1
+            if _is_native(row[0]):
+                native += size
+    return total, files, native
+
+
+def _measure_tree(site: Path, dist_info: Path) -> tuple[int, int, int]:
+    """Walk the distribution's top-level packages and modules when it has no RECORD."""
+    try:
+        names = (dist_info / "top_level.txt").read_text(encoding="utf-8").split()
+    except OSError:
+        names = [dist_info.name.split("-")[0]]
+    total = files = native = 0
+    paths = [dist_info]
+    for name in names:
+        paths.extend(p for p in (site / name, site / f"{name}.py") if p.exists())
+    for path in paths:
+        walked = [(str(path.parent), [], [path.name])] if path.is_file() else os.walk(path)
+        for directory, _, filenames in walked:
+            for filename in filenames:
+                try:
+                    size = os.stat(os.path.join(directory, filename)).st_size
+                except OSError:
+                    continue
+                total += size
+                files += 1
+                if _is_native(filename):
+                    native += size
+    return total, files, native
+
+
+def read_distribution(site: Path, dist_info: Path) -> dict[str, Any]:
+    """Name, version, requirements and installed bytes/files/native bytes of one distribution."""
+    name, version, requires = _read_metadata(dist_info)
+    record = dist_info / "RECORD"
+    total, files, native = _measure_record(site, record) if record.is_file() else _measure_tree(site, dist_info)
+    return {"name": name, "version": version, "requires": requires, "bytes": total, "files": files, "native": native}
+
+
+@lru_cache(maxsize=4096)
+def _parse_requirement(text: str) -> Optional[Requirement]:
+    try:
+        return Requirement(text)
+    except InvalidRequirement:
+        return None
+
+
+def _dependencies(requires: list[str], extras: frozenset[str]) -> list[tuple[str, frozenset[str]]]:
+    """Canonical names (with extras) of the ``Requires-Dist`` entries that apply when ``extras`` are requested."""
+    found: list[tuple[str, frozenset[str]]] = []
+    for text in requires:
+        requirement = _parse_requirement(text)
+        if requirement is None:
+            continue
+        if requirement.marker is not None:
+            try:
+                if not any(requirement.marker.evaluate({"extra": extra}) for extra in (*extras, "")):
+                    continue
+            except InvalidMarker:
+                continue
+        found.append((canonicalize_name(requirement.name), frozenset(requirement.extras)))
+    return found
+
+
+class FootprintAnalyzer:
+    """Reads the distributions of one site-packages directory, reusing cached footprints."""
+
+    def __init__(self, site: Path, cache: Optional[JsonCache] = None) -> None:
+        self.site = Path(site)
+        self._cache = cache if cache is not None else JsonCache("dist_footprint")
+        self.read = 0
+
+    def _dist_infos(self) -> list[Path]:
+        try:
+            with os.scandir(self.site) as entries:
+                return sorted(
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.name.endswith((".dist-info", ".egg-info")) and entry.is_dir()
+                )
+        except OSError as exc:
+            logger.debug(f"Cannot list {self.site}: {exc}")
+            return []
+
+    @staticmethod
+    def _key(dist_info: Path) -> str:
+        record = dist_info / "RECORD"
+        try:
+            mtime = os.stat(record if record.is_file() else dist_info).st_mtime_ns
+        except OSError:
+            mtime = 0
+        return f"{dist_info}:{mtime}"
+
+    def distributions(self, workers: int = _MAX_WORKERS) -> dict[str, dict[str, Any]]:
+        """Canonical name -> footprint of every installed distribution."""
+        dist_infos = self._dist_infos()
+        keys = [self._key(dist_info) for dist_info in dist_infos]
+        data = self._cache.data()
+        missing = [(key, dist_info) for key, dist_info in zip(keys, dist_infos) if not isinstance(data.get(key), dict)]
+        if missing:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dist-footprint") as executor:
+                for (key, _), entry in zip(
+                    missing, executor.map(lambda m: read_distribution(self.site, m[1]), missing)
+                ):
+                    self._cache.set(key, entry)
+            self.read = len(missing)
+            if len(data) > _MAX_CACHE_ENTRIES:
+                used = set(keys)
+                for key in [key for key in data if key not in used]:
+                    self._cache.pop(key)
+            self._cache.save()
+        return {canonicalize_name(data[key]["name"]): data[key] for key in keys}
+
+
+def _closure(installed: dict[str, dict[str, Any]], name: str, extras: frozenset[str]) -> set[str]:
+    """Installed distributions reachable from ``name`` (itself included), following requested extras."""
+    seen: dict[str, frozenset[str]] = {}
+    queue = deque([(name, extras)])
+    while queue:
+        current, wanted = queue.popleft()
+        if current not in installed:
+            continue
+        known = seen.get(current)
+        if known is not None and wanted <= known:
+            continue
+        seen[current] = wanted | (known or frozenset())
+        queue.extend(_dependencies(installed[current]["requires"], seen[current]))
+    return set(seen)
+
+
+def measure_footprint(
+    root: Path,
+    context: Optional[ProjectContext] = None,
+    site: Optional[Path] = None,
+    top: int = 20,
+    cache: Optional[JsonCache] = None,
+) -> Optional[FootprintReport]:
+    """Footprint of the project's installed distributions, or None when no environment is found."""
+    root = Path(root)
+    context = context or ProjectContext(root)
+    # The run's environment, not the process's: the daemon serves clients with their own $VIRTUAL_ENV
+    site = site or site_packages(root, context.environ)
+    if site is None:
+        return None
+    installed = FootprintAnalyzer(site, cache).distributions()
+
+    index = context.requirements()
+    roots: dict[str, frozenset[str]] = {}
+    for declared in index:
+        if declared.applies():
+            canonical = str(canonicalize_name(declared.name))
+            roots[canonical] = roots.get(canonical, frozenset()) | declared.extras
+    if not roots:
+        # Without requirements.txt, the distributions nothing else requires are the top level
+        required = {dep for entry in installed.values() for dep, _ in _dependencies(entry["requires"], frozenset())}
+        roots = {name: frozenset() for name in installed if name not in required}
+
+    required_by: dict[str, list[str]] = {name: [] for name in installed}
+    requirements: list[RequirementFootprint] = []
+    for requirement, extras in sorted(roots.items()):
+        closure = _closure(installed, requirement, extras)
+        if not closure:
+            continue
+        for name in closure:
+            required_by[name].append(requirement)
+        members = sorted(closure, key=lambda n: -installed[n]["bytes"])
+        requirements.append(
+            {
+                "requirement": requirement,
+                "bytes": sum(installed[n]["bytes"] for n in closure),
+                "native_bytes": sum(installed[n]["native"] for n in closure),
+                "distributions": [f"{installed[n]['name']} {format_bytes(installed[n]['bytes'])}" for n in members],
+            }
+        )
+    requirements.sort(key=lambda r: -r["bytes"])
+
+    distributions: list[Distribution] = [
+        {
+            "name": entry["name"],
+            "version": entry["version"],
+            "bytes": entry["bytes"],
+            "files": entry["files"],
+            "native_bytes": entry["native"],
+            "required_by": required_by[name],
+        }
+        for name, entry in installed.items()
+    ]
+    distributions.sort(key=lambda d: -d["bytes"])
+    return {
+        "site_packages": str(site),
+        "total_bytes": sum(d["bytes"] for d in distributions),
+        "file_count": sum(d["files"] for d in distributions),
+        "native_bytes": sum(d["native_bytes"] for d in distributions),
+        "distributions": distributions[:top],
+        "requirements": requirements,
+        "unattributed": sorted(d["name"] for d in distributions if not d["required_by"]),
+    }
+
+
+def heavy_requirements(report: FootprintReport, max_bytes: int) -> list[str]:
+    """Top-level requirements whose installed closure exceeds ``max_bytes``, with their heaviest members."""
+    return [
+        f"{r['requirement']} installs {format_bytes(r['bytes'])} ({', '.join(r['distributions'][:_MAX_LISTED])})"
+        for r in report["requirements"]
+        if r["bytes"] > max_bytes
+    ]
@@ -1,29 +1,42 @@
 import importlib.resources
 import json
+import os
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import TypedDict
+from typing import Collection, Mapping, Optional, Sequence
 
+from azure_functions_doctor.config import get_config
+from azure_functions_doctor.context import ProjectContext
 from azure_functions_doctor.handlers import Rule, generic_handler
 from azure_functions_doctor.logging_config import get_logger, log_rule_execution
+from azure_functions_doctor.results import Check, CheckResult, Section, Status
+from azure_functions_doctor.results import SectionResult as SectionResult  # re-exported for existing imports
+from azure_functions_doctor.rule_packs import load_rule_packs, merge_rules
+from azure_functions_doctor.rule_schema import ValidatedDigests
+from azure_functions_doctor.scheduler import RuleTimings
 
 logger = get_logger(__name__)
 
+# Upper bound on worker threads when parallel execution is enabled without an explicit job count
+_MAX_DEFAULT_JOBS = 8
 
-class CheckResult(TypedDict, total=False):
-    label: str
-    value: str
-    status: str
-    hint: str
-    hint_url: str
 
+def select_rules(rules: list[Rule], only: Sequence[str] = (), skip: Sequence[str] = ()) -> list[Rule]:
+    """
+    Keep the rules matching any ``only`` selector (all rules when empty) and no ``skip`` selector.
+
+    A selector matches a rule's id, section, category or handler type and may use
+    shell-style wildcards, e.g. ``python_env``, ``check_azure_*`` or ``compare_version``.
+    """
+
+    def matches(rule: Rule, selectors: Sequence[str]) -> bool:
+        fields = [str(rule.get(key, "")) for key in ("id", "section", "category", "type")]
+        return any(fnmatchcase(field, selector) for selector in selectors for field in fields)
 
-class SectionResult(TypedDict):
-    title: str
-    category: str
-    status: str  # 'pass' or 'fail'
-    items: list[CheckResult]
+    return [rule for rule in rules if (not only or matches(rule, only)) and not matches(rule, skip)]
 
 
 class Doctor:
@@ -36,60 +49,97 @@ class Doctor:
     appropriate v1/v2 files are present in package assets.
     """
 
-    def __init__(self, path: str = ".", allow_v1: bool = False) -> None:
+    def __init__(
+        self,
+        path: str = ".",
+        allow_v1: bool = False,
+        programming_model: Optional[str] = None,
+        tracked_only: bool = False,
+    ) -> None:
         self.project_path: Path = Path(path).resolve()
-        self.programming_model = self._detect_programming_model()
-        # If v1 detected in nested function folders (function.json not at project root)
-        # and caller did not allow v1, signal incompatibility.
-        function_json_files = list(self.project_path.rglob("function.json"))
+        # Shared inputs (file listing, parsed files, tool probes) reused by detection and every rule.
+        # In a git work tree ``tracked_only`` lists only files in the index, skipping the untracked-file walk.
+        self.context = ProjectContext(self.project_path, untracked=not tracked_only)
+        self._rules_by_model: dict[str, list[Rule]] = {}
+        self._custom_rules: Optional[list[Rule]] = None
+        # Rule files (built-in and custom) are validated only when their content is new
+        self._digests = ValidatedDigests()
+        # Detected on first use, so rule selections that do not depend on the model never walk the tree
+        self._programming_model = programming_model
+        if programming_model is not None or allow_v1:
+            return
+        self.reject_nested_v1()
+
+    def reject_nested_v1(self) -> None:
+        """Raise SystemExit when function.json files sit in nested function folders (v1, limited support)."""
+        function_json_files = self.context.files.rglob("function.json")
         nested_v1 = any(f.parent.resolve() != self.project_path for f in function_json_files)
 
-        if nested_v1 and not allow_v1:
+        if nested_v1:
             raise SystemExit("v1 programming model detected - limited support")
 
+    @property
+    def model_detected(self) -> bool:
+        """Whether the programming model is already known (given or detected), so the tree may have been walked."""
+        return self._programming_model is not None
+
+    @property
+    def programming_model(self) -> str:
+        """The project's programming model ('v1' or 'v2'), detected on first access unless given."""
+        if self._programming_model is None:
+            self._programming_model = self._detect_programming_model()
+        return self._programming_model
+
+    @programming_model.setter
+    def programming_model(self, value: str) -> None:
+        self._programming_model = value
+
     def _detect_programming_model(self) -> str:
         """Detect the Azure Functions programming model version.
 
         Returns:
-            str: 'v1' if function.json files are found, 'v2' if @app decorators are found,
-                 'v2' as default if neither is clearly detected.
+            str: 'v1' if function.json files are found, otherwise 'v2' (decorator-based
+                 projects and projects without clear indicators alike).
         """
-        # Check for v1: function.json files
-        function_json_files = list(self.project_path.rglob("function.json"))
+        # Check for v1: function.json files. Without them the project is treated as v2
+        # whether or not @app decorators are present, so the sources need not be read.
+        function_json_files = self.context.files.rglob("function.json")
         if function_json_files:
             return "v1"
-
-        # Check for v2: @app decorators in Python files
-        if self._has_v2_decorators():
-            return "v2"
-
-        # Default to v2 (current primary support)
         return "v2"
 
-    def _has_v2_decorators(self) -> bool:
-        """Check if the project uses v2 decorators (@app.*)."""
-        python_files = list(self.project_path.rglob("*.py"))
-
-        for py_file in python_files:
-            try:
-                with py_file.open(encoding="utf-8") as f:
-                    content = f.read()
-                    if "@app." in content:
-                        return True
-            except (OSError, UnicodeDecodeError):
-                # Skip files that can't be read
-                continue
-
-        return False
-
-    def load_rules(self) -> list[Rule]:
-        """Load rules based on detected programming model."""
-        if self.programming_model == "v2":
-            return self._load_v2_rules()
-        elif self.programming_model == "v1":
-            return self._load_v1_rules()
+    def load_rules(self, only: Sequence[str] = (), skip: Sequence[str] = ()) -> list[Rule]:
+        """
+        Load the rules of the detected programming model, optionally narrowed by selectors.
+
+        See :func:`select_rules` for the selector syntax. When a selection picks
+        the same rules under both models, the model is not detected at all.
+        """
+        if (only or skip) and self._programming_model is None:
+            v1_rules = select_rules(self._model_rules("v1"), only, skip)
+            v2_rules = select_rules(self._model_rules("v2"), only, skip)
+            if v1_rules == v2_rules:
+                return v2_rules
+        return select_rules(self._model_rules(self.programming_model), only, skip)
+
+    def _model_rules(self, model: str) -> list[Rule]:
+        """Rules of ``model`` merged with custom rule packs, in check order (loaded once per Doctor instance)."""
+        cached = self._rules_by_model.get(model)
+        if cached is not None:
+            return list(cached)
+        if model == "v2":
+            rules = self._load_v2_rules()
+        elif model == "v1":
+            rules = self._load_v1_rules()
         else:
             raise RuntimeError("Unknown programming model; no rules to load")
+        if self._custom_rules is None:
+            self._custom_rules = load_rule_packs(digests=self._digests)
+        if self._custom_rules:
+            rules = merge_rules(rules, self._custom_rules, model)
+        self._digests.save()
+        self._rules_by_model[model] = rules
+        return list(rules)
 
     def _load_v2_rules(self) -> list[Rule]:
         """Load complete v2 rules set."""
@@ -99,13 +149,15 @@ class Doctor:
         try:
             rules_path = files_obj.joinpath("rules/v2.json")
             with rules_path.open(encoding="utf-8") as f:
-                v2_rules = json.load(f)
+                content = f.read()
+            v2_rules = json.loads(content)
         except FileNotFoundError as e:
             logger.error("v2.json not found")
             raise RuntimeError("v2.json not found") from e
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in v2.json: {e}")
             raise RuntimeError(f"Failed to parse v2.json: {e}") from e
+        self._digests.ensure_valid("v2.json", content, v2_rules)
 
         return sorted(list(v2_rules), key=lambda r: r.get("check_order", 999))
 
@@ -117,72 +169,174 @@ class Doctor:
         try:
             rules_path = files_obj.joinpath("rules/v1.json")
             with rules_path.open(encoding="utf-8") as f:
-                v1_rules = json.load(f)
+                content = f.read()
+            v1_rules = json.loads(content)
         except FileNotFoundError as e:
             logger.error("v1.json not found")
             raise RuntimeError("v1.json not found") from e
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in v1.json: {e}")
             raise RuntimeError(f"Failed to parse v1.json: {e}") from e
+        self._digests.ensure_valid("v1.json", content, v1_rules)
 
         return sorted(list(v1_rules), key=lambda r: r.get("check_order", 999))
 
     # Legacy `rules.json` support removed per repository simplification.
 
-    def run_all_checks(self) -> list[SectionResult]:
-        rules = self.load_rules()
+    def refresh(self) -> None:
+        """Drop cached project inputs so the next run re-reads the tree and re-detects the model."""
+        self.context = ProjectContext(
+            self.project_path,
+            environ=self.context.environ,
+            overlays=self.context.overlays,
+            untracked=self.context.untracked,
+        )
+        self._programming_model = None
+        # Custom rule packs may have been edited as well
+        self._rules_by_model.clear()
+        self._custom_rules = None
+
+    def redetect(self) -> bool:
+        """Re-run model detection against the current context; returns True if the model changed."""
+        previous = self.programming_model
+        self.programming_model = self._detect_programming_model()
+        return self.programming_model != previous
+
+    def evaluate_rule(self, rule: Rule, context: Optional[ProjectContext] = None) -> Check:
+        """Run a single rule and map the handler outcome onto a displayable check result."""
+        # Time rule execution for logging
+        rule_start = time.perf_counter()
+        result = generic_handler(rule, self.project_path, context if context is not None else self.context)
+        rule_duration_ms = (time.perf_counter() - rule_start) * 1000
+
+        log_rule_execution(rule["id"], rule["type"], result.status.value, rule_duration_ms)
+
+        # Simplified canonical mapping: pass stays pass, else required -> fail, optional -> warn
+        required = rule.get("required", True)
+        if result.status is Status.PASS:
+            canonical = Status.PASS
+        else:
+            canonical = Status.FAIL if required else Status.WARN
+
+        detail = result.detail
+        if canonical is not Status.PASS and not required:
+            detail += " (optional)"
+
+        return Check(
+            rule["id"],
+            rule.get("label", rule["id"]),
+            detail,
+            canonical,
+            hint=rule.get("hint"),
+            hint_url=rule.get("hint_url") or None,
+            duration_ms=round(rule_duration_ms, 3),
+        )
+
+    def run_all_checks(
+        self,
+        reuse: Optional[Mapping[str, CheckResult]] = None,
+        jobs: Optional[int] = None,
+        fail_fast: bool = False,
+        only: Sequence[str] = (),
+        skip: Sequence[str] = (),
+        rule_ids: Optional[Collection[str]] = None,
+    ) -> list[Section]:
+        """
+        Run every rule of the detected model and group the results by section.
+
+        ``reuse`` maps rule ids to previously computed results that are reported
+        as-is instead of re-running those rules. ``jobs`` is the number of worker
+        threads (default: one, or the CPU count when parallel execution is
+        enabled in the config). With ``fail_fast`` the cheapest rules run first
+        and execution stops at the first required failure; rules that did not
+        run are left out of the report. Results are always reported in
+        ``check_order`` regardless of the order the scheduler ran them in.
+        ``only`` and ``skip`` narrow the rules (see :func:`select_rules`); shared
+        inputs such as the file index are only built if a selected rule needs them.
+        ``rule_ids`` further restricts the run to those ids, e.g. one shard's share;
+        such partial runs do not update the learned timings. The sections read like
+        ``SectionResult`` dicts; use ``to_dict()`` (or :func:`results.to_dicts`) for JSON.
+        """
+        rules = self.load_rules(only, skip)
+        if rule_ids is not None:
+            rules = [rule for rule in rules if rule["id"] in rule_ids]
+        reuse = reuse or {}
+        context = self.context
+        if jobs is None:
+            jobs = min(_MAX_DEFAULT_JOBS, os.cpu_count() or 1) if get_config().is_parallel_execution_enabled() else 1
+        # Start every external tool probe up front so they run concurrently
+        version_targets = [
+            str(rule.get("condition", {}).get("target"))
+            for rule in rules
+            if rule.get("type") == "compare_version" and rule["id"] not in reuse
+        ]
+        if any(target != "python" for target in version_targets):
+            from azure_functions_doctor.probes import is_probe_target
+
+            probe_targets = [target for target in version_targets if is_probe_target(target)]
+            if probe_targets:
+                context.target_values(probe_targets)
+
+        timings = RuleTimings(self.project_path)
+        pending = timings.schedule((rule for rule in rules if rule["id"] not in reuse), cheapest_first=fail_fast)
+        evaluated = self._execute(pending, context, jobs, fail_fast)
+        if rule_ids is None:
+            # Shards of one run must all plan from the same timings, so partial runs do not record theirs
+            timings.record({rule_id: item["duration_ms"] for rule_id, item in evaluated.items()})
+
         grouped: dict[str, list[Rule]] = defaultdict(list)
 
         for rule in rules:
             grouped[rule["section"]].append(rule)
 
-        results: list[SectionResult] = []
+        results: list[Section] = []
 
         for section, checks in grouped.items():
-            section_result: SectionResult = {
-                "title": section.replace("_", " ").title(),
-                "category": section,
-                "status": "pass",
-                "items": [],
-            }
+            section_result = Section(section)
 
             for rule in checks:
-                # Time rule execution for logging
-                rule_start = time.time()
-                result = generic_handler(rule, self.project_path)
-                rule_duration_ms = (time.time() - rule_start) * 1000
-
-                handler_status = result.get("status", "fail")
-                log_rule_execution(rule["id"], rule["type"], handler_status, rule_duration_ms)
-
-                # Simplified canonical mapping: pass stays pass, else required -> fail, optional -> warn
-                required = rule.get("required", True)
-                if handler_status == "pass":
-                    canonical = "pass"
+                reused = reuse.get(rule["id"])
+                if reused is not None:
+                    item = Check.from_dict(reused)
+                    # The rule did not run, so it has no duration of its own
+                    item.duration_ms = None
+                elif rule["id"] in evaluated:
+                    item = evaluated[rule["id"]]
                 else:
-                    canonical = "fail" if required else "warn"
+                    # Skipped after a fail-fast stop
+                    continue
+                section_result.append(item)
 
-                detail = result.get("detail", "")
-                if canonical != "pass" and not required:
-                    detail += " (optional)"
-
-                item: CheckResult = {
-                    "label": rule.get("label", rule["id"]),
-                    "value": detail,
-                    "status": canonical,
-                }
-
-                if canonical == "fail" and required:
-                    section_result["status"] = "fail"
-
-                if "hint" in rule:
-                    item["hint"] = rule["hint"]
-
-                if "hint_url" in rule and rule["hint_url"]:
-                    item["hint_url"] = rule["hint_url"]
-
-                section_result["items"].append(item)
-
-            results.append(section_result)
+            if section_result.checks:
+                results.append(section_result)
 
         return results
+
+    def _execute(self, rules: list[Rule], context: ProjectContext, jobs: int, fail_fast: bool) -> dict[str, Check]:
+        """Evaluate ``rules`` in the given order, on ``jobs`` threads, stopping early for ``fail_fast``."""
+        evaluated: dict[str, Check] = {}
+        if jobs <= 1 or len(rules) <= 1:
+            for rule in rules:
+                item = self.evaluate_rule(rule, context)
+                evaluated[rule["id"]] = item
+                if fail_fast and item.status is Status.FAIL:
+                    break
+            return evaluated
+
+        # Create the shared file index up front (its walk is lazy and locked) so workers share one walk
+        _ = context.files
+        # Executor queues are FIFO, so submission order is the start order
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="doctor-rule") as executor:
+            futures = {executor.submit(self.evaluate_rule, rule, context): rule["id"] for rule in rules}
+            for future in as_completed(futures):
+                item = future.result()
+                evaluated[futures[future]] = item
+                if fail_fast and item.status is Status.FAIL:
+                    for other in futures:
+                        other.cancel()
+                    break
+        # Rules already running when fail-fast stopped have finished by now; keep their results
+        for future, rule_id in futures.items():
+            if rule_id not in evaluated and future.done() and not future.cancelled():
+                evaluated[rule_id] = future.result()
+        return evaluated
@@ -0,0 +1,106 @@
+"""
+PATH executable index shared by tool checks.
+
+``shutil.which`` walks every PATH entry and stats each candidate on every call.
+``ExecutableIndex`` lists each PATH directory once with ``os.scandir`` and then
+answers any number of lookups from memory.
+"""
+
+import os
+import sys
+from typing import Optional
+
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_IS_WINDOWS = sys.platform.startswith("win")
+
+
+class ExecutableIndex:
+    """
+    Lazily built map of executable names to their first resolved path on PATH.
+
+    The directory listing happens on the first lookup; the executable bit is
+    checked only for names that are actually looked up, and each answer is
+    memoized so repeated checks for the same tool cost a dict lookup.
+    """
+
+    def __init__(self, path_env: Optional[str] = None, pathext: Optional[str] = None) -> None:
+        self._path_env = os.environ.get("PATH", os.defpath) if path_env is None else path_env
+        if _IS_WINDOWS:
+            raw_ext = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD") if pathext is None else pathext
+            self._pathext: tuple[str, ...] = tuple(ext.lower() for ext in raw_ext.split(os.pathsep) if ext)
+        else:
+            self._pathext = ()
+        self._candidates: Optional[dict[str, list[str]]] = None
+        self._resolved: dict[str, Optional[str]] = {}
+
+    @property
+    def directories(self) -> list[str]:
+        """PATH entries in lookup order, without duplicates or empty entries."""
+        seen: set[str] = set()
+        ordered: list[str] = []
+        for entry in self._path_env.split(os.pathsep):
+            if not entry:
+                continue
+            key = os.path.normcase(entry)
+            if key not in seen:
+                seen.add(key)
+                ordered.append(entry)
+        return ordered
+
+    def which(self, name: str) -> Optional[str]:
+        """Return the first executable named ``name`` on PATH, like ``shutil.which``."""
+        if name in self._resolved:
+            return self._resolved[name]
+
+        if os.path.dirname(name):
+            resolved = name if _is_executable(name) else None
+        else:
+            resolved = None
+            for candidate in self._index().get(self._key(name), []):
+                if _is_executable(candidate):
+                    resolved = candidate
+                    break
+
+        self._resolved[name] = resolved
+        return resolved
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.which(name) is not None
+
+    def _key(self, name: str) -> str:
+        if not _IS_WINDOWS:
+            return name
+        lowered = name.lower()
+        root, ext = os.path.splitext(lowered)
+        return root if ext in self._pathext else lowered
+
+    def _index(self) -> dict[str, list[str]]:
+        if self._candidates is not None:
+            return self._candidates
+
+        candidates: dict[str, list[str]] = {}
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if _IS_WINDOWS:
+                            root, ext = os.path.splitext(entry.name.lower())
+                            if ext not in self._pathext:
+                                continue
+                            candidates.setdefault(root, []).append(entry.path)
+                            candidates.setdefault(entry.name.lower(), []).append(entry.path)
+                        else:
+                            candidates.setdefault(entry.name, []).append(entry.path)
+            except OSError as exc:
+                logger.debug(f"Skipping unreadable PATH entry {directory}: {exc}")
+                continue
+
+        self._candidates = candidates
+        return candidates
+
+
+def _is_executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
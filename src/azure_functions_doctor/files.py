@@ -0,0 +1,203 @@
+"""
+Project file enumeration shared by all rules of a run.
+
+Handlers used to call ``Path.rglob`` independently, walking the whole tree once
+per rule. ``FileIndex`` walks the tree a single time with ``os.scandir`` and
+answers glob queries from memory with ``Path.rglob`` matching semantics.
+
+Inside a git work tree the listing comes from the git index instead (see
+:mod:`azure_functions_doctor.git_index`): tracked files, plus untracked files
+that are not ignored when ``untracked`` is set. Ignored files are therefore not
+listed there; queries that must see them (unwanted-file checks, since
+``.funcignore`` rather than ``.gitignore`` decides what is deployed) pass
+``include_ignored`` and get a full walk. Outside a work tree, or when the index
+cannot be read, the tree is walked.
+"""
+
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Pattern
+
+from azure_functions_doctor.git_index import GitIndex, GitIndexError
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class FileIndex:
+    """
+    In-memory listing of every file and directory below a project root.
+
+    Entries are stored as POSIX-style relative paths in walk order. Symlinked
+    directories are listed but not descended into, which also protects the walk
+    from symlink cycles.
+    """
+
+    def __init__(self, root: Path, untracked: bool = False) -> None:
+        self.root = Path(root)
+        self.untracked = untracked
+        # Set when the listing came from the git index
+        self.git: Optional[GitIndex] = None
+        self._git_prefix = ""
+        self._entries: Optional[list[tuple[str, bool]]] = None
+        # Full walk, only taken when a query must also see files the git listing leaves out
+        self._walked: Optional[list[tuple[str, bool]]] = None
+        self._glob_cache: dict[tuple[str, bool], list[Path]] = {}
+        # Rules may run on several threads; the walk is too expensive to do twice
+        self._walk_lock = threading.Lock()
+
+    @property
+    def entries(self) -> list[tuple[str, bool]]:
+        """``(relative_path, is_dir)`` pairs for every entry, walking the tree on first access."""
+        entries = self._entries
+        if entries is None:
+            with self._walk_lock:
+                if self._entries is None:
+                    self._entries = self._list()
+                entries = self._entries
+        return entries
+
+    @property
+    def files(self) -> list[str]:
+        """Relative paths of every non-directory entry."""
+        return [rel for rel, is_dir in self.entries if not is_dir]
+
+    def all_entries(self) -> list[tuple[str, bool]]:
+        """Like ``entries``, but including ignored and untracked files when the listing came from git."""
+        entries = self.entries
+        if self.git is None:
+            return entries
+        walked = self._walked
+        if walked is None:
+            with self._walk_lock:
+                if self._walked is None:
+                    self._walked = self._walk()
+                walked = self._walked
+        return walked
+
+    def rglob(self, pattern: str, include_ignored: bool = False) -> list[Path]:
+        """
+        Return absolute paths matching ``pattern`` at any depth, like ``Path.rglob``.
+
+        Set ``include_ignored`` when files git ignores matter too, e.g. build
+        output that would still be deployed; in a git work tree that walks the
+        tree once.
+        """
+        key = (pattern, include_ignored)
+        cached = self._glob_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        dir_only = pattern.endswith("/")
+        regex = _compile_rglob(pattern)
+        matches = [
+            self.root / rel
+            for rel, is_dir in (self.all_entries() if include_ignored else self.entries)
+            if (is_dir or not dir_only) and regex.fullmatch(rel) is not None
+        ]
+        self._glob_cache[key] = matches
+        return list(matches)
+
+    def content_signature(self, path: Path, st: os.stat_result) -> Optional[str]:
+        """Git object id of ``path`` when the index shows it unchanged; None for walked listings."""
+        if self.git is None:
+            return None
+        root = str(self.root)
+        name = str(path)
+        if not name.startswith(root) or name[len(root) : len(root) + 1] != os.sep:
+            return None
+        rel = name[len(root) + 1 :].replace(os.sep, "/")
+        return self.git.content_signature(self._git_prefix + rel, st)
+
+    def _list(self) -> list[tuple[str, bool]]:
+        try:
+            git = GitIndex.load(self.root)
+            if git is not None:
+                entries = git.listing(self.root, untracked=self.untracked)
+                self._git_prefix = git.prefix(self.root)
+                self.git = git
+                return entries
+        except (GitIndexError, OSError, ValueError) as exc:
+            logger.debug(f"Cannot list {self.root} from the git index ({exc}); walking the tree")
+        return self._walk()
+
+    def _walk(self) -> list[tuple[str, bool]]:
+        entries: list[tuple[str, bool]] = []
+        stack: list[tuple[str, str]] = [(str(self.root), "")]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    children = sorted(it, key=lambda e: e.name)
+            except OSError as exc:
+                logger.debug(f"Skipping unreadable directory {directory}: {exc}")
+                continue
+            subdirs: list[tuple[str, str]] = []
+            for entry in children:
+                rel = f"{prefix}{entry.name}"
+                try:
+                    is_dir = entry.is_dir()
+                    descend = is_dir and not entry.is_symlink()
+                except OSError:
+                    is_dir = descend = False
+                entries.append((rel, is_dir))
+                if descend:
+                    subdirs.append((entry.path, f"{rel}/"))
+            # Depth-first in name order, matching the listing order users expect
+            stack.extend(reversed(subdirs))
+        return entries
+
+
+def matches_rglob(pattern: str, relative_path: str) -> bool:
+    """
+    Return True if ``relative_path`` (POSIX style) matches ``pattern`` or lies inside a match.
+
+    A change to ``tests/unit/a.py`` therefore matches the directory pattern ``tests/``.
+    """
+    regex = _compile_rglob(pattern)
+    parts = relative_path.strip("/").split("/")
+    for end in range(len(parts), 0, -1):
+        if regex.fullmatch("/".join(parts[:end])) is not None:
+            return True
+    return False
+
+
+@lru_cache(maxsize=256)
+def _compile_rglob(pattern: str) -> Pattern[str]:
+    """Translate an ``rglob`` pattern into a regex matched against relative POSIX paths."""
+    segments = ["**"] + [seg for seg in pattern.strip("/").split("/") if seg and seg != "."]
+    parts: list[str] = []
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            parts.append("(?:[^/]+/)*[^/]+" if last else "(?:[^/]+/)*")
+        else:
+            parts.append(_translate_segment(segment) + ("" if last else "/"))
+    return re.compile("".join(parts))
+
+
+def _translate_segment(segment: str) -> str:
+    out: list[str] = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", i + 2 if segment[i + 1 : i + 2] in ("!", "]") else i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = segment[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
@@ -0,0 +1,348 @@
+"""
+Project file listing read from the git index.
+
+In a git work tree the tracked files are already recorded in ``.git/index``,
+together with the stat data git saw when it last refreshed each of them.
+:class:`GitIndex` parses that file directly (index versions 2 to 4, SHA-1 and
+SHA-256 repositories) without running git, so listing a checkout never walks
+ignored trees such as ``.venv`` or ``node_modules``. Untracked files that are
+not ignored are added only on request, by a walk that prunes ignored
+directories using ``.gitignore`` files and ``.git/info/exclude``. The global
+excludes file is not read.
+
+An entry whose stat data still matches the file on disk, and which is not
+racily clean, has its content identified by the entry's object id.
+:meth:`GitIndex.content_signature` returns that id so per-file scan verdicts
+survive changes that only touch mtimes, such as a fresh checkout.
+
+Indexes that cannot be read completely raise :class:`GitIndexError`, and
+callers fall back to walking the tree. This covers split and sparse indexes,
+unknown versions and truncated files.
+"""
+
+import os
+import re
+import struct
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from azure_functions_doctor.deploy_size import FuncIgnore
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SIGNATURE = b"DIRC"
+_HEADER = struct.Struct(">4sII")
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size
+_STAT = struct.Struct(">10I")
+_FLAGS = struct.Struct(">H")
+_EXTENDED = 0x4000
+# Extended flags (index version 3 and later)
+_SKIP_WORKTREE = 0x4000
+_INTENT_TO_ADD = 0x2000
+_TYPE_MASK = 0o170000
+_DIRECTORY = 0o040000
+_GITLINK = 0o160000
+_UNSUPPORTED_EXTENSIONS = {b"link": "split index", b"sdir": "sparse index"}
+
+
+class GitIndexError(Exception):
+    """The git index exists but cannot be used; callers fall back to walking the tree."""
+
+
+class IndexEntry(NamedTuple):
+    path: str  # POSIX style, relative to the top of the work tree
+    mode: int
+    oid: str  # empty for intent-to-add entries, whose content is not recorded
+    ctime_ns: int
+    mtime_ns: int
+    ino: int
+    size: int
+
+
+def find_work_tree(start: Path) -> Optional[tuple[Path, Path]]:
+    """Return ``(top, git_dir)`` of the work tree containing ``start``, or None outside any."""
+    start = Path(start).resolve()
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            # Linked worktrees and submodules point at their git directory
+            try:
+                text = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if not text.startswith("gitdir:"):
+                return None
+            return directory, (directory / text[len("gitdir:") :].strip()).resolve()
+    return None
+
+
+def _hash_size(git_dir: Path) -> int:
+    common = git_dir
+    try:
+        common = (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    except OSError:
+        pass
+    try:
+        config = (common / "config").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return 20
+    return 32 if re.search(r"^\s*objectformat\s*=\s*sha256\s*$", config, re.IGNORECASE | re.MULTILINE) else 20
+
+
+def _varint(data: bytes, offset: int) -> tuple[int, int]:
+    # Git's offset encoding: each continuation byte adds one before shifting
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, offset
+
+
+def _truncate_ns(ns: int) -> int:
+    """Round-trip a timestamp through the index's 32-bit seconds field."""
+    seconds, nanos = divmod(ns, 1_000_000_000)
+    return (seconds & 0xFFFFFFFF) * 1_000_000_000 + nanos
+
+
+def parse_index(data: bytes, hash_size: int = 20) -> list[IndexEntry]:
+    """
+    Parse the bytes of a git index into its work-tree entries.
+
+    Entries outside the work tree (skip-worktree) are dropped, and unmerged
+    paths appear once. Entries are returned in index order.
+    """
+    end = len(data) - hash_size
+    if end < _HEADER.size:
+        raise GitIndexError("index file is truncated")
+    signature, version, count = _HEADER.unpack_from(data)
+    if signature != _SIGNATURE:
+        raise GitIndexError("not a git index file")
+    if version not in (2, 3, 4):
+        raise GitIndexError(f"unsupported index version {version}")
+
+    entries: list[IndexEntry] = []
+    offset = _HEADER.size
+    previous = b""
+    try:
+        for _ in range(count):
+            start = offset
+            ctime_s, ctime_n, mtime_s, mtime_n, _dev, ino, mode, _uid, _gid, size = _STAT.unpack_from(data, offset)
+            offset += _STAT.size
+            oid = data[offset : offset + hash_size]
+            offset += hash_size
+            (flags,) = _FLAGS.unpack_from(data, offset)
+            offset += _FLAGS.size
+            extended = 0
+            if flags & _EXTENDED:
+                if version < 3:
+                    raise GitIndexError("extended entry flags in a version 2 index")
+                (extended,) = _FLAGS.unpack_from(data, offset)
+                offset += _FLAGS.size
+            if version == 4:
+                # Paths are stored as "drop N bytes of the previous path, then append this suffix"
+                strip, offset = _varint(data, offset)
+                if strip > len(previous):
+                    raise GitIndexError("corrupt path prefix")
+                nul = data.index(b"\0", offset)
+                name = previous[: len(previous) - strip] + data[offset:nul]
+                offset = nul + 1
+            else:
+                nul = data.index(b"\0", offset)
+                name = data[offset:nul]
+                # NUL-padded so each entry is a multiple of eight bytes long
+                offset = start + ((nul - start + 8) & ~7)
+            if offset > end:
+                raise GitIndexError("index file is truncated")
+            previous = name
+            if mode & _TYPE_MASK == _DIRECTORY:
+                raise GitIndexError("sparse directory entries are not supported")
+            if extended & _SKIP_WORKTREE:
+                continue
+            path = os.fsdecode(name)
+            # Conflicted paths have one entry per stage, adjacent in the index
+            if entries and entries[-1].path == path:
+                continue
+            entries.append(
+                IndexEntry(
+                    path,
+                    mode,
+                    "" if extended & _INTENT_TO_ADD else oid.hex(),
+                    ctime_s * 1_000_000_000 + ctime_n,
+                    mtime_s * 1_000_000_000 + mtime_n,
+                    ino,
+                    size,
+                )
+            )
+        while offset + 8 <= end:
+            kind = data[offset : offset + 4]
+            if kind in _UNSUPPORTED_EXTENSIONS:
+                raise GitIndexError(f"{_UNSUPPORTED_EXTENSIONS[kind]} is not supported")
+            (length,) = struct.unpack_from(">I", data, offset + 4)
+            offset += 8 + length
+    except (struct.error, IndexError, ValueError) as exc:
+        raise GitIndexError(f"index file is truncated or corrupt: {exc}") from exc
+    return entries
+
+
+def _walk_order(item: tuple[str, bool]) -> tuple[list[str], str]:
+    # The walk lists a directory's children in name order, then descends into its subdirectories in turn
+    parent, _, name = item[0].rpartition("/")
+    return parent.split("/"), name
+
+
+def _read_ignore(path: str) -> Optional[FuncIgnore]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            lines = handle.read().splitlines()
+    except OSError:
+        return None
+    return FuncIgnore(lines) if lines else None
+
+
+class GitIndex:
+    """Entries of a work tree's index, with the index file's mtime for racy-clean detection."""
+
+    def __init__(self, top: Path, git_dir: Path, entries: list[IndexEntry], mtime_ns: int) -> None:
+        self.top = top
+        self.git_dir = git_dir
+        self.entries = entries
+        self.mtime_ns = mtime_ns
+        self._by_path: Optional[dict[str, IndexEntry]] = None
+
+    @classmethod
+    def load(cls, root: Path) -> Optional["GitIndex"]:
+        """Index of the work tree containing ``root``; None outside a work tree."""
+        found = find_work_tree(root)
+        if found is None:
+            return None
+        top, git_dir = found
+        index_path = git_dir / "index"
+        try:
+            with open(index_path, "rb") as handle:
+                data = handle.read()
+                mtime_ns = os.fstat(handle.fileno()).st_mtime_ns
+        except FileNotFoundError:
+            # Nothing has been staged yet
+            return cls(top, git_dir, [], 0)
+        except OSError as exc:
+            raise GitIndexError(f"cannot read {index_path}: {exc}") from exc
+        return cls(top, git_dir, parse_index(data, _hash_size(git_dir)), _truncate_ns(mtime_ns))
+
+    def prefix(self, root: Path) -> str:
+        """Index path prefix (``""`` or ``"dir/"``) of ``root``, which must lie inside the work tree."""
+        rel = Path(root).resolve().relative_to(self.top).as_posix()
+        return "" if rel == "." else f"{rel}/"
+
+    def listing(self, root: Path, untracked: bool = False) -> list[tuple[str, bool]]:
+        """
+        ``(relative_path, is_dir)`` pairs below ``root`` in ``FileIndex`` walk order.
+
+        Tracked files deleted from the work tree are left out. Directories are
+        those containing listed files; submodules are listed as directories but
+        not descended into. With ``untracked``, files that are neither tracked
+        nor ignored are included too.
+        """
+        prefix = self.prefix(root)
+        tracked = {
+            entry.path[len(prefix) :]: entry.mode & _TYPE_MASK == _GITLINK
+            for entry in self.entries
+            if entry.path.startswith(prefix)
+        }
+        base = str(root)
+        present = self._walk(base, prefix, tracked) if untracked else {}
+        for rel, is_dir in tracked.items():
+            if rel not in present and os.path.lexists(os.path.join(base, rel)):
+                present[rel] = is_dir
+
+        directories: set[str] = set()
+        for rel in present:
+            parent = rel.rpartition("/")[0]
+            while parent and parent not in directories:
+                directories.add(parent)
+                parent = parent.rpartition("/")[0]
+        for directory in directories:
+            present[directory] = True
+        return sorted(present.items(), key=_walk_order)
+
+    def _walk(self, base: str, prefix: str, tracked: dict[str, bool]) -> dict[str, bool]:
+        """Tracked and non-ignored untracked files found by walking ``base``, pruning ignored directories."""
+        # (index path prefix the patterns are relative to, patterns); innermost last
+        rules: list[tuple[str, FuncIgnore]] = []
+        exclude = _read_ignore(str(self.git_dir / "info" / "exclude"))
+        if exclude is not None:
+            rules.append(("", exclude))
+        parts = prefix.split("/")[:-1]
+        for depth in range(len(parts)):
+            outer = "".join(f"{part}/" for part in parts[:depth])
+            found = _read_ignore(os.path.join(str(self.top), outer, ".gitignore"))
+            if found is not None:
+                rules.append((outer, found))
+
+        def ignored(path: str, is_dir: bool, scope: list[tuple[str, FuncIgnore]]) -> bool:
+            for outer, patterns in reversed(scope):
+                verdict = patterns.match(path[len(outer) :], is_dir)
+                if verdict is not None:
+                    return verdict
+            return False
+
+        present: dict[str, bool] = {}
+        stack: list[tuple[str, str, list[tuple[str, FuncIgnore]]]] = [(base, "", rules)]
+        while stack:
+            directory, rel_dir, scope = stack.pop()
+            local = _read_ignore(os.path.join(directory, ".gitignore"))
+            if local is not None:
+                scope = [*scope, (prefix + rel_dir, local)]
+            try:
+                with os.scandir(directory) as it:
+                    children = list(it)
+            except OSError as exc:
+                logger.debug(f"Skipping unreadable directory {directory}: {exc}")
+                continue
+            for entry in children:
+                if entry.name == ".git":
+                    continue
+                rel = f"{rel_dir}{entry.name}"
+                if rel in tracked:
+                    present[rel] = tracked[rel]
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                    descend = is_dir and not entry.is_symlink()
+                except OSError:
+                    is_dir = descend = False
+                if ignored(prefix + rel, is_dir, scope):
+                    continue
+                if not is_dir:
+                    present[rel] = False
+                elif descend and os.path.lexists(os.path.join(entry.path, ".git")):
+                    # Nested repositories are not descended into, as in git
+                    present[rel] = True
+                elif descend:
+                    stack.append((entry.path, f"{rel}/", scope))
+        return present
+
+    def content_signature(self, path: str, st: os.stat_result) -> Optional[str]:
+        """
+        ``git:<object id>`` for the index path ``path`` when ``st`` shows the file unchanged since git hashed it.
+
+        Entries modified within the index file's mtime granularity are racily
+        clean and get no signature, as git would re-hash them.
+        """
+        if self._by_path is None:
+            self._by_path = {entry.path: entry for entry in self.entries}
+        entry = self._by_path.get(path)
+        if entry is None or not entry.oid or entry.mtime_ns >= self.mtime_ns:
+            return None
+        unchanged = (
+            entry.size == st.st_size & 0xFFFFFFFF
+            and entry.mtime_ns == _truncate_ns(st.st_mtime_ns)
+            and entry.ctime_ns == _truncate_ns(st.st_ctime_ns)
+            and entry.ino == st.st_ino & 0xFFFFFFFF
+        )
+        return f"git:{entry.oid}" if unchanged else None
@@ -1,34 +1,40 @@
-import json
 import os
 import re
-import shutil
 import sys
+import threading
 from pathlib import Path
-from typing import List, Literal, TypedDict, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Literal, Mapping, Optional, TypedDict, Union, cast
 
+from packaging.version import InvalidVersion
 from packaging.version import parse as parse_version
 
+# host_config is light (its import graph dependency is deferred) and HostArea is needed at runtime: the
+# rule schema is generated from Condition's type hints. The other analysis modules load with their handlers
+from azure_functions_doctor import host_config
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.host_config import HostArea
 from azure_functions_doctor.logging_config import get_logger
+from azure_functions_doctor.results import HandlerResult
+
+if TYPE_CHECKING:
+    from importlib.metadata import EntryPoint
 
 logger = get_logger(__name__)
 
 
-def _create_result(status: str, detail: str, internal_error: bool = False) -> dict[str, str]:
-    """Create a standardized result dictionary (status limited to 'pass'/'fail')."""
-    res: dict[str, str] = {"status": status, "detail": detail}
-    if internal_error:
-        res["internal_error"] = "true"
-    return res
+def _create_result(status: str, detail: str, internal_error: bool = False) -> HandlerResult:
+    """Create a standardized handler result (status limited to 'pass'/'fail')."""
+    return HandlerResult(status, detail, internal_error)
 
 
-def _handle_exception(operation: str, exc: Exception) -> dict[str, str]:
+def _handle_exception(operation: str, exc: Exception) -> HandlerResult:
     """Handle exceptions consistently across all handlers (always fail)."""
     error_msg = f"Error during {operation}: {exc}"
     logger.error(error_msg, exc_info=True)
     return _create_result("fail", error_msg, internal_error=True)
 
 
-def _handle_specific_exceptions(operation: str, exc: Exception) -> dict[str, str]:
+def _handle_specific_exceptions(operation: str, exc: Exception) -> HandlerResult:
     """Handle specific exception types with user-friendly messages (fail only)."""
     if isinstance(exc, UnicodeDecodeError):
         return _create_result("fail", f"Encoding error in {operation}: {exc}.", internal_error=True)
@@ -48,6 +54,19 @@ def _handle_specific_exceptions(operation: str, exc: Exception) -> dict[str, str
     return _create_result("fail", f"Unexpected error in {operation}", internal_error=True)
 
 
+def _compare_versions(current: str, operator: str, expected: str) -> bool:
+    """Compare two version strings with a rule operator; unknown operators never pass."""
+    current_version = parse_version(current)
+    expected_version = parse_version(expected)
+    return {
+        ">=": current_version >= expected_version,
+        "<=": current_version <= expected_version,
+        "==": current_version == expected_version,
+        ">": current_version > expected_version,
+        "<": current_version < expected_version,
+    }.get(operator, False)
+
+
 class Condition(TypedDict, total=False):
     target: str
     operator: str
@@ -57,6 +76,16 @@ class Condition(TypedDict, total=False):
     targets: list[str]
     patterns: list[str]
     pypi: str
+    package: str
+    file: str
+    max_bytes: int
+    max_files: int
+    max_ms: float
+    runs: int
+    static: bool
+    blocking_calls: list[str]
+    client_types: list[str]
+    area: HostArea
 
 
 class Rule(TypedDict, total=False):
@@ -67,6 +96,7 @@ class Rule(TypedDict, total=False):
         "path_exists",
         "file_exists",
         "package_installed",
+        "package_declared",
         "source_code_contains",
         "conditional_exists",
         "callable_detection",
@@ -76,6 +106,13 @@ class Rule(TypedDict, total=False):
         "host_json_property",
         "binding_validation",
         "cron_validation",
+        "deploy_size",
+        "cold_start_import",
+        "cold_start_memory",
+        "async_blocking_io",
+        "client_per_invocation",
+        "host_json_audit",
+        "dist_footprint",
     ]
     label: str
     category: str
@@ -88,13 +125,44 @@ class Rule(TypedDict, total=False):
     fix_command: str
     hint_url: str
     check_order: int
+    severity: str
+    models: list[Literal["v1", "v2"]]
+
+
+# Plugin handlers may return a plain {"status", "detail"} dict; the registry coerces it
+Handler = Callable[[Rule, Path, ProjectContext], Mapping[str, Any]]
+
+
+# Entry-point group through which other distributions provide handler types:
+#   [project.entry-points."azure_functions_doctor.handlers"]
+#   my_check = "my_package.checks:handle_my_check"
+ENTRY_POINT_GROUP = "azure_functions_doctor.handlers"
+
+
+def _entry_points(group: str) -> list["EntryPoint"]:
+    # Slow to import, and only rules of a plugin type need it
+    import importlib.metadata
+
+    if sys.version_info >= (3, 10):
+        return list(importlib.metadata.entry_points(group=group))
+    return list(importlib.metadata.entry_points().get(group, []))
 
 
 class HandlerRegistry:
-    """Registry for diagnostic check handlers with individual handler methods."""
+    """
+    Registry for diagnostic check handlers with individual handler methods.
+
+    Besides the built-in handlers, third-party handler types are discovered
+    through the :data:`ENTRY_POINT_GROUP` entry-point group. Entry-point
+    metadata is read once, the first time a rule references a type that is not
+    built in, and a plugin module is imported only when a rule of its type
+    runs. Built-in types cannot be overridden by plugins.
+    """
 
     def __init__(self) -> None:
-        self._handlers = {
+        self._plugins: Optional[dict[str, "EntryPoint"]] = None
+        self._plugin_lock = threading.Lock()
+        self._handlers: dict[str, Handler] = {
             "compare_version": self._handle_compare_version,
             "env_var_exists": self._handle_env_var_exists,
             "path_exists": self._handle_path_exists,
@@ -110,24 +178,88 @@ class HandlerRegistry:
             "host_json_property": self._handle_host_json_property,
             "binding_validation": self._handle_binding_validation,
             "cron_validation": self._handle_cron_validation,
+            "deploy_size": self._handle_deploy_size,
+            "cold_start_import": self._handle_cold_start_import,
+            "cold_start_memory": self._handle_cold_start_memory,
+            "async_blocking_io": self._handle_async_blocking_io,
+            "client_per_invocation": self._handle_client_per_invocation,
+            "host_json_audit": self._handle_host_json_audit,
+            "dist_footprint": self._handle_dist_footprint,
         }
 
-    def handle(self, rule: Rule, path: Path) -> dict[str, str]:
-        """Route rule execution to appropriate handler."""
+        self._builtin_types = frozenset(self._handlers)
+
+    @property
+    def builtin_types(self) -> frozenset[str]:
+        """Handler types implemented by this package."""
+        return self._builtin_types
+
+    def types(self) -> frozenset[str]:
+        """Handler types that rules may reference, including installed plugins (not imported)."""
+        return frozenset(self._handlers) | frozenset(self._plugin_entry_points())
+
+    def has_type(self, check_type: str) -> bool:
+        """Whether ``check_type`` is handled, reading plugin metadata only for non-built-in types."""
+        return check_type in self._handlers or check_type in self._plugin_entry_points()
+
+    def _plugin_entry_points(self) -> dict[str, "EntryPoint"]:
+        if self._plugins is None:
+            plugins: dict[str, "EntryPoint"] = {}
+            for entry_point in _entry_points(ENTRY_POINT_GROUP):
+                if entry_point.name in self._builtin_types:
+                    logger.warning(f"Ignoring plugin handler '{entry_point.name}': built-in handler types are reserved")
+                    continue
+                plugins.setdefault(entry_point.name, entry_point)
+            self._plugins = plugins
+        return self._plugins
+
+    def _load_plugin(self, check_type: str) -> Optional[Handler]:
+        """Import the plugin providing ``check_type`` (once) and register its handler."""
+        entry_point = self._plugin_entry_points().get(check_type)
+        if entry_point is None:
+            return None
+        with self._plugin_lock:
+            handler = self._handlers.get(check_type)
+            if handler is None:
+                loaded = entry_point.load()
+                if not callable(loaded):
+                    raise TypeError(f"entry point {entry_point.value} is not callable")
+                handler = cast(Handler, loaded)
+                self._handlers[check_type] = handler
+                logger.debug(f"Loaded plugin handler '{check_type}' from {entry_point.value}")
+        return handler
+
+    def handle(self, rule: Rule, path: Path, context: Optional[ProjectContext] = None) -> HandlerResult:
+        """Route rule execution to appropriate handler.
+
+        ``context`` carries inputs shared by every rule of a run; a fresh one is
+        created when the caller evaluates a single rule in isolation.
+        """
         check_type = rule.get("type")
         if check_type is None:
             return _create_result("fail", "Missing check type in rule")
         handler = self._handlers.get(check_type)
+        if handler is None:
+            try:
+                handler = self._load_plugin(check_type)
+            except Exception as exc:
+                logger.warning(f"Failed to load plugin handler '{check_type}': {exc}")
+                return _create_result(
+                    "fail", f"Failed to load plugin handler '{check_type}': {exc}", internal_error=True
+                )
 
         if not handler:
             return _create_result("fail", f"Unknown check type: {check_type}")
 
+        if context is None:
+            context = ProjectContext(path)
+
         try:
-            return handler(rule, path)
+            return HandlerResult.coerce(handler(rule, path, context))
         except Exception as exc:
             return _handle_specific_exceptions(f"executing {check_type} check", exc)
 
-    def _handle_compare_version(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_compare_version(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Handle version comparison checks."""
         condition = rule.get("condition", {}) or {}
         target = condition.get("target")
@@ -139,24 +271,29 @@ class HandlerRegistry:
 
         if target == "python":
             current_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
-            current = parse_version(current_version)
-            expected = parse_version(str(value))
-            passed = {
-                ">=": current >= expected,
-                "<=": current <= expected,
-                "==": current == expected,
-                ">": current > expected,
-                "<": current < expected,
-            }.get(operator, False)
+            passed = _compare_versions(current_version, operator, str(value))
             # Simplified concise-style detail for Python version
             return _create_result(
                 "pass" if passed else "fail",
                 f"Python {current_version} ({operator}{value})",
             )
 
+        from azure_functions_doctor.probes import is_probe_target
+
+        if is_probe_target(target):
+            current_value = context.target_value(target)
+            try:
+                passed = _compare_versions(current_value, operator, str(value))
+            except InvalidVersion:
+                return _create_result("fail", f"{target}: {current_value} ({operator}{value})")
+            return _create_result(
+                "pass" if passed else "fail",
+                f"{target} {current_value} ({operator}{value})",
+            )
+
         return _create_result("fail", f"Unknown target for version comparison: {target}")
 
-    def _handle_env_var_exists(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_env_var_exists(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Handle environment variable existence checks."""
         condition = rule.get("condition", {}) or {}
         target = condition.get("target")
@@ -164,13 +301,13 @@ class HandlerRegistry:
         if not target:
             return _create_result("fail", "Missing environment variable name")
 
-        exists = os.getenv(target) is not None
+        exists = context.getenv(target) is not None
         return _create_result(
             "pass" if exists else "fail",
             f"{target} is {'set' if exists else 'not set'}",
         )
 
-    def _handle_path_exists(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_path_exists(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Handle path existence checks."""
         condition = rule.get("condition", {}) or {}
         target = condition.get("target")
@@ -184,7 +321,7 @@ class HandlerRegistry:
             detail += " (optional)"
         return _create_result("pass" if exists else "fail", detail)
 
-    def _handle_file_exists(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_file_exists(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Handle file existence checks."""
         condition = rule.get("condition", {}) or {}
         target = condition.get("target")
@@ -198,7 +335,7 @@ class HandlerRegistry:
             detail += " (optional)"
         return _create_result("pass" if exists else "fail", detail)
 
-    def _handle_package_installed(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_package_installed(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Handle Python package installation checks."""
         condition = rule.get("condition", {}) or {}
         target = condition.get("target")
@@ -216,7 +353,7 @@ class HandlerRegistry:
         except Exception as exc:
             return _handle_exception(f"importing module '{import_path_str}'", exc)
 
-    def _handle_source_code_contains(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_source_code_contains(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Handle source code keyword search checks."""
         condition = rule.get("condition", {}) or {}
         keyword = condition.get("keyword")
@@ -224,41 +361,33 @@ class HandlerRegistry:
         if not isinstance(keyword, str):
             return _create_result("fail", "Missing or invalid 'keyword' in condition")
 
-        found = False
-
-        for py_file in path.rglob("*.py"):
+        def contains_keyword(py_file: Path) -> bool:
             try:
-                content = py_file.read_text(encoding="utf-8")
-                if keyword in content:
-                    found = True
-                    break
+                return keyword in context.read_text(py_file)
             except PermissionError:
                 logger.warning(f"Permission denied reading {py_file}")
-                continue
             except UnicodeDecodeError:
                 logger.warning(f"Encoding error in {py_file}, trying with errors='ignore'")
                 try:
-                    content = py_file.read_text(encoding="utf-8", errors="ignore")
-                    if keyword in content:
-                        found = True
-                        break
+                    return keyword in context.read_text(py_file, errors="ignore")
                 except Exception:
                     logger.warning(f"Failed to read {py_file} even with error handling")
-                    continue
             except MemoryError:
                 logger.error(f"File too large to process: {py_file}")
-                continue
             except Exception as exc:
                 logger.error(f"Unexpected error reading {py_file}: {exc}")
-                continue
+            return False
+
+        scan_key = f"source_code_contains:{keyword}"
+        found = any(context.scan(scan_key, py_file, contains_keyword) for py_file in context.files.rglob("*.py"))
 
         return _create_result(
             "pass" if found else "fail",
             f"Keyword '{keyword}' {'found' if found else 'not found'} in source code",
         )
 
-    def _handle_package_declared(self, rule: Rule, path: Path) -> dict[str, str]:
-        """Check that a package name appears in requirements.txt (declaration-level)."""
+    def _handle_package_declared(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
+        """Check that a package is declared in requirements.txt or any file it includes."""
         condition = rule.get("condition", {}) or {}
         package_name_obj = condition.get("package") or condition.get("target")
         req_file_obj = condition.get("file", "requirements.txt")
@@ -266,25 +395,16 @@ class HandlerRegistry:
             return _create_result("fail", "Missing 'package' in condition")
         package_name = package_name_obj
         req_file = str(req_file_obj)
-        req_path = path / Path(req_file)
-        if not req_path.exists():
-            return _create_result("fail", f"{req_path} not found")
-        try:
-            content = req_path.read_text(encoding="utf-8").splitlines()
-        except Exception as exc:
-            return _handle_specific_exceptions(f"reading {req_file}", exc)
-        normalized = [
-            re.split(pattern=r"[=<>!~]", string=line.strip(), maxsplit=1)[0].lower()
-            for line in content
-            if line.strip() and not line.strip().startswith("#")
-        ]
-        declared = package_name.lower() in normalized
+        requirements = context.requirements(req_file)
+        if not requirements.exists:
+            return _create_result("fail", f"{path / req_file} not found")
+        declared = package_name in requirements
         return _create_result(
             "pass" if declared else "fail",
             f"Package '{package_name}' {'declared' if declared else 'not declared'} in {req_file}",
         )
 
-    def _handle_conditional_exists(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_conditional_exists(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Handle conditional existence checks such as durableTask in host.json when durable usage exists."""
         durable_keywords = [
             "durable",
@@ -292,18 +412,19 @@ class HandlerRegistry:
             "durable_functions",
             "orchestrator",
         ]
-        uses_durable = False
+
+        def mentions_durable(py_file: Path) -> bool:
+            try:
+                lowered = context.read_text(py_file, errors="ignore").lower()
+            except Exception:
+                return False
+            return any(k in lowered for k in durable_keywords)
 
         try:
-            for py_file in path.rglob("*.py"):
-                try:
-                    content = py_file.read_text(encoding="utf-8", errors="ignore")
-                except Exception:
-                    continue
-                lowered = content.lower()
-                if any(k in lowered for k in durable_keywords):
-                    uses_durable = True
-                    break
+            uses_durable = any(
+                context.scan("conditional_exists:durable", py_file, mentions_durable)
+                for py_file in context.files.rglob("*.py")
+            )
         except Exception as exc:
             return _handle_specific_exceptions("scanning for durable usage", exc)
 
@@ -322,14 +443,12 @@ class HandlerRegistry:
         if not isinstance(jsonpath, str):
             return _create_result("fail", "jsonpath must be a string for conditional_exists check")
 
-        host_path = path / "host.json"
-        if not host_path.exists():
-            return _create_result("fail", "host.json missing (durable usage)")
-
         try:
-            host_data = json.loads(host_path.read_text(encoding="utf-8"))
+            host_data = context.host_json()
         except Exception as exc:
             return _handle_specific_exceptions("reading host.json", exc)
+        if host_data is None:
+            return _create_result("fail", "host.json missing (durable usage)")
 
         pointer = jsonpath.lstrip("$.")
         parts = pointer.split(".") if pointer else []
@@ -345,7 +464,7 @@ class HandlerRegistry:
 
         return _create_result("pass", f"host.json contains '{jsonpath}'")
 
-    def _handle_callable_detection(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_callable_detection(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Detect ASGI/WSGI callable exposure in source files (basic heuristics)."""
         patterns = [
             r"\bFastAPI\s*\(|\bStarlette\s*\(|\bFlask\s*\(|\bQuart\s*\(",
@@ -353,17 +472,19 @@ class HandlerRegistry:
             r"ASGIApp|WSGIApp|asgi_app|wsgi_app",
         ]
 
+        def first_pattern(py_file: Path) -> Optional[str]:
+            try:
+                content = context.read_text(py_file, errors="ignore")
+            except Exception:
+                return None
+            return next((pat for pat in patterns if re.search(pat, content)), None)
+
         found_items: List[str] = []
         try:
-            for py_file in path.rglob("*.py"):
-                try:
-                    content = py_file.read_text(encoding="utf-8", errors="ignore")
-                except Exception:
-                    continue
-                for pat in patterns:
-                    if re.search(pat, content):
-                        found_items.append(f"{py_file.relative_to(path)}:{pat}")
-                        break
+            for py_file in context.files.rglob("*.py"):
+                matched = context.scan("callable_detection", py_file, first_pattern)
+                if matched is not None:
+                    found_items.append(f"{py_file.relative_to(path)}:{matched}")
         except Exception as exc:
             return _handle_specific_exceptions("scanning for ASGI/WSGI callables", exc)
 
@@ -374,19 +495,19 @@ class HandlerRegistry:
 
     # --- adapters / additional handlers ---
 
-    def _handle_executable_exists(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_executable_exists(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Check if an executable is available on PATH."""
         condition = rule.get("condition", {}) or {}
         target = condition.get("target")
         if not target:
             return _create_result("fail", "Missing 'target' for executable_exists")
-        found = shutil.which(target) is not None
+        found = context.executables.which(target) is not None
         if found:
             # Concise style: "<name> detected"
             return _create_result("pass", f"{target} detected")
         return _create_result("fail", f"{target} not found")
 
-    def _handle_any_of_exists(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_any_of_exists(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Check if any of a list of targets exist (env vars, host.json keys, files)."""
         condition = rule.get("condition", {}) or {}
         targets = condition.get("targets", [])
@@ -396,10 +517,9 @@ class HandlerRegistry:
         for t in targets:
             if isinstance(t, str) and t.startswith("host.json:"):
                 key = t.split("host.json:", 1)[1].lstrip(".")
-                host_path = path / "host.json"
-                if host_path.exists():
+                if (path / "host.json").exists():
                     try:
-                        data = json.loads(host_path.read_text(encoding="utf-8"))
+                        data = context.host_json()
                         node = data
                         for p in key.split("."):
                             if isinstance(node, dict) and p in node:
@@ -413,7 +533,7 @@ class HandlerRegistry:
                         continue
             else:
                 # env var
-                if os.getenv(str(t)) is not None:
+                if context.getenv(str(t)) is not None:
                     return _create_result("pass", f"env:{t} set")
                 # file path
                 candidate = path / str(t)
@@ -422,7 +542,7 @@ class HandlerRegistry:
         # Shorter failure detail for concise output integration
         return _create_result("fail", "Targets not found")
 
-    def _handle_file_glob_check(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_file_glob_check(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Detect unwanted files by glob patterns."""
         condition = rule.get("condition", {}) or {}
         patterns = condition.get("patterns", [])
@@ -431,7 +551,8 @@ class HandlerRegistry:
         matches: List[str] = []
         try:
             for pat in patterns:
-                for p in path.rglob(pat):
+                # Ignored files are deployed unless .funcignore excludes them, so they count here
+                for p in context.files.rglob(pat, include_ignored=True):
                     matches.append(str(p.relative_to(path)))
                     if len(matches) >= 5:
                         break
@@ -443,19 +564,18 @@ class HandlerRegistry:
             return _create_result("fail", f"Found unwanted files: {matches[:5]}")
         return _create_result("pass", "No unwanted files detected")
 
-    def _handle_host_json_property(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_host_json_property(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """Check a property exists in host.json using simple jsonpath-like pointer."""
         condition = rule.get("condition", {}) or {}
         jsonpath = condition.get("jsonpath")
         if not jsonpath or not isinstance(jsonpath, str):
             return _create_result("fail", "Missing or invalid 'jsonpath' in condition")
-        host_path = path / "host.json"
-        if not host_path.exists():
-            return _create_result("fail", "host.json not found")
         try:
-            host_data = json.loads(host_path.read_text(encoding="utf-8"))
+            host_data = context.host_json()
         except Exception as exc:
             return _handle_specific_exceptions("reading host.json", exc)
+        if host_data is None:
+            return _create_result("fail", "host.json not found")
         pointer = jsonpath.lstrip("$.")
         parts = pointer.split(".") if pointer else []
         node = host_data
@@ -466,7 +586,7 @@ class HandlerRegistry:
                 return _create_result("fail", f"host.json property '{jsonpath}' not found")
         return _create_result("pass", f"host.json contains '{jsonpath}'")
 
-    def _handle_binding_validation(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_binding_validation(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """
         Basic HTTP trigger binding validation:
         - look for function.json files and validate httpTrigger bindings have authLevel/methods where applicable.
@@ -474,9 +594,9 @@ class HandlerRegistry:
         """
         try:
             issues = []
-            for func_file in path.rglob("function.json"):
+            for func_file in context.files.rglob("function.json"):
                 try:
-                    data = json.loads(func_file.read_text(encoding="utf-8"))
+                    data = context.read_json(func_file)
                 except Exception:
                     continue
                 bindings = data.get("bindings", [])
@@ -492,7 +612,7 @@ class HandlerRegistry:
         except Exception as exc:
             return _handle_specific_exceptions("validating httpTrigger bindings", exc)
 
-    def _handle_cron_validation(self, rule: Rule, path: Path) -> dict[str, str]:
+    def _handle_cron_validation(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
         """
         Simple CRON validation for timerTrigger schedules found in function.json files.
         Accepts 5- or 6-field cron-like expressions as a heuristic.
@@ -501,9 +621,9 @@ class HandlerRegistry:
         try:
             found_cron = False
             invalid = []
-            for func_file in path.rglob("function.json"):
+            for func_file in context.files.rglob("function.json"):
                 try:
-                    data = json.loads(func_file.read_text(encoding="utf-8"))
+                    data = context.read_json(func_file)
                 except Exception:
                     continue
                 bindings = data.get("bindings", [])
@@ -521,12 +641,188 @@ class HandlerRegistry:
         except Exception as exc:
             return _handle_specific_exceptions("validating cron expressions", exc)
 
+    def _handle_deploy_size(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
+        """Check the deployment package (files not excluded by .funcignore) against size budgets."""
+        from azure_functions_doctor.deploy_size import format_bytes, measure_deployment, over_budget
+
+        condition = rule.get("condition", {}) or {}
+        max_bytes = condition.get("max_bytes")
+        max_files = condition.get("max_files")
+        if max_bytes is None and max_files is None:
+            return _create_result("fail", "Missing 'max_bytes' or 'max_files' for deploy_size")
+        try:
+            report = measure_deployment(path, top=1)
+        except Exception as exc:
+            return _handle_specific_exceptions("measuring deployment size", exc)
+        summary = f"{format_bytes(report['total_bytes'])} in {report['file_count']} files"
+        problems = over_budget(report, max_bytes, max_files)
+        if problems:
+            largest = report["largest_directories"] or report["largest_files"]
+            culprit = f" (largest: {largest[0]['path']}, {format_bytes(largest[0]['bytes'])})" if largest else ""
+            return _create_result("fail", f"Deployment package over budget: {'; '.join(problems)}{culprit}")
+        return _create_result("pass", f"Deployment package: {summary}")
+
+    def _handle_dist_footprint(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
+        """Check the installed footprint of each top-level requirement against ``max_bytes``."""
+        from azure_functions_doctor.deploy_size import format_bytes
+        from azure_functions_doctor.dist_footprint import heavy_requirements, measure_footprint
+
+        condition = rule.get("condition", {}) or {}
+        max_bytes = condition.get("max_bytes")
+        if not isinstance(max_bytes, int):
+            return _create_result("fail", "Missing or invalid 'max_bytes' for dist_footprint")
+        try:
+            report = measure_footprint(path, context, top=0)
+        except Exception as exc:
+            return _handle_specific_exceptions("measuring installed distributions", exc)
+        if report is None:
+            return _create_result("pass", "No installed packages found (.python_packages or virtual environment)")
+        heavy = heavy_requirements(report, max_bytes)
+        if heavy:
+            return _create_result("fail", f"Heavy dependencies: {'; '.join(heavy)}")
+        return _create_result(
+            "pass",
+            f"{len(report['requirements'])} top-level requirement(s) install {format_bytes(report['total_bytes'])}",
+        )
+
+    def _handle_cold_start_import(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
+        """Profile the app's import time in fresh interpreters and compare p95 against ``max_ms``."""
+        from azure_functions_doctor.coldstart import ColdStartError, describe_heaviest, profile_imports
+
+        condition = rule.get("condition", {}) or {}
+        max_ms = condition.get("max_ms")
+        if not isinstance(max_ms, (int, float)):
+            return _create_result("fail", "Missing or invalid 'max_ms' for cold_start_import")
+        if condition.get("static"):
+            return self._check_static_import_weight(path, context, max_ms)
+        runs = condition.get("runs", 3)
+        try:
+            report = profile_imports(path, runs=runs if isinstance(runs, int) else 3, top=3, context=context)
+        except ColdStartError as exc:
+            return _create_result("fail", str(exc))
+        except Exception as exc:
+            return _handle_specific_exceptions("profiling import time", exc)
+        summary = f"p50 {report['p50_ms']:.0f} ms, p95 {report['p95_ms']:.0f} ms over {report['runs']} runs"
+        heaviest = describe_heaviest(report)
+        if report["p95_ms"] > max_ms:
+            return _create_result("fail", f"Import time {summary} exceeds {max_ms:g} ms; heaviest: {heaviest}")
+        return _create_result("pass", f"Import time {summary}" + (f"; heaviest: {heaviest}" if heaviest else ""))
+
+    def _handle_cold_start_memory(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
+        """Measure peak memory of importing the app and compare p95 against ``max_bytes``."""
+        from azure_functions_doctor.coldstart import ColdStartError, describe_memory_heaviest, profile_memory
+        from azure_functions_doctor.deploy_size import format_bytes
+
+        condition = rule.get("condition", {}) or {}
+        max_bytes = condition.get("max_bytes")
+        if not isinstance(max_bytes, int):
+            return _create_result("fail", "Missing or invalid 'max_bytes' for cold_start_memory")
+        runs = condition.get("runs", 3)
+        try:
+            report = profile_memory(path, runs=runs if isinstance(runs, int) else 3, top=3, context=context)
+        except ColdStartError as exc:
+            return _create_result("fail", str(exc))
+        except Exception as exc:
+            return _handle_specific_exceptions("profiling import memory", exc)
+        # Peak RSS is what the plan's memory limit sees; without it (Windows) fall back to the Python heap
+        if report["p95_rss_bytes"] is not None:
+            measure, p50, p95 = "Peak RSS", report["p50_rss_bytes"] or 0, report["p95_rss_bytes"]
+        else:
+            measure, p50, p95 = "Peak heap", report["p50_heap_bytes"], report["p95_heap_bytes"]
+        summary = f"p50 {format_bytes(p50)}, p95 {format_bytes(p95)} over {report['runs']} runs"
+        heaviest = describe_memory_heaviest(report)
+        if p95 > max_bytes:
+            return _create_result(
+                "fail", f"{measure} {summary} exceeds {format_bytes(max_bytes)}; heaviest: {heaviest}"
+            )
+        return _create_result("pass", f"{measure} {summary}" + (f"; heaviest: {heaviest}" if heaviest else ""))
+
+    def _check_static_import_weight(self, path: Path, context: ProjectContext, max_ms: float) -> HandlerResult:
+        """Estimate import time from the import graph without executing the app."""
+        from azure_functions_doctor.coldstart import ColdStartError
+        from azure_functions_doctor.import_graph import analyze_imports
+
+        try:
+            report = analyze_imports(path, top=3, context=context)
+        except ColdStartError as exc:
+            return _create_result("fail", str(exc))
+        except Exception as exc:
+            return _handle_specific_exceptions("analyzing imports", exc)
+        summary = f"~{report['estimated_ms']:.0f} ms estimated for {report['modules']} modules"
+        heaviest = ", ".join(f"line {line['line']} {line['statement']!r}" for line in report["lines"])
+        if report["estimated_ms"] > max_ms:
+            return _create_result("fail", f"Import cost {summary} exceeds {max_ms:g} ms; heaviest: {heaviest}")
+        return _create_result("pass", f"Import cost {summary}")
+
+    def _handle_async_blocking_io(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
+        """Find blocking calls reachable from async function handlers."""
+        from azure_functions_doctor import async_blocking
+        from azure_functions_doctor.call_graph import load_call_graph
+
+        condition = rule.get("condition", {}) or {}
+        extra = condition.get("blocking_calls", [])
+        if not isinstance(extra, list):
+            return _create_result("fail", "'blocking_calls' must be a list of call patterns")
+        try:
+            graph = load_call_graph(path, context)
+            handlers = graph.handlers(async_only=True)
+            findings = async_blocking.find_blocking(graph, (p for p in extra if isinstance(p, str)))
+            graph.save()
+        except Exception as exc:
+            return _handle_specific_exceptions("analyzing async handlers", exc)
+        if findings:
+            return _create_result("fail", f"Blocking calls in async handlers: {async_blocking.describe(findings)}")
+        if not handlers:
+            return _create_result("pass", "No async function handlers found")
+        return _create_result("pass", f"No blocking calls reachable from {len(handlers)} async handler(s)")
+
+    def _handle_client_per_invocation(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
+        """Find SDK clients and HTTP sessions constructed inside function handlers."""
+        from azure_functions_doctor import client_reuse
+        from azure_functions_doctor.call_graph import load_call_graph
+
+        condition = rule.get("condition", {}) or {}
+        extra = condition.get("client_types", [])
+        if not isinstance(extra, list):
+            return _create_result("fail", "'client_types' must be a list of constructor patterns")
+        try:
+            graph = load_call_graph(path, context)
+            handlers = graph.handlers()
+            findings = client_reuse.find_per_invocation_clients(graph, (p for p in extra if isinstance(p, str)))
+            graph.save()
+        except Exception as exc:
+            return _handle_specific_exceptions("analyzing function handlers", exc)
+        if findings:
+            return _create_result("fail", f"Clients created per invocation: {client_reuse.describe(findings)}")
+        if not handlers:
+            return _create_result("pass", "No function handlers found")
+        return _create_result("pass", f"No clients constructed inside {len(handlers)} handler(s)")
+
+    def _handle_host_json_audit(self, rule: Rule, path: Path, context: ProjectContext) -> HandlerResult:
+        """Audit one area of host.json concurrency and scale settings against the app's triggers."""
+        condition = rule.get("condition", {}) or {}
+        area = condition.get("area")
+        if area not in host_config.HOST_AREAS:
+            areas = list(host_config.HOST_AREAS)
+            return _create_result("fail", f"Missing or invalid 'area' in condition; expected one of {areas}")
+        try:
+            host_data = context.host_json()
+            if host_data is None:
+                return _create_result("pass", "host.json not found; nothing to audit")
+            findings = host_config.audit_host(host_data, str(area), host_config.used_triggers(path, context))
+            text = context.read_text(path / "host.json") if findings else None
+        except Exception as exc:
+            return _handle_specific_exceptions("auditing host.json", exc)
+        if findings:
+            return _create_result("fail", f"host.json {area} settings: {host_config.describe(findings, text)}")
+        return _create_result("pass", f"host.json {area} settings match the app's triggers")
+
 
 # Global registry instance
 _registry = HandlerRegistry()
 
 
-def generic_handler(rule: Rule, path: Path) -> dict[str, str]:
+def generic_handler(rule: Rule, path: Path, context: Optional[ProjectContext] = None) -> HandlerResult:
     """
     Execute a diagnostic rule based on its type and condition.
 
@@ -535,8 +831,100 @@ def generic_handler(rule: Rule, path: Path) -> dict[str, str]:
     Args:
         rule: The diagnostic rule to execute.
         path: Path to the Azure Functions project.
+        context: Optional shared project context for the current run.
 
     Returns:
-        A dictionary with the status and detail of the check.
+        The handler result; it reads like a ``{"status", "detail"}`` dict.
+    """
+    return _registry.handle(rule, path, context)
+
+
+def handler_types() -> frozenset[str]:
+    """Handler types known to the global registry, including installed plugins."""
+    return _registry.types()
+
+
+def builtin_handler_types() -> frozenset[str]:
+    """Handler types implemented by this package."""
+    return _registry.builtin_types
+
+
+def has_handler_type(check_type: str) -> bool:
+    """Whether a rule of ``check_type`` can run (built in or provided by an installed plugin)."""
+    return _registry.has_type(check_type)
+
+
+# File inputs (rglob patterns relative to the project root) read by each handler type.
+# Handlers missing here, or returning no patterns, depend only on the environment.
+_HANDLER_INPUTS: dict[str, tuple[str, ...]] = {
+    "package_declared": ("*.txt", "*.in"),
+    "source_code_contains": ("*.py",),
+    "conditional_exists": ("*.py", "host.json"),
+    "callable_detection": ("*.py",),
+    "host_json_property": ("host.json",),
+    "binding_validation": ("function.json",),
+    "cron_validation": ("function.json",),
+    # Also measures gitignored paths; changed-only runs therefore never reuse its result
+    "deploy_size": ("*",),
+    "cold_start_import": ("*.py", "function.json"),
+    "cold_start_memory": ("*.py", "function.json"),
+    "async_blocking_io": ("*.py", "function.json"),
+    "client_per_invocation": ("*.py", "function.json"),
+    "host_json_audit": ("host.json", "function.json", "*.py"),
+    "dist_footprint": ("requirements*.txt",),
+}
+
+
+# Environment variables read by built-in handlers whatever the rule's condition: executable lookups,
+# interpreter discovery and the worker's script file. Rules that start the project's interpreter pass the
+# whole environment on, so the variables that change what it imports are included as well.
+_ENVIRONMENT_INPUTS = ("PATH", "PATHEXT", "VIRTUAL_ENV", "PYTHONPATH", "PYTHONHOME", "PYTHON_SCRIPT_FILE_NAME")
+
+
+def environment_inputs(rules: Iterable[Rule]) -> Optional[frozenset[str]]:
+    """
+    Return the environment variables whose values can change the outcome of ``rules``.
+
+    Returns None when any variable may matter, which is the case as soon as a
+    rule uses a plugin handler type.
     """
-    return _registry.handle(rule, path)
+    names = set(_ENVIRONMENT_INPUTS)
+    for rule in rules:
+        check_type = rule.get("type", "")
+        if check_type not in _registry.builtin_types:
+            return None
+        condition = rule.get("condition", {}) or {}
+        if check_type == "env_var_exists" and isinstance(condition.get("target"), str):
+            names.add(condition["target"])
+        elif check_type == "any_of_exists":
+            targets = condition.get("targets", []) or []
+            names.update(t for t in targets if isinstance(t, str) and not t.startswith("host.json:"))
+    return frozenset(names)
+
+
+def rule_inputs(rule: Rule) -> tuple[str, ...]:
+    """
+    Return the file patterns whose contents can change the outcome of ``rule``.
+
+    Incremental front ends (the language server, changed-only runs) use this to
+    re-evaluate just the rules affected by an edit. Patterns may over-approximate
+    a rule's inputs but never under-approximate them.
+    """
+    check_type = rule.get("type", "")
+    condition = rule.get("condition", {}) or {}
+    patterns = list(_HANDLER_INPUTS.get(check_type, ()))
+    if check_type in ("file_exists", "path_exists"):
+        target = condition.get("target")
+        if isinstance(target, str) and target != "sys.executable":
+            patterns.append(target)
+    elif check_type == "package_declared":
+        req_file = condition.get("file")
+        if isinstance(req_file, str):
+            patterns.append(req_file)
+    elif check_type == "any_of_exists":
+        for target in condition.get("targets", []) or []:
+            if isinstance(target, str):
+                patterns.append("host.json" if target.startswith("host.json:") else target)
+    elif check_type == "file_glob_check":
+        patterns.extend(p for p in condition.get("patterns", []) or [] if isinstance(p, str))
+    return tuple(dict.fromkeys(patterns))
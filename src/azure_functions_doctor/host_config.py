@@ -0,0 +1,476 @@
+"""
+Typed ``host.json`` model and an audit of its concurrency and scale settings.
+
+:func:`parse_host_json` reads the performance-relevant part of ``host.json``
+into the :class:`HostJson` TypedDicts; values of the wrong JSON type are
+reported and dropped (the host rejects them at startup). :func:`audit_host`
+then checks one area of settings against the triggers the app actually uses
+(:func:`used_triggers`, from v1 ``function.json`` bindings or v2 trigger
+decorators), so queue settings are only audited for apps with queue triggers.
+Each finding names the setting, the offending value and its effect on
+throughput. Defaults and limits are those of extension bundle 3.x and later
+(Service Bus and Event Hubs extensions 5.x).
+"""
+
+import re
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional, TypedDict, cast, get_args, get_origin, get_type_hints
+
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+HostArea = Literal["timeout", "concurrency", "queues", "service_bus", "event_hubs", "http"]
+
+
+class HttpSettings(TypedDict, total=False):
+    maxConcurrentRequests: int
+    maxOutstandingRequests: int
+    dynamicThrottlesEnabled: bool
+
+
+class QueuesSettings(TypedDict, total=False):
+    batchSize: int
+    newBatchThreshold: int
+    maxPollingInterval: str
+    maxDequeueCount: int
+
+
+class ServiceBusSettings(TypedDict, total=False):
+    maxConcurrentCalls: int
+    maxConcurrentSessions: int
+    prefetchCount: int
+    messageHandlerOptions: dict[str, Any]
+
+
+class EventHubsSettings(TypedDict, total=False):
+    maxEventBatchSize: int
+    prefetchCount: int
+    batchCheckpointFrequency: int
+    eventProcessorOptions: dict[str, Any]
+
+
+class ExtensionsSettings(TypedDict, total=False):
+    http: HttpSettings
+    queues: QueuesSettings
+    serviceBus: ServiceBusSettings
+    eventHubs: EventHubsSettings
+
+
+class ConcurrencySettings(TypedDict, total=False):
+    dynamicConcurrencyEnabled: bool
+    snapshotPersistenceEnabled: bool
+
+
+class HostJson(TypedDict, total=False):
+    version: str
+    functionTimeout: str
+    concurrency: ConcurrencySettings
+    extensions: ExtensionsSettings
+
+
+class HostFinding(TypedDict):
+    setting: str
+    message: str
+
+
+# v2 decorator -> binding type, for the triggers the audit cares about
+_DECORATOR_TRIGGERS = {
+    "route": "httpTrigger",
+    "queue_trigger": "queueTrigger",
+    "service_bus_queue_trigger": "serviceBusTrigger",
+    "service_bus_topic_trigger": "serviceBusTrigger",
+    "event_hub_message_trigger": "eventHubTrigger",
+    "blob_trigger": "blobTrigger",
+    "timer_trigger": "timerTrigger",
+    "schedule": "timerTrigger",
+}
+_DECORATOR = re.compile(r"@\s*[\w.]+\.(%s)\b" % "|".join(_DECORATOR_TRIGGERS))
+_TIMESPAN = re.compile(r"^(?:(\d+)\.)?(\d{1,2}):(\d{2}):(\d{2}(?:\.\d+)?)$")
+
+_CONSUMPTION_MAX_TIMEOUT_S = 600
+# Azure's front end drops HTTP requests that take longer, whatever functionTimeout says
+_HTTP_RESPONSE_LIMIT_S = 230
+_QUEUE_MAX_BATCH = 32
+_QUEUE_DEFAULT_POLLING_S = 60
+_EVENT_HUBS_DEFAULT_BATCH = 100
+_EVENT_HUBS_DEFAULT_PREFETCH = 300
+# Triggers whose concurrency dynamic concurrency manages, and the static settings it then ignores
+_DYNAMIC_CONCURRENCY_TRIGGERS = frozenset({"queueTrigger", "blobTrigger", "serviceBusTrigger"})
+_STATIC_CONCURRENCY_SETTINGS = (
+    ("queues", "batchSize"),
+    ("queues", "newBatchThreshold"),
+    ("serviceBus", "maxConcurrentCalls"),
+    ("serviceBus", "maxConcurrentSessions"),
+)
+
+
+def _json_type(annotation: Any) -> tuple[type, ...]:
+    origin = get_origin(annotation)
+    return (origin,) if origin is not None else (annotation,)
+
+
+def _typed(data: dict[str, Any], model: Any, prefix: str, problems: list[HostFinding]) -> dict[str, Any]:
+    result: dict[str, Any] = {}
+    for key, annotation in get_type_hints(model).items():
+        if key not in data:
+            continue
+        value = data[key]
+        setting = f"{prefix}{key}"
+        if isinstance(annotation, type) and issubclass(annotation, dict) and hasattr(annotation, "__annotations__"):
+            if isinstance(value, dict):
+                result[key] = _typed(value, annotation, f"{setting}.", problems)
+                continue
+            expected = "an object"
+        else:
+            types = _json_type(annotation)
+            # bool is an int subclass; JSON true is not a count
+            if isinstance(value, types) and not (isinstance(value, bool) and bool not in types):
+                result[key] = value
+                continue
+            expected = {int: "an integer", str: "a string", bool: "true or false"}.get(types[0], "an object")
+        problems.append({"setting": setting, "message": f"must be {expected}, got {json_value(value)}"})
+    return result
+
+
+def parse_host_json(data: Any) -> tuple[HostJson, list[HostFinding]]:
+    """The typed view of ``host.json`` and the settings dropped from it for having the wrong type."""
+    problems: list[HostFinding] = []
+    if not isinstance(data, dict):
+        return HostJson(), [{"setting": "$", "message": "host.json must contain a JSON object"}]
+    return cast(HostJson, _typed(data, HostJson, "", problems)), problems
+
+
+def json_value(value: Any) -> str:
+    """A setting value as written in JSON."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return f'"{value}"' if isinstance(value, str) else str(value)
+
+
+def timespan_seconds(value: str) -> Optional[float]:
+    """Seconds in a ``[d.]hh:mm:ss[.fff]`` timespan, ``-1`` for unbounded, None when it does not parse."""
+    if value.strip() == "-1":
+        return -1.0
+    match = _TIMESPAN.match(value.strip())
+    if match is None:
+        return None
+    days, hours, minutes, seconds = match.groups()
+    return int(days or 0) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _bundle_major(data: Any) -> Optional[int]:
+    """Lowest major version admitted by the ``extensionBundle`` version range (``[4.*, 5.0.0)`` -> 4)."""
+    bundle = data.get("extensionBundle") if isinstance(data, dict) else None
+    version = bundle.get("version") if isinstance(bundle, dict) else None
+    match = re.search(r"\d+", version) if isinstance(version, str) else None
+    return int(match.group()) if match else None
+
+
+def _function_json_triggers(context: ProjectContext, path: Path) -> list[str]:
+    try:
+        data = context.read_json(path)
+    except Exception as exc:
+        logger.debug(f"Skipping {path}: {exc}")
+        return []
+    bindings = data.get("bindings", []) if isinstance(data, dict) else []
+    return [
+        str(b["type"])
+        for b in bindings
+        if isinstance(b, dict) and isinstance(b.get("type"), str) and b["type"].endswith("Trigger")
+    ]
+
+
+def _decorator_triggers(context: ProjectContext, path: Path) -> list[str]:
+    try:
+        text = context.read_text(path, errors="replace")
+    except OSError:
+        return []
+    return sorted({_DECORATOR_TRIGGERS[name] for name in _DECORATOR.findall(text)})
+
+
+def used_triggers(root: Path, context: ProjectContext) -> set[str]:
+    """Binding types (``queueTrigger``, ``httpTrigger``, ...) of the app's functions."""
+    from azure_functions_doctor.import_graph import VENDORED_DIRS
+
+    triggers: set[str] = set()
+    for path in context.files.rglob("function.json"):
+        triggers.update(_function_json_triggers(context, path))
+    for path in context.files.rglob("*.py"):
+        if VENDORED_DIRS.intersection(path.relative_to(root).parts):
+            continue
+        triggers.update(context.scan("host_triggers", path, partial(_decorator_triggers, context)))
+    return triggers
+
+
+def _audit_timeout(host: HostJson, raw: Any, triggers: set[str]) -> list[HostFinding]:
+    value = host.get("functionTimeout")
+    if value is None:
+        return []
+    seconds = timespan_seconds(value)
+    setting = "functionTimeout"
+    if seconds is None:
+        return [
+            {
+                "setting": setting,
+                "message": f"{json_value(value)} is not a timespan (hh:mm:ss); the host will not start",
+            }
+        ]
+    if seconds == -1:
+        return [
+            {
+                "setting": setting,
+                "message": "-1 is unbounded: a hung invocation holds its concurrency slot until the worker restarts, "
+                "and the Consumption plan rejects it",
+            }
+        ]
+    findings: list[HostFinding] = []
+    if seconds > _CONSUMPTION_MAX_TIMEOUT_S:
+        findings.append(
+            {
+                "setting": setting,
+                "message": f"{json_value(value)} exceeds the Consumption plan maximum of 00:10:00; "
+                "only Premium, Flex Consumption and Dedicated plans accept it",
+            }
+        )
+    if seconds > _HTTP_RESPONSE_LIMIT_S and "httpTrigger" in triggers:
+        findings.append(
+            {
+                "setting": setting,
+                "message": f"{json_value(value)} outlives the {_HTTP_RESPONSE_LIMIT_S} s HTTP response limit; "
+                "slow HTTP invocations keep running after the client got a 502",
+            }
+        )
+    return findings
+
+
+def _audit_concurrency(host: HostJson, raw: Any, triggers: set[str]) -> list[HostFinding]:
+    concurrency = host.get("concurrency", {})
+    if not concurrency.get("dynamicConcurrencyEnabled"):
+        return []
+    findings: list[HostFinding] = []
+    if not triggers & _DYNAMIC_CONCURRENCY_TRIGGERS:
+        findings.append(
+            {
+                "setting": "concurrency.dynamicConcurrencyEnabled",
+                "message": "has no effect: none of the app's triggers (queue, blob, Service Bus) "
+                "support dynamic concurrency",
+            }
+        )
+    extensions = cast(dict[str, dict[str, Any]], host.get("extensions", {}))
+    for extension, key in _STATIC_CONCURRENCY_SETTINGS:
+        if key in extensions.get(extension, {}):
+            findings.append(
+                {
+                    "setting": f"extensions.{extension}.{key}",
+                    "message": "is ignored while dynamicConcurrencyEnabled is true; "
+                    "remove it or disable dynamic concurrency",
+                }
+            )
+    if concurrency.get("snapshotPersistenceEnabled") is False:
+        findings.append(
+            {
+                "setting": "concurrency.snapshotPersistenceEnabled",
+                "message": "false: learned concurrency is lost on restart and every new instance ramps up from 1",
+            }
+        )
+    return findings
+
+
+def _audit_queues(host: HostJson, raw: Any, triggers: set[str]) -> list[HostFinding]:
+    if "queueTrigger" not in triggers:
+        return []
+    queues = host.get("extensions", {}).get("queues", {})
+    findings: list[HostFinding] = []
+    batch = queues.get("batchSize")
+    if batch is not None and not 1 <= batch <= _QUEUE_MAX_BATCH:
+        findings.append(
+            {
+                "setting": "extensions.queues.batchSize",
+                "message": f"{batch} is outside 1-{_QUEUE_MAX_BATCH}; the host will not start",
+            }
+        )
+    threshold = queues.get("newBatchThreshold")
+    if threshold is not None and threshold < 0:
+        findings.append(
+            {"setting": "extensions.queues.newBatchThreshold", "message": f"{threshold} must not be negative"}
+        )
+    if batch == 1 and threshold == 0:
+        findings.append(
+            {
+                "setting": "extensions.queues.batchSize",
+                "message": "1 with newBatchThreshold 0 processes one message at a time per instance",
+            }
+        )
+    polling = queues.get("maxPollingInterval")
+    seconds = timespan_seconds(polling) if polling is not None else None
+    if polling is not None and (seconds is None or seconds < 0):
+        findings.append(
+            {"setting": "extensions.queues.maxPollingInterval", "message": f"{json_value(polling)} is not a timespan"}
+        )
+    elif seconds is not None and seconds > _QUEUE_DEFAULT_POLLING_S:
+        findings.append(
+            {
+                "setting": "extensions.queues.maxPollingInterval",
+                "message": f"{json_value(polling)}: a message arriving on an idle queue waits up to {seconds:g} s",
+            }
+        )
+    return findings
+
+
+def _audit_service_bus(host: HostJson, raw: Any, triggers: set[str]) -> list[HostFinding]:
+    if "serviceBusTrigger" not in triggers:
+        return []
+    service_bus = host.get("extensions", {}).get("serviceBus", {})
+    findings: list[HostFinding] = []
+    calls = service_bus.get("maxConcurrentCalls")
+    if calls is not None and calls < 1:
+        findings.append(
+            {"setting": "extensions.serviceBus.maxConcurrentCalls", "message": f"{calls} must be at least 1"}
+        )
+    elif calls == 1:
+        findings.append(
+            {
+                "setting": "extensions.serviceBus.maxConcurrentCalls",
+                "message": "1 processes one message at a time per instance",
+            }
+        )
+    prefetch = service_bus.get("prefetchCount")
+    if prefetch is not None and prefetch < 0:
+        findings.append(
+            {"setting": "extensions.serviceBus.prefetchCount", "message": f"{prefetch} must not be negative"}
+        )
+    elif prefetch and calls and prefetch < calls:
+        findings.append(
+            {
+                "setting": "extensions.serviceBus.prefetchCount",
+                "message": f"{prefetch} is below maxConcurrentCalls ({calls}); "
+                "handlers wait on broker round trips instead of the prefetch buffer",
+            }
+        )
+    legacy = service_bus.get("messageHandlerOptions")
+    major = _bundle_major(raw)
+    if legacy is not None and (major is None or major >= 3):
+        findings.append(
+            {
+                "setting": "extensions.serviceBus.messageHandlerOptions",
+                "message": "is the Service Bus extension 4.x layout and is ignored by 5.x (bundle 3.x+); "
+                "set maxConcurrentCalls directly under serviceBus",
+            }
+        )
+    return findings
+
+
+def _audit_event_hubs(host: HostJson, raw: Any, triggers: set[str]) -> list[HostFinding]:
+    if "eventHubTrigger" not in triggers:
+        return []
+    event_hubs = host.get("extensions", {}).get("eventHubs", {})
+    findings: list[HostFinding] = []
+    batch = event_hubs.get("maxEventBatchSize", _EVENT_HUBS_DEFAULT_BATCH)
+    prefetch = event_hubs.get("prefetchCount", _EVENT_HUBS_DEFAULT_PREFETCH)
+    if batch < 1:
+        findings.append({"setting": "extensions.eventHubs.maxEventBatchSize", "message": f"{batch} must be at least 1"})
+    elif batch == 1:
+        findings.append(
+            {
+                "setting": "extensions.eventHubs.maxEventBatchSize",
+                "message": "1 invokes the function once per event; partition throughput is bound by invocation latency",
+            }
+        )
+    if 0 <= prefetch < batch:
+        findings.append(
+            {
+                "setting": "extensions.eventHubs.prefetchCount",
+                "message": f"{prefetch} is below maxEventBatchSize ({batch}); "
+                "batches are cut short at the prefetch size",
+            }
+        )
+    legacy = event_hubs.get("eventProcessorOptions")
+    major = _bundle_major(raw)
+    if legacy is not None and (major is None or major >= 3):
+        findings.append(
+            {
+                "setting": "extensions.eventHubs.eventProcessorOptions",
+                "message": "is the Event Hubs extension 4.x layout and is ignored by 5.x (bundle 3.x+); "
+                "set maxEventBatchSize and prefetchCount directly under eventHubs",
+            }
+        )
+    return findings
+
+
+def _audit_http(host: HostJson, raw: Any, triggers: set[str]) -> list[HostFinding]:
+    if "httpTrigger" not in triggers:
+        return []
+    http = host.get("extensions", {}).get("http", {})
+    findings: list[HostFinding] = []
+    concurrent = http.get("maxConcurrentRequests", -1)
+    outstanding = http.get("maxOutstandingRequests", -1)
+    if concurrent == 1:
+        findings.append(
+            {
+                "setting": "extensions.http.maxConcurrentRequests",
+                "message": "1 serializes HTTP invocations per instance; queued requests add latency",
+            }
+        )
+    if 0 < outstanding < concurrent:
+        findings.append(
+            {
+                "setting": "extensions.http.maxOutstandingRequests",
+                "message": f"{outstanding} is below maxConcurrentRequests ({concurrent}); "
+                "requests are rejected with 429 before the concurrency limit is reached",
+            }
+        )
+    return findings
+
+
+_AUDITS: dict[str, Callable[[HostJson, Any, set[str]], list[HostFinding]]] = {
+    "timeout": _audit_timeout,
+    "concurrency": _audit_concurrency,
+    "queues": _audit_queues,
+    "service_bus": _audit_service_bus,
+    "event_hubs": _audit_event_hubs,
+    "http": _audit_http,
+}
+# Settings whose type problems are reported by each area
+_AREA_PREFIXES = {
+    "timeout": ("functionTimeout",),
+    "concurrency": ("concurrency.",),
+    "queues": ("extensions.queues.",),
+    "service_bus": ("extensions.serviceBus.",),
+    "event_hubs": ("extensions.eventHubs.",),
+    "http": ("extensions.http.",),
+}
+HOST_AREAS: tuple[str, ...] = get_args(HostArea)
+
+
+def audit_host(data: Any, area: str, triggers: set[str]) -> list[HostFinding]:
+    """Findings for one area of the parsed ``host.json`` document ``data``."""
+    if area not in _AUDITS:
+        raise ValueError(f"Unknown host.json area '{area}'; expected one of {', '.join(HOST_AREAS)}")
+    host, problems = parse_host_json(data)
+    findings = [p for p in problems if p["setting"] == "$" or p["setting"].startswith(_AREA_PREFIXES[area])]
+    return findings + _AUDITS[area](host, data, triggers)
+
+
+def setting_line(text: str, setting: str) -> Optional[int]:
+    """1-based line of the deepest key of a dotted ``setting`` found in the ``host.json`` text."""
+    position: Optional[int] = None
+    start = 0
+    for key in setting.split("."):
+        match = re.compile(r'"%s"\s*:' % re.escape(key)).search(text, start)
+        if match is None:
+            break
+        position, start = match.start(), match.end()
+    return None if position is None else text.count("\n", 0, position) + 1
+
+
+def describe(findings: list[HostFinding], text: Optional[str] = None) -> list[str]:
+    """``host.json:<line> setting: message`` evidence, the line when ``text`` locates the setting."""
+    described = []
+    for finding in findings:
+        line = setting_line(text, finding["setting"]) if text is not None else None
+        location = f"host.json:{line}" if line is not None else "host.json"
+        described.append(f"{location} {finding['setting']}: {finding['message']}")
+    return described
@@ -0,0 +1,438 @@
+"""
+Language Server Protocol front end publishing doctor findings as editor diagnostics.
+
+The server speaks JSON-RPC over stdio with ``Content-Length`` framing and needs no
+third-party LSP library. It keeps one warm :class:`Doctor` per project root and,
+on ``didOpen``/``didChange``/``didSave``, re-evaluates only the rules whose inputs
+(see :func:`azure_functions_doctor.handlers.rule_inputs`) match the edited file.
+Unsaved buffers are served to handlers through the project context's overlays,
+so findings follow what is on screen rather than what is on disk.
+
+Findings are attached to the offending location where one can be derived: the
+JSON key in ``host.json``, the binding in ``function.json``, a ``file:line``
+reference in the detail, or otherwise the first line of the project's entry
+document (``function_app.py``, ``host.json`` or ``requirements.txt``).
+"""
+
+import json
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import IO, Any, Optional
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from azure_functions_doctor import __version__
+from azure_functions_doctor.config import get_config
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.files import matches_rglob
+from azure_functions_doctor.handlers import Rule, rule_inputs
+from azure_functions_doctor.logging_config import get_logger
+from azure_functions_doctor.results import Check
+
+logger = get_logger(__name__)
+
+_SEVERITY = {"fail": 1, "warn": 2}
+_ANCHOR_DOCUMENTS = ("function_app.py", "host.json", "requirements.txt")
+# Edits to these can flip the detected programming model (and with it the rule set)
+_MODEL_INPUTS = ("*.py", "function.json")
+# Measurements of the files on disk (a tree walk, importing the app): unsaved buffers cannot
+# change them and repeating them on every keystroke is too slow, so they run on full evaluations only
+_FULL_RUN_ONLY_TYPES = frozenset({"deploy_size", "cold_start_import", "cold_start_memory", "dist_footprint"})
+_EVIDENCE = re.compile(r"([\w./\\-]+\.(?:py|json|txt)):(\d+)")
+_FUNCTION_JSON_EVIDENCE = re.compile(r"([\w./\\-]*function\.json):")
+_FUNCTION_JSON_KEYS = {"binding_validation": "httpTrigger", "cron_validation": "schedule"}
+
+Range = dict[str, dict[str, int]]
+
+
+def read_message(stream: IO[bytes]) -> Optional[dict[str, Any]]:
+    """Read one framed JSON-RPC message; returns None at end of stream."""
+    headers: dict[str, str] = {}
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii", errors="replace").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    body = stream.read(length)
+    message = json.loads(body.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("JSON-RPC message must be an object")
+    return message
+
+
+def write_message(stream: IO[bytes], message: dict[str, Any]) -> None:
+    """Write one JSON-RPC message with ``Content-Length`` framing."""
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+def uri_to_path(uri: str) -> Path:
+    """Convert a ``file://`` URI to a resolved filesystem path."""
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        raise ValueError(f"Unsupported URI scheme: {uri}")
+    return Path(url2pathname(unquote(parsed.path))).resolve()
+
+
+def _position(text: str, offset: int) -> dict[str, int]:
+    """LSP position (UTF-16 code units) of a character offset."""
+    line_start = text.rfind("\n", 0, offset) + 1
+    prefix = text[line_start:offset]
+    return {"line": text.count("\n", 0, offset), "character": len(prefix.encode("utf-16-le")) // 2}
+
+
+def _line_range(text: str, line: int) -> Range:
+    lines = text.splitlines()
+    line = max(0, min(line, len(lines) - 1)) if lines else 0
+    content = lines[line] if lines else ""
+    indent = len(content) - len(content.lstrip())
+    return {
+        "start": {"line": line, "character": indent},
+        "end": {"line": line, "character": len(content.encode("utf-16-le")) // 2},
+    }
+
+
+def json_key_range(text: str, keys: list[str]) -> Optional[Range]:
+    """
+    Range of the deepest key of ``keys`` present in a JSON document.
+
+    Keys are searched in sequence, each after the previous one, which follows
+    nesting for the small configuration files this is used on.
+    """
+    found: Optional[tuple[int, int]] = None
+    position = 0
+    for key in keys:
+        match = re.compile(r'"%s"\s*:' % re.escape(key)).search(text, position)
+        if match is None:
+            break
+        found = (match.start(), match.start() + len(key) + 2)
+        position = match.end()
+    if found is None:
+        return None
+    return {"start": _position(text, found[0]), "end": _position(text, found[1])}
+
+
+class _Workspace:
+    """Warm state for one project root: its doctor, rules and last result per rule."""
+
+    def __init__(self, root: Path, overlays: dict[Path, str]) -> None:
+        self.root = root
+        self.doctor = Doctor(str(root), allow_v1=True)
+        self.doctor.context.overlays = overlays
+        self.rules: list[Rule] = self.doctor.load_rules()
+        self.results: dict[str, Check] = {}
+        self.pending: set[str] = set()
+        self.full = True
+        self.published: dict[str, list[dict[str, Any]]] = {}
+
+    def evaluate(self) -> list[str]:
+        """Re-evaluate rules affected by pending changes; returns the ids that ran."""
+        pending, self.pending = self.pending, set()
+        if any(matches_rglob(p, rel) for rel in pending for p in _MODEL_INPUTS) and self.doctor.redetect():
+            self.full = True
+        if self.full:
+            self.rules = self.doctor.load_rules()
+            self.results.clear()
+            affected = self.rules
+            self.full = False
+        else:
+            affected = [rule for rule in self.rules if _affected(rule, pending)]
+        for rule in affected:
+            self.results[rule["id"]] = self.doctor.evaluate_rule(rule)
+        return [rule["id"] for rule in affected]
+
+    def diagnostics(self) -> dict[Path, list[dict[str, Any]]]:
+        """Current findings grouped by the document they are attached to."""
+        grouped: dict[Path, list[dict[str, Any]]] = {}
+        for rule in self.rules:
+            item = self.results.get(rule["id"])
+            if item is None or item.get("status") not in _SEVERITY:
+                continue
+            for path, range_ in self._locate(rule, item):
+                message = f"{item.get('label', rule['id'])}: {item.get('value', '')}"
+                if item.get("hint"):
+                    message += f"\n{item['hint']}"
+                diagnostic: dict[str, Any] = {
+                    "range": range_,
+                    "severity": _SEVERITY[item.get("status", "fail")],
+                    "source": "func-doctor",
+                    "code": rule["id"],
+                    "message": message,
+                }
+                if item.get("hint_url"):
+                    diagnostic["codeDescription"] = {"href": item["hint_url"]}
+                grouped.setdefault(path, []).append(diagnostic)
+        return grouped
+
+    def _read(self, path: Path) -> Optional[str]:
+        try:
+            return self.doctor.context.read_text(path, errors="replace")
+        except OSError:
+            return None
+
+    def _locate(self, rule: Rule, item: Check) -> list[tuple[Path, Range]]:
+        check_type = rule.get("type", "")
+        condition = rule.get("condition", {}) or {}
+        detail = item.get("value", "")
+
+        if check_type in _FUNCTION_JSON_KEYS:
+            located = []
+            for rel in dict.fromkeys(_FUNCTION_JSON_EVIDENCE.findall(detail)):
+                path = self.root / rel
+                text = self._read(path)
+                if text is not None:
+                    key_range = json_key_range(text, [_FUNCTION_JSON_KEYS[check_type]])
+                    located.append((path, key_range or _line_range(text, 0)))
+            if located:
+                return located
+
+        evidence = []
+        for rel, line in _EVIDENCE.findall(detail):
+            path = self.root / rel
+            text = self._read(path)
+            if text is not None:
+                evidence.append((path, _line_range(text, int(line) - 1)))
+        if evidence:
+            return evidence
+
+        jsonpath: Optional[str] = None
+        if check_type in ("host_json_property", "conditional_exists"):
+            jsonpath = str(condition.get("jsonpath", ""))
+        elif check_type == "any_of_exists":
+            jsonpath = next(
+                (t.split(":", 1)[1] for t in condition.get("targets", []) or [] if str(t).startswith("host.json:")),
+                None,
+            )
+        if jsonpath is not None:
+            host_path = self.root / "host.json"
+            text = self._read(host_path)
+            if text is not None:
+                keys = [k for k in jsonpath.lstrip("$.").split(".") if k]
+                return [(host_path, json_key_range(text, keys) or _line_range(text, 0))]
+
+        if check_type == "package_declared":
+            req_path = self.root / str(condition.get("file", "requirements.txt"))
+            text = self._read(req_path)
+            if text is not None:
+                return [(req_path, _line_range(text, 0))]
+
+        for name in _ANCHOR_DOCUMENTS:
+            anchor = self.root / name
+            text = self._read(anchor)
+            if text is not None:
+                return [(anchor, _line_range(text, 0))]
+        return []
+
+
+def _affected(rule: Rule, changed: set[str]) -> bool:
+    if rule.get("type") in _FULL_RUN_ONLY_TYPES:
+        return False
+    patterns = rule_inputs(rule)
+    return any(matches_rglob(pattern, rel) for rel in changed for pattern in patterns)
+
+
+class LanguageServer:
+    """Stdio language server; ``debounce`` of 0 evaluates synchronously (used by tests)."""
+
+    def __init__(self, reader: IO[bytes], writer: IO[bytes], debounce: Optional[float] = None) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.debounce = debounce if debounce is not None else get_config().get_lsp_debounce_seconds()
+        self.roots: list[Path] = []
+        self.overlays: dict[Path, str] = {}
+        self._uris: dict[Path, str] = {}
+        self._workspaces: dict[Path, _Workspace] = {}
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._shutdown = False
+
+    # --- transport ---
+
+    def serve(self) -> int:
+        """Process messages until ``exit``; returns the process exit code."""
+        while True:
+            try:
+                message = read_message(self.reader)
+            except (ValueError, UnicodeDecodeError) as exc:
+                logger.warning(f"Discarding malformed message: {exc}")
+                continue
+            if message is None:
+                return 0 if self._shutdown else 1
+            if message.get("method") == "exit":
+                self._cancel_timer()
+                return 0 if self._shutdown else 1
+            self.handle_message(message)
+
+    def send(self, message: dict[str, Any]) -> None:
+        with self._write_lock:
+            write_message(self.writer, message)
+
+    def handle_message(self, message: dict[str, Any]) -> None:
+        """Dispatch one request or notification."""
+        method = message.get("method")
+        params = message.get("params") or {}
+        msg_id = message.get("id")
+        handler = getattr(self, "_on_" + str(method).replace("/", "_").replace("$", "_"), None)
+        if handler is None:
+            if msg_id is not None and method is not None:
+                self.send({"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32601, "message": f"{method}"}})
+            return
+        try:
+            result = handler(params)
+        except Exception as exc:
+            logger.error(f"LSP {method} failed: {exc}", exc_info=True)
+            if msg_id is not None:
+                self.send({"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32603, "message": str(exc)}})
+            return
+        if msg_id is not None:
+            self.send({"jsonrpc": "2.0", "id": msg_id, "result": result})
+
+    # --- lifecycle ---
+
+    def _on_initialize(self, params: dict[str, Any]) -> dict[str, Any]:
+        folders = params.get("workspaceFolders") or []
+        uris = [f.get("uri") for f in folders if isinstance(f, dict)] or [params.get("rootUri")]
+        for uri in uris:
+            if isinstance(uri, str):
+                try:
+                    self.roots.append(uri_to_path(uri))
+                except ValueError:
+                    continue
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": 1, "save": {"includeText": False}},
+            },
+            "serverInfo": {"name": "func-doctor", "version": __version__},
+        }
+
+    def _on_initialized(self, params: dict[str, Any]) -> None:
+        return None
+
+    def _on_shutdown(self, params: dict[str, Any]) -> None:
+        self._shutdown = True
+        self._cancel_timer()
+        return None
+
+    # --- documents ---
+
+    def _on_textDocument_didOpen(self, params: dict[str, Any]) -> None:
+        document = params["textDocument"]
+        self._document_changed(document["uri"], document.get("text"))
+
+    def _on_textDocument_didChange(self, params: dict[str, Any]) -> None:
+        changes = params.get("contentChanges") or []
+        # Full document sync: the last change carries the whole buffer
+        text = changes[-1].get("text") if changes else None
+        self._document_changed(params["textDocument"]["uri"], text)
+
+    def _on_textDocument_didSave(self, params: dict[str, Any]) -> None:
+        self._document_changed(params["textDocument"]["uri"], params.get("text"), keep_overlay=True)
+
+    def _on_textDocument_didClose(self, params: dict[str, Any]) -> None:
+        self._document_changed(params["textDocument"]["uri"], None)
+
+    def _on_workspace_didChangeWatchedFiles(self, params: dict[str, Any]) -> None:
+        for change in params.get("changes") or []:
+            # FileChangeType: 1 created, 2 changed, 3 deleted
+            self._document_changed(change["uri"], None, structural=change.get("type") != 2, keep_overlay=True)
+
+    def _document_changed(
+        self, uri: str, text: Optional[str], structural: bool = False, keep_overlay: bool = False
+    ) -> None:
+        try:
+            path = uri_to_path(uri)
+        except ValueError:
+            return
+        with self._lock:
+            self._uris[path] = uri
+            if text is not None:
+                self.overlays[path] = text
+            elif not keep_overlay:
+                self.overlays.pop(path, None)
+            workspace = self._workspace_for(path)
+            if workspace is None:
+                return
+            workspace.doctor.context.invalidate([path], structural=structural)
+            workspace.pending.add(path.relative_to(workspace.root).as_posix())
+        self._schedule()
+
+    def _root_for(self, path: Path) -> Path:
+        for parent in path.parents:
+            if (parent / "host.json").is_file():
+                return parent
+            if parent in self.roots:
+                return parent
+        return path.parent
+
+    def _workspace_for(self, path: Path) -> Optional[_Workspace]:
+        root = self._root_for(path)
+        workspace = self._workspaces.get(root)
+        if workspace is None:
+            try:
+                workspace = _Workspace(root, self.overlays)
+            except (SystemExit, RuntimeError) as exc:
+                logger.warning(f"Cannot diagnose {root}: {exc}")
+                return None
+            self._workspaces[root] = workspace
+        return workspace
+
+    # --- evaluation ---
+
+    def _schedule(self) -> None:
+        if self.debounce <= 0:
+            self.flush()
+            return
+        with self._lock:
+            self._cancel_timer()
+            timer = threading.Timer(self.debounce, self.flush)
+            timer.daemon = True
+            self._timer = timer
+            timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def flush(self) -> None:
+        """Evaluate pending changes in every workspace and publish updated diagnostics."""
+        with self._lock:
+            for workspace in self._workspaces.values():
+                if not workspace.pending and not workspace.full:
+                    continue
+                ran = workspace.evaluate()
+                logger.debug(f"Re-evaluated {len(ran)} rule(s) in {workspace.root}")
+                self._publish(workspace)
+
+    def _publish(self, workspace: _Workspace) -> None:
+        grouped = workspace.diagnostics()
+        uris = {self._uris.get(path, path.as_uri()): diagnostics for path, diagnostics in grouped.items()}
+        # Clear documents whose findings were all resolved
+        for uri in set(workspace.published) - set(uris):
+            uris[uri] = []
+        previous, workspace.published = workspace.published, {u: d for u, d in uris.items() if d}
+        for uri, diagnostics in sorted(uris.items()):
+            if previous.get(uri) == diagnostics:
+                continue  # unchanged since the last publish
+            self.send(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "textDocument/publishDiagnostics",
+                    "params": {"uri": uri, "diagnostics": diagnostics},
+                }
+            )
+
+
+def main() -> int:
+    """Run the language server on stdin/stdout."""
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer)
+    return server.serve()
@@ -0,0 +1,208 @@
+"""
+External tool version probes.
+
+Tools such as Azure Functions Core Tools are slow to start, so probes run
+concurrently with ``asyncio.create_subprocess_exec`` and their results are cached
+on disk. Each cache entry is keyed by the binary's resolved path, size and mtime
+and expires after ``probe_cache_ttl_seconds``; replacing or upgrading the binary
+therefore invalidates it immediately.
+"""
+
+import asyncio
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Coroutine, Iterable, NamedTuple, Optional
+
+from azure_functions_doctor.cache import JsonCache, file_signature
+from azure_functions_doctor.config import get_config
+from azure_functions_doctor.executables import ExecutableIndex
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Sentinel values returned instead of a version string
+NOT_INSTALLED = "not_installed"
+TIMEOUT = "timeout"
+UNKNOWN_ERROR = "unknown_error"
+
+_CACHE_NAME = "probes"
+_IS_WINDOWS = sys.platform.startswith("win")
+
+
+class ToolProbe(NamedTuple):
+    """How to ask an external tool for its version."""
+
+    executable: str
+    args: tuple[str, ...]
+    pattern: str = r"(\d+(?:\.\d+)+)"
+
+
+PROBES: dict[str, ToolProbe] = {
+    "func_core_tools": ToolProbe("func", ("--version",)),
+    "azure_cli": ToolProbe("az", ("--version",), r"azure-cli\s+(\d+(?:\.\d+)+)"),
+    "azurite": ToolProbe("azurite", ("--version",)),
+    "docker": ToolProbe("docker", ("--version",)),
+    "dotnet": ToolProbe("dotnet", ("--version",)),
+    "node": ToolProbe("node", ("--version",)),
+}
+
+
+def is_probe_target(target: str) -> bool:
+    """Return True if ``target`` names a known external tool probe."""
+    return target in PROBES
+
+
+def run_probes(
+    targets: Iterable[str],
+    executables: Optional[ExecutableIndex] = None,
+    use_cache: bool = True,
+) -> dict[str, str]:
+    """
+    Resolve the versions of several external tools at once.
+
+    Cached results are returned without spawning anything; all remaining probes
+    are started together and awaited concurrently.
+
+    Args:
+        targets: Probe names from ``PROBES`` (e.g. "func_core_tools").
+        executables: PATH index used to locate binaries; a fresh one is built if omitted.
+        use_cache: Whether to read and update the on-disk probe cache.
+
+    Returns:
+        Mapping of target to version string, or one of ``not_installed``,
+        ``timeout``, ``error_<code>`` or ``unknown_error``.
+
+    Raises:
+        ValueError: If a target is not a known probe.
+    """
+    index = executables if executables is not None else ExecutableIndex()
+    cache = JsonCache(_CACHE_NAME)
+    ttl = get_config().get_probe_cache_ttl_seconds()
+    now = time.time()
+
+    results: dict[str, str] = {}
+    pending: dict[str, tuple[str, Optional[str]]] = {}
+    for target in dict.fromkeys(targets):
+        probe = PROBES.get(target)
+        if probe is None:
+            raise ValueError(f"Unknown target: {target}")
+        binary = index.which(probe.executable)
+        if binary is None:
+            logger.debug(f"{probe.executable} not found in PATH")
+            results[target] = NOT_INSTALLED
+            continue
+        key = _cache_key(target, binary)
+        if use_cache and key is not None:
+            entry = cache.get(key)
+            if isinstance(entry, dict) and now - float(entry.get("ts", 0)) < ttl:
+                results[target] = str(entry["value"])
+                continue
+        pending[target] = (binary, key)
+
+    if pending:
+        timeout = get_config().get_probe_timeout_seconds()
+        fresh = _run_async(_probe_all({t: b for t, (b, _) in pending.items()}, timeout))
+        for target, value in fresh.items():
+            results[target] = value
+            key = pending[target][1]
+            if use_cache and key is not None and _is_version(value):
+                cache.set(key, {"value": value, "ts": now})
+        if use_cache:
+            _prune_expired(cache, now, ttl)
+            cache.save()
+
+    return results
+
+
+def _cache_key(target: str, binary: str) -> Optional[str]:
+    signature = file_signature(Path(binary))
+    return f"{target}|{signature}" if signature is not None else None
+
+
+def _prune_expired(cache: JsonCache, now: float, ttl: int) -> None:
+    for key, entry in list(cache.data().items()):
+        if not isinstance(entry, dict) or now - float(entry.get("ts", 0)) >= ttl:
+            cache.pop(key)
+
+
+def _is_version(value: str) -> bool:
+    return bool(value) and value[0].isdigit()
+
+
+async def _probe_all(binaries: dict[str, str], timeout: float) -> dict[str, str]:
+    targets = list(binaries)
+    values = await asyncio.gather(*(_probe_one(t, binaries[t], timeout) for t in targets))
+    return dict(zip(targets, values))
+
+
+async def _probe_one(target: str, binary: str, timeout: float) -> str:
+    probe = PROBES[target]
+    try:
+        process = await asyncio.create_subprocess_exec(
+            binary,
+            *probe.args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Own process group so a timeout also kills helpers the tool spawned
+            start_new_session=not _IS_WINDOWS,
+        )
+    except FileNotFoundError:
+        logger.debug(f"{binary} disappeared before it could be probed")
+        return NOT_INSTALLED
+    except Exception as exc:
+        logger.error(f"Unexpected error starting {binary}: {exc}")
+        return UNKNOWN_ERROR
+
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Timeout getting {probe.executable} version")
+        await _kill(process)
+        return TIMEOUT
+    except Exception as exc:
+        logger.error(f"Unexpected error getting {probe.executable} version: {exc}")
+        await _kill(process)
+        return UNKNOWN_ERROR
+
+    if process.returncode:
+        logger.warning(f"{probe.executable} command failed with code {process.returncode}")
+        return f"error_{process.returncode}"
+
+    output = stdout.decode("utf-8", errors="replace").strip()
+    match = re.search(probe.pattern, output)
+    return match.group(1) if match else output
+
+
+async def _kill(process: "asyncio.subprocess.Process") -> None:
+    try:
+        if _IS_WINDOWS:
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        return
+    await process.wait()
+
+
+def _run_async(coro: Coroutine[Any, Any, dict[str, str]]) -> dict[str, str]:
+    """Run ``coro`` to completion, even when called from inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # A loop is already running in this thread (e.g. an embedding server); use a helper thread
+    box: dict[str, dict[str, str]] = {}
+
+    def runner() -> None:
+        box["result"] = asyncio.run(coro)
+
+    thread = threading.Thread(target=runner, name="func-doctor-probes")
+    thread.start()
+    thread.join()
+    return box.get("result", {})
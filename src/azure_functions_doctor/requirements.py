@@ -0,0 +1,237 @@
+"""
+Requirements file parsing for dependency declaration checks.
+
+This module parses a pip requirements file together with every file it pulls in
+through ``-r``/``--requirement`` and ``-c``/``--constraint`` includes, and exposes
+the result as an index keyed by PEP 503 canonical project names.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from packaging.markers import InvalidMarker, Marker
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Options that include another requirements file, mapped to whether the include is a constraint file
+_INCLUDE_OPTIONS = {
+    "-r": False,
+    "--requirement": False,
+    "-c": True,
+    "--constraint": True,
+}
+
+_EDITABLE_OPTIONS = ("-e", "--editable")
+
+# pip only expands environment variables written in the ${VAR} form
+_ENV_VAR_PATTERN = re.compile(r"\$\{([A-Za-z0-9_]+)\}")
+_EGG_PATTERN = re.compile(r"[#&]egg=([A-Za-z0-9_.\-]+)")
+_COMMENT_PATTERN = re.compile(r"(^|\s+)#.*$")
+_PER_REQUIREMENT_OPTION_PATTERN = re.compile(r"\s+--?[A-Za-z][\w-]*(?:[=\s].*)?$")
+_FALLBACK_NAME_PATTERN = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+class DeclaredRequirement(NamedTuple):
+    """A single requirement line resolved from the include graph."""
+
+    name: str
+    raw: str
+    specifier: str
+    extras: frozenset[str]
+    marker: Optional[str]
+    source: Path
+    line: int
+
+    def applies(self) -> bool:
+        """Return True when the requirement's environment marker matches the running interpreter."""
+        if not self.marker:
+            return True
+        try:
+            return Marker(self.marker).evaluate()
+        except InvalidMarker:
+            return True
+
+
+class RequirementsIndex:
+    """
+    Parsed view of a requirements file and everything it includes.
+
+    Lookups are keyed by canonical project name so ``Azure_Functions``,
+    ``azure.functions`` and ``azure-functions[extra]`` all resolve to the same
+    entry. Constraint files contribute specifiers but never declare packages.
+    """
+
+    def __init__(self, root: Path, overlays: Optional[dict[Path, str]] = None) -> None:
+        self.root = root
+        self._overlays = overlays or {}
+        self.files: list[Path] = []
+        self.missing: list[Path] = []
+        self.errors: list[str] = []
+        self._declared: dict[str, list[DeclaredRequirement]] = {}
+        self._constraints: dict[str, list[DeclaredRequirement]] = {}
+        self._names: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_file(cls, path: Path, overlays: Optional[dict[Path, str]] = None) -> "RequirementsIndex":
+        """
+        Parse ``path`` and its full ``-r``/``-c`` include graph.
+
+        ``overlays`` maps paths to unsaved buffer contents read instead of the files on disk.
+        """
+        index = cls(path, overlays)
+        index._parse(path, constraint=False, visited=set())
+        index._names = frozenset(index._declared)
+        return index
+
+    @property
+    def exists(self) -> bool:
+        """Whether the root requirements file was found."""
+        return bool(self.files) and self.files[0] == self.root
+
+    @property
+    def names(self) -> frozenset[str]:
+        """Canonical names of every declared (non-constraint) requirement."""
+        return self._names
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and canonicalize_name(name) in self._names
+
+    def __iter__(self) -> Iterator[DeclaredRequirement]:
+        for entries in self._declared.values():
+            yield from entries
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def get(self, name: str) -> list[DeclaredRequirement]:
+        """Return every declaration of ``name`` in include order."""
+        return list(self._declared.get(canonicalize_name(name), []))
+
+    def constraints(self, name: str) -> list[DeclaredRequirement]:
+        """Return every constraint entry for ``name`` in include order."""
+        return list(self._constraints.get(canonicalize_name(name), []))
+
+    def specifier(self, name: str, include_constraints: bool = True) -> SpecifierSet:
+        """Return the combined version specifier declared for ``name``."""
+        key = canonicalize_name(name)
+        entries = list(self._declared.get(key, []))
+        if include_constraints:
+            entries.extend(self._constraints.get(key, []))
+        combined = SpecifierSet()
+        for entry in entries:
+            if entry.specifier:
+                combined &= SpecifierSet(entry.specifier)
+        return combined
+
+    # --- parsing ---
+
+    def _parse(self, path: Path, constraint: bool, visited: set[Path]) -> None:
+        resolved = path.resolve()
+        if resolved in visited:
+            return
+        visited.add(resolved)
+
+        overlay = self._overlays.get(path)
+        if overlay is None and not path.is_file():
+            self.missing.append(path)
+            return
+
+        self.files.append(path)
+        try:
+            text = overlay if overlay is not None else path.read_text(encoding="utf-8", errors="replace")
+        except OSError as exc:
+            logger.warning(f"Failed to read {path}: {exc}")
+            self.errors.append(f"{path}: {exc}")
+            return
+
+        for line_no, line in _logical_lines(text):
+            self._parse_line(path, line_no, line, constraint, visited)
+
+    def _parse_line(self, path: Path, line_no: int, line: str, constraint: bool, visited: set[Path]) -> None:
+        if line.startswith("-"):
+            option, _, argument = _split_option(line)
+            if option in _INCLUDE_OPTIONS:
+                if argument:
+                    include = path.parent / _expand_env(argument)
+                    self._parse(include, constraint or _INCLUDE_OPTIONS[option], visited)
+                return
+            if option in _EDITABLE_OPTIONS:
+                egg = _EGG_PATTERN.search(argument)
+                if egg:
+                    self._add(egg.group(1), "", frozenset(), None, line, path, line_no, constraint)
+                return
+            # Index, find-links and other global options do not declare packages
+            return
+
+        requirement_text = _PER_REQUIREMENT_OPTION_PATTERN.sub("", line)
+        egg = _EGG_PATTERN.search(requirement_text)
+        try:
+            req = Requirement(requirement_text)
+        except InvalidRequirement as exc:
+            if egg:
+                self._add(egg.group(1), "", frozenset(), None, line, path, line_no, constraint)
+                return
+            match = _FALLBACK_NAME_PATTERN.match(requirement_text)
+            if match and "/" not in requirement_text and ":" not in requirement_text:
+                self._add(match.group(1), "", frozenset(), None, line, path, line_no, constraint)
+            self.errors.append(f"{path}:{line_no}: {exc}")
+            return
+
+        marker = str(req.marker) if req.marker is not None else None
+        self._add(req.name, str(req.specifier), frozenset(req.extras), marker, line, path, line_no, constraint)
+
+    def _add(
+        self,
+        name: str,
+        specifier: str,
+        extras: frozenset[str],
+        marker: Optional[str],
+        raw: str,
+        source: Path,
+        line: int,
+        constraint: bool,
+    ) -> None:
+        canonical = canonicalize_name(name)
+        entry = DeclaredRequirement(canonical, raw, specifier, extras, marker, source, line)
+        target = self._constraints if constraint else self._declared
+        target.setdefault(canonical, []).append(entry)
+
+
+def _logical_lines(text: str) -> Iterator[tuple[int, str]]:
+    """Yield ``(line_number, line)`` pairs with comments stripped and continuations joined."""
+    buffer = ""
+    start = 0
+    for line_no, raw in enumerate(text.splitlines(), start=1):
+        if not buffer:
+            start = line_no
+        line = _COMMENT_PATTERN.sub("", raw).rstrip()
+        if line.endswith("\\"):
+            buffer += line[:-1] + " "
+            continue
+        line = (buffer + line).strip()
+        buffer = ""
+        if line:
+            yield start, line
+    if buffer.strip():
+        yield start, buffer.strip()
+
+
+def _split_option(line: str) -> tuple[str, str, str]:
+    """Split an option line such as ``-r base.txt``, ``--requirement=base.txt`` or ``-rbase.txt``."""
+    if line.startswith("--"):
+        match = re.match(r"(--[\w-]+)(=|\s+|$)(.*)", line)
+        if match is None:
+            return line, "", ""
+        return match.group(1), match.group(2), match.group(3).strip()
+    return line[:2], " ", line[2:].lstrip("=").strip()
+
+
+def _expand_env(value: str) -> str:
+    return _ENV_VAR_PATTERN.sub(lambda m: os.environ.get(m.group(1), m.group(0)), value)
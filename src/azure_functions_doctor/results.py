@@ -0,0 +1,212 @@
+"""
+Compact result objects produced while evaluating rules.
+
+Every rule yields a handler result and a check result, and check results are
+grouped into sections. The daemon keeps them per project and environment, so
+they are slotted objects rather than dicts. Statuses are :class:`Status`
+members. Ids, labels, hints and section names are interned, so repeated runs
+share those strings instead of holding copies.
+
+Each class is a read-only mapping with the keys of the JSON report, so code
+that reads ``result["status"]`` or ``section["items"]`` keeps working.
+``to_dict()`` builds the plain ``CheckResult``/``SectionResult`` dicts; that
+only happens at output boundaries such as JSON reports, the daemon protocol and
+:func:`azure_functions_doctor.api.run_diagnostics`.
+"""
+
+import sys
+from enum import Enum
+from typing import Any, Iterable, Iterator, Mapping, Optional, TypedDict, Union
+
+
+class CheckResult(TypedDict, total=False):
+    id: str
+    label: str
+    value: str
+    status: str
+    hint: str
+    hint_url: str
+    duration_ms: float
+
+
+class SectionResult(TypedDict):
+    title: str
+    category: str
+    status: str  # 'pass' or 'fail'
+    items: list[CheckResult]
+
+
+class Status(str, Enum):
+    PASS = "pass"
+    WARN = "warn"
+    FAIL = "fail"
+
+    def __str__(self) -> str:
+        return str.__str__(self)
+
+    def __format__(self, spec: str) -> str:
+        return str.__format__(self, spec)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+class HandlerResult(Mapping[str, Any]):
+    """Outcome of one handler call; ``internal_error`` marks failures of the doctor itself."""
+
+    __slots__ = ("status", "detail", "internal_error")
+
+    def __init__(self, status: Union[Status, str], detail: str, internal_error: bool = False) -> None:
+        self.status = Status(status)
+        self.detail = detail
+        self.internal_error = internal_error
+
+    @classmethod
+    def coerce(cls, value: Mapping[str, Any]) -> "HandlerResult":
+        """Accept the plain ``{"status", "detail"}`` dicts returned by plugin handlers."""
+        if isinstance(value, HandlerResult):
+            return value
+        status = Status.PASS if value.get("status") == "pass" else Status.FAIL
+        return cls(status, str(value.get("detail", "")), value.get("internal_error") in (True, "true"))
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "status":
+            return self.status.value
+        if key == "detail":
+            return self.detail
+        if key == "internal_error" and self.internal_error:
+            return True
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield "status"
+        yield "detail"
+        if self.internal_error:
+            yield "internal_error"
+
+    def __len__(self) -> int:
+        return 3 if self.internal_error else 2
+
+    def __repr__(self) -> str:
+        return f"HandlerResult({self.status.value!r}, {self.detail!r})"
+
+
+class Check(Mapping[str, Any]):
+    """Displayable result of one rule."""
+
+    __slots__ = ("id", "label", "value", "status", "hint", "hint_url", "duration_ms")
+
+    def __init__(
+        self,
+        id: str,
+        label: str,
+        value: str,
+        status: Union[Status, str],
+        hint: Optional[str] = None,
+        hint_url: Optional[str] = None,
+        duration_ms: Optional[float] = None,
+    ) -> None:
+        self.id = sys.intern(id)
+        self.label = sys.intern(label)
+        self.value = value
+        self.status = Status(status)
+        self.hint = _intern(hint)
+        self.hint_url = _intern(hint_url)
+        self.duration_ms = duration_ms
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Check":
+        """Rebuild a check from its dict form, e.g. a result kept in the cache."""
+        return cls(
+            str(data.get("id", "")),
+            str(data.get("label", data.get("id", ""))),
+            str(data.get("value", "")),
+            str(data.get("status", "fail")),
+            data.get("hint"),
+            data.get("hint_url"),
+            data.get("duration_ms"),
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        # Optional fields are absent from the mapping rather than None, as in the JSON report
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        if value is None:
+            raise KeyError(key)
+        return value.value if isinstance(value, Status) else value
+
+    def __iter__(self) -> Iterator[str]:
+        # Key order of the JSON report
+        yield from ("id", "label", "value", "status")
+        for key in ("duration_ms", "hint", "hint_url"):
+            if getattr(self, key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> CheckResult:
+        item: CheckResult = {"id": self.id, "label": self.label, "value": self.value, "status": self.status.value}
+        if self.duration_ms is not None:
+            item["duration_ms"] = self.duration_ms
+        if self.hint is not None:
+            item["hint"] = self.hint
+        if self.hint_url is not None:
+            item["hint_url"] = self.hint_url
+        return item
+
+    def __repr__(self) -> str:
+        return f"Check({self.id!r}, {self.status.value!r})"
+
+
+class Section(Mapping[str, Any]):
+    """Checks of one section, in ``check_order``; failed if any check failed."""
+
+    # ``items`` would shadow Mapping.items(), so the checks live in ``checks`` and are exposed as ["items"]
+    __slots__ = ("title", "category", "status", "checks")
+
+    def __init__(self, category: str, title: Optional[str] = None, checks: Optional[list[Check]] = None) -> None:
+        self.category = sys.intern(category)
+        self.title = sys.intern(title if title is not None else category.replace("_", " ").title())
+        self.status = Status.PASS
+        self.checks: list[Check] = []
+        for check in checks or ():
+            self.append(check)
+
+    def append(self, check: Check) -> None:
+        self.checks.append(check)
+        if check.status is Status.FAIL:
+            self.status = Status.FAIL
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "title":
+            return self.title
+        if key == "category":
+            return self.category
+        if key == "status":
+            return self.status.value
+        if key == "items":
+            return self.checks
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from ("title", "category", "status", "items")
+
+    def __len__(self) -> int:
+        return 4
+
+    def to_dict(self) -> SectionResult:
+        return {
+            "title": self.title,
+            "category": self.category,
+            "status": self.status.value,
+            "items": [check.to_dict() for check in self.checks],
+        }
+
+    def __repr__(self) -> str:
+        return f"Section({self.category!r}, {len(self.checks)} checks)"
+
+
+def to_dicts(sections: Iterable[Union[Section, SectionResult]]) -> list[SectionResult]:
+    """Plain dicts of ``sections`` for JSON output; sections that already are dicts pass through."""
+    return [section.to_dict() if isinstance(section, Section) else section for section in sections]
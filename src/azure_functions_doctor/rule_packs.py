@@ -0,0 +1,87 @@
+"""
+Organization-specific rule packs loaded from ``FUNC_DOCTOR_CUSTOM_RULES``.
+
+The variable names a JSON file or a directory whose ``*.json`` files are read
+in name order. A pack holds a list of rules in the built-in format (or an
+object with a ``rules`` list). Packs are merged into the built-in v1/v2 sets by
+``id``: a custom rule replaces the built-in rule with the same id, later packs
+override earlier ones and new ids are added. A rule applies to both models
+unless it lists the ones it is meant for in ``models`` (e.g. ``["v2"]``).
+
+Packs are validated against the rule schema (see
+:mod:`azure_functions_doctor.rule_schema`) only when their content digest has
+not passed before, so an unchanged pack costs one read, one hash, one cache
+lookup and a C-level JSON parse per run. The parsed rules themselves are not
+cached: reading them back would be another JSON parse of the same size.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Optional, Sequence, cast
+
+from azure_functions_doctor.config import get_config
+from azure_functions_doctor.handlers import Rule
+from azure_functions_doctor.logging_config import get_logger
+from azure_functions_doctor.rule_schema import RuleValidationError, ValidatedDigests
+
+logger = get_logger(__name__)
+
+MODELS = ("v1", "v2")
+
+
+class RulePackError(RuleValidationError):
+    """Raised when a custom rule pack cannot be read or fails validation."""
+
+
+def _pack_rules(source: Path, content: bytes) -> list[Any]:
+    try:
+        data = json.loads(content)
+    except ValueError as exc:
+        raise RulePackError(f"Invalid JSON in custom rules {source}: {exc}") from exc
+    if isinstance(data, dict):
+        data = data.get("rules")
+    if not isinstance(data, list):
+        raise RulePackError(f"Custom rules {source} must contain a list of rules")
+    return data
+
+
+def pack_files(path: Path) -> list[Path]:
+    """The pack files named by ``path``: the file itself, or a directory's ``*.json`` files in name order."""
+    if path.is_dir():
+        return sorted(p for p in path.glob("*.json") if p.is_file())
+    return [path]
+
+
+def load_rule_packs(path: Optional[Path] = None, digests: Optional[ValidatedDigests] = None) -> list[Rule]:
+    """
+    Load every custom rule from ``path`` (default: ``FUNC_DOCTOR_CUSTOM_RULES``) in override order.
+
+    Packs are validated against the rule schema unless their content passed before.
+    """
+    root = path if path is not None else get_config().get_custom_rules_path()
+    if root is None:
+        return []
+    digests = digests if digests is not None else ValidatedDigests()
+    rules: list[Rule] = []
+    for pack in pack_files(root):
+        try:
+            content = pack.read_bytes()
+        except OSError as exc:
+            raise RulePackError(f"Cannot read custom rules {pack}: {exc}") from exc
+        data = _pack_rules(pack, content)
+        try:
+            digests.ensure_valid(str(pack.resolve()), content, data)
+        except RuleValidationError as exc:
+            raise RulePackError(str(exc)) from exc
+        rules.extend(cast(list[Rule], data))
+    digests.save()
+    return rules
+
+
+def merge_rules(builtin: Sequence[Rule], custom: Sequence[Rule], model: str) -> list[Rule]:
+    """Merge the custom rules that apply to ``model`` into ``builtin`` by id, in check order."""
+    merged: dict[str, Rule] = {rule["id"]: rule for rule in builtin}
+    for rule in custom:
+        if model in rule.get("models", MODELS):
+            merged[rule["id"]] = rule
+    return sorted(merged.values(), key=lambda r: r.get("check_order", 999))
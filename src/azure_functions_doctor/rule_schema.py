@@ -0,0 +1,211 @@
+"""
+JSON Schema for rule files and a dependency-free validator compiled from it.
+
+The schema is generated from the ``Rule``/``Condition`` TypedDicts and the
+built-in handler table, so it cannot drift from what the doctor accepts.
+Handler types provided by plugins are not part of the shipped schema; the
+validator accepts them when the plugin is installed.
+``schemas/rules.schema.json`` is the generated copy for editors and external
+tooling; refresh it with ``python -m azure_functions_doctor.rule_schema``.
+
+Validation does not interpret the schema for every rule: :func:`compile_validator`
+turns it once into nested closures holding plain Python checks (``isinstance``
+tests and set lookups). Rule files whose content digest already passed
+validation are not validated again (see :class:`ValidatedDigests`).
+"""
+
+import hashlib
+import json
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Literal, Optional, Union, get_args, get_origin, get_type_hints
+
+from azure_functions_doctor.cache import JsonCache
+from azure_functions_doctor.handlers import Condition, Rule, builtin_handler_types, has_handler_type
+
+# Keys the doctor cannot run a rule without; everything else has a default
+RULE_REQUIRED_KEYS = ("id", "type", "section", "condition")
+
+_DESCRIPTIONS = {
+    "id": "Unique identifier for the rule.",
+    "type": "Handler type used to execute the check.",
+    "label": "Label displayed in CLI output.",
+    "category": "Top-level grouping category.",
+    "section": "Section used to group checks in output (e.g., python_env).",
+    "description": "Description of what this rule checks.",
+    "required": "Whether this check is required to pass; optional checks report 'warn'.",
+    "condition": "Condition parameters used by the handler.",
+    "hint": "Hint message shown to users on failure.",
+    "fix": "Natural language fix instruction.",
+    "fix_command": "CLI command to fix the issue.",
+    "hint_url": "URL for documentation or solution.",
+    "check_order": "Display order of the check.",
+    "severity": "Severity shown by integrations such as the language server.",
+    "models": "Programming models the rule applies to (custom rule packs); both when omitted.",
+}
+
+_JSON_TYPES: dict[Any, str] = {str: "string", bool: "boolean", int: "integer", float: "number"}
+_PY_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "boolean": (bool,),
+    "integer": (int,),
+    "number": (int, float),
+    "object": (dict,),
+    "array": (list,),
+}
+
+Check = Callable[[Any, str, list[str]], None]
+
+
+class RuleValidationError(RuntimeError):
+    """Raised when a rule file does not match the rule schema."""
+
+
+def _type_schema(annotation: Any) -> dict[str, Any]:
+    """Translate a TypedDict field annotation into a JSON Schema fragment."""
+    origin = get_origin(annotation)
+    if annotation in _JSON_TYPES:
+        return {"type": _JSON_TYPES[annotation]}
+    if origin is Literal:
+        values = list(get_args(annotation))
+        return {"type": _JSON_TYPES[type(values[0])], "enum": values}
+    if origin is Union:
+        return {"type": [_JSON_TYPES[arg] for arg in get_args(annotation)]}
+    if origin is list:
+        (item,) = get_args(annotation)
+        return {"type": "array", "items": _type_schema(item)}
+    if isinstance(annotation, type) and issubclass(annotation, dict) and hasattr(annotation, "__annotations__"):
+        return {
+            "type": "object",
+            "properties": {key: _type_schema(value) for key, value in get_type_hints(annotation).items()},
+        }
+    return {}
+
+
+def build_rule_schema() -> dict[str, Any]:
+    """Generate the rule file schema (draft-07) from the TypedDicts and built-in handler types."""
+    item = _type_schema(Rule)
+    for key, description in _DESCRIPTIONS.items():
+        item["properties"][key]["description"] = description
+    # The registry, not the static Literal, decides which handler types exist
+    item["properties"]["type"]["enum"] = sorted(builtin_handler_types())
+    item["properties"]["condition"] = {**_type_schema(Condition), "description": _DESCRIPTIONS["condition"]}
+    item["required"] = list(RULE_REQUIRED_KEYS)
+    # Catch misspelled rule keys; condition stays open for handler-specific parameters
+    item["additionalProperties"] = False
+    return {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "title": "Azure Functions Doctor Rules Schema",
+        "type": "array",
+        "items": item,
+    }
+
+
+def compile_validator(schema: dict[str, Any]) -> Check:
+    """
+    Compile a schema fragment into a check ``(value, path, errors) -> None``.
+
+    Supports the subset the rule schema uses: ``type``, ``enum``,
+    ``properties``, ``required``, ``additionalProperties: false`` and ``items``.
+    Problems are appended to ``errors`` as ``"<path>: <message>"``.
+    """
+    types = schema.get("type")
+    names = [types] if isinstance(types, str) else list(types or [])
+    accepted = tuple(t for name in names for t in _PY_TYPES[name])
+    # bool is an int subclass, but JSON true is not an integer
+    reject_bool = bool(names) and "boolean" not in names
+    expected = " or ".join(names)
+    enum = frozenset(schema["enum"]) if "enum" in schema else None
+    properties = {key: compile_validator(value) for key, value in schema.get("properties", {}).items()}
+    required = tuple(schema.get("required", ()))
+    closed = schema.get("additionalProperties", True) is False
+    items = compile_validator(schema["items"]) if "items" in schema else None
+
+    def check(value: Any, path: str, errors: list[str]) -> None:
+        if accepted and (not isinstance(value, accepted) or (reject_bool and isinstance(value, bool))):
+            errors.append(f"{path}: expected {expected}")
+            return
+        if enum is not None and value not in enum:
+            errors.append(f"{path}: unsupported value {value!r}")
+            return
+        if isinstance(value, dict):
+            for key in required:
+                if key not in value:
+                    errors.append(f"{path}: missing '{key}'")
+            for key, item in value.items():
+                prop = properties.get(key)
+                if prop is not None:
+                    prop(item, f"{path}.{key}", errors)
+                elif closed:
+                    errors.append(f"{path}: unknown field '{key}'")
+        elif items is not None and isinstance(value, list):
+            for index, item in enumerate(value):
+                items(item, f"{path}[{index}]", errors)
+
+    return check
+
+
+@lru_cache(maxsize=1)
+def _compiled_rule_check() -> tuple[Check, str]:
+    schema = build_rule_schema()
+    fingerprint = hashlib.blake2b(json.dumps(schema, sort_keys=True).encode(), digest_size=8).hexdigest()
+    item = schema["items"]
+    # Handler types are checked against the registry instead, which also knows installed plugins
+    type_schema = {k: v for k, v in item["properties"]["type"].items() if k != "enum"}
+    item = {**item, "properties": {**item["properties"], "type": type_schema}}
+    return compile_validator(item), fingerprint
+
+
+def validate_rules(rules: Any) -> list[str]:
+    """Validate a parsed rule file; returns problems prefixed with the rule id (or ``#index``)."""
+    if not isinstance(rules, list):
+        return ["rule file must contain a list of rules"]
+    check, _ = _compiled_rule_check()
+    errors: list[str] = []
+    seen: set[str] = set()
+    for index, rule in enumerate(rules):
+        name = str(rule["id"]) if isinstance(rule, dict) and isinstance(rule.get("id"), str) else f"#{index}"
+        check(rule, name, errors)
+        rule_type = rule.get("type") if isinstance(rule, dict) else None
+        if isinstance(rule_type, str) and not has_handler_type(rule_type):
+            errors.append(f"{name}.type: unknown handler type '{rule_type}'")
+        if name in seen:
+            errors.append(f"{name}: duplicate id")
+        seen.add(name)
+    return errors
+
+
+class ValidatedDigests:
+    """
+    Content digests of rule files that passed validation, kept in the ``rule_digests`` cache.
+
+    Entries are tied to the schema fingerprint, so a schema change validates
+    every file again. Plugin handler types are not part of the fingerprint:
+    reading plugin metadata on every run would defeat the cache.
+    """
+
+    def __init__(self, cache: Optional[JsonCache] = None) -> None:
+        self._cache = cache if cache is not None else JsonCache("rule_digests")
+
+    @staticmethod
+    def _entry(content: Union[str, bytes]) -> list[str]:
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        _, fingerprint = _compiled_rule_check()
+        return [fingerprint, hashlib.blake2b(data, digest_size=16).hexdigest()]
+
+    def ensure_valid(self, key: str, content: Union[str, bytes], rules: Any) -> None:
+        """Validate ``rules`` parsed from ``content`` unless this exact content passed before."""
+        entry = self._entry(content)
+        if self._cache.get(key) == entry:
+            return
+        problems = validate_rules(rules)
+        if problems:
+            raise RuleValidationError(f"Invalid rules in {key}:\n  " + "\n  ".join(problems))
+        self._cache.set(key, entry)
+
+    def save(self) -> None:
+        self._cache.save()
+
+
+if __name__ == "__main__":
+    sys.stdout.write(json.dumps(build_rule_schema(), indent=2) + "\n")
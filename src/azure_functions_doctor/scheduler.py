@@ -0,0 +1,86 @@
+"""
+Cost-based ordering of rule execution.
+
+Rules are reported in ``check_order``, but that order says nothing about cost:
+an O(1) environment lookup may sit behind a whole-tree scan. The scheduler
+keeps a per-project estimate of every rule's duration in the on-disk cache and
+uses it to decide which rule to start next:
+
+* with several workers, longest rules start first, which keeps a single slow
+  scan from being started last and dominating the wall time;
+* in fail-fast mode, cheapest rules run first so the first required failure is
+  found as early as possible.
+
+Rules without a recorded timing fall back to a static estimate per handler type.
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from azure_functions_doctor.cache import JsonCache
+from azure_functions_doctor.handlers import Rule
+
+# Rough costs (ms) used until a rule has been timed on this project
+_TREE_SCAN_COST_MS = 50.0
+_PROBE_COST_MS = 20.0
+_IMPORT_PROFILE_COST_MS = 1000.0
+_DEFAULT_COST_MS = 0.1
+_STATIC_COSTS_MS = {
+    "source_code_contains": _TREE_SCAN_COST_MS,
+    "conditional_exists": _TREE_SCAN_COST_MS,
+    "callable_detection": _TREE_SCAN_COST_MS,
+    "file_glob_check": _TREE_SCAN_COST_MS,
+    "binding_validation": _TREE_SCAN_COST_MS,
+    "cron_validation": _TREE_SCAN_COST_MS,
+    "deploy_size": _TREE_SCAN_COST_MS,
+    "cold_start_import": _IMPORT_PROFILE_COST_MS,
+    "cold_start_memory": _IMPORT_PROFILE_COST_MS,
+    "async_blocking_io": _TREE_SCAN_COST_MS,
+    "client_per_invocation": _TREE_SCAN_COST_MS,
+    "host_json_audit": _TREE_SCAN_COST_MS,
+    "dist_footprint": _TREE_SCAN_COST_MS,
+    "compare_version": _PROBE_COST_MS,
+    "executable_exists": _PROBE_COST_MS,
+}
+# Weight of the newest sample in the moving average; damps one-off outliers
+_SMOOTHING = 0.5
+
+
+class RuleTimings:
+    """Learned per-rule durations for one project, persisted in the ``timings`` cache."""
+
+    def __init__(self, project_path: Path, cache: Optional[JsonCache] = None) -> None:
+        self._key = str(project_path)
+        self._cache = cache if cache is not None else JsonCache("timings")
+        stored: Any = self._cache.get(self._key)
+        self._timings: dict[str, float] = {
+            str(rule_id): float(ms)
+            for rule_id, ms in (stored.items() if isinstance(stored, dict) else ())
+            if isinstance(ms, (int, float))
+        }
+
+    def has_history(self) -> bool:
+        """True once any rule has been timed on this project."""
+        return bool(self._timings)
+
+    def estimate(self, rule: Rule) -> float:
+        """Expected duration of ``rule`` in milliseconds."""
+        learned = self._timings.get(rule["id"])
+        if learned is not None:
+            return learned
+        return _STATIC_COSTS_MS.get(rule.get("type", ""), _DEFAULT_COST_MS)
+
+    def record(self, durations: Mapping[str, float]) -> None:
+        """Fold measured durations (rule id -> ms) into the estimates and save them."""
+        if not durations:
+            return
+        for rule_id, ms in durations.items():
+            previous = self._timings.get(rule_id)
+            self._timings[rule_id] = round(ms if previous is None else previous + _SMOOTHING * (ms - previous), 3)
+        self._cache.set(self._key, self._timings)
+        self._cache.save()
+
+    def schedule(self, rules: Iterable[Rule], cheapest_first: bool = False) -> list[Rule]:
+        """Return ``rules`` in execution order: longest first, or cheapest first for fail-fast runs."""
+        # sorted() is stable, so rules with equal estimates keep their check_order
+        return sorted(rules, key=self.estimate, reverse=not cheapest_first)
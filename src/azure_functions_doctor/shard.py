@@ -0,0 +1,169 @@
+"""
+Deterministic sharding of a run across CI nodes, and merging of the partial reports.
+
+``doctor --shard K/N`` splits the selected rules into ``N`` shards and runs
+only shard ``K``. Without timing history each rule goes to the shard given by
+a stable hash of its id. Once the project has learned rule timings (see
+:mod:`azure_functions_doctor.scheduler`), the shards are balanced by cost
+instead: rules are placed longest first onto the least-loaded shard. Both
+strategies depend only on the rule set and the timings, so nodes that share
+the cache agree on the plan without coordinating.
+
+Each shard writes a partial report that carries the whole plan: every rule's
+id, section and shard, and a digest of that plan. :func:`merge_partials`
+checks that the partials come from the same plan and that each shard is
+present exactly once. It then rebuilds the sections in ``check_order``, so the
+merged result matches a single-node ``--format json`` run apart from the
+measured durations.
+"""
+
+import hashlib
+import json
+from typing import Any, Literal, Mapping, Optional, Sequence, TypedDict
+
+from azure_functions_doctor.handlers import Rule
+from azure_functions_doctor.results import CheckResult, Section, SectionResult, to_dicts
+from azure_functions_doctor.scheduler import RuleTimings
+
+ShardStrategy = Literal["hash", "weighted"]
+
+
+class ShardError(ValueError):
+    """Invalid shard specification or partial reports that cannot be merged."""
+
+
+class PlannedRule(TypedDict):
+    id: str
+    section: str
+    shard: int
+
+
+class ShardInfo(TypedDict):
+    index: int
+    count: int
+    strategy: ShardStrategy
+    plan: str
+
+
+class PartialReport(TypedDict):
+    shard: ShardInfo
+    rules: list[PlannedRule]
+    results: list[SectionResult]
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse ``K/N`` (1-based shard ``K`` of ``N``)."""
+    index, sep, count = value.partition("/")
+    if not sep or not index.strip().isdigit() or not count.strip().isdigit():
+        raise ShardError(f"Invalid shard {value!r}; expected K/N, e.g. 2/4")
+    k, n = int(index), int(count)
+    if not 1 <= k <= n:
+        raise ShardError(f"Invalid shard {value!r}; K must be between 1 and N")
+    return k, n
+
+
+def stable_bucket(key: str, count: int) -> int:
+    """Shard (1-based) of ``key``; the same on every machine and Python version."""
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def assign(keys: Sequence[str], count: int, weights: Optional[Mapping[str, float]] = None) -> list[int]:
+    """
+    Shard (1-based) of each of ``keys``.
+
+    Without ``weights`` keys are hashed. With ``weights`` they are placed heaviest
+    first onto the least-loaded shard (lowest index on ties), which keeps shard
+    totals within one unit's weight of each other.
+    """
+    if weights is None:
+        return [stable_bucket(key, count) for key in keys]
+    loads = [0.0] * count
+    shards: dict[str, int] = {}
+    for key in sorted(set(keys), key=lambda k: (-weights.get(k, 0.0), k)):
+        target = min(range(count), key=lambda i: (loads[i], i))
+        loads[target] += weights.get(key, 0.0)
+        shards[key] = target + 1
+    return [shards[key] for key in keys]
+
+
+def plan_rules(
+    rules: Sequence[Rule], count: int, timings: Optional[RuleTimings] = None
+) -> tuple[list[PlannedRule], ShardStrategy]:
+    """Assign ``rules`` (in report order) to ``count`` shards, weighted when ``timings`` has history."""
+    ids = [rule["id"] for rule in rules]
+    weighted = timings is not None and timings.has_history()
+    weights = {rule["id"]: timings.estimate(rule) for rule in rules} if timings is not None and weighted else None
+    shards = assign(ids, count, weights)
+    plan: list[PlannedRule] = [
+        {"id": rule["id"], "section": rule["section"], "shard": shard} for rule, shard in zip(rules, shards)
+    ]
+    return plan, "weighted" if weighted else "hash"
+
+
+def plan_digest(plan: Sequence[PlannedRule]) -> str:
+    """Short digest identifying a plan; partials can only be merged when theirs agree."""
+    encoded = json.dumps([[rule["id"], rule["section"], rule["shard"]] for rule in plan], separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def partial_report(
+    index: int, count: int, strategy: ShardStrategy, plan: list[PlannedRule], results: Sequence[Section]
+) -> PartialReport:
+    """The self-describing report of shard ``index``."""
+    return {
+        "shard": {"index": index, "count": count, "strategy": strategy, "plan": plan_digest(plan)},
+        "rules": plan,
+        "results": to_dicts(results),
+    }
+
+
+def merge_partials(partials: Sequence[Mapping[str, Any]]) -> list[SectionResult]:
+    """Combine the partial reports of every shard into one report in ``check_order``."""
+    if not partials:
+        raise ShardError("No partial reports to merge")
+    by_index: dict[int, Mapping[str, Any]] = {}
+    for partial in partials:
+        info = partial.get("shard")
+        if not isinstance(info, dict) or not isinstance(partial.get("rules"), list):
+            raise ShardError("Not a partial report; run doctor with --shard K/N")
+        first = next(iter(by_index.values()), partial)["shard"]
+        if (info["plan"], info["count"]) != (first["plan"], first["count"]):
+            raise ShardError("Partial reports come from different shard plans (rules or timings differed)")
+        if info["index"] in by_index:
+            raise ShardError(f"Shard {info['index']}/{info['count']} appears more than once")
+        by_index[info["index"]] = partial
+    count = first["count"]
+    missing = sorted(set(range(1, count + 1)) - set(by_index))
+    if missing:
+        raise ShardError(f"Missing shard(s) {', '.join(f'{i}/{count}' for i in missing)}")
+
+    items: dict[str, CheckResult] = {}
+    titles: dict[str, str] = {}
+    for partial in by_index.values():
+        for section in partial["results"]:
+            titles[section["category"]] = section["title"]
+            for item in section["items"]:
+                items[item["id"]] = item
+
+    # Sections are ordered by their first rule, as Doctor.run_all_checks groups them
+    plan: list[PlannedRule] = partials[0]["rules"]
+    sections: dict[str, SectionResult] = {}
+    for rule in plan:
+        name = rule["section"]
+        section = sections.setdefault(
+            name,
+            {
+                "title": titles.get(name, name.replace("_", " ").title()),
+                "category": name,
+                "status": "pass",
+                "items": [],
+            },
+        )
+        item = items.get(rule["id"])
+        if item is None:
+            continue
+        if item["status"] == "fail":
+            section["status"] = "fail"
+        section["items"].append(item)
+    return [section for section in sections.values() if section["items"]]
@@ -1,17 +1,19 @@
-import subprocess
 import sys
+from typing import Iterable, Optional
 
+from azure_functions_doctor.executables import ExecutableIndex
 from azure_functions_doctor.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
-def resolve_target_value(target: str) -> str:
+def resolve_target_value(target: str, executables: Optional[ExecutableIndex] = None) -> str:
     """
     Resolve the current value of a target used in version comparison or diagnostics.
 
     Args:
         target: The name of the target to resolve. Examples include "python" or "func_core_tools".
+        executables: Optional PATH index shared with other checks of the same run.
 
     Returns:
         A string representing the resolved version or value.
@@ -19,25 +21,36 @@ def resolve_target_value(target: str) -> str:
     Raises:
         ValueError: If the target is not recognized.
     """
-    if target == "python":
-        return sys.version.split()[0]
-    if target == "func_core_tools":
-        try:
-            output = subprocess.check_output(["func", "--version"], text=True, timeout=10)
-            return output.strip()
-        except FileNotFoundError:
-            logger.debug("Azure Functions Core Tools not found in PATH")
-            return "not_installed"
-        except subprocess.TimeoutExpired:
-            logger.warning("Timeout getting func version")
-            return "timeout"
-        except TimeoutError:
-            logger.warning("Timeout getting func version")
-            return "timeout"
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"func command failed with code {e.returncode}")
-            return f"error_{e.returncode}"
-        except Exception as exc:
-            logger.error(f"Unexpected error getting func version: {exc}")
-            return "unknown_error"
-    raise ValueError(f"Unknown target: {target}")
+    return resolve_target_values([target], executables)[target]
+
+
+def resolve_target_values(targets: Iterable[str], executables: Optional[ExecutableIndex] = None) -> dict[str, str]:
+    """
+    Resolve several targets at once; external tool probes run concurrently and are cached.
+
+    Args:
+        targets: Target names such as "python", "func_core_tools" or "azure_cli".
+        executables: Optional PATH index shared with other checks of the same run.
+
+    Returns:
+        Mapping of each target to its resolved version or value.
+
+    Raises:
+        ValueError: If any target is not recognized.
+    """
+    values: dict[str, str] = {}
+    probe_targets: list[str] = []
+    for target in targets:
+        if target == "python":
+            values[target] = sys.version.split()[0]
+        else:
+            probe_targets.append(target)
+    if probe_targets:
+        # Probing runs on asyncio, which is only worth importing when a tool is actually probed
+        from azure_functions_doctor.probes import is_probe_target, run_probes
+
+        unknown = [target for target in probe_targets if not is_probe_target(target)]
+        if unknown:
+            raise ValueError(f"Unknown target: {unknown[0]}")
+        values.update(run_probes(probe_targets, executables))
+    return values
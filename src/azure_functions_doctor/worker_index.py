@@ -0,0 +1,271 @@
+"""
+Simulation of the Python worker's function indexing for v2 apps.
+
+On startup the worker imports the script named by ``PYTHON_SCRIPT_FILE_NAME``
+(``function_app.py`` by default). It then looks for the single top-level
+``FunctionRegister`` instance, usually ``func.FunctionApp``, and calls
+``get_functions()``. That builds every decorated function and fails indexing
+for functions without a trigger or with duplicate names. This module repeats
+those steps in a fresh interpreter and times the import and the indexing
+separately. It attributes every function to the app or to the blueprint that
+registered it.
+
+The app's interpreter is used with its installed ``azure-functions``. When that
+package is missing, or when asked, a bundled stub is used instead
+(``assets/azure_functions_stub.py``). The stub models the decorator surface but
+not binding validation, and its timings leave out the real package's import
+cost. Errors raised while importing or indexing are reported as findings rather
+than raised, because they are what this simulation is meant to catch.
+"""
+
+import importlib.resources
+import json
+from pathlib import Path
+from typing import Any, Optional, TypedDict
+
+from azure_functions_doctor.coldstart import ColdStartError, percentile, project_python, run_python
+from azure_functions_doctor.config import get_config
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_DEFAULT_SCRIPT = "function_app.py"
+_MARKER = "__azure_functions_doctor_index__"
+# Run with ``-c``: argv is the project root, the module to index, the stub's path and "auto" or "stub".
+# Registration through register_functions/register_blueprint is recorded so every built function
+# can be traced back to the blueprint whose builder produced it
+_INDEXER = f"""\
+import importlib, importlib.util, json, os, sys, time, types
+root, module_name, stub_path, mode = sys.argv[1:5]
+sys.path.insert(0, root)
+func = None
+if mode != "stub":
+    try:
+        import azure.functions as func
+    except ImportError:
+        pass
+if func is None:
+    spec = importlib.util.spec_from_file_location("azure.functions", stub_path)
+    func = importlib.util.module_from_spec(spec)
+    try:
+        import azure
+    except ImportError:
+        azure = types.ModuleType("azure")
+        azure.__path__ = []
+        sys.modules["azure"] = azure
+    sys.modules["azure.functions"] = func
+    spec.loader.exec_module(func)
+    azure.functions = func
+    library = "stub"
+else:
+    library = "azure-functions " + getattr(func, "__version__", "unknown")
+result = {{"library": library, "import_ms": 0.0, "index_ms": 0.0, "functions": [], "errors": []}}
+register = func.FunctionRegister
+registered = []
+for attr in ("register_functions", "register_blueprint"):
+    original = getattr(register, attr, None)
+    if original is not None:
+        def wrapper(self, container, _original=original):
+            registered.append((container, list(getattr(container, "_function_builders", []))))
+            return _original(self, container)
+        setattr(register, attr, wrapper)
+
+def decorator_line(tb):
+    # Before 3.11 a failing decorator is reported on the ``def`` line. The decorator calls left to run
+    # after the failing instruction tell which one it was: they are applied bottom-up
+    lineno = tb.tb_lineno
+    if sys.version_info >= (3, 11):
+        return lineno
+    import ast, dis
+    remaining = 0
+    for instruction in dis.get_instructions(tb.tb_frame.f_code):
+        if instruction.offset <= tb.tb_lasti:
+            continue
+        if instruction.opname.startswith("STORE_"):
+            break
+        if instruction.opname != "CALL_FUNCTION":
+            return lineno
+        remaining += 1
+    try:
+        with open(tb.tb_frame.f_code.co_filename, "rb") as source:
+            tree = ast.parse(source.read())
+    except (OSError, SyntaxError, ValueError):
+        return lineno
+    for node in ast.walk(tree):
+        decorators = getattr(node, "decorator_list", [])
+        if getattr(node, "lineno", None) == lineno and len(decorators) > remaining:
+            return decorators[remaining].lineno
+    return lineno
+
+def location(exc):
+    tb, found = exc.__traceback__, None
+    while tb is not None:
+        if tb.tb_frame.f_code.co_filename.startswith(root + os.sep):
+            found = tb
+        tb = tb.tb_next
+    if found is None:
+        return None
+    return f"{{os.path.relpath(found.tb_frame.f_code.co_filename, root)}}:{{decorator_line(found)}}"
+
+def fail(stage, exc):
+    result["errors"].append(
+        {{"stage": stage, "type": type(exc).__name__, "message": str(exc), "location": location(exc)}}
+    )
+
+def label(target):
+    # A blueprint imported into the entry script is named after the module that defines it
+    found = []
+    for name, module in list(sys.modules.items()):
+        if not (getattr(module, "__file__", None) or "").startswith(root + os.sep):
+            continue
+        found.extend((name == module_name, name, attr) for attr, value in vars(module).items() if value is target)
+    return "{{1}}.{{2}}".format(*min(found)) if found else type(target).__name__
+
+start = time.perf_counter()
+try:
+    module = importlib.import_module(module_name)
+except Exception as exc:
+    fail("import", exc)
+    module = None
+result["import_ms"] = (time.perf_counter() - start) * 1000
+if module is not None:
+    apps = [getattr(module, n) for n in dir(module) if isinstance(getattr(module, n, None), register)]
+    if not apps:
+        fail("index", ValueError(f"No top-level FunctionApp instance found in {{module_name}}"))
+    elif len(apps) > 1:
+        names = [n for n in dir(module) if isinstance(getattr(module, n, None), register)]
+        fail("index", ValueError(f"More than one top-level function app instance: {{', '.join(names)}}"))
+    else:
+        start = time.perf_counter()
+        try:
+            functions = apps[0].get_functions()
+            for function in functions:
+                if hasattr(function, "get_function_json"):
+                    function.get_function_json()
+        except Exception as exc:
+            fail("index", exc)
+            functions = []
+        result["index_ms"] = (time.perf_counter() - start) * 1000
+        owners = {{}}
+        for container, builders in registered:
+            tag = label(container)
+            owners.update((id(builder), tag) for builder in builders)
+        app_label = label(apps[0])
+        builders = getattr(apps[0], "_function_builders", [])
+        for i, function in enumerate(functions):
+            trigger = function.get_trigger() if hasattr(function, "get_trigger") else None
+            result["functions"].append({{
+                "name": function.get_function_name(),
+                "blueprint": owners.get(id(builders[i]) if i < len(builders) else None, app_label),
+                "trigger": getattr(trigger, "type", None),
+            }})
+print("{_MARKER}" + json.dumps(result))
+"""
+
+
+class IndexedFunction(TypedDict):
+    name: str
+    blueprint: str
+    trigger: Optional[str]
+
+
+class BlueprintFunctions(TypedDict):
+    blueprint: str
+    functions: int
+
+
+class IndexingError(TypedDict):
+    stage: str
+    type: str
+    message: str
+    location: Optional[str]
+
+
+class WorkerIndexReport(TypedDict):
+    python: str
+    library: str
+    script: str
+    runs: int
+    import_ms: float
+    index_ms: float
+    p50_ms: float
+    p95_ms: float
+    function_count: int
+    blueprints: list[BlueprintFunctions]
+    functions: list[IndexedFunction]
+    errors: list[IndexingError]
+
+
+def script_file(root: Path, context: Optional[ProjectContext] = None) -> Path:
+    """The script the worker indexes: ``PYTHON_SCRIPT_FILE_NAME`` relative to ``root``, else ``function_app.py``."""
+    context = context if context is not None else ProjectContext(root)
+    return root / context.environ.get("PYTHON_SCRIPT_FILE_NAME", _DEFAULT_SCRIPT)
+
+
+def _index_once(
+    python: str, root: Path, module: str, stub: Path, force_stub: bool, timeout: float, environ: dict[str, str]
+) -> dict[str, Any]:
+    args = ["-c", _INDEXER, str(root), module, str(stub), "stub" if force_stub else "auto"]
+    proc = run_python(python, args, root, [module], timeout, environ)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(_MARKER):
+            result: dict[str, Any] = json.loads(line[len(_MARKER) :])
+            return result
+    raise ColdStartError(f"Indexing {module} reported no result")
+
+
+def simulate_indexing(
+    root: Path,
+    runs: int = 3,
+    python: Optional[str] = None,
+    stub: bool = False,
+    context: Optional[ProjectContext] = None,
+) -> WorkerIndexReport:
+    """
+    Import and index the v2 app ``runs`` times in fresh interpreters.
+
+    Timings are medians of the import and of ``get_functions()``, plus p50/p95 of
+    their sum. Functions, blueprints and errors come from the first run. With
+    ``stub`` the bundled ``azure.functions`` stand-in is used even when the real
+    package is installed.
+    """
+    root = Path(root).resolve()
+    context = context if context is not None else ProjectContext(root)
+    script = script_file(root, context)
+    if not script.is_file():
+        raise ColdStartError(f"{script.name} not found; worker indexing applies to v2 (decorator) apps")
+    module = script.relative_to(root).with_suffix("").as_posix().replace("/", ".")
+    python = python or project_python(root, context.environ)
+    timeout = get_config().get_coldstart_timeout_seconds()
+    environ = dict(context.environ)
+
+    with importlib.resources.as_file(
+        importlib.resources.files("azure_functions_doctor.assets") / "azure_functions_stub.py"
+    ) as stub_path:
+        results = [_index_once(python, root, module, stub_path, stub, timeout, environ) for _ in range(max(1, runs))]
+
+    first = results[0]
+    functions: list[IndexedFunction] = first["functions"]
+    counts: dict[str, int] = {}
+    for function in functions:
+        counts[function["blueprint"]] = counts.get(function["blueprint"], 0) + 1
+    totals = [r["import_ms"] + r["index_ms"] for r in results]
+    return {
+        "python": python,
+        "library": first["library"],
+        "script": script.relative_to(root).as_posix(),
+        "runs": len(results),
+        "import_ms": round(percentile([r["import_ms"] for r in results], 50), 3),
+        "index_ms": round(percentile([r["index_ms"] for r in results], 50), 3),
+        "p50_ms": round(percentile(totals, 50), 3),
+        "p95_ms": round(percentile(totals, 95), 3),
+        "function_count": len(functions),
+        "blueprints": sorted(
+            ({"blueprint": name, "functions": count} for name, count in counts.items()),
+            key=lambda entry: entry["functions"],
+            reverse=True,
+        ),
+        "functions": functions,
+        "errors": first["errors"],
+    }
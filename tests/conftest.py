@@ -0,0 +1,34 @@
+"""Shared pytest fixtures."""
+
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Keep the on-disk cache out of the user's home directory during tests."""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("FUNC_DOCTOR_CACHE_DIR", str(cache_dir))
+    yield cache_dir
+
+
+@pytest.fixture
+def fake_tool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Callable[[str, str], Path]:
+    """Create a shell-script executable on an isolated PATH and return its path."""
+    if sys.platform.startswith("win"):
+        pytest.skip("fake shell tools require a POSIX shell")
+    bin_dir = tmp_path / "fake-bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", os.pathsep.join([str(bin_dir), os.defpath]))
+
+    def factory(name: str, script: str) -> Path:
+        tool = bin_dir / name
+        tool.write_text(f"#!/bin/sh\n{script}\n")
+        tool.chmod(0o755)
+        return tool
+
+    return factory
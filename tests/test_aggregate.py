@@ -0,0 +1,95 @@
+"""Tests for fleet report aggregation."""
+
+import gzip
+import io
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from azure_functions_doctor.aggregate import (
+    connect,
+    ingest_reports,
+    iter_report_sections,
+    most_failed_rules,
+    regressions_since,
+    slowest_rules,
+)
+
+
+def _report(statuses: dict[str, str], duration: float = 1.0) -> list[dict[str, Any]]:
+    items = [
+        {"id": rule, "label": rule.title(), "value": "", "status": status, "duration_ms": duration}
+        for rule, status in statuses.items()
+    ]
+    return [{"title": "Env", "category": "env", "status": "pass", "items": items}]
+
+
+def _write(path: Path, reports: list[Any], when: str, compress: bool = False) -> Path:
+    text = "\n".join(json.dumps(r, indent=2) for r in reports)
+    if compress:
+        path.write_bytes(gzip.compress(text.encode()))
+    else:
+        path.write_text(text)
+    ts = datetime.fromisoformat(when).replace(tzinfo=timezone.utc).timestamp()
+    os.utime(path, (ts, ts))
+    return path
+
+
+def test_stream_parser_handles_small_chunks_and_concatenated_reports() -> None:
+    reports = [_report({"a": "pass", "b": "fail"}), _report({"a": "fail"})]
+    stream = io.StringIO(json.dumps(reports[0], indent=2) + "\n" + json.dumps(reports[1]))
+
+    sections = list(iter_report_sections(stream, chunk_size=7))
+
+    assert [index for index, _ in sections] == [0, 1]
+    assert [item["id"] for item in sections[0][1]["items"]] == ["a", "b"]
+
+
+def test_stream_parser_rejects_truncated_reports() -> None:
+    with pytest.raises(ValueError):
+        list(iter_report_sections(io.StringIO('[{"title": "x", "items": ['), chunk_size=4))
+
+
+def test_ingest_and_built_in_queries(tmp_path: Path) -> None:
+    db = tmp_path / "fleet.sqlite"
+    files = [
+        _write(tmp_path / "app1.json", [_report({"venv": "pass", "host": "pass"}, 2.0)], "2024-01-01T00:00:00"),
+        _write(
+            tmp_path / "app1-late.json.gz",
+            [_report({"venv": "fail", "host": "pass"}, 4.0)],
+            "2024-02-01T00:00:00",
+            compress=True,
+        ),
+        _write(tmp_path / "app2.json", [_report({"venv": "fail", "host": "fail"})], "2024-02-02T00:00:00"),
+    ]
+
+    stats = ingest_reports(db, files, app_pattern=r"(?P<app>app\d)")
+    assert (stats.files, stats.runs, stats.results) == (3, 3, 6)
+    # Re-ingesting the same reports does not duplicate runs
+    assert ingest_reports(db, files, app_pattern=r"(?P<app>app\d)").skipped_runs == 3
+
+    conn = connect(db)
+    try:
+        assert most_failed_rules(conn)[0] == {"rule": "venv", "label": "Venv", "failures": 2, "apps": 2}
+        assert slowest_rules(conn, limit=1)[0]["max_ms"] == 4.0
+        regressions = regressions_since(conn, "2024-01-15")
+        assert [(r["app"], r["rule"], r["status"]) for r in regressions] == [("app1", "venv", "fail")]
+        assert conn.execute("SELECT COUNT(*) FROM apps").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+def test_index_creation_is_idempotent(tmp_path: Path) -> None:
+    db = tmp_path / "fleet.sqlite"
+    report = _write(tmp_path / "a.json", [_report({"x": "pass"})], "2024-01-01T00:00:00")
+    ingest_reports(db, [report])
+    ingest_reports(db, [report])
+
+    with sqlite3.connect(db) as conn:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "results_rule_status" in names
@@ -1,8 +1,14 @@
 import json
 import os
+import subprocess
+import sys
 import tempfile
+from pathlib import Path
+
+import pytest
 
 from azure_functions_doctor.api import run_diagnostics
+from azure_functions_doctor.files import FileIndex
 
 
 def test_run_diagnostics_minimal() -> None:
@@ -23,3 +29,37 @@ def test_run_diagnostics_minimal() -> None:
             any("host.json" in item.get("label", "") for item in section["items"]) for section in results
         )
         assert host_check_found, "Expected 'host.json' check not found in results"
+
+
+def test_model_independent_selection_does_not_walk_tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A selection shared by both models neither detects the model nor lists the project."""
+    (tmp_path / "MyFunction").mkdir()
+    (tmp_path / "MyFunction" / "function.json").write_text(json.dumps({"bindings": []}))
+
+    def no_listing(self: FileIndex) -> None:
+        raise AssertionError("project tree was listed")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(FileIndex, "_list", no_listing)
+        results = run_diagnostics(str(tmp_path), only=["environment"], skip=["check_python_version"])
+    assert {item["id"] for item in results[0]["items"]} == {"check_venv", "check_python_executable"}
+
+    # Selections that need the model still reject nested v1 projects, as Doctor(path) does
+    with pytest.raises(SystemExit):
+        run_diagnostics(str(tmp_path))
+
+
+def test_import_defers_rule_specific_machinery() -> None:
+    """Importing the API loads nothing that only some rules need."""
+    deferred = [
+        "asyncio",
+        "importlib.metadata",
+        "packaging.markers",
+        *(
+            f"azure_functions_doctor.{name}"
+            for name in ("probes", "requirements", "coldstart", "import_graph", "call_graph", "dist_footprint")
+        ),
+    ]
+    code = "import sys, azure_functions_doctor.api; print(sorted(set(sys.argv[1:]) & set(sys.modules)))"
+    done = subprocess.run([sys.executable, "-c", code, *deferred], capture_output=True, text=True, check=True)
+    assert done.stdout.strip() == "[]"
@@ -0,0 +1,99 @@
+"""Tests for the blocking I/O lint of async handlers."""
+
+import json
+from pathlib import Path
+from typing import cast
+
+from azure_functions_doctor.async_blocking import blocking_advice, find_blocking
+from azure_functions_doctor.cache import JsonCache
+from azure_functions_doctor.call_graph import CallGraph
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.handlers import Rule, generic_handler
+
+RULE = cast(Rule, {"id": "check_async_blocking_io", "type": "async_blocking_io", "condition": {}})
+
+
+def _v2_project(root: Path) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "function_app.py").write_text(
+        "import asyncio\n"
+        "import time\n"
+        "import azure.functions as func\n"
+        "from services import client as svc\n"
+        "\n"
+        "app = func.FunctionApp()\n"
+        "\n"
+        "@app.route(route='items')\n"
+        "async def items(req):\n"
+        "    await asyncio.sleep(1)\n"
+        "    loop = asyncio.get_running_loop()\n"
+        "    await loop.run_in_executor(None, lambda: time.sleep(1))\n"
+        "    return svc.fetch_items()\n"
+        "\n"
+        "@app.timer_trigger(schedule='0 * * * * *', arg_name='timer')\n"
+        "def tick(timer):\n"
+        "    time.sleep(1)\n"
+    )
+    (root / "services").mkdir()
+    (root / "services" / "__init__.py").write_text("")
+    (root / "services" / "client.py").write_text(
+        "import requests as http\n"
+        "\n"
+        "def fetch_items():\n"
+        "    return _get('https://example.invalid/items')\n"
+        "\n"
+        "def _get(url):\n"
+        "    return http.get(url, timeout=5).json()\n"
+    )
+    return root
+
+
+def test_blocking_table_and_async_variants() -> None:
+    assert blocking_advice("time.sleep") == "await asyncio.sleep()"
+    assert blocking_advice("azure.storage.blob.BlobServiceClient.from_connection_string")
+    assert blocking_advice("azure.storage.blob.aio.BlobServiceClient") is None
+    assert blocking_advice("asyncio.sleep") is None
+    assert blocking_advice("mycorp.sdk.call") is None
+    assert blocking_advice("mycorp.sdk.call", ["mycorp.sdk.*"])
+
+
+def test_async_handler_call_chain_is_reported(tmp_path: Path) -> None:
+    root = _v2_project(tmp_path / "app")
+    result = generic_handler(RULE, root)
+    assert result["status"] == "fail"
+    detail = result["detail"]
+    # The chain leads from the handler through project helpers to the blocking call
+    assert "function_app.py:9 items -> function_app.py:13 svc.fetch_items" in detail
+    assert "services/client.py:7 http.get" in detail
+    assert "aiohttp" in detail
+    # Sync handlers, awaited asyncio calls and work handed to an executor are fine
+    assert "time.sleep" not in detail
+
+
+def test_v1_entry_points_and_custom_patterns(tmp_path: Path) -> None:
+    handler = tmp_path / "HttpTrigger"
+    handler.mkdir()
+    (handler / "function.json").write_text(json.dumps({"scriptFile": "__init__.py", "bindings": []}))
+    (handler / "__init__.py").write_text("import mycorp.sdk\n\nasync def main(req):\n    return mycorp.sdk.call()\n")
+    assert generic_handler(RULE, tmp_path)["status"] == "pass"
+
+    custom = cast(Rule, {**RULE, "condition": {"blocking_calls": ["mycorp.sdk.*"]}})
+    result = generic_handler(custom, tmp_path)
+    assert result["status"] == "fail"
+    assert "HttpTrigger/__init__.py:4 mycorp.sdk.call" in result["detail"]
+
+
+def test_summaries_are_cached_by_content(tmp_path: Path) -> None:
+    root = _v2_project(tmp_path / "app")
+    first = CallGraph(root, ProjectContext(root), cache=JsonCache("ab", cache_dir=tmp_path / "c"))
+    first.load()
+    assert len(find_blocking(first)) == 1
+    first.save()
+    # Only the handler's module and the module it calls into; services/__init__.py is never parsed
+    assert first.parsed == 2
+
+    (root / "services" / "client.py").write_text("def fetch_items():\n    return []\n")
+    second = CallGraph(root, ProjectContext(root), cache=JsonCache("ab", cache_dir=tmp_path / "c"))
+    second.load()
+    assert find_blocking(second) == []
+    assert second.parsed == 1
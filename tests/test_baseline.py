@@ -0,0 +1,76 @@
+"""Tests for baseline diff mode."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from typer.testing import CliRunner
+
+from azure_functions_doctor.baseline import BaselineIndex
+from azure_functions_doctor.cli import cli as app
+
+runner = CliRunner()
+
+
+def _section(*items: dict[str, Any]) -> Any:
+    return {"title": "Env", "category": "env", "status": "pass", "items": list(items)}
+
+
+def test_diff_classifies_changes() -> None:
+    baseline = BaselineIndex(
+        [
+            _section(
+                {"id": "a", "label": "A", "status": "fail", "value": "missing"},
+                {"id": "b", "label": "B", "status": "pass", "value": "/ci/1/ok"},
+                {"id": "c", "label": "C", "status": "warn", "value": "old"},
+                {"id": "d", "label": "D", "status": "fail", "value": "x"},
+            )
+        ]
+    )
+
+    diff = baseline.diff(
+        [
+            _section(
+                {"id": "a", "label": "A", "status": "pass", "value": "found"},
+                {"id": "b", "label": "B", "status": "pass", "value": "/ci/2/ok"},
+                {"id": "c", "label": "C", "status": "warn", "value": "new"},
+                {"id": "d", "label": "D", "status": "fail", "value": "x"},
+                {"id": "e", "label": "E", "status": "fail", "value": "boom"},
+            )
+        ]
+    )
+
+    assert [c["id"] for c in diff.new_failures] == ["e"]
+    assert [c["id"] for c in diff.fixed] == ["a"]
+    assert [(c["id"], c["previous_value"]) for c in diff.changed] == [("c", "old")]
+    assert diff.unchanged == 2
+    assert diff.exit_code == 1
+
+
+def test_reports_without_rule_ids_match_by_label() -> None:
+    baseline = BaselineIndex([_section({"label": "A", "status": "fail", "value": "v"})])
+
+    diff = baseline.diff([_section({"id": "a", "label": "A", "status": "fail", "value": "v"})])
+
+    assert diff.exit_code == 0 and diff.unchanged == 1
+
+
+def test_cli_baseline_exits_only_on_new_failures(tmp_path: Path) -> None:
+    project = tmp_path / "app"
+    project.mkdir()
+    (project / "host.json").write_text(json.dumps({"version": "2.0"}))
+    (project / "requirements.txt").write_text("azure-functions\n")
+    baseline = tmp_path / "baseline.json"
+
+    first = runner.invoke(app, ["doctor", "--path", str(project), "--format", "json", "--output", str(baseline)])
+    assert first.exit_code in (0, 1)
+
+    same = runner.invoke(app, ["doctor", "--path", str(project), "--baseline", str(baseline), "--format", "json"])
+    assert same.exit_code == 0
+    assert json.loads(same.output)["new_failures"] == []
+
+    (project / "host.json").unlink()
+    worse = runner.invoke(app, ["doctor", "--path", str(project), "--baseline", str(baseline)])
+    assert worse.exit_code == 1
+    assert "New failures" in worse.output
+    assert "1 new failures" in worse.output
@@ -0,0 +1,142 @@
+"""Tests for changed-files-only runs driven by git."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from azure_functions_doctor.changes import GitError, _reusable, run_changed_only
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is required")
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _make_repo(root: Path) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "host.json").write_text(json.dumps({"version": "2.0"}))
+    (root / "requirements.txt").write_text("azure-functions\n")
+    (root / "function_app.py").write_text("import azure.functions as func\napp = func.FunctionApp()\n")
+    _git(root, "init", "-q")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+def _items(results: list[Any]) -> dict[str, Any]:
+    return {
+        item["id"]: {k: v for k, v in item.items() if k != "duration_ms"}
+        for section in results
+        for item in section["items"]
+    }
+
+
+def test_second_run_reuses_tree_scanning_results(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path / "app")
+
+    first = run_changed_only(str(repo))
+    second = run_changed_only(str(repo))
+
+    assert first.full and first.reused == 0
+    assert not second.full and second.reused > 0
+    assert second.changed == set()
+    assert _items(first.results) == _items(second.results)
+
+
+def test_python_change_reruns_rules_reading_sources(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path / "app")
+    run_changed_only(str(repo))
+    assert _items(run_changed_only(str(repo)).results)["check_programming_model_v2"]["status"] == "fail"
+
+    (repo / "function_app.py").write_text("import azure.functions as func\napp = func.FunctionApp()\n@app.route()\n")
+    run = run_changed_only(str(repo))
+
+    assert run.changed == {"function_app.py"}
+    assert _items(run.results)["check_programming_model_v2"]["status"] == "pass"
+    # function.json-based rules were not affected by the Python edit
+    assert run.reused >= 2
+
+
+def test_commits_made_between_runs_are_detected(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path / "app")
+    run_changed_only(str(repo))
+
+    (repo / "app.pyc").write_text("")
+    _git(repo, "add", "-f", "app.pyc")
+    _git(repo, "commit", "-q", "-m", "oops")
+    run = run_changed_only(str(repo))
+
+    assert "app.pyc" in run.changed
+    assert _items(run.results)["check_unused_files"]["status"] == "warn"
+
+
+def test_rules_reading_ignored_paths_always_rerun(tmp_path: Path) -> None:
+    repo = tmp_path / "app"
+    repo.mkdir()
+    (repo / ".gitignore").write_text("__pycache__/\n*.pyc\n")
+    _make_repo(repo)
+    assert _items(run_changed_only(str(repo)).results)["check_unused_files"]["status"] == "pass"
+
+    (repo / "__pycache__").mkdir()
+    (repo / "__pycache__" / "function_app.cpython-311.pyc").write_text("")
+    run = run_changed_only(str(repo))
+
+    assert run.changed == set()
+    assert _items(run.results)["check_unused_files"]["status"] == "warn"
+
+
+def test_measurements_of_installed_dependencies_are_not_reused() -> None:
+    assert _reusable({"id": "check_imports", "type": "source_code_contains"})
+    assert not _reusable({"id": "check_cold_start", "type": "cold_start_import"})
+    assert not _reusable({"id": "check_import_memory", "type": "cold_start_memory"})
+    assert not _reusable({"id": "check_footprint", "type": "dist_footprint"})
+
+
+def test_deploy_size_counts_ignored_packages(tmp_path: Path) -> None:
+    repo = tmp_path / "app"
+    repo.mkdir()
+    (repo / ".gitignore").write_text(".python_packages/\n")
+    _make_repo(repo)
+    before = _items(run_changed_only(str(repo)).results)["check_deploy_size"]["value"]
+
+    packages = repo / ".python_packages" / "lib" / "site-packages"
+    packages.mkdir(parents=True)
+    (packages / "big.bin").write_bytes(bytes(50_000))
+    after = _items(run_changed_only(str(repo)).results)["check_deploy_size"]["value"]
+
+    assert after != before and "5 files" in after
+
+
+def test_staged_selection_and_model_switch(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path / "app")
+    run_changed_only(str(repo))
+
+    func_dir = repo / "HttpTrigger"
+    func_dir.mkdir()
+    (func_dir / "function.json").write_text(json.dumps({"bindings": [{"type": "httpTrigger"}]}))
+    _git(repo, "add", ".")
+    run = run_changed_only(str(repo), staged=True)
+
+    assert "HttpTrigger/function.json" in run.changed
+    # A new function.json switches the project to the v1 rule set, so nothing is reused
+    assert run.full
+    assert "check_programming_model_v1" in _items(run.results)
+
+
+def test_outside_git_raises(tmp_path: Path) -> None:
+    project = tmp_path / "plain"
+    project.mkdir()
+    (project / "host.json").write_text("{}")
+
+    with pytest.raises(GitError):
+        run_changed_only(str(project))
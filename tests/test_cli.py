@@ -57,3 +57,14 @@ def test_cli_verbose_output() -> None:
     result = runner.invoke(app, ["doctor", "--format", "table", "--verbose"])
     _assert_exit_code_matches_fail_count_text(result.output, result.exit_code)
     assert "fix:" in result.output  # hint indicator now printed as 'fix:'
+
+
+def test_cli_section_filter_runs_only_that_section() -> None:
+    """--section limits the run to one section; an empty selection is rejected."""
+    result = runner.invoke(app, ["doctor", "--format", "json", "--section", "python_env", "--skip", "check_venv"])
+    data = json.loads(result.output)
+    assert [section["category"] for section in data] == ["python_env"]
+    assert "check_venv" not in {item["id"] for item in data[0]["items"]}
+
+    result = runner.invoke(app, ["doctor", "--only", "no_such_rule"])
+    assert result.exit_code != 0
@@ -0,0 +1,97 @@
+"""Tests for the per-invocation client lint."""
+
+import json
+from pathlib import Path
+from typing import cast
+
+from azure_functions_doctor.client_reuse import client_kind
+from azure_functions_doctor.handlers import Rule, generic_handler
+
+RULE = cast(Rule, {"id": "check_client_per_invocation", "type": "client_per_invocation", "condition": {}})
+
+
+def _v2_project(root: Path) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "function_app.py").write_text(
+        "import functools\n"
+        "import azure.functions as func\n"
+        "import requests\n"
+        "from azure.storage.blob import BlobServiceClient\n"
+        "from storage import Repository\n"
+        "\n"
+        "app = func.FunctionApp()\n"
+        "shared = requests.Session()\n"
+        "\n"
+        "@functools.lru_cache\n"
+        "def blob_service():\n"
+        "    return BlobServiceClient.from_connection_string('...')\n"
+        "\n"
+        "@app.route(route='items')\n"
+        "def items(req):\n"
+        "    blob_service().get_container_client('items')\n"
+        "    shared.get('https://example.invalid')\n"
+        "    return Repository().load()\n"
+        "\n"
+        "@app.queue_trigger(arg_name='msg', queue_name='q', connection='C')\n"
+        "def on_message(msg):\n"
+        "    with requests.Session() as session:\n"
+        "        session.get('https://example.invalid')\n"
+    )
+    (root / "storage.py").write_text(
+        "from azure.cosmos import CosmosClient\n"
+        "\n"
+        "class Repository:\n"
+        "    def __init__(self):\n"
+        "        self.client = CosmosClient('https://example.invalid', credential='...')\n"
+        "\n"
+        "    def load(self):\n"
+        "        return []\n"
+    )
+    return root
+
+
+def test_client_table() -> None:
+    assert client_kind("azure.storage.blob.BlobServiceClient.from_connection_string") == "Azure SDK client"
+    assert client_kind("azure.cosmos.aio.CosmosClient") == "Azure SDK client"
+    assert client_kind("aiohttp.ClientSession") == "aiohttp.ClientSession"
+    assert client_kind("requests.get") is None
+    assert client_kind("mycorp.Client", ["mycorp.Client"]) == "client"
+
+
+def test_clients_built_in_handlers_are_reported(tmp_path: Path) -> None:
+    result = generic_handler(RULE, _v2_project(tmp_path / "app"))
+    assert result["status"] == "fail"
+    detail = result["detail"]
+    # Constructors reached through a class are followed into __init__
+    assert "function_app.py:15 items -> function_app.py:18 Repository -> storage.py:5 CosmosClient" in detail
+    assert "function_app.py:22 requests.Session (requests.Session)" in detail
+    # Module scope and cached factories are reused across invocations
+    assert "BlobServiceClient" not in detail
+    assert ":8 " not in detail
+
+
+def test_v1_entry_points_and_custom_types(tmp_path: Path) -> None:
+    handler = tmp_path / "HttpTrigger"
+    handler.mkdir()
+    (handler / "function.json").write_text(json.dumps({"scriptFile": "__init__.py", "bindings": []}))
+    (handler / "__init__.py").write_text(
+        "import mycorp\n"
+        "_client = None\n"
+        "\n"
+        "def client():\n"
+        "    global _client\n"
+        "    if _client is None:\n"
+        "        _client = mycorp.Client()\n"
+        "    return _client\n"
+        "\n"
+        "def main(req):\n"
+        "    client()\n"
+        "    return mycorp.Client().call()\n"
+    )
+    assert generic_handler(RULE, tmp_path)["status"] == "pass"
+
+    custom = cast(Rule, {**RULE, "condition": {"client_types": ["mycorp.Client"]}})
+    result = generic_handler(custom, tmp_path)
+    assert result["status"] == "fail"
+    assert "HttpTrigger/__init__.py:10 main -> HttpTrigger/__init__.py:12 mycorp.Client" in result["detail"]
+    assert ":7 " not in result["detail"]
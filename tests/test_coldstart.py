@@ -0,0 +1,116 @@
+"""Tests for the cold-start import-time and memory profilers."""
+
+import json
+import sys
+from pathlib import Path
+from typing import cast
+
+from typer.testing import CliRunner
+
+from azure_functions_doctor.cli import cli as app
+from azure_functions_doctor.coldstart import app_entry_points, parse_importtime, profile_imports, profile_memory
+from azure_functions_doctor.handlers import Rule, generic_handler
+
+runner = CliRunner()
+
+_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | _io
+import time:        40 |         40 |     numbers
+import time:       300 |        340 |   decimal
+import time:        50 |         50 |   helpers
+import time:        10 |        400 | function_app
+"""
+
+
+def _v2_app(root: Path, body: str = "import helpers\nimport decimal\n") -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "function_app.py").write_text(body)
+    (root / "helpers.py").write_text("import json\n")
+    return root
+
+
+def test_parse_importtime_builds_tree() -> None:
+    roots = parse_importtime("unrelated stderr line\n" + _IMPORTTIME)
+    assert [node["module"] for node in roots] == ["_io", "function_app"]
+    app_node = roots[1]
+    assert app_node["cumulative_us"] == 400
+    assert [child["module"] for child in app_node["children"]] == ["decimal", "helpers"]
+    assert app_node["children"][0]["children"][0]["module"] == "numbers"
+
+
+def test_v1_entry_points_follow_script_file(tmp_path: Path) -> None:
+    for name, binding in (("HttpTrigger", {}), ("Timer", {"scriptFile": "main.py"})):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "function.json").write_text(json.dumps({**binding, "bindings": []}))
+    (tmp_path / "HttpTrigger" / "__init__.py").write_text("")
+    (tmp_path / "Timer" / "main.py").write_text("")
+    (tmp_path / "function_app.py").write_text("")
+    entries = [p.relative_to(tmp_path.resolve()).as_posix() for p in app_entry_points(tmp_path.resolve())]
+    assert entries == ["HttpTrigger/__init__.py", "Timer/main.py"]
+
+
+def test_profile_imports_reports_heaviest_top_level_imports(tmp_path: Path) -> None:
+    root = _v2_app(tmp_path / "app")
+    report = profile_imports(root, runs=2, python=sys.executable)
+    assert report["entry_modules"] == ["function_app"]
+    assert report["runs"] == 2 and len(report["samples_ms"]) == 2
+    assert 0 < report["p50_ms"] <= report["p95_ms"]
+    assert {"helpers", "decimal"} <= {cost["module"] for cost in report["heaviest"]}
+
+
+def test_rule_and_cli_fail_on_budget_or_import_error(tmp_path: Path) -> None:
+    root = _v2_app(tmp_path / "app")
+    rule = cast(Rule, {"id": "cold", "type": "cold_start_import", "condition": {"max_ms": 60000, "runs": 1}})
+    assert generic_handler(rule, root)["status"] == "pass"
+
+    over = runner.invoke(app, ["coldstart", "--path", str(root), "--runs", "1", "--max-ms", "0", "--format", "json"])
+    assert over.exit_code == 1
+    assert json.loads(over.stdout)["over_budget"] is True
+
+    broken = _v2_app(tmp_path / "broken", body="import not_a_real_module_xyz\n")
+    result = generic_handler(rule, broken)
+    assert result["status"] == "fail"
+    assert "not_a_real_module_xyz" in result["detail"]
+
+
+def test_memory_profile_attributes_allocations_and_checks_budget(tmp_path: Path) -> None:
+    root = _v2_app(tmp_path / "app", "import helpers\nimport ballast\n")
+    (root / "ballast.py").write_text("BLOCK = [str(i) * 8 for i in range(100_000)]\n")
+    report = profile_memory(root, runs=2)
+    assert report["entry_modules"] == ["function_app"]
+    assert len(report["heap_samples"]) == 2
+    assert report["heaviest"][0]["module"] == "ballast"
+    assert report["heaviest"][0]["bytes"] > 5_000_000
+    if sys.platform != "win32":
+        assert report["baseline_rss_bytes"] is not None and report["p95_rss_bytes"] is not None
+        assert report["p95_rss_bytes"] > report["baseline_rss_bytes"]
+
+    rule = cast(Rule, {"id": "mem", "type": "cold_start_memory", "condition": {"max_bytes": 1_000_000, "runs": 1}})
+    result = generic_handler(rule, root)
+    assert result["status"] == "fail"
+    assert "heaviest: ballast" in result["detail"]
+
+    cli = runner.invoke(app, ["memory", "--path", str(root), "--runs", "1", "--format", "json"])
+    assert cli.exit_code == 0
+    assert json.loads(cli.output)["heaviest"][0]["module"] == "ballast"
+
+
+def test_memory_is_charged_to_modules_rather_than_the_import_system(tmp_path: Path) -> None:
+    body = "import argparse, email.mime.multipart, http.client, json\nimport bulky\n"
+    root = _v2_app(tmp_path / "app", body)
+    (root / "bulky.py").write_text("".join(f"def f{i}(x):\n    return x * {i} + len(str(x))\n" for i in range(2000)))
+    report = profile_memory(root, runs=1, top=1000)
+    charged = {entry["module"]: entry["bytes"] for entry in report["heaviest"]}
+    named = sum(size for module, size in charged.items() if not module.startswith("<"))
+    assert named > 0.9 * sum(charged.values())
+    assert {"bulky", "email", "http"} <= set(charged)
+
+
+def test_memory_breakdown_is_taken_at_the_heap_peak(tmp_path: Path) -> None:
+    root = _v2_app(tmp_path / "app", "import scratch\nimport helpers\n")
+    (root / "scratch.py").write_text("BLOCK = [str(i) * 8 for i in range(100_000)]\ndel BLOCK\n")
+    report = profile_memory(root, runs=1)
+    assert report["p50_heap_bytes"] > 5_000_000
+    assert report["heaviest"][0]["module"] == "scratch"
+    assert report["heaviest"][0]["bytes"] > 5_000_000
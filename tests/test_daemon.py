@@ -0,0 +1,153 @@
+"""Tests for the diagnostics daemon and its thin client."""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from azure_functions_doctor import daemon as daemon_module
+from azure_functions_doctor.client import DaemonUnavailableError, request
+from azure_functions_doctor.daemon import DoctorDaemon
+
+
+def _make_project(root: Path) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "host.json").write_text(json.dumps({"version": "2.0"}))
+    (root / "requirements.txt").write_text("azure-functions\n")
+    (root / "function_app.py").write_text("import azure.functions as func\napp = func.FunctionApp()\n")
+    return root
+
+
+def _labels(results: list[Any]) -> dict[str, Any]:
+    return {item["label"]: item for section in results for item in section["items"]}
+
+
+def test_repeated_runs_are_served_from_warm_state(tmp_path: Path) -> None:
+    project = _make_project(tmp_path / "app")
+    daemon = DoctorDaemon(socket_path=tmp_path / "d.sock", max_projects=4)
+    env = {"PATH": os.defpath}
+
+    first = daemon.handle_request({"command": "run", "path": str(project), "env": env})
+    second = daemon.handle_request({"command": "run", "path": str(project), "env": env})
+
+    assert first["ok"] and not first["cached"]
+    assert second["ok"] and second["cached"]
+    assert first["results"] == second["results"]
+
+
+def test_file_change_invalidates_state(tmp_path: Path) -> None:
+    project = _make_project(tmp_path / "app")
+    daemon = DoctorDaemon(socket_path=tmp_path / "d.sock")
+    env = {"PATH": os.defpath}
+
+    before = daemon.handle_request({"command": "run", "path": str(project), "env": env})
+    assert _labels(before["results"])["local.settings.json"]["status"] == "warn"
+
+    (project / "local.settings.json").write_text("{}")
+    assert daemon.poll_once() == [project.resolve()]
+
+    after = daemon.handle_request({"command": "run", "path": str(project), "env": env})
+    assert not after["cached"]
+    assert _labels(after["results"])["local.settings.json"]["status"] == "pass"
+
+
+def test_requests_rely_on_the_watcher(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    project = _make_project(tmp_path / "app")
+    site = project / ".venv" / "lib" / "python3.11" / "site-packages"
+    site.mkdir(parents=True)
+    daemon = DoctorDaemon(socket_path=tmp_path / "d.sock")
+    daemon.handle_request({"command": "run", "path": str(project), "env": {"PATH": os.defpath}})
+
+    walks: list[Path] = []
+
+    def counting_signature(root: Path) -> str:
+        walks.append(root)
+        return ""
+
+    monkeypatch.setattr(daemon_module, "tree_signature", counting_signature)
+    # Variables no rule reads, such as the shell's working directory, share one cached result
+    for pwd in ("/a", "/b"):
+        response = daemon.handle_request(
+            {"command": "run", "path": str(project), "env": {"PATH": os.defpath, "PWD": pwd}}
+        )
+        assert response["cached"]
+    assert walks == []
+    monkeypatch.undo()
+
+    assert daemon.poll_once() == []
+    (site / "requests-2.32.0.dist-info").mkdir()
+    os.utime(site, ns=(0, 0))
+    assert daemon.poll_once() == [project.resolve()]
+
+
+def test_results_per_environment_are_bounded(tmp_path: Path) -> None:
+    project = _make_project(tmp_path / "app")
+    daemon = DoctorDaemon(socket_path=tmp_path / "d.sock")
+    for i in range(daemon_module._MAX_ENVIRONMENTS + 3):
+        daemon.handle_request({"command": "run", "path": str(project), "env": {"VIRTUAL_ENV": f"/venv{i}"}})
+    assert len(daemon._state_for(project.resolve()).results) == daemon_module._MAX_ENVIRONMENTS
+
+
+def test_client_environment_is_used_for_env_checks(tmp_path: Path) -> None:
+    project = _make_project(tmp_path / "app")
+    daemon = DoctorDaemon(socket_path=tmp_path / "d.sock")
+
+    without = daemon.handle_request({"command": "run", "path": str(project), "env": {}})
+    with_venv = daemon.handle_request({"command": "run", "path": str(project), "env": {"VIRTUAL_ENV": "/venv"}})
+
+    assert _labels(without["results"])["Virtual environment"]["status"] == "fail"
+    assert _labels(with_venv["results"])["Virtual environment"]["status"] == "pass"
+
+
+def test_lru_limit_on_project_state(tmp_path: Path) -> None:
+    daemon = DoctorDaemon(socket_path=tmp_path / "d.sock", max_projects=2)
+    projects = [_make_project(tmp_path / f"app{i}").resolve() for i in range(3)]
+
+    for project in projects:
+        assert daemon.handle_request({"command": "run", "path": str(project), "env": {}})["ok"]
+    # Touch the first survivor so it becomes most recently used
+    daemon.handle_request({"command": "run", "path": str(projects[1]), "env": {}})
+
+    assert daemon.projects == [projects[2], projects[1]]
+
+
+def test_invalid_requests_report_errors(tmp_path: Path) -> None:
+    daemon = DoctorDaemon(socket_path=tmp_path / "d.sock")
+
+    assert daemon.handle_request({"command": "run"})["ok"] is False
+    assert "Unknown command" in daemon.handle_request({"command": "nope"})["error"]
+    assert daemon.handle_request({"command": "ping"})["ok"] is True
+
+
+def test_client_reports_missing_daemon(tmp_path: Path) -> None:
+    with pytest.raises(DaemonUnavailableError):
+        request({"command": "ping"}, tmp_path / "absent.sock", timeout=1)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX") or sys.platform.startswith("win"), reason="Unix sockets")
+def test_socket_round_trip(tmp_path: Path) -> None:
+    project = _make_project(tmp_path / "app")
+    socket_path = tmp_path / "d.sock"
+    daemon = DoctorDaemon(socket_path=socket_path, poll_interval=0.05)
+    server = threading.Thread(target=daemon.serve_forever, daemon=True)
+    server.start()
+    deadline = time.monotonic() + 5
+    while not socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    try:
+        response = request({"command": "run", "path": str(project), "env": {}}, socket_path)
+        assert response["ok"]
+        assert any(section["title"] == "Python Env" for section in response["results"])
+        assert request({"command": "stats"}, socket_path)["projects"][0]["path"] == str(project.resolve())
+    finally:
+        request({"command": "shutdown"}, socket_path)
+        server.join(timeout=5)
+    assert not server.is_alive()
+    assert not socket_path.exists()
@@ -0,0 +1,89 @@
+"""Tests for the deployment package size analyzer."""
+
+import json
+from pathlib import Path
+from typing import cast
+
+from typer.testing import CliRunner
+
+from azure_functions_doctor.cli import cli as app
+from azure_functions_doctor.deploy_size import FuncIgnore, measure_deployment, walk_deployment
+from azure_functions_doctor.handlers import Rule, generic_handler
+
+runner = CliRunner()
+
+
+def _write(root: Path, rel: str, size: int) -> None:
+    target = root / rel
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(b"x" * size)
+
+
+def _project(root: Path) -> Path:
+    _write(root, "function_app.py", 100)
+    _write(root, "host.json", 20)
+    _write(root, "shared/util.py", 300)
+    _write(root, "shared/__pycache__/util.cpython-311.pyc", 400)
+    _write(root, "shared/data/model.bin", 5000)
+    _write(root, "tests/test_app.py", 50)
+    _write(root, ".venv/lib/site.py", 9000)
+    _write(root, ".git/objects/pack", 9000)
+    _write(root, "keep.pyc", 10)
+    (root / ".funcignore").write_text(".venv\n*.pyc\n__pycache__/\n/tests\n!keep.pyc\n# comment\n")
+    return root
+
+
+def test_funcignore_semantics() -> None:
+    rules = FuncIgnore(["*.pyc", "!keep.pyc", "build/", "/local.settings.json", "docs/**/*.md"])
+    assert rules.ignored("a/b/c.pyc", False)
+    assert not rules.ignored("a/keep.pyc", False)
+    # Trailing slash only matches directories
+    assert rules.ignored("x/build", True)
+    assert not rules.ignored("x/build", False)
+    # Patterns with a slash are anchored to the root
+    assert rules.ignored("local.settings.json", False)
+    assert not rules.ignored("sub/local.settings.json", False)
+    assert rules.ignored("docs/a/b/readme.md", False)
+    assert not rules.ignored("src/readme.md", False)
+
+
+def test_walk_prunes_ignored_directories(tmp_path: Path) -> None:
+    files = dict(walk_deployment(_project(tmp_path)))
+    assert set(files) == {
+        "function_app.py",
+        "host.json",
+        "shared/util.py",
+        "shared/data/model.bin",
+        "keep.pyc",
+        ".funcignore",
+    }
+    assert files["shared/data/model.bin"] == 5000
+
+
+def test_measure_deployment_report(tmp_path: Path) -> None:
+    report = measure_deployment(_project(tmp_path), top=2)
+    assert report["file_count"] == 6
+    assert report["total_bytes"] == sum(size for _, size in walk_deployment(tmp_path))
+    assert report["largest_files"][0] == {"path": "shared/data/model.bin", "bytes": 5000}
+    assert [entry["path"] for entry in report["largest_directories"]] == ["shared", "shared/data"]
+    assert report["largest_directories"][0]["bytes"] == 5300
+    extensions = {entry["extension"]: entry for entry in report["extensions"]}
+    assert extensions[".py"]["files"] == 2
+    assert extensions["(none)"]["files"] == 1
+
+
+def test_deploy_size_rule_and_cli_budget(tmp_path: Path) -> None:
+    _project(tmp_path)
+    rule = cast(Rule, {"id": "size", "type": "deploy_size", "condition": {"max_bytes": 1000}})
+    result = generic_handler(rule, tmp_path)
+    assert result["status"] == "fail"
+    assert "shared" in result["detail"]
+    rule["condition"] = {"max_bytes": 100_000, "max_files": 10}
+    assert generic_handler(rule, tmp_path)["status"] == "pass"
+
+    within = runner.invoke(app, ["size", "--path", str(tmp_path), "--format", "json"])
+    assert within.exit_code == 0, within.output
+    assert json.loads(within.stdout)["over_budget"] == []
+    over = runner.invoke(app, ["size", "--path", str(tmp_path), "--max-files", "3"])
+    assert over.exit_code == 1
+    assert "Over budget" in over.stdout
@@ -0,0 +1,104 @@
+"""Tests for the installed distribution footprint report."""
+
+from pathlib import Path
+from typing import cast
+
+import pytest
+from typer.testing import CliRunner
+
+from azure_functions_doctor.cache import JsonCache
+from azure_functions_doctor.cli import cli as app
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.dist_footprint import FootprintAnalyzer, measure_footprint, site_packages
+from azure_functions_doctor.handlers import Rule, generic_handler
+
+
+def _dist(site: Path, name: str, files: dict[str, int], requires: tuple[str, ...] = ()) -> None:
+    info = site / f"{name}-1.0.dist-info"
+    info.mkdir(parents=True)
+    headers = "".join(f"Requires-Dist: {r}\n" for r in requires)
+    (info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n{headers}\nName: not-a-header\n"
+    )
+    rows = [f"{path},sha256=x,{size}" for path, size in files.items()]
+    (info / "RECORD").write_text("\n".join([*rows, f"{name}-1.0.dist-info/RECORD,,"]) + "\n")
+
+
+def _project(root: Path) -> Path:
+    site = root / ".python_packages" / "lib" / "site-packages"
+    _dist(site, "Frame", {"frame/__init__.py": 1_000}, ("numlib>=1", "arrowish; extra == 'arrow'"))
+    _dist(site, "numlib", {"numlib/__init__.py": 500, "numlib/_core.cpython-311-x86_64-linux-gnu.so": 40_000})
+    _dist(site, "arrowish", {"arrowish/libarrow.so.1500": 90_000})
+    _dist(site, "tinyhttp", {"tinyhttp.py": 300}, ("numlib; python_version < '3'",))
+    # An egg-info install without RECORD is measured by walking its packages
+    egg = site / "legacy-0.1.egg-info"
+    egg.mkdir()
+    (egg / "PKG-INFO").write_text("Metadata-Version: 1.1\nName: legacy\nVersion: 0.1\n")
+    (egg / "top_level.txt").write_text("legacy\n")
+    (site / "legacy").mkdir()
+    (site / "legacy" / "__init__.py").write_text("x" * 200)
+    (root / "requirements.txt").write_text("frame[arrow]\ntinyhttp\n")
+    return root
+
+
+def test_footprint_is_attributed_to_top_level_requirements(tmp_path: Path) -> None:
+    root = _project(tmp_path / "app")
+    assert site_packages(root, environ={}) == root / ".python_packages" / "lib" / "site-packages"
+    report = measure_footprint(root, cache=JsonCache("fp", cache_dir=tmp_path / "cache"))
+    assert report is not None
+
+    by_name = {d["name"]: d for d in report["distributions"]}
+    assert by_name["numlib"]["native_bytes"] == 40_000
+    assert by_name["arrowish"]["native_bytes"] == 90_000
+    # The extra requested in requirements.txt pulls arrowish in; the marker on tinyhttp's dependency does not apply
+    assert by_name["arrowish"]["required_by"] == ["frame"]
+    assert by_name["numlib"]["required_by"] == ["frame"]
+    assert report["unattributed"] == ["legacy"]
+    assert by_name["legacy"]["files"] == 3
+
+    frame, tinyhttp = report["requirements"]
+    assert frame["requirement"] == "frame"
+    assert frame["native_bytes"] == 130_000
+    assert frame["distributions"][0].startswith("arrowish ")
+    assert tinyhttp["bytes"] < 1_000
+
+
+def test_client_virtual_env_is_measured(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("VIRTUAL_ENV", raising=False)
+    root = tmp_path / "app"
+    root.mkdir()
+    (root / "requirements.txt").write_text("tinyhttp\n")
+    venv = tmp_path / "client-venv"
+    _dist(venv / "lib" / "python3.11" / "site-packages", "tinyhttp", {"tinyhttp.py": 300})
+
+    context = ProjectContext(root, environ={"VIRTUAL_ENV": str(venv)})
+    report = measure_footprint(root, context, cache=JsonCache("fp", cache_dir=tmp_path / "cache"))
+    assert report is not None and report["site_packages"].startswith(str(venv))
+    assert measure_footprint(root, ProjectContext(root, environ={})) is None
+
+
+def test_distributions_are_cached_by_record_mtime(tmp_path: Path) -> None:
+    root = _project(tmp_path / "app")
+    site = root / ".python_packages" / "lib" / "site-packages"
+    first = FootprintAnalyzer(site, JsonCache("fp", cache_dir=tmp_path / "cache"))
+    assert len(first.distributions()) == 5
+    assert first.read == 5
+
+    _dist(site, "newcomer", {"newcomer.py": 10})
+    again = FootprintAnalyzer(site, JsonCache("fp", cache_dir=tmp_path / "cache"))
+    assert "newcomer" in again.distributions()
+    assert again.read == 1
+
+
+def test_rule_and_command_report_heavy_requirements(tmp_path: Path) -> None:
+    root = _project(tmp_path / "app")
+    rule = cast(Rule, {"id": "fp", "type": "dist_footprint", "condition": {"max_bytes": 100_000}})
+    result = generic_handler(rule, root)
+    assert result["status"] == "fail"
+    assert "frame installs" in result["detail"]
+    assert "tinyhttp" not in result["detail"]
+    assert generic_handler(rule, tmp_path / "empty")["status"] == "pass"
+
+    cli = CliRunner().invoke(app, ["footprint", "--path", str(root), "--max-bytes", "100000"])
+    assert cli.exit_code == 1
+    assert "frame" in cli.output
@@ -4,7 +4,9 @@ import tempfile
 
 import pytest
 
-from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.doctor import Doctor, select_rules
+from azure_functions_doctor.files import FileIndex
+from azure_functions_doctor.handlers import Rule
 
 
 def test_doctor_checks_pass() -> None:
@@ -74,3 +76,43 @@ def test_v1_incompatibility_exit() -> None:
         # Should raise SystemExit
         with pytest.raises(SystemExit):
             Doctor(tmp)
+
+
+def test_select_rules_by_id_section_category_and_type() -> None:
+    """Selectors match ids, sections, categories and handler types, with wildcards."""
+    with tempfile.TemporaryDirectory() as tmp:
+        rules = Doctor(tmp).load_rules()
+
+        def ids(selected: list[Rule]) -> set[str]:
+            return {rule["id"] for rule in selected}
+
+        assert ids(select_rules(rules, only=["check_venv"])) == {"check_venv"}
+        assert ids(select_rules(rules, only=["tooling"])) == {"check_func_cli"}
+        assert ids(select_rules(rules, only=["compare_version"])) == {"check_python_version"}
+        assert "check_venv" not in ids(select_rules(rules, only=["environment"], skip=["check_venv"]))
+        assert ids(select_rules(rules, only=["check_azure_*"])) == {"check_azure_functions_library"}
+
+
+def test_model_independent_selection_does_not_walk_tree(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Selecting rules shared by both models skips detection and the project walk."""
+    with tempfile.TemporaryDirectory() as tmp:
+
+        def no_walk(self: FileIndex) -> None:
+            raise AssertionError("project tree was walked")
+
+        monkeypatch.setattr(FileIndex, "_walk", no_walk)
+        results = Doctor(tmp, allow_v1=True).run_all_checks(only=["environment"], skip=["check_python_version"])
+
+        assert [section["category"] for section in results] == ["python_env"]
+        assert {item["id"] for item in results[0]["items"]} == {"check_venv", "check_python_executable"}
+
+
+def test_model_dependent_selection_detects_model() -> None:
+    """A selection that differs between v1 and v2 still uses the detected model's rules."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "function.json"), "w") as f:
+            json.dump({"bindings": []}, f)
+
+        rules = Doctor(tmp, allow_v1=True).load_rules(only=["python_env"])
+
+        assert "check_azure_functions_worker" in {rule["id"] for rule in rules}
@@ -3,12 +3,14 @@
 import os
 import tempfile
 from pathlib import Path
+from typing import Callable
 from unittest.mock import patch
 
 import pytest
 import typer
 
 from azure_functions_doctor.cli import _validate_inputs
+from azure_functions_doctor.config import get_config, override_config
 from azure_functions_doctor.doctor import Doctor
 from azure_functions_doctor.handlers import _handle_specific_exceptions
 from azure_functions_doctor.target_resolver import resolve_target_value
@@ -69,21 +71,27 @@ class TestSpecificExceptionHandling:
 class TestTargetResolverErrorHandling:
     """Test error handling in target resolver."""
 
-    def test_func_core_tools_not_found(self) -> None:
+    def test_func_core_tools_not_found(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         """Test handling when func command is not found."""
-        with patch("subprocess.check_output", side_effect=FileNotFoundError()):
-            result = resolve_target_value("func_core_tools")
-            assert result == "not_installed"
+        monkeypatch.setenv("PATH", str(tmp_path))
+        result = resolve_target_value("func_core_tools")
+        assert result == "not_installed"
 
-    def test_func_core_tools_timeout(self) -> None:
+    def test_func_core_tools_timeout(self, fake_tool: Callable[[str, str], Path]) -> None:
         """Test handling when func command times out."""
-        with patch("subprocess.check_output", side_effect=TimeoutError()):
+        fake_tool("func", "sleep 5")
+        original_timeout = get_config().get("probe_timeout_seconds")
+        override_config(probe_timeout_seconds=0.2)
+        try:
             result = resolve_target_value("func_core_tools")
-            assert result == "timeout"
+        finally:
+            override_config(probe_timeout_seconds=original_timeout)
+        assert result == "timeout"
 
-    def test_func_core_tools_command_error(self) -> None:
+    def test_func_core_tools_command_error(self, fake_tool: Callable[[str, str], Path]) -> None:
         """Test handling when func command fails."""
-        with patch("subprocess.check_output", side_effect=Exception("Command failed")):
+        fake_tool("func", "exit 0")
+        with patch("asyncio.create_subprocess_exec", side_effect=Exception("Command failed")):
             result = resolve_target_value("func_core_tools")
             assert result == "unknown_error"
 
@@ -0,0 +1,69 @@
+"""Tests for the PATH executable index."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.executables import ExecutableIndex
+from azure_functions_doctor.handlers import Rule, generic_handler
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="POSIX executable bits")
+
+
+def _make_executable(path: Path, mode: int = 0o755) -> Path:
+    path.write_text("#!/bin/sh\n")
+    path.chmod(mode)
+    return path
+
+
+def test_first_executable_on_path_wins(tmp_path: Path) -> None:
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    _make_executable(first / "tool", mode=0o644)  # not executable, must be skipped
+    expected = _make_executable(second / "tool")
+    _make_executable(second / "other")
+    path_env = os.pathsep.join([str(first), str(tmp_path / "missing"), str(second)])
+
+    index = ExecutableIndex(path_env=path_env)
+
+    assert index.which("tool") == str(expected)
+    assert "other" in index
+    assert index.which("absent") is None
+    assert index.directories == [str(first), str(tmp_path / "missing"), str(second)]
+
+
+def test_index_lists_each_directory_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _make_executable(tmp_path / "func")
+    calls: list[str] = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path: str) -> "os._ScandirIterator[str]":
+        calls.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    index = ExecutableIndex(path_env=os.pathsep.join([str(tmp_path), str(tmp_path)]))
+
+    for name in ("func", "az", "azurite", "docker", "func"):
+        index.which(name)
+
+    assert calls == [str(tmp_path)]
+
+
+def test_executable_exists_uses_context_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    _make_executable(bin_dir / "func")
+    monkeypatch.setenv("PATH", str(bin_dir))
+    context = ProjectContext(tmp_path)
+
+    rule: Rule = {"type": "executable_exists", "condition": {"target": "func"}}
+    assert generic_handler(rule, tmp_path, context)["status"] == "pass"
+
+    missing: Rule = {"type": "executable_exists", "condition": {"target": "az"}}
+    assert generic_handler(missing, tmp_path, context)["status"] == "fail"
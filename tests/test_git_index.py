@@ -0,0 +1,139 @@
+"""Tests for the git-index-backed file listing."""
+
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.files import FileIndex
+from azure_functions_doctor.git_index import GitIndexError, parse_index
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is required")
+
+
+def _git(root: Path, *args: str) -> list[str]:
+    done = subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+    return [line for line in done.stdout.decode().split("\0") if line]
+
+
+def _write(root: Path, rel: str, text: str = "x\n") -> None:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.mark.parametrize("version", [3, 4])
+def test_listing_matches_git(tmp_path: Path, version: int) -> None:
+    _write(tmp_path, ".gitignore", ".venv/\n*.pyc\n")
+    app = tmp_path / "app"
+    for rel in ("function_app.py", "shared/util.py", "shared/deep/x.json", "shared.txt", "deleted.py"):
+        _write(app, rel)
+    _write(app, "docs/.gitignore", "*.tmp\n!keep.tmp\n")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _write(app, "forced.pyc")
+    _git(tmp_path, "add", "-f", "app/forced.pyc")
+    _write(app, "intent.py")
+    _git(tmp_path, "add", "-N", "app/intent.py")
+    _git(tmp_path, "update-index", "--index-version", str(version))
+    (app / "deleted.py").unlink()
+    for rel in ("new.py", ".venv/lib/site.py", "cache.pyc", "docs/a.tmp", "docs/keep.tmp", "nested/.git/HEAD"):
+        _write(app, rel)
+
+    present = {rel for rel in _git(app, "ls-files", "-z") if (app / rel).exists()}
+    untracked = set(_git(app, "ls-files", "-z", "--others", "--exclude-standard"))
+    assert "app/shared/util.py" not in present and "shared/util.py" in present
+
+    tracked_index = FileIndex(app)
+    assert set(tracked_index.files) == present
+    assert tracked_index.git is not None
+    full_index = FileIndex(app, untracked=True)
+    assert set(full_index.files) - {"nested"} == present | untracked
+    assert ("nested", True) in full_index.entries and ("shared/deep", True) in full_index.entries
+    assert [p.name for p in full_index.rglob("*.pyc")] == ["forced.pyc"]
+
+    # Same order as walking the tree
+    listed = set(full_index.entries)
+    walked = FileIndex(app)._walk()
+    assert [entry for entry in walked if entry in listed] == full_index.entries
+
+
+def test_unwanted_file_check_sees_ignored_files(tmp_path: Path) -> None:
+    _write(tmp_path, ".gitignore", ".venv/\n__pycache__/\n*.pyc\n")
+    _write(tmp_path, "host.json", '{"version": "2.0"}')
+    _write(tmp_path, "function_app.py", "import azure.functions as func\napp = func.FunctionApp()\n")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    for rel in ("__pycache__/a.pyc", ".venv/pyvenv.cfg"):
+        _write(tmp_path, rel)
+
+    doctor = Doctor(str(tmp_path))
+    check = doctor.run_all_checks(only=["check_unused_files"])[0].checks[0]
+    assert doctor.context.files.git is not None
+    assert "a.pyc" not in "".join(doctor.context.files.files)
+    assert check.status == "warn"
+    assert all(name in check.value for name in ("__pycache__", "a.pyc", ".venv"))
+
+
+def test_unreadable_index_falls_back_to_walk(tmp_path: Path) -> None:
+    _write(tmp_path, "function_app.py")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    data = (tmp_path / ".git" / "index").read_bytes()
+    with pytest.raises(GitIndexError):
+        parse_index(data[:40])
+    with pytest.raises(GitIndexError):
+        parse_index(b"DIRC\0\0\0\x09\0\0\0\0" + bytes(20))
+
+    (tmp_path / ".git" / "index").write_bytes(data[:40])
+    index = FileIndex(tmp_path)
+    assert index.git is None
+    assert "function_app.py" in index.files and ".git/HEAD" in index.files
+
+
+def test_scan_verdicts_survive_mtime_only_changes(tmp_path: Path) -> None:
+    _write(tmp_path, "function_app.py", "import time\n")
+    source = tmp_path / "function_app.py"
+    # Old enough that the index entry is not racily clean
+    past = time.time() - 600
+    os.utime(source, (past, past))
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+
+    calls: list[Path] = []
+
+    def compute(path: Path) -> bool:
+        calls.append(path)
+        return True
+
+    def scan(memo: dict[str, dict[str, list[object]]]) -> ProjectContext:
+        context = ProjectContext(tmp_path)
+        context.scan_memo = memo
+        for path in context.files.rglob("*.py"):
+            context.scan("imports_time", path, compute)
+        return context
+
+    first = scan({})
+    assert len(calls) == 1
+    assert next(iter(first.scan_memo["imports_time"].values()))[0].startswith("git:")
+
+    # A fresh checkout or touch changes the mtime only; git records the new stat data on refresh
+    os.utime(source, (past + 60, past + 60))
+    _git(tmp_path, "update-index", "-q", "--refresh")
+    scan(first.scan_memo)
+    assert len(calls) == 1
+
+    source.write_text("import os\n")
+    os.utime(source, (past + 120, past + 120))
+    scan(first.scan_memo)
+    assert len(calls) == 2
@@ -2,7 +2,7 @@ import json
 import sys
 import tempfile
 from pathlib import Path
-from typing import cast
+from typing import Callable, cast
 
 from pytest import MonkeyPatch
 
@@ -306,3 +306,16 @@ def test_cron_validation_pass_and_fail(tmp_path: Path) -> None:
     func_file.write_text(json.dumps({"bindings": [{"type": "timerTrigger", "schedule": "everyday"}]}))
     res2 = generic_handler(rule, tmp_path)
     assert res2["status"] == "fail"
+
+
+def test_compare_version_external_tool(tmp_path: Path, fake_tool: Callable[[str, str], Path]) -> None:
+    fake_tool("func", "echo 4.0.5198")
+    rule = _make_rule("compare_version", {"target": "func_core_tools", "operator": ">=", "value": "4.0"})
+    res = generic_handler(rule, tmp_path)
+    assert res["status"] == "pass"
+    assert res["detail"] == "func_core_tools 4.0.5198 (>=4.0)"
+
+    rule_missing = _make_rule("compare_version", {"target": "docker", "operator": ">=", "value": "20"})
+    res2 = generic_handler(rule_missing, tmp_path)
+    assert res2["status"] == "fail"
+    assert "not_installed" in res2["detail"]
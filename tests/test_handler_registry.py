@@ -1,10 +1,14 @@
 """Tests for the handler registry pattern."""
 
+import importlib.metadata
 import sys
 import tempfile
 from pathlib import Path
 from typing import cast
 
+import pytest
+
+from azure_functions_doctor import handlers
 from azure_functions_doctor.handlers import HandlerRegistry, Rule
 
 
@@ -212,3 +216,56 @@ def test_handler_registry_optional_rules() -> None:
     # Handlers now always return fail for missing optional resources; optional marking handled at aggregation layer
     assert result["status"] == "fail"
     assert "optional" in result["detail"]
+
+
+def _install_plugin(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, module: str, source: str) -> list[str]:
+    """Expose ``module:handle`` as the ``org_check`` plugin type and record metadata reads."""
+    (tmp_path / f"{module}.py").write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    reads: list[str] = []
+
+    def fake_entry_points(group: str) -> list[importlib.metadata.EntryPoint]:
+        reads.append(group)
+        return [
+            importlib.metadata.EntryPoint(name="org_check", value=f"{module}:handle", group=group),
+            importlib.metadata.EntryPoint(name="file_exists", value=f"{module}:handle", group=group),
+        ]
+
+    monkeypatch.setattr(handlers, "_entry_points", fake_entry_points)
+    return reads
+
+
+def test_plugin_handlers_are_imported_on_first_use(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Plugin metadata is read once; the plugin module is imported only when its type runs."""
+    reads = _install_plugin(
+        tmp_path,
+        monkeypatch,
+        "org_doctor_plugin",
+        "def handle(rule, path, context):\n    return {'status': 'pass', 'detail': 'org ok'}\n",
+    )
+    registry = HandlerRegistry()
+    file_rule = cast(Rule, {"id": "f", "type": "file_exists", "condition": {"target": "x"}})
+    plugin_rule = cast(Rule, {"id": "o", "type": "org_check", "condition": {}})
+
+    registry.handle(file_rule, tmp_path)
+    assert reads == []
+
+    assert registry.has_type("org_check")
+    assert "org_doctor_plugin" not in sys.modules
+    assert registry.handle(plugin_rule, tmp_path) == {"status": "pass", "detail": "org ok"}
+    assert registry.handle(plugin_rule, tmp_path)["detail"] == "org ok"
+    # Built-in types cannot be replaced by plugins
+    assert registry.handle(file_rule, tmp_path)["status"] == "fail"
+    assert reads == [handlers.ENTRY_POINT_GROUP]
+    sys.modules.pop("org_doctor_plugin", None)
+
+
+def test_broken_plugin_fails_only_its_rules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _install_plugin(tmp_path, monkeypatch, "broken_doctor_plugin", "raise ImportError('missing dependency')\n")
+    registry = HandlerRegistry()
+
+    result = registry.handle(cast(Rule, {"id": "o", "type": "org_check", "condition": {}}), tmp_path)
+
+    assert result["status"] == "fail"
+    assert "missing dependency" in result["detail"]
+    assert not registry.has_type("no_such_type")
@@ -0,0 +1,88 @@
+"""Tests for the host.json concurrency and scale audit."""
+
+import json
+from pathlib import Path
+from typing import Any, cast
+
+from azure_functions_doctor.handlers import Rule, generic_handler
+from azure_functions_doctor.host_config import audit_host, parse_host_json, timespan_seconds
+
+
+def _rule(area: str) -> Rule:
+    return cast(Rule, {"id": f"host_{area}", "type": "host_json_audit", "condition": {"area": area}})
+
+
+def _project(root: Path, host: dict[str, Any], source: str) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "host.json").write_text(json.dumps(host, indent=2))
+    (root / "function_app.py").write_text("import azure.functions as func\n\napp = func.FunctionApp()\n\n" + source)
+    return root
+
+
+def test_typed_model_drops_wrong_types() -> None:
+    host, problems = parse_host_json(
+        {"functionTimeout": 600, "extensions": {"queues": {"batchSize": "16", "newBatchThreshold": 8}}}
+    )
+    assert host == {"extensions": {"queues": {"newBatchThreshold": 8}}}
+    assert problems == [
+        {"setting": "functionTimeout", "message": "must be a string, got 600"},
+        {"setting": "extensions.queues.batchSize", "message": 'must be an integer, got "16"'},
+    ]
+    assert timespan_seconds("00:05:00") == 300
+    assert timespan_seconds("1.00:00:00") == 86400
+    assert timespan_seconds("-1") == -1
+    assert timespan_seconds("5m") is None
+
+
+def test_queue_settings_audited_only_for_queue_triggers(tmp_path: Path) -> None:
+    host = {"version": "2.0", "extensions": {"queues": {"batchSize": 64, "maxPollingInterval": "00:05:00"}}}
+    http_only = _project(tmp_path / "http", host, "@app.route(route='x')\ndef x(req):\n    pass\n")
+    assert generic_handler(_rule("queues"), http_only)["status"] == "pass"
+
+    queued = _project(
+        tmp_path / "queue",
+        host,
+        "@app.queue_trigger(arg_name='m', queue_name='q', connection='C')\ndef q(m):\n    pass\n",
+    )
+    result = generic_handler(_rule("queues"), queued)
+    assert result["status"] == "fail"
+    assert "host.json:5 extensions.queues.batchSize: 64 is outside 1-32" in result["detail"]
+    assert "waits up to 300 s" in result["detail"]
+
+
+def test_dynamic_concurrency_and_legacy_layout(tmp_path: Path) -> None:
+    host = {
+        "version": "2.0",
+        "extensionBundle": {"id": "Microsoft.Azure.Functions.ExtensionBundle", "version": "[4.*, 5.0.0)"},
+        "concurrency": {"dynamicConcurrencyEnabled": True},
+        "extensions": {"serviceBus": {"maxConcurrentCalls": 32, "messageHandlerOptions": {"maxConcurrentCalls": 8}}},
+    }
+    function = tmp_path / "Orders"
+    function.mkdir()
+    (function / "function.json").write_text(json.dumps({"bindings": [{"type": "serviceBusTrigger", "name": "msg"}]}))
+    (tmp_path / "host.json").write_text(json.dumps(host))
+
+    concurrency = generic_handler(_rule("concurrency"), tmp_path)
+    assert concurrency["status"] == "fail"
+    assert (
+        "extensions.serviceBus.maxConcurrentCalls: is ignored while dynamicConcurrencyEnabled" in concurrency["detail"]
+    )
+    service_bus = generic_handler(_rule("service_bus"), tmp_path)
+    assert "messageHandlerOptions: is the Service Bus extension 4.x layout" in service_bus["detail"]
+
+
+def test_batch_and_request_limits() -> None:
+    event_hubs = audit_host(
+        {"extensions": {"eventHubs": {"maxEventBatchSize": 500, "prefetchCount": 100}}},
+        "event_hubs",
+        {"eventHubTrigger"},
+    )
+    assert [f["setting"] for f in event_hubs] == ["extensions.eventHubs.prefetchCount"]
+    http = audit_host(
+        {"extensions": {"http": {"maxConcurrentRequests": 100, "maxOutstandingRequests": 50}}}, "http", {"httpTrigger"}
+    )
+    assert "rejected with 429" in http[0]["message"]
+    timeout = audit_host({"functionTimeout": "00:30:00"}, "timeout", {"httpTrigger"})
+    assert len(timeout) == 2
+    assert audit_host({"functionTimeout": "00:03:00"}, "timeout", {"httpTrigger"}) == []
+    assert generic_handler(_rule("nope"), Path("."))["status"] == "fail"
@@ -0,0 +1,80 @@
+"""Tests for the static import-graph estimator."""
+
+import ast
+from pathlib import Path
+from typing import cast
+
+from azure_functions_doctor.cache import JsonCache
+from azure_functions_doctor.handlers import Rule, generic_handler
+from azure_functions_doctor.import_graph import ImportGraph, absolute_imports, analyze_imports, module_imports
+
+
+def _project(root: Path) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "function_app.py").write_text(
+        "import small\n"
+        "from pkg import heavy\n"
+        "import missing_dependency\n"
+        "\n"
+        "def handler():\n"
+        "    import lazy\n"
+    )
+    (root / "small.py").write_text("VALUE = 1\n")
+    (root / "lazy.py").write_text("raise SystemExit('must not be imported')\n")
+    pkg = root / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from . import util\n")
+    (pkg / "util.py").write_text("X = 1\n" * 200)
+    # Importing would fail loudly; the analyzer only parses it
+    (pkg / "heavy.py").write_text("from .util import X\nimport pkg.extra\nraise SystemExit('executed')\n")
+    (pkg / "extra.py").write_text("Y = 2\n" * 2000)
+    return root
+
+
+def test_module_imports_follow_import_time_execution() -> None:
+    tree = ast.parse(
+        "import a, b.c\n"
+        "try:\n    import d\nexcept ImportError:\n    e = None\n"
+        "if TYPE_CHECKING:\n    import typed_only\n"
+        "def f():\n    import lazy\n"
+        "class K:\n    from . import sibling\n"
+    )
+    assert [(line, level, module, names) for line, level, module, names in module_imports(tree)] == [
+        (1, 0, "a", []),
+        (1, 0, "b.c", []),
+        (3, 0, "d", []),
+        (11, 1, "", ["sibling"]),
+    ]
+    assert absolute_imports((1, 2, "util", ["X"]), "pkg.sub.mod", False) == ("pkg.util", ["pkg.util.X"])
+    assert absolute_imports((1, 1, "", ["util"]), "pkg", True) == ("pkg", ["pkg.util"])
+
+
+def test_analyze_ranks_import_lines_without_executing(tmp_path: Path) -> None:
+    root = _project(tmp_path / "app").resolve()
+    cache = JsonCache("import_graph_test", cache_dir=tmp_path / "cache")
+    graph = ImportGraph(root, paths=[str(root)], cache=cache)
+    report = analyze_imports(root, graph=graph)
+
+    assert report["unresolved"] == ["missing_dependency"]
+    assert [line["statement"] for line in report["lines"]][:2] == ["from pkg import heavy", "import small"]
+    heavy = report["lines"][0]
+    # pkg, pkg.util (via pkg/__init__), pkg.heavy and pkg.extra
+    assert heavy["modules"] == 4
+    assert heavy["line"] == 2
+    assert "lazy" not in graph.weights
+    assert report["modules"] == 6
+
+    # Unchanged files are not parsed again
+    again = ImportGraph(root, paths=[str(root)], cache=JsonCache("import_graph_test", cache_dir=tmp_path / "cache"))
+    assert analyze_imports(root, graph=again)["lines"] == report["lines"]
+    assert again.parsed == 0
+
+
+def test_static_rule_checks_estimate_against_budget(tmp_path: Path) -> None:
+    root = _project(tmp_path / "app")
+    rule = cast(Rule, {"id": "weight", "type": "cold_start_import", "condition": {"max_ms": 0.01, "static": True}})
+    result = generic_handler(rule, root)
+    assert result["status"] == "fail"
+    assert "from pkg import heavy" in result["detail"]
+    rule["condition"] = {"max_ms": 10_000, "static": True}
+    assert generic_handler(rule, root)["status"] == "pass"
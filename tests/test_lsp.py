@@ -0,0 +1,166 @@
+"""Tests for the language server front end."""
+
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.files import matches_rglob
+from azure_functions_doctor.handlers import Rule, rule_inputs
+from azure_functions_doctor.lsp import LanguageServer, json_key_range, read_message, write_message
+
+
+def _make_project(root: Path) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "host.json").write_text(json.dumps({"version": "2.0", "extensions": {"http": {}}}, indent=2))
+    (root / "requirements.txt").write_text("azure-functions\n")
+    (root / "function_app.py").write_text(
+        "import azure.functions as func\nimport azure.durable_functions as df\n\napp = func.FunctionApp()\n\n"
+        "@app.route(route='hello')\ndef hello(req):\n    return 'ok'\n"
+    )
+    return root
+
+
+class _Harness:
+    def __init__(self, project: Path) -> None:
+        self.project = project
+        self.out = io.BytesIO()
+        self.server = LanguageServer(io.BytesIO(), self.out, debounce=0)
+        self.server.handle_message(
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"rootUri": project.as_uri()}}
+        )
+
+    def messages(self) -> list[dict[str, Any]]:
+        stream = io.BytesIO(self.out.getvalue())
+        self.out.seek(0)
+        self.out.truncate()
+        messages = []
+        while (message := read_message(stream)) is not None:
+            messages.append(message)
+        return messages
+
+    def diagnostics(self) -> dict[str, list[dict[str, Any]]]:
+        return {
+            m["params"]["uri"].rsplit("/", 1)[-1]: m["params"]["diagnostics"]
+            for m in self.messages()
+            if m.get("method") == "textDocument/publishDiagnostics"
+        }
+
+    def notify(self, method: str, params: dict[str, Any]) -> None:
+        self.server.handle_message({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def open(self, name: str) -> None:
+        path = self.project / name
+        self.notify(
+            "textDocument/didOpen",
+            {"textDocument": {"uri": path.as_uri(), "languageId": "json", "version": 1, "text": path.read_text()}},
+        )
+
+    def change(self, name: str, text: str) -> None:
+        uri = (self.project / name).as_uri()
+        self.notify(
+            "textDocument/didChange", {"textDocument": {"uri": uri, "version": 2}, "contentChanges": [{"text": text}]}
+        )
+
+
+def _codes(diagnostics: list[dict[str, Any]]) -> set[str]:
+    return {d["code"] for d in diagnostics}
+
+
+def test_rule_inputs_cover_read_files() -> None:
+    host_rule: Rule = {"id": "x", "type": "host_json_property", "condition": {"jsonpath": "$.a"}}
+    env_rule: Rule = {"id": "y", "type": "env_var_exists", "condition": {"target": "A"}}
+    glob_rule: Rule = {"id": "z", "type": "file_glob_check", "condition": {"patterns": ["tests/"]}}
+
+    assert rule_inputs(host_rule) == ("host.json",)
+    assert rule_inputs(env_rule) == ()
+    assert matches_rglob("tests/", "tests/unit/test_a.py")
+    assert not matches_rglob("*.py", "host.json")
+    assert any(matches_rglob(p, "sub/function.json") for p in rule_inputs({"id": "c", "type": "cron_validation"}))
+    assert rule_inputs(glob_rule) == ("tests/",)
+
+
+def test_json_key_range_points_at_deepest_existing_key() -> None:
+    text = '{\n  "version": "2.0",\n  "extensions": {\n    "http": {}\n  }\n}'
+    found = json_key_range(text, ["extensions", "durableTask"])
+
+    assert found == {"start": {"line": 2, "character": 2}, "end": {"line": 2, "character": 14}}
+    assert json_key_range(text, ["missing"]) is None
+
+
+def test_open_publishes_ranged_diagnostics(tmp_path: Path) -> None:
+    harness = _Harness(_make_project(tmp_path / "app"))
+    assert harness.messages()[0]["result"]["capabilities"]["textDocumentSync"]["change"] == 1
+
+    harness.open("host.json")
+    diagnostics = harness.diagnostics()
+
+    host = {d["code"]: d for d in diagnostics["host.json"]}
+    # Durable usage without extensions.durableTask points at the "extensions" key
+    assert host["check_durabletask_config"]["range"]["start"] == {"line": 2, "character": 2}
+    assert host["check_durabletask_config"]["severity"] == 2
+    assert "check_extension_bundle" in host
+
+
+def test_unsaved_edit_reevaluates_only_affected_rules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    project = _make_project(tmp_path / "app")
+    harness = _Harness(project)
+    harness.open("requirements.txt")
+    harness.messages()
+
+    ran: list[str] = []
+    original = Doctor.evaluate_rule
+
+    def spy(self: Doctor, rule: Rule, context: Any = None) -> Any:
+        ran.append(rule["id"])
+        return original(self, rule, context)
+
+    monkeypatch.setattr(Doctor, "evaluate_rule", spy)
+    harness.change("requirements.txt", "requests\n")
+    diagnostics = harness.diagnostics()
+
+    assert set(ran) == {"check_requirements_txt", "check_azure_functions_library"}
+    assert "check_azure_functions_library" in _codes(diagnostics["requirements.txt"])
+    # The buffer was never saved
+    assert (project / "requirements.txt").read_text() == "azure-functions\n"
+
+    ran.clear()
+    harness.change("requirements.txt", "azure-functions\n")
+    assert "check_azure_functions_library" not in _codes(harness.diagnostics().get("requirements.txt", []))
+
+
+def test_resolved_findings_are_cleared(tmp_path: Path) -> None:
+    project = _make_project(tmp_path / "app")
+    harness = _Harness(project)
+    harness.open("host.json")
+    harness.messages()
+
+    fixed = {"version": "2.0", "extensionBundle": {"id": "x"}, "extensions": {"durableTask": {}}}
+    harness.change("host.json", json.dumps(fixed))
+    host_codes = _codes(harness.diagnostics().get("host.json", []))
+
+    assert "check_extension_bundle" not in host_codes
+    assert "check_durabletask_config" not in host_codes
+
+
+def test_shutdown_and_exit_over_stdio(tmp_path: Path) -> None:
+    incoming = io.BytesIO()
+    for message in (
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"rootUri": tmp_path.as_uri()}},
+        {"jsonrpc": "2.0", "id": 2, "method": "unknown/request", "params": {}},
+        {"jsonrpc": "2.0", "id": 3, "method": "shutdown"},
+        {"jsonrpc": "2.0", "method": "exit"},
+    ):
+        write_message(incoming, message)
+    incoming.seek(0)
+    out = io.BytesIO()
+
+    assert LanguageServer(incoming, out, debounce=0).serve() == 0
+
+    out.seek(0)
+    responses = [read_message(out) for _ in range(3)]
+    assert responses[1] is not None and responses[1]["error"]["code"] == -32601
+    assert responses[2] is not None and responses[2]["result"] is None
@@ -0,0 +1,73 @@
+"""Tests for the requirements include-graph index."""
+
+from pathlib import Path
+
+from azure_functions_doctor.context import ProjectContext
+from azure_functions_doctor.handlers import Rule, generic_handler
+from azure_functions_doctor.requirements import RequirementsIndex
+
+
+def test_names_are_canonicalized(tmp_path: Path) -> None:
+    req = tmp_path / "requirements.txt"
+    req.write_text("Azure_Functions[extra]>=1.13  # comment\nrequests ; python_version >= '3.0'\n")
+
+    index = RequirementsIndex.from_file(req)
+
+    assert index.exists
+    assert "azure-functions" in index
+    assert "AZURE.FUNCTIONS" in index
+    assert "requests" in index
+    assert index.names == frozenset({"azure-functions", "requests"})
+    entry = index.get("azure-functions")[0]
+    assert entry.extras == frozenset({"extra"})
+    assert entry.line == 1
+    assert index.get("requests")[0].applies()
+
+
+def test_include_graph_is_followed(tmp_path: Path) -> None:
+    (tmp_path / "reqs").mkdir()
+    (tmp_path / "reqs" / "base.txt").write_text("azure-functions\n-r ../requirements.txt\n")
+    (tmp_path / "reqs" / "constraints.txt").write_text("azure-functions<2\nurllib3==2.0\n")
+    req = tmp_path / "requirements.txt"
+    req.write_text("-r reqs/base.txt\n--constraint=reqs/constraints.txt\nhttpx \\\n  >=0.27\n")
+
+    index = RequirementsIndex.from_file(req)
+
+    assert "azure-functions" in index
+    assert "httpx" in index
+    # Constraint files only constrain; they never declare packages
+    assert "urllib3" not in index
+    assert str(index.specifier("httpx")) == ">=0.27"
+    assert index.specifier("azure-functions").contains("1.20")
+    assert not index.specifier("azure-functions").contains("2.1")
+    assert len(index.files) == 3
+
+
+def test_options_and_missing_includes(tmp_path: Path) -> None:
+    req = tmp_path / "requirements.txt"
+    req.write_text(
+        "--index-url https://example.invalid/simple\n"
+        "-e git+https://example.invalid/repo.git#egg=my_pkg\n"
+        "-r missing.txt\n"
+        "pkg==1.0 --hash=sha256:abc\n"
+    )
+
+    index = RequirementsIndex.from_file(req)
+
+    assert "my-pkg" in index
+    assert "pkg" in index
+    assert index.missing == [tmp_path / "missing.txt"]
+
+
+def test_package_declared_handler_uses_shared_index(tmp_path: Path) -> None:
+    (tmp_path / "base.txt").write_text("azure-functions[extras]==1.20.0\n")
+    (tmp_path / "requirements.txt").write_text("-r base.txt\n")
+    context = ProjectContext(tmp_path)
+    rule: Rule = {"type": "package_declared", "condition": {"package": "azure_functions"}}
+
+    assert generic_handler(rule, tmp_path, context)["status"] == "pass"
+    # A second rule reuses the parse cached on the context
+    assert context.requirements() is context.requirements("requirements.txt")
+
+    missing: Rule = {"type": "package_declared", "condition": {"package": "pandas"}}
+    assert generic_handler(missing, tmp_path, context)["status"] == "fail"
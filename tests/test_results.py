@@ -0,0 +1,44 @@
+"""Tests for the slotted result objects."""
+
+import json
+from pathlib import Path
+
+from azure_functions_doctor.api import run_diagnostics
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.results import Check, HandlerResult, Section, Status, to_dicts
+
+
+def test_checks_read_like_report_dicts() -> None:
+    check = Check("check_x", "Label", "detail", "fail", hint="Fix it", duration_ms=1.5)
+    assert not hasattr(check, "__dict__")
+    assert check["status"] == "fail" and check.status is Status.FAIL
+    assert "hint_url" not in check and check.get("hint_url") is None
+    assert list(check) == ["id", "label", "value", "status", "duration_ms", "hint"]
+    assert check == check.to_dict()
+    assert Check.from_dict(check.to_dict()).to_dict() == check.to_dict()
+
+    section = Section("python_env", checks=[Check("ok", "OK", "", Status.PASS), check])
+    assert section["title"] == "Python Env"
+    assert section["status"] == "fail"
+    assert [item["id"] for item in section["items"]] == ["ok", "check_x"]
+    assert json.loads(json.dumps(to_dicts([section]))) == [section.to_dict()]
+
+
+def test_plugin_dicts_are_coerced() -> None:
+    assert HandlerResult.coerce({"status": "pass", "detail": "ok"}) == {"status": "pass", "detail": "ok"}
+    failed = HandlerResult.coerce({"status": "error", "detail": "boom", "internal_error": "true"})
+    assert failed.status is Status.FAIL and failed.internal_error
+    assert dict(failed) == {"status": "fail", "detail": "boom", "internal_error": True}
+
+
+def test_runs_share_interned_strings_and_convert_at_the_boundary(tmp_path: Path) -> None:
+    (tmp_path / "host.json").write_text('{"version": "2.0"}')
+    (tmp_path / "requirements.txt").write_text("azure-functions\n")
+    doctor = Doctor(str(tmp_path))
+    first, second = doctor.run_all_checks(), doctor.run_all_checks()
+    assert all(isinstance(section, Section) for section in first)
+    assert first[0].checks[0].label is second[0].checks[0].label
+
+    public = run_diagnostics(str(tmp_path))
+    assert all(type(section) is dict and type(section["items"][0]) is dict for section in public)
+    json.dumps(public)
@@ -0,0 +1,97 @@
+"""Tests for custom rule packs."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from azure_functions_doctor import rule_schema
+from azure_functions_doctor.cli import cli as app
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.rule_packs import RulePackError, load_rule_packs
+
+runner = CliRunner()
+
+
+def _rule(rule_id: str, **extra: Any) -> dict[str, Any]:
+    rule = {
+        "id": rule_id,
+        "type": "env_var_exists",
+        "section": "org",
+        "label": rule_id,
+        "condition": {"target": "ORG_TOKEN"},
+        "check_order": 40,
+    }
+    rule.update(extra)
+    return rule
+
+
+def _write(path: Path, rules: Any) -> Path:
+    path.write_text(json.dumps(rules))
+    return path
+
+
+def test_packs_merge_and_override_by_id(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    packs = tmp_path / "packs"
+    packs.mkdir()
+    _write(packs / "10-base.json", [_rule("org_token"), _rule("org_v1_only", models=["v1"])])
+    # Later files override earlier ones and built-in rules with the same id
+    _write(
+        packs / "20-team.json",
+        {"rules": [_rule("org_token", label="Org token"), _rule("check_func_cli", section="tooling", check_order=20)]},
+    )
+    monkeypatch.setenv("FUNC_DOCTOR_CUSTOM_RULES", str(packs))
+    monkeypatch.setenv("ORG_TOKEN", "x")
+
+    doctor = Doctor(str(tmp_path), allow_v1=True, programming_model="v2")
+    rules = {rule["id"]: rule for rule in doctor.load_rules()}
+
+    assert rules["org_token"]["label"] == "Org token"
+    assert "org_v1_only" not in rules
+    assert rules["check_func_cli"]["type"] == "env_var_exists"
+    items = {item["id"]: item for section in doctor.run_all_checks(only=["org"]) for item in section["items"]}
+    assert items["org_token"]["status"] == "pass"
+
+
+def test_invalid_pack_reports_every_problem(tmp_path: Path) -> None:
+    pack = _write(
+        tmp_path / "bad.json",
+        [_rule("a", type="no_such_handler"), _rule("b", models="v2"), {"id": "a", "section": "s"}],
+    )
+
+    with pytest.raises(RulePackError) as excinfo:
+        load_rule_packs(pack)
+
+    message = str(excinfo.value)
+    assert "a.type: unknown handler type 'no_such_handler'" in message
+    assert "b.models: expected array" in message
+    assert "a: duplicate id" in message and "a: missing 'condition'" in message
+
+
+def test_validated_pack_is_not_revalidated_until_content_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pack = _write(tmp_path / "org.json", [_rule("org_token")])
+    load_rule_packs(pack)
+
+    def fail_validation(rules: Any) -> list[str]:
+        raise AssertionError("pack was revalidated")
+
+    monkeypatch.setattr(rule_schema, "validate_rules", fail_validation)
+    assert [rule["id"] for rule in load_rule_packs(pack)] == ["org_token"]
+
+    _write(pack, [_rule("org_token"), _rule("org_other")])
+    with pytest.raises(AssertionError, match="revalidated"):
+        load_rule_packs(pack)
+
+
+def test_cli_reports_invalid_pack(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FUNC_DOCTOR_CUSTOM_RULES", str(_write(tmp_path / "bad.json", {"rules": "nope"})))
+
+    # Wide enough that Rich does not wrap the message around the temporary path
+    result = runner.invoke(app, ["doctor", "--path", str(tmp_path)], env={"COLUMNS": "500"})
+
+    assert result.exit_code == 2
+    assert "must contain a list of rules" in result.output
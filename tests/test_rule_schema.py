@@ -0,0 +1,71 @@
+"""Tests for the generated rule schema and its compiled validator."""
+
+import importlib.resources
+import json
+from typing import Any
+
+import pytest
+
+from azure_functions_doctor.cache import JsonCache
+from azure_functions_doctor.rule_schema import (
+    RuleValidationError,
+    ValidatedDigests,
+    build_rule_schema,
+    compile_validator,
+    validate_rules,
+)
+
+
+def _asset(name: str) -> Any:
+    return json.loads(importlib.resources.files("azure_functions_doctor").joinpath(name).read_text(encoding="utf-8"))
+
+
+def test_shipped_schema_matches_generated_schema() -> None:
+    """schemas/rules.schema.json must be regenerated when Rule, Condition or the handlers change."""
+    assert _asset("schemas/rules.schema.json") == build_rule_schema()
+
+
+@pytest.mark.parametrize("name", ["assets/rules/v1.json", "assets/rules/v2.json"])
+def test_builtin_rules_are_valid(name: str) -> None:
+    assert validate_rules(_asset(name)) == []
+
+
+def test_validator_reports_paths_and_json_types() -> None:
+    rule = {
+        "id": "r",
+        "type": "env_var_exists",
+        "section": "s",
+        "condition": {"target": "X", "value": [1]},
+        "check_order": True,
+        "lable": "typo",
+    }
+
+    assert validate_rules([rule]) == [
+        "r.condition.value: expected string or integer or number",
+        "r.check_order: expected integer",
+        "r: unknown field 'lable'",
+    ]
+    assert validate_rules({"rules": []}) == ["rule file must contain a list of rules"]
+
+
+def test_compile_validator_checks_items_and_enums() -> None:
+    check = compile_validator({"type": "array", "items": {"type": "string", "enum": ["a"]}})
+    errors: list[str] = []
+
+    check(["a", "b", 3], "x", errors)
+
+    assert errors == ["x[1]: unsupported value 'b'", "x[2]: expected string"]
+
+
+def test_validated_digests_skip_unchanged_content(tmp_path: Any) -> None:
+    digests = ValidatedDigests(JsonCache("rule_digests", cache_dir=tmp_path))
+    bad = [{"id": "r"}]
+
+    with pytest.raises(RuleValidationError, match="r: missing 'type'"):
+        digests.ensure_valid("pack.json", b"bad", bad)
+    good = [{"id": "r", "type": "file_exists", "section": "s", "condition": {"target": "host.json"}}]
+    digests.ensure_valid("pack.json", b"good", good)
+    digests.save()
+
+    # Same content digest: accepted without validating again
+    ValidatedDigests(JsonCache("rule_digests", cache_dir=tmp_path)).ensure_valid("pack.json", b"good", bad)
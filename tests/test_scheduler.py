@@ -0,0 +1,67 @@
+"""Tests for the cost-based rule scheduler."""
+
+import json
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from azure_functions_doctor.doctor import Doctor
+from azure_functions_doctor.handlers import Rule
+from azure_functions_doctor.scheduler import RuleTimings
+
+
+def _rule(rule_id: str, rule_type: str = "env_var_exists") -> Rule:
+    return cast(Rule, {"id": rule_id, "type": rule_type, "section": "s", "label": rule_id, "condition": {}})
+
+
+def _strip(results: list[Any]) -> list[Any]:
+    return [
+        {**section, "items": [{k: v for k, v in item.items() if k != "duration_ms"} for item in section["items"]]}
+        for section in results
+    ]
+
+
+def test_schedule_uses_learned_timings_over_static_estimates(tmp_path: Path) -> None:
+    rules = [_rule("env"), _rule("scan", "source_code_contains"), _rule("slow_env")]
+    timings = RuleTimings(tmp_path)
+    timings.record({"slow_env": 500.0})
+
+    reloaded = RuleTimings(tmp_path)
+
+    assert [r["id"] for r in reloaded.schedule(rules)] == ["slow_env", "scan", "env"]
+    assert [r["id"] for r in reloaded.schedule(rules, cheapest_first=True)] == ["env", "scan", "slow_env"]
+    reloaded.record({"slow_env": 100.0})
+    assert reloaded.estimate(rules[2]) == 300.0
+
+
+def _project(root: Path) -> Path:
+    root.mkdir()
+    (root / "host.json").write_text(json.dumps({"version": "2.0"}))
+    (root / "requirements.txt").write_text("azure-functions\n")
+    (root / "function_app.py").write_text("import azure.functions as func\napp = func.FunctionApp()\n")
+    return root
+
+
+def test_parallel_run_reports_in_check_order(tmp_path: Path) -> None:
+    project = _project(tmp_path / "app")
+
+    sequential = Doctor(str(project)).run_all_checks(jobs=1)
+    parallel = Doctor(str(project)).run_all_checks(jobs=4)
+
+    assert _strip(parallel) == _strip(sequential)
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_fail_fast_stops_at_first_required_failure(tmp_path: Path, jobs: int) -> None:
+    project = tmp_path / "empty"
+    project.mkdir()
+    full = Doctor(str(project)).run_all_checks()
+
+    results = Doctor(str(project)).run_all_checks(jobs=jobs, fail_fast=True)
+
+    items = [item for section in results for item in section["items"]]
+    assert any(item["status"] == "fail" for item in items)
+    assert len(items) < sum(len(section["items"]) for section in full)
+    if jobs == 1:
+        assert [item["status"] for item in items].count("fail") == 1
@@ -0,0 +1,80 @@
+"""Tests for sharded runs and merging of partial reports."""
+
+import json
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+from typer.testing import CliRunner
+
+from azure_functions_doctor.cli import cli as app
+from azure_functions_doctor.handlers import Rule
+from azure_functions_doctor.scheduler import RuleTimings
+from azure_functions_doctor.shard import ShardError, assign, merge_partials, parse_shard, plan_rules
+
+runner = CliRunner()
+
+
+def _without_durations(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    for section in results:
+        for item in section["items"]:
+            item.pop("duration_ms", None)
+    return results
+
+
+def test_assignment_is_stable_and_weighted_shards_balance() -> None:
+    keys = [f"check_{i}" for i in range(40)]
+    assert assign(keys, 3) == assign(list(keys), 3)
+    assert set(assign(keys, 3)) == {1, 2, 3}
+
+    weights = {"slow": 100.0, "medium": 60.0, "a": 20.0, "b": 20.0, "c": 15.0}
+    shards = assign(list(weights), 2, weights)
+    loads = [sum(weights[k] for k, s in zip(weights, shards) if s == shard) for shard in (1, 2)]
+    assert shards[0] != shards[1]
+    assert abs(loads[0] - loads[1]) <= 20
+
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/2", "3/2", "1", "a/b"):
+        with pytest.raises(ShardError):
+            parse_shard(bad)
+
+
+def test_plan_is_weighted_only_with_timing_history(tmp_path: Path) -> None:
+    from azure_functions_doctor.cache import JsonCache
+
+    rules = [cast(Rule, {"id": f"r{i}", "section": "s", "type": "file_exists"}) for i in range(4)]
+    timings = RuleTimings(tmp_path, JsonCache("timings", cache_dir=tmp_path / "cache"))
+    assert plan_rules(rules, 2, timings)[1] == "hash"
+    timings.record({"r0": 500.0})
+    plan, strategy = plan_rules(rules, 2, timings)
+    assert strategy == "weighted"
+    # The one slow rule gets a shard to itself
+    assert [r["shard"] for r in plan] == [1, 2, 2, 2]
+
+
+def test_sharded_runs_merge_into_the_single_node_report(tmp_path: Path) -> None:
+    project = tmp_path / "app"
+    project.mkdir()
+    (project / "function_app.py").write_text("import azure.functions as func\n\napp = func.FunctionApp()\n")
+    (project / "host.json").write_text('{"version": "2.0"}')
+    (project / "requirements.txt").write_text("azure-functions\n")
+
+    partials = []
+    for index in (1, 2, 3):
+        out = tmp_path / f"shard-{index}.json"
+        result = runner.invoke(app, ["doctor", "--path", str(project), "--shard", f"{index}/3", "--output", str(out)])
+        assert result.exit_code in (0, 1)
+        partials.append(json.loads(out.read_text()))
+    assert {p["shard"]["plan"] for p in partials} == {partials[0]["shard"]["plan"]}
+    ran = [item["id"] for p in partials for section in p["results"] for item in section["items"]]
+    assert len(ran) == len(set(ran)) == len(partials[0]["rules"])
+
+    single = runner.invoke(app, ["doctor", "--path", str(project), "--format", "json"])
+    merged = runner.invoke(app, ["merge", *(str(tmp_path / f"shard-{i}.json") for i in (1, 2, 3))])
+    assert merged.exit_code == single.exit_code
+    assert _without_durations(json.loads(merged.output)) == _without_durations(json.loads(single.output))
+
+    with pytest.raises(ShardError, match="Missing shard"):
+        merge_partials(partials[:2])
+    with pytest.raises(ShardError, match="more than once"):
+        merge_partials([partials[0], *partials])
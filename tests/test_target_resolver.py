@@ -1,8 +1,6 @@
-import subprocess
 import sys
-from typing import Optional
-
-import pytest
+from pathlib import Path
+from typing import Callable
 
 from azure_functions_doctor import target_resolver
 
@@ -13,23 +11,48 @@ def test_resolve_python_version() -> None:
     assert result == sys.version.split()[0]
 
 
-def test_resolve_func_core_tools_version(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Test resolving func_core_tools version via subprocess."""
+def test_resolve_func_core_tools_version(fake_tool: Callable[[str, str], Path]) -> None:
+    """Test resolving func_core_tools version via an async subprocess probe."""
+    fake_tool("func", "echo 4.0.5198")
+    result = target_resolver.resolve_target_value("func_core_tools")
+    assert result == "4.0.5198"
 
-    def mock_check_output(cmd: list[str], text: bool, timeout: Optional[int] = None) -> str:
-        return "4.0.5198"
 
-    monkeypatch.setattr(subprocess, "check_output", mock_check_output)
+def test_resolve_func_core_tools_fallback(fake_tool: Callable[[str, str], Path]) -> None:
+    """Test fallback when func_core_tools exits with an error."""
+    fake_tool("func", "exit 3")
     result = target_resolver.resolve_target_value("func_core_tools")
-    assert result == "4.0.5198"
+    assert result == "error_3"
 
 
-def test_resolve_func_core_tools_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Test fallback when func_core_tools resolution fails."""
+def test_probe_results_are_cached_until_binary_changes(fake_tool: Callable[[str, str], Path], tmp_path: Path) -> None:
+    """A cached probe is reused until the binary's size or mtime changes."""
+    counter = tmp_path / "calls"
+    tool = fake_tool("func", f"echo x >> {counter}\necho 4.0.1")
 
-    def mock_check_output(cmd: list[str], text: bool, timeout: Optional[int] = None) -> str:
-        raise Exception("not found")
+    assert target_resolver.resolve_target_value("func_core_tools") == "4.0.1"
+    assert target_resolver.resolve_target_value("func_core_tools") == "4.0.1"
+    assert counter.read_text().count("x") == 1
 
-    monkeypatch.setattr(subprocess, "check_output", mock_check_output)
-    result = target_resolver.resolve_target_value("func_core_tools")
-    assert result == "unknown_error"
+    tool.write_text(f"#!/bin/sh\necho x >> {counter}\necho 4.0.2 upgraded\n")
+    assert target_resolver.resolve_target_value("func_core_tools") == "4.0.2"
+    assert counter.read_text().count("x") == 2
+
+
+def test_resolve_many_targets_concurrently(fake_tool: Callable[[str, str], Path], tmp_path: Path) -> None:
+    """Several probes resolve in one call and run together."""
+
+    def rendezvous(name: str, other: str, output: str) -> str:
+        # Each tool only answers once the other has started, so probes run one after another time out
+        return (
+            f"touch {tmp_path}/{name}.started; i=0; "
+            f"while [ ! -f {tmp_path}/{other}.started ] && [ $i -lt 200 ]; do sleep 0.05; i=$((i+1)); done; "
+            f"[ -f {tmp_path}/{other}.started ] && {output}"
+        )
+
+    fake_tool("func", rendezvous("func", "az", "echo 4.0.5198"))
+    fake_tool("az", rendezvous("az", "func", "printf 'azure-cli                         2.61.0\\n\\ncore 2.61.0\\n'"))
+    values = target_resolver.resolve_target_values(["python", "func_core_tools", "azure_cli", "docker"])
+    assert values["func_core_tools"] == "4.0.5198"
+    assert values["azure_cli"] == "2.61.0"
+    assert values["docker"] == "not_installed"
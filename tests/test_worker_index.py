@@ -0,0 +1,95 @@
+"""Tests for the worker-indexing simulation."""
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from azure_functions_doctor.cli import cli as app
+from azure_functions_doctor.worker_index import simulate_indexing
+
+_BLUEPRINT = """\
+import azure.functions as func
+
+bp = func.Blueprint()
+
+
+@bp.queue_trigger(arg_name="msg", queue_name="orders", connection="Storage")
+def take(msg: func.QueueMessage) -> None:
+    pass
+
+
+@bp.function_name("ship")
+@bp.schedule(schedule="0 */5 * * * *", arg_name="timer")
+@bp.blob_output(arg_name="out", path="orders/{rand-guid}", connection="Storage")
+def ship_orders(timer: func.TimerRequest, out: func.Out[str]) -> None:
+    pass
+"""
+
+
+def _app(root: Path, body: str) -> Path:
+    (root / "blueprints").mkdir(parents=True, exist_ok=True)
+    (root / "blueprints" / "__init__.py").write_text("")
+    (root / "blueprints" / "orders.py").write_text(_BLUEPRINT)
+    (root / "function_app.py").write_text(
+        "import azure.functions as func\nfrom blueprints.orders import bp as orders\n\n" + body
+    )
+    return root
+
+
+def test_functions_are_attributed_to_app_and_blueprints(tmp_path: Path) -> None:
+    root = _app(
+        tmp_path,
+        "app = func.FunctionApp()\napp.register_functions(orders)\n\n\n"
+        "@app.route(route='ping')\ndef ping(req: func.HttpRequest) -> func.HttpResponse:\n    return None\n",
+    )
+    report = simulate_indexing(root, runs=2, stub=True)
+    assert report["library"] == "stub"
+    assert report["runs"] == 2
+    assert report["errors"] == []
+    assert report["function_count"] == 3
+    assert report["blueprints"] == [
+        {"blueprint": "blueprints.orders.bp", "functions": 2},
+        {"blueprint": "function_app.app", "functions": 1},
+    ]
+    assert {(f["name"], f["trigger"]) for f in report["functions"]} == {
+        ("take", "queueTrigger"),
+        ("ship", "timerTrigger"),
+        ("ping", "httpTrigger"),
+    }
+
+
+def test_registration_errors_are_reported(tmp_path: Path) -> None:
+    # A duplicate name only fails when the worker builds the function list
+    duplicate = _app(
+        tmp_path / "duplicate",
+        "app = func.FunctionApp()\napp.register_blueprint(orders)\n\n\n"
+        "@app.function_name('take')\n@app.route(route='take')\ndef take_http(req):\n    return None\n",
+    )
+    (error,) = simulate_indexing(duplicate, runs=1, stub=True)["errors"]
+    assert error["stage"] == "index"
+    assert "take does not have a unique function name" in error["message"]
+
+    # A second trigger fails while the decorators run, i.e. during import
+    two_triggers = _app(
+        tmp_path / "two",
+        "app = func.FunctionApp()\n\n\n"
+        "@app.route(route='x')\n@app.timer_trigger(schedule='0 * * * * *', arg_name='t')\ndef x(req, t):\n    pass\n",
+    )
+    (error,) = simulate_indexing(two_triggers, runs=1, stub=True)["errors"]
+    assert error["stage"] == "import"
+    assert error["location"] == "function_app.py:7"
+
+    # Reported on the failing decorator, not the ``def`` line as Python < 3.11 tracebacks have it
+    middle = _app(
+        tmp_path / "middle",
+        "app = func.FunctionApp()\n\n\n@app.function_name('y')\n@app.route(route='y')\n"
+        "@app.timer_trigger(schedule='0 * * * * *', arg_name='t')\ndef y(req, t):\n    pass\n",
+    )
+    (error,) = simulate_indexing(middle, runs=1, stub=True)["errors"]
+    assert error["location"] == "function_app.py:8"
+
+    no_app = _app(tmp_path / "none", "handlers = [orders]\n")
+    result = CliRunner().invoke(app, ["index", "--path", str(no_app), "--runs", "1", "--format", "json"])
+    assert result.exit_code == 1
+    assert "No top-level FunctionApp" in json.loads(result.output)["errors"][0]["message"]